@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark API startup for eager and lazy router registration.
+
+Each mode runs in a fresh interpreter and reports the time to import and build
+the application, the worker's resident memory after startup, and the latency of
+the first and second request to a path (the first one includes importing the
+endpoint modules in lazy mode).
+
+Usage:
+    python scripts/benchmark_api_startup.py [--path /api/v1/schedules/] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(path: str) -> dict:
+    """Runs inside the child interpreter"""
+    start = time.perf_counter()
+    from src.api.main import app
+    from src.api.v1.router import route_registry
+    startup_ms = (time.perf_counter() - start) * 1000
+    startup_rss = rss_mb()
+
+    import httpx
+
+    async def timed_get(client):
+        request_start = time.perf_counter()
+        response = await client.get(path)
+        return (time.perf_counter() - request_start) * 1000, response.status_code
+
+    async def requests():
+        # ASGITransport does not run the lifespan, so no database is needed
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            return await timed_get(client), await timed_get(client)
+
+    (first_ms, status), (second_ms, _) = asyncio.run(requests())
+    stats = route_registry.get_stats()
+    return {
+        "startup_ms": round(startup_ms, 1),
+        "startup_rss_mb": round(startup_rss, 1),
+        "first_request_ms": round(first_ms, 1),
+        "second_request_ms": round(second_ms, 1),
+        "status_code": status,
+        "rss_after_request_mb": round(rss_mb(), 1),
+        "modules_loaded": stats["loaded"],
+        "modules_failed": stats["failed"],
+        "modules_total": stats["modules"],
+    }
+
+
+def run_mode(lazy: bool, path: str) -> dict:
+    env = {**os.environ, "LAZY_ROUTERS": "true" if lazy else "false", "ROUTER_WARM_UP": "false"}
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", "--path", path],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default="/api/v1/schedules/", help="Path of the first request")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.path)))
+        return
+
+    results = {"eager": run_mode(False, args.path), "lazy": run_mode(True, args.path)}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("API Startup Benchmark")
+    print("=" * 50)
+    print(f"First request: GET {args.path}")
+    for mode, result in results.items():
+        print(f"\n{mode.upper()} registration")
+        if "error" in result:
+            print(f"  failed: {result['error']}")
+            continue
+        print(f"  Startup:          {result['startup_ms']:.1f} ms")
+        print(f"  Memory (startup): {result['startup_rss_mb']:.1f} MB")
+        print(f"  First request:    {result['first_request_ms']:.1f} ms (HTTP {result['status_code']})")
+        print(f"  Second request:   {result['second_request_ms']:.1f} ms")
+        print(f"  Memory (after):   {result['rss_after_request_mb']:.1f} MB")
+        print(f"  Modules loaded:   {result['modules_loaded']}/{result['modules_total']}"
+              f" ({result['modules_failed']} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API middleware stack: raw ASGI vs BaseHTTPMiddleware.
+
+Builds two apps with the same endpoints and the same three middlewares as
+src.api.main (request ID, monitoring, error handling). One app uses the current
+raw ASGI implementations. The other uses the previous BaseHTTPMiddleware
+versions, reproduced below. Both are driven in-process through httpx's ASGI
+transport, and the script reports p50/p99 latency and throughput for a small
+JSON endpoint and a streamed response. The rate limiter is left out because it
+needs Redis.
+
+Usage:
+    python scripts/benchmark_middleware_stack.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.api.middleware.monitoring import MonitoringMiddleware
+from src.api.middleware.request_id import RequestIDMiddleware
+
+# Previous metric definitions, in their own registry so names do not clash
+legacy_registry = CollectorRegistry()
+legacy_request_count = Counter("http_requests_total", "Total HTTP requests",
+                               ["method", "endpoint", "status"], registry=legacy_registry)
+legacy_request_duration = Histogram("http_request_duration_seconds", "HTTP request duration",
+                                    ["method", "endpoint"], registry=legacy_registry)
+legacy_active_requests = Gauge("http_requests_active", "Active HTTP requests", registry=legacy_registry)
+
+
+# Previous BaseHTTPMiddleware implementations, kept here for comparison only
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyMonitoringMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        legacy_active_requests.inc()
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+            duration = time.time() - start_time
+            legacy_request_count.labels(method=request.method, endpoint=request.url.path,
+                                        status=response.status_code).inc()
+            legacy_request_duration.labels(method=request.method, endpoint=request.url.path).observe(duration)
+            response.headers["X-Process-Time"] = str(duration)
+            return response
+        finally:
+            legacy_active_requests.dec()
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
+def build_app(raw_asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(32):
+                yield b"x" * 1024
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if raw_asgi:
+        middlewares = [RequestIDMiddleware, MonitoringMiddleware, ErrorHandlingMiddleware]
+    else:
+        middlewares = [LegacyRequestIDMiddleware, LegacyMonitoringMiddleware, LegacyErrorHandlingMiddleware]
+    for middleware in middlewares:
+        app.add_middleware(middleware)
+    return app
+
+
+async def drive(app: FastAPI, path: str, total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        # Warm up routing and metric label children
+        for _ in range(20):
+            await client.get(path)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "rps": len(latencies) / elapsed,
+    }
+
+
+async def run_benchmark(total: int, concurrency: int):
+    print("Middleware Stack Benchmark")
+    print("=" * 64)
+    print(f"{total} requests per case, concurrency {concurrency}\n")
+    print(f"{'Case':<28}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>12}")
+    for path in ("/ping", "/stream"):
+        results = {}
+        for label, raw_asgi in (("BaseHTTPMiddleware", False), ("raw ASGI", True)):
+            results[label] = await drive(build_app(raw_asgi), path, total, concurrency)
+            result = results[label]
+            print(f"{path + ' ' + label:<28}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+                  f"{result['rps']:>12.0f}")
+        speedup = results["raw ASGI"]["rps"] / results["BaseHTTPMiddleware"]["rps"]
+        print(f"{path + ' throughput gain':<28}{speedup:>32.2f}x\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
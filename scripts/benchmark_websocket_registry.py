@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Churn benchmark for the WebSocket ConnectionPool registry.
+
+Simulates a reconnect storm after a deploy. All connections connect at once,
+then each one subscribes to a few event types and joins a room, rooms and
+subscriptions are looked up while members keep joining and leaving, and
+finally everyone disconnects. Each phase runs as concurrent tasks on one event
+loop. Results are reported for a single shard, which matches the previous
+one-lock registry, and for the sharded default.
+
+Usage:
+    python scripts/benchmark_websocket_registry.py [--connections 10000] [--shards 64]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.websocket.core.connection import WebSocketConnection
+from src.websocket.core.server import ConnectionPool
+
+EVENT_TYPES = [f"schedule.updated.{i}" for i in range(20)]
+ROOMS = [f"team-{i}" for i in range(200)]
+
+
+class BenchWebSocket:
+    def __init__(self):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+
+
+async def timed(label: str, results: Dict[str, float], count: int, coroutines):
+    start = time.perf_counter()
+    await asyncio.gather(*coroutines)
+    results[label] = count / (time.perf_counter() - start)
+
+
+async def run_case(connections: int, shards: int) -> Dict[str, float]:
+    pool = ConnectionPool(max_connections=connections, num_shards=shards)
+    rng = random.Random(42)
+    conns = [
+        WebSocketConnection(websocket=BenchWebSocket(), connection_id=f"bench-{i}", user_id=f"user-{i % 2000}")
+        for i in range(connections)
+    ]
+    results: Dict[str, float] = {}
+
+    await timed("connect/s", results, connections, [pool.add_connection(c) for c in conns])
+
+    async def subscribe(connection):
+        for event_type in rng.sample(EVENT_TYPES, 3):
+            await pool.add_subscription(connection.connection_id, event_type)
+        await pool.add_to_room(connection.connection_id, rng.choice(ROOMS))
+
+    await timed("subscribe/s", results, connections * 4, [subscribe(c) for c in conns])
+
+    async def churn_and_lookup(connection):
+        room = rng.choice(ROOMS)
+        await pool.add_to_room(connection.connection_id, room)
+        await pool.get_room_connections(rng.choice(ROOMS))
+        await pool.get_subscription_connections(rng.choice(EVENT_TYPES))
+        await pool.remove_from_room(connection.connection_id, room)
+
+    await timed("churn+lookup/s", results, connections * 4, [churn_and_lookup(c) for c in conns])
+    await timed("disconnect/s", results, connections, [pool.remove_connection(c.connection_id) for c in conns])
+    assert pool.active_connections == 0 and not pool.room_connections
+    return results
+
+
+async def run_benchmark(connections: int, shards: int):
+    print("WebSocket Registry Churn Benchmark")
+    print("=" * 72)
+    print(f"{connections} connections, 3 subscriptions and 1 room each\n")
+    cases = {"1 shard (single lock)": 1, f"{shards} shards": shards}
+    results = {label: await run_case(connections, n) for label, n in cases.items()}
+    phases = list(next(iter(results.values())))
+    print(f"{'Case':<24}" + "".join(f"{phase:>16}" for phase in phases))
+    for label, result in results.items():
+        print(f"{label:<24}" + "".join(f"{result[phase]:>16,.0f}" for phase in phases))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--shards", type=int, default=64)
+    args = parser.parse_args()
+    # Per-connection INFO logs would dominate the timings
+    logging.disable(logging.INFO)
+    asyncio.run(run_benchmark(args.connections, args.shards))
+
+
+if __name__ == "__main__":
+    main()
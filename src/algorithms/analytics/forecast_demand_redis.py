@@ -25,9 +25,11 @@ import json
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
-from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import hashlib
+import os
+import uuid
 
 import numpy as np
 import pandas as pd
@@ -38,6 +40,12 @@ from sqlalchemy.exc import OperationalError
 
 logger = logging.getLogger(__name__)
 
+# Services handed to one worker process at a time in batch forecasting
+BATCH_FORECAST_CHUNK_SIZE = 25
+
+# Rows per executemany round trip when writing batch results
+BATCH_WRITE_SIZE = 5000
+
 
 @dataclass
 class ForecastResult:
@@ -63,6 +71,16 @@ class DemandForecastRequest:
     forecast_type: str  # 'simple', 'seasonal', 'trend'
 
 
+@dataclass
+class BatchForecastReport:
+    """Outcome of a multi-service batch forecast run"""
+    batch_id: str
+    results: List[ForecastResult]
+    failed_services: List[int]
+    rows_written: int
+    stage_timings: Dict[str, float] = field(default_factory=dict)  # seconds per stage
+
+
 class OptimizedDemandForecaster:
     """Redis-optimized demand forecasting engine"""
     
@@ -115,45 +133,58 @@ class OptimizedDemandForecaster:
         cache_key = self._generate_cache_key(request)
         
         # Try Redis cache first
-        if self.redis_client:
-            try:
-                cached_result = self.redis_client.get(cache_key)
-                if cached_result:
-                    result_data = json.loads(cached_result)
-                    return ForecastResult(
-                        service_id=result_data['service_id'],
-                        forecast_horizon_days=result_data['forecast_horizon_days'],
-                        forecast_values=result_data['forecast_values'],
-                        confidence_intervals=[tuple(ci) for ci in result_data['confidence_intervals']],
-                        seasonal_pattern=result_data['seasonal_pattern'],
-                        forecast_accuracy=result_data['forecast_accuracy'],
-                        forecast_timestamp=datetime.fromisoformat(result_data['forecast_timestamp']),
-                        cache_hit=True
-                    )
-            except Exception as e:
-                logger.debug(f"Cache miss: {e}")
+        cached = self._get_cached_forecast(cache_key)
+        if cached:
+            return cached
         
         # Perform forecasting
         result = self._perform_forecasting(request)
         result.cache_hit = False
         
         # Cache result if Redis available
-        if self.redis_client and result.forecast_accuracy > 0.7:
-            try:
-                result_data = asdict(result)
-                result_data['forecast_timestamp'] = result.forecast_timestamp.isoformat()
-                result_data.pop('cache_hit')  # Don't cache the cache_hit flag
-                
-                self.redis_client.setex(
-                    cache_key,
-                    self.cache_ttl_forecast,
-                    json.dumps(result_data)
-                )
-            except Exception as e:
-                logger.debug(f"Cache write failed: {e}")
+        self._cache_forecast(cache_key, result)
         
         return result
     
+    def _get_cached_forecast(self, cache_key: str) -> Optional[ForecastResult]:
+        """Cached forecast for key, None on a miss or without Redis"""
+        if not self.redis_client:
+            return None
+        try:
+            cached_result = self.redis_client.get(cache_key)
+            if cached_result:
+                result_data = json.loads(cached_result)
+                return ForecastResult(
+                    service_id=result_data['service_id'],
+                    forecast_horizon_days=result_data['forecast_horizon_days'],
+                    forecast_values=result_data['forecast_values'],
+                    confidence_intervals=[tuple(ci) for ci in result_data['confidence_intervals']],
+                    seasonal_pattern=result_data['seasonal_pattern'],
+                    forecast_accuracy=result_data['forecast_accuracy'],
+                    forecast_timestamp=datetime.fromisoformat(result_data['forecast_timestamp']),
+                    cache_hit=True
+                )
+        except Exception as e:
+            logger.debug(f"Cache miss: {e}")
+        return None
+    
+    def _cache_forecast(self, cache_key: str, result: ForecastResult):
+        """Cache an accurate enough forecast if Redis is available"""
+        if not self.redis_client or result.forecast_accuracy <= 0.7:
+            return
+        try:
+            result_data = asdict(result)
+            result_data['forecast_timestamp'] = result.forecast_timestamp.isoformat()
+            result_data.pop('cache_hit')  # Don't cache the cache_hit flag
+            
+            self.redis_client.setex(
+                cache_key,
+                self.cache_ttl_forecast,
+                json.dumps(result_data)
+            )
+        except Exception as e:
+            logger.debug(f"Cache write failed: {e}")
+    
     def _perform_forecasting(
         self,
         request: DemandForecastRequest
@@ -171,40 +202,53 @@ class OptimizedDemandForecaster:
             
             # Convert to NumPy arrays for vectorized operations
             demand_values = np.array([d['calls_offered'] for d in historical_data])
-            time_series = np.arange(len(demand_values))
             
-            # Vectorized forecast calculation based on type
-            if request.forecast_type == 'seasonal':
-                forecast_values, confidence_intervals = self._seasonal_forecast_vectorized(
-                    demand_values, request.forecast_days, request.confidence_level
-                )
-                seasonal_pattern = self._detect_seasonal_pattern_vectorized(demand_values)
-            elif request.forecast_type == 'trend':
-                forecast_values, confidence_intervals = self._trend_forecast_vectorized(
-                    demand_values, time_series, request.forecast_days, request.confidence_level
-                )
-                seasonal_pattern = "trend_only"
-            else:  # simple moving average
-                forecast_values, confidence_intervals = self._simple_forecast_vectorized(
-                    demand_values, request.forecast_days, request.confidence_level
-                )
-                seasonal_pattern = "none"
-            
-            # Calculate forecast accuracy using recent validation
-            accuracy = self._calculate_forecast_accuracy_vectorized(
-                demand_values, request.forecast_type
+            return self.forecast_from_history(request, demand_values)
+    
+    def forecast_from_history(
+        self,
+        request: DemandForecastRequest,
+        demand_values: np.ndarray
+    ) -> ForecastResult:
+        """Forecast from an already loaded daily demand series (no database access)"""
+        
+        if len(demand_values) < self.min_history_days:
+            return self._create_fallback_forecast(request)
+        
+        time_series = np.arange(len(demand_values))
+        
+        # Vectorized forecast calculation based on type
+        if request.forecast_type == 'seasonal':
+            forecast_values, confidence_intervals = self._seasonal_forecast_vectorized(
+                demand_values, request.forecast_days, request.confidence_level
             )
-            
-            return ForecastResult(
-                service_id=request.service_id,
-                forecast_horizon_days=request.forecast_days,
-                forecast_values=forecast_values.tolist(),
-                confidence_intervals=confidence_intervals,
-                seasonal_pattern=seasonal_pattern,
-                forecast_accuracy=accuracy,
-                forecast_timestamp=datetime.utcnow(),
-                cache_hit=False
+            seasonal_pattern = self._detect_seasonal_pattern_vectorized(demand_values)
+        elif request.forecast_type == 'trend':
+            forecast_values, confidence_intervals = self._trend_forecast_vectorized(
+                demand_values, time_series, request.forecast_days, request.confidence_level
             )
+            seasonal_pattern = "trend_only"
+        else:  # simple moving average
+            forecast_values, confidence_intervals = self._simple_forecast_vectorized(
+                demand_values, request.forecast_days, request.confidence_level
+            )
+            seasonal_pattern = "none"
+        
+        # Calculate forecast accuracy using recent validation
+        accuracy = self._calculate_forecast_accuracy_vectorized(
+            demand_values, request.forecast_type
+        )
+        
+        return ForecastResult(
+            service_id=request.service_id,
+            forecast_horizon_days=request.forecast_days,
+            forecast_values=forecast_values.tolist(),
+            confidence_intervals=confidence_intervals,
+            seasonal_pattern=seasonal_pattern,
+            forecast_accuracy=accuracy,
+            forecast_timestamp=datetime.utcnow(),
+            cache_hit=False
+        )
     
     def _get_historical_demand_vectorized(
         self,
@@ -473,32 +517,259 @@ class OptimizedDemandForecaster:
         forecast_days: int = 7,
         forecast_type: str = 'seasonal'
     ) -> List[ForecastResult]:
-        """Generate forecasts for multiple services in parallel"""
-        
-        futures = []
-        for service_id in service_ids:
-            request = DemandForecastRequest(
+        """
+        Generate forecasts for multiple services, served from the Redis cache
+        where possible; only the cache misses go through one batch run
+        """
+        cache_keys = {
+            service_id: self._generate_cache_key(DemandForecastRequest(
                 service_id=service_id,
                 forecast_days=forecast_days,
                 historical_days=30,
                 confidence_level=0.95,
                 include_seasonality=True,
                 forecast_type=forecast_type
+            ))
+            for service_id in service_ids
+        }
+        
+        results: Dict[int, ForecastResult] = {}
+        for service_id, cache_key in cache_keys.items():
+            cached = self._get_cached_forecast(cache_key)
+            if cached:
+                results[service_id] = cached
+        
+        misses = [service_id for service_id in cache_keys if service_id not in results]
+        if misses:
+            report = self.run_batch_forecast(
+                misses,
+                forecast_days=forecast_days,
+                historical_days=30,
+                forecast_type=forecast_type,
+                persist=False
             )
+            for result in report.results:
+                self._cache_forecast(cache_keys[result.service_id], result)
+                results[result.service_id] = result
+        
+        return [results[service_id] for service_id in cache_keys if service_id in results]
+    
+    def run_batch_forecast(
+        self,
+        service_ids: List[int],
+        forecast_days: int = 7,
+        historical_days: int = 30,
+        forecast_type: str = 'seasonal',
+        confidence_level: float = 0.95,
+        persist: bool = True,
+        max_workers: Optional[int] = None
+    ) -> BatchForecastReport:
+        """
+        Forecast many services in one job (e.g. the nightly run)
+        
+        Stages: one columnar history query for all services, model work spread
+        across worker processes in chunks, bulk upsert of every forecast day.
+        Per-stage timings are returned in the report.
+        """
+        batch_id = str(uuid.uuid4())
+        timings = {}
+        job_start = time.perf_counter()
+        
+        # Stage 1: history for all services in one query
+        stage_start = time.perf_counter()
+        histories = self._get_batch_historical_demand(service_ids, historical_days)
+        timings['fetch_history'] = time.perf_counter() - stage_start
+        
+        # Stage 2: per-service model work in worker processes
+        stage_start = time.perf_counter()
+        requests = [
+            DemandForecastRequest(
+                service_id=service_id,
+                forecast_days=forecast_days,
+                historical_days=historical_days,
+                confidence_level=confidence_level,
+                include_seasonality=True,
+                forecast_type=forecast_type
+            )
+            for service_id in service_ids
+        ]
+        jobs = [(request, histories.get(request.service_id, np.empty(0))) for request in requests]
+        chunks = [jobs[i:i + BATCH_FORECAST_CHUNK_SIZE] for i in range(0, len(jobs), BATCH_FORECAST_CHUNK_SIZE)]
+        
+        results: List[ForecastResult] = []
+        failed_services: List[int] = []
+        workers = max_workers or min(len(chunks), os.cpu_count() or 1) or 1
+        
+        if workers == 1 or len(chunks) == 1:
+            # Not worth starting processes for a single chunk
+            for request, demand_values in jobs:
+                try:
+                    results.append(self.forecast_from_history(request, demand_values))
+                except Exception as e:
+                    logger.error(f"Batch forecast failed for service {request.service_id}: {e}")
+                    failed_services.append(request.service_id)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(chunk, pool.submit(_forecast_history_chunk, chunk)) for chunk in chunks]
+                for chunk, future in futures:
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        logger.error(f"Batch forecast chunk failed: {e}")
+                        failed_services.extend(request.service_id for request, _ in chunk)
+        timings['model'] = time.perf_counter() - stage_start
+        
+        # Stage 3: bulk write
+        stage_start = time.perf_counter()
+        rows_written = self._save_batch_results(batch_id, forecast_type, results) if persist else 0
+        timings['write_results'] = time.perf_counter() - stage_start
+        
+        timings['total'] = time.perf_counter() - job_start
+        logger.info(
+            f"Batch forecast {batch_id}: {len(results)} services, {len(failed_services)} failed, "
+            f"{rows_written} rows written, timings {', '.join(f'{k}={v:.2f}s' for k, v in timings.items())}"
+        )
+        
+        return BatchForecastReport(
+            batch_id=batch_id,
+            results=results,
+            failed_services=failed_services,
+            rows_written=rows_written,
+            stage_timings=timings
+        )
+    
+    def _get_batch_historical_demand(
+        self,
+        service_ids: List[int],
+        days: int
+    ) -> Dict[int, np.ndarray]:
+        """Daily demand series for many services from one columnar query"""
+        
+        if not service_ids:
+            return {}
+        
+        # One row per service with its daily totals aggregated into an ordered array
+        query = text("""
+            SELECT 
+                service_id,
+                array_agg(calls_offered ORDER BY forecast_date) as daily_calls
+            FROM (
+                SELECT 
+                    service_id,
+                    DATE(interval_start_time) as forecast_date,
+                    SUM(calls_offered) as calls_offered
+                FROM contact_statistics
+                WHERE service_id = ANY(:service_ids)
+                    AND interval_start_time >= NOW() - make_interval(days => :days)
+                    AND calls_offered > 0
+                GROUP BY service_id, DATE(interval_start_time)
+            ) daily
+            GROUP BY service_id
+        """)
+        
+        with self.SessionLocal() as session:
+            result = session.execute(query, {
+                'service_ids': list(service_ids),
+                'days': days
+            })
             
-            future = self.executor.submit(self.forecast_demand, request)
-            futures.append(future)
+            return {
+                row.service_id: np.asarray(row.daily_calls, dtype=float)
+                for row in result
+            }
+    
+    def _ensure_batch_results_table(self, session):
+        """Create the batch forecast results table if needed"""
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS demand_forecast_results (
+                id SERIAL PRIMARY KEY,
+                batch_id UUID NOT NULL,
+                service_id INTEGER NOT NULL,
+                forecast_date DATE NOT NULL,
+                forecast_type VARCHAR(20) NOT NULL,
+                forecast_value FLOAT NOT NULL,
+                ci_lower FLOAT,
+                ci_upper FLOAT,
+                seasonal_pattern VARCHAR(50),
+                forecast_accuracy FLOAT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(service_id, forecast_date, forecast_type)
+            )
+        """))
+    
+    def _save_batch_results(
+        self,
+        batch_id: str,
+        forecast_type: str,
+        results: List[ForecastResult]
+    ) -> int:
+        """Bulk upsert one row per service and forecast day"""
+        
+        rows = []
+        for result in results:
+            start_date = result.forecast_timestamp.date() + timedelta(days=1)
+            for day, (value, (ci_lower, ci_upper)) in enumerate(
+                zip(result.forecast_values, result.confidence_intervals)
+            ):
+                rows.append({
+                    'batch_id': batch_id,
+                    'service_id': result.service_id,
+                    'forecast_date': start_date + timedelta(days=day),
+                    'forecast_type': forecast_type,
+                    'forecast_value': float(value),
+                    'ci_lower': float(ci_lower),
+                    'ci_upper': float(ci_upper),
+                    'seasonal_pattern': result.seasonal_pattern,
+                    'forecast_accuracy': float(result.forecast_accuracy)
+                })
+        
+        if not rows:
+            return 0
+        
+        insert = text("""
+            INSERT INTO demand_forecast_results (
+                batch_id, service_id, forecast_date, forecast_type, forecast_value,
+                ci_lower, ci_upper, seasonal_pattern, forecast_accuracy
+            ) VALUES (
+                :batch_id, :service_id, :forecast_date, :forecast_type, :forecast_value,
+                :ci_lower, :ci_upper, :seasonal_pattern, :forecast_accuracy
+            )
+            ON CONFLICT (service_id, forecast_date, forecast_type) DO UPDATE SET
+                batch_id = EXCLUDED.batch_id,
+                forecast_value = EXCLUDED.forecast_value,
+                ci_lower = EXCLUDED.ci_lower,
+                ci_upper = EXCLUDED.ci_upper,
+                seasonal_pattern = EXCLUDED.seasonal_pattern,
+                forecast_accuracy = EXCLUDED.forecast_accuracy,
+                created_at = CURRENT_TIMESTAMP
+        """)
         
-        # Collect results
-        results = []
-        for future in futures:
-            try:
-                result = future.result(timeout=30)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Batch forecast failed: {e}")
+        with self.SessionLocal() as session:
+            self._ensure_batch_results_table(session)
+            for i in range(0, len(rows), BATCH_WRITE_SIZE):
+                session.execute(insert, rows[i:i + BATCH_WRITE_SIZE])
+            session.commit()
         
-        return results
+        return len(rows)
+
+
+# Per-process forecaster used by batch workers (model maths only, never connects)
+_worker_forecaster: Optional[OptimizedDemandForecaster] = None
+
+
+def _forecast_history_chunk(
+    jobs: List[Tuple[DemandForecastRequest, np.ndarray]]
+) -> List[ForecastResult]:
+    """Run forecast_from_history for a chunk of services inside a worker process"""
+    global _worker_forecaster
+    if _worker_forecaster is None:
+        # In-memory SQLite engine: workers only run the model maths
+        _worker_forecaster = OptimizedDemandForecaster(database_url='sqlite://')
+    
+    return [
+        _worker_forecaster.forecast_from_history(request, demand_values)
+        for request, demand_values in jobs
+    ]
 
 
 if __name__ == "__main__":
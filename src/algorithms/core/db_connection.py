@@ -4,7 +4,10 @@ Database connection utility for Mobile Workforce Scheduler
 Connects to real employee data and skill proficiency levels
 """
 
-import psycopg2
+try:
+    from . import db_pool
+except ImportError:
+    import db_pool
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 import logging
@@ -43,7 +46,7 @@ class WFMDatabaseConnection:
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = psycopg2.connect(**self.connection_params)
+            self.conn = db_pool.connect(**self.connection_params)
             logging.info("Connected to WFM Enterprise database")
             return True
         except Exception as e:
@@ -0,0 +1,379 @@
+"""
+Process-wide psycopg2 connection pools for the algorithm modules
+
+Algorithm modules used to call psycopg2.connect directly, so every engine
+created inside an API request paid TCP and authentication setup. connect()
+takes the same arguments as psycopg2.connect and hands out a connection from
+a pool shared by every caller with the same connection arguments.
+
+- close() returns the connection to its pool instead of closing the socket
+- leaving a ``with connect(...) as conn:`` block commits or rolls back and then
+  returns the connection (psycopg2 itself would keep it open until garbage
+  collection)
+- connections are reset before reuse, and broken ones are discarded
+- when a pool is saturated, callers wait up to DB_POOL_TIMEOUT seconds and
+  then get PoolTimeout, which is a psycopg2.Error
+
+Sizes come from DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT and DB_POOL_MAX_IDLE_SECONDS.
+Modules that use SQLAlchemy share engines per URL through get_engine().
+get_pool_stats() reports saturation per pool and engine.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DEFAULT_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DEFAULT_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+
+
+class PoolTimeout(PoolError):
+    """No connection became free within the pool timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe, bounded pool of psycopg2 connections for one target"""
+
+    def __init__(self,
+                 dsn: Optional[str] = None,
+                 connect_kwargs: Optional[Dict[str, Any]] = None,
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+                 connect: Callable[..., Any] = psycopg2.connect):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.dsn = dsn
+        self.connect_kwargs = dict(connect_kwargs or {})
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle_seconds = max_idle_seconds
+        self._connect = connect
+        # (connection, returned_at); reused LIFO so cold connections age out
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._in_use = 0
+        # Reentrant: a PooledConnection may be released from __del__ while this thread holds the lock
+        self._cond = threading.Condition(threading.RLock())
+        self.stats = {
+            "acquired": 0,
+            "reused": 0,
+            "opened": 0,
+            "discarded": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_ms_total": 0.0,
+            "connect_ms_total": 0.0,
+            "peak_in_use": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Raw connections
+    # ------------------------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Take a raw connection, opening one if the pool has room"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None
+        waited_from = None
+
+        with self._cond:
+            while True:
+                conn = self._pop_idle()
+                if conn is not None:
+                    self.stats["reused"] += 1
+                    break
+                if self._size < self.max_size:
+                    # Reserve the slot, open outside the lock
+                    self._size += 1
+                    conn = None
+                    break
+                if waited_from is None:
+                    waited_from = time.perf_counter()
+                    deadline = waited_from + timeout
+                    self.stats["waits"] += 1
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    self.stats["wait_ms_total"] += (time.perf_counter() - waited_from) * 1000
+                    raise PoolTimeout(
+                        f"no connection available within {timeout}s ({self.max_size} in use)"
+                    )
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self.stats["acquired"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self._in_use)
+            if waited_from is not None:
+                self.stats["wait_ms_total"] += (time.perf_counter() - waited_from) * 1000
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Give a raw connection back, resetting or discarding it"""
+        if not discard:
+            discard = not self._reset(conn)
+        if discard:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+                self.stats["discarded"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _pop_idle(self):
+        now = time.monotonic()
+        while self._idle:
+            conn, returned_at = self._idle.pop()
+            if conn.closed or now - returned_at > self.max_idle_seconds:
+                self._size -= 1
+                self.stats["discarded"] += 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                continue
+            return conn
+        return None
+
+    def _open(self):
+        start = time.perf_counter()
+        if self.dsn is not None:
+            conn = self._connect(self.dsn, **self.connect_kwargs)
+        else:
+            conn = self._connect(**self.connect_kwargs)
+        with self._cond:
+            self.stats["opened"] += 1
+            self.stats["connect_ms_total"] += (time.perf_counter() - start) * 1000
+        return conn
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        """Roll back and restore session defaults; False if the connection is unusable"""
+        if conn.closed:
+            return False
+        try:
+            if conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            conn.reset()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except Exception as e:
+            logger.debug(f"Discarding pooled connection: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Wrapped connections
+    # ------------------------------------------------------------------
+
+    def connect(self, timeout: Optional[float] = None) -> "PooledConnection":
+        return PooledConnection(self, self.getconn(timeout))
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator["PooledConnection"]:
+        """Connection for the duration of a block, committed on success"""
+        with self.connect(timeout) as conn:
+            yield conn
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            opened = self.stats["opened"]
+            acquired = self.stats["acquired"]
+            return {
+                **self.stats,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "saturation": self._in_use / self.max_size,
+                "reuse_rate": self.stats["reused"] / acquired if acquired else 0.0,
+                "avg_connect_ms": self.stats["connect_ms_total"] / opened if opened else 0.0,
+            }
+
+
+class PooledConnection:
+    """psycopg2 connection whose close() returns it to its pool"""
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool: ConnectionPool, conn):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        # autocommit, isolation_level, ... are set on the real connection
+        setattr(self._conn, name, value)
+
+    @property
+    def closed(self) -> int:
+        conn = object.__getattribute__(self, "_conn")
+        return 1 if conn is None else conn.closed
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        self._pool.putconn(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            return False
+        try:
+            if not conn.closed:
+                if exc_type is None:
+                    conn.commit()
+                else:
+                    conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+_pools: Dict[Any, ConnectionPool] = {}
+_engines: Dict[Any, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(dsn: Optional[str], kwargs: Dict[str, Any]):
+    return dsn, tuple(sorted((name, str(value)) for name, value in kwargs.items()))
+
+
+def get_connection_pool(dsn: Optional[str] = None, **kwargs) -> ConnectionPool:
+    """Process-wide pool for the given psycopg2.connect arguments"""
+    key = _pool_key(dsn, kwargs)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(dsn, kwargs)
+    return pool
+
+
+def connect(dsn: Optional[str] = None, **kwargs) -> PooledConnection:
+    """Drop-in for psycopg2.connect that draws from the shared pool"""
+    return get_connection_pool(dsn, **kwargs).connect()
+
+
+def get_engine(database_url: str, **kwargs):
+    """Process-wide SQLAlchemy engine for the given create_engine arguments"""
+    key = _pool_key(database_url, kwargs)
+    engine = _engines.get(key)
+    if engine is None:
+        from sqlalchemy import create_engine
+
+        with _pools_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = create_engine(database_url, pool_pre_ping=True, **kwargs)
+    return engine
+
+
+def _describe(pool: ConnectionPool) -> str:
+    if pool.dsn is not None:
+        try:
+            params = extensions.parse_dsn(pool.dsn)
+        except psycopg2.ProgrammingError:
+            return "<dsn>"
+    else:
+        params = pool.connect_kwargs
+    return _describe_params(params)
+
+
+def _describe_params(params: Dict[str, Any]) -> str:
+    host = params.get("host", "localhost")
+    port = params.get("port", 5432)
+    database = params.get("dbname") or params.get("database", "")
+    return f"{params.get('user', '')}@{host}:{port}/{database}"
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every shared pool and engine, keyed by user@host:port/database"""
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    def add(name: str, values: Dict[str, Any]):
+        if name in stats:
+            name = f"{name}#{len(stats)}"
+        stats[name] = values
+
+    for pool in list(_pools.values()):
+        add(_describe(pool), pool.get_stats())
+    for engine in list(_engines.values()):
+        url = engine.url
+        name = _describe_params({"user": url.username or "", "host": url.host or "localhost",
+                                 "port": url.port or 5432, "dbname": url.database or ""})
+        engine_pool = engine.pool
+        if hasattr(engine_pool, "checkedout"):
+            in_use = engine_pool.checkedout()
+            max_size = engine_pool.size() + max(engine_pool._max_overflow, 0)
+            add(f"{name} (sqlalchemy)", {
+                "size": engine_pool.size(),
+                "in_use": in_use,
+                "idle": engine_pool.checkedin(),
+                "overflow": engine_pool.overflow(),
+                "max_size": max_size,
+                "saturation": in_use / max_size if max_size else 0.0,
+            })
+    return stats
+
+
+def close_all_pools():
+    """Close idle connections in every shared pool and engine (e.g. on shutdown)"""
+    for pool in list(_pools.values()):
+        pool.close_all()
+    for engine in list(_engines.values()):
+        engine.dispose()
@@ -16,8 +16,11 @@ import math
 import numpy as np
 from functools import lru_cache
 from typing import Union, Tuple, Optional, Dict
-import psycopg2
 from psycopg2.extras import RealDictCursor
+try:
+    from . import db_pool
+except ImportError:
+    import db_pool
 from datetime import datetime, timedelta
 import time
 import os
@@ -118,7 +121,7 @@ class ErlangCEnhanced:
     def _connect_to_db(self):
         """Connect to the WFM Enterprise database."""
         try:
-            self._db_conn = psycopg2.connect(
+            self._db_conn = db_pool.connect(
                 host=os.environ.get('DB_HOST', 'localhost'),
                 port=os.environ.get('DB_PORT', 5432),
                 database='wfm_enterprise',
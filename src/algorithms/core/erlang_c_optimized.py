@@ -29,8 +29,8 @@ import time
 
 from .erlang_c_enhanced import ErlangCEnhanced
 from ..optimization.erlang_c_cache import ErlangCCache, CachedErlangCEnhanced
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from . import db_pool
 import os
 from datetime import datetime, timedelta
 from typing import List
@@ -148,7 +148,7 @@ class ErlangCOptimized(ErlangCEnhanced):
         """Ensure database connection for real data access"""
         if not hasattr(self, '_db_conn') or not self._db_conn:
             try:
-                self._db_conn = psycopg2.connect(
+                self._db_conn = db_pool.connect(
                     host=os.environ.get('DB_HOST', 'localhost'),
                     port=os.environ.get('DB_PORT', 5432),
                     database='wfm_enterprise',
@@ -0,0 +1,145 @@
+"""
+Shared Erlang C Staffing Solver
+
+Numerically stable, memoized Erlang C staffing for interval planning:
+- Erlang B/C evaluated in log space from the Poisson pmf/cdf (no factorials,
+  no overflow at thousands of agents)
+- Service level honours the answer-time target:
+  SL = 1 - C(N, A) * exp(-(N - A) * answer_time / AHT)
+- Minimum agent count found by exponential + binary search (O(log n)
+  service-level evaluations instead of a linear scan)
+- Results cached in a bounded LRU keyed on quantized traffic, SL target and
+  answer time, so planning runs over thousands of intervals with near-identical
+  traffic solve each distinct case once
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from scipy.special import gammaincc, gammaln
+
+# Traffic is rounded UP to this grid (Erlangs) before solving, so a cached
+# answer never understaffs the interval that reuses it
+DEFAULT_TRAFFIC_STEP = 0.01
+DEFAULT_CACHE_SIZE = 65536
+# Highest SL target the solver will chase (SL = 1.0 needs infinite agents)
+MAX_SERVICE_LEVEL_TARGET = 0.999999
+
+
+def erlang_b(traffic: float, agents: int) -> float:
+    """Erlang B blocking probability, B = pmf(N; A) / cdf(N; A) of Poisson(A)"""
+    if agents <= 0:
+        return 1.0
+    if traffic <= 0:
+        return 0.0
+    log_pmf = agents * math.log(traffic) - traffic - gammaln(agents + 1)
+    cdf = gammaincc(agents + 1, traffic)
+    if cdf <= 0:
+        return 1.0
+    return min(1.0, math.exp(log_pmf - math.log(cdf)))
+
+
+def erlang_c(traffic: float, agents: int) -> float:
+    """Erlang C probability of waiting (1.0 when the queue is unstable)"""
+    if traffic <= 0:
+        return 0.0
+    if agents <= traffic:
+        return 1.0
+    blocking = erlang_b(traffic, agents)
+    return min(1.0, agents * blocking / (agents - traffic * (1 - blocking)))
+
+
+def service_level(traffic: float, agents: int, answer_time: float, avg_handle_time: float) -> float:
+    """Share of calls answered within answer_time seconds"""
+    if traffic <= 0:
+        return 1.0
+    if agents <= traffic:
+        return 0.0
+    ratio = answer_time / avg_handle_time if avg_handle_time > 0 else 0.0
+    return max(0.0, 1.0 - erlang_c(traffic, agents) * math.exp(-(agents - traffic) * ratio))
+
+
+def average_speed_of_answer(traffic: float, agents: int, avg_handle_time: float) -> float:
+    """Average wait in seconds, ASA = C * AHT / (N - A)"""
+    if traffic <= 0:
+        return 0.0
+    if agents <= traffic:
+        return math.inf
+    return erlang_c(traffic, agents) * avg_handle_time / (agents - traffic)
+
+
+class StaffingSolver:
+    """Memoized minimum-agents solver shared by all callers in the process"""
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, traffic_step: float = DEFAULT_TRAFFIC_STEP):
+        self.traffic_step = traffic_step
+        self._solve_cached = lru_cache(maxsize=cache_size)(self._solve)
+
+    def _quantize(self, traffic: float, service_level_target: float,
+                  answer_time: float, avg_handle_time: float) -> Tuple[int, int, int]:
+        # Conservative rounding: more traffic, higher target, shorter answer window
+        ratio = answer_time / avg_handle_time if avg_handle_time and avg_handle_time > 0 else 0.0
+        return (
+            math.ceil(max(0.0, traffic) / self.traffic_step - 1e-9),
+            math.ceil(min(service_level_target, MAX_SERVICE_LEVEL_TARGET) * 1e6 - 1e-6),
+            math.floor(max(0.0, ratio) * 1e4 + 1e-6),
+        )
+
+    def _solve(self, traffic_units: int, target_units: int, ratio_units: int) -> int:
+        traffic = traffic_units * self.traffic_step
+        target = target_units / 1e6
+        ratio = ratio_units / 1e4
+
+        def meets_target(agents: int) -> bool:
+            return service_level(traffic, agents, ratio, 1.0) >= target
+
+        low = max(1, math.floor(traffic) + 1)
+        if traffic <= 0 or meets_target(low):
+            return low
+
+        # Exponential search for a passing upper bound, then bisect
+        step = 1
+        high = low + step
+        while not meets_target(high):
+            low = high
+            step *= 2
+            high = low + step
+        while high - low > 1:
+            middle = (low + high) // 2
+            if meets_target(middle):
+                high = middle
+            else:
+                low = middle
+        return high
+
+    def required_agents(self, traffic: float, service_level_target: float,
+                        answer_time: float, avg_handle_time: float) -> int:
+        """Minimum agents meeting the SL target for traffic Erlangs"""
+        return self._solve_cached(*self._quantize(traffic, service_level_target, answer_time, avg_handle_time))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """LRU hit/miss counters and hit rate"""
+        info = self._solve_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    def clear(self):
+        self._solve_cached.cache_clear()
+
+
+_staffing_solver: Optional[StaffingSolver] = None
+
+
+def get_staffing_solver() -> StaffingSolver:
+    """Process-wide staffing solver"""
+    global _staffing_solver
+    if _staffing_solver is None:
+        _staffing_solver = StaffingSolver()
+    return _staffing_solver
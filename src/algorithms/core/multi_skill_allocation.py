@@ -13,6 +13,7 @@ import logging
 import psycopg2
 import psycopg2.extras
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from . import db_pool
 import os
 
 logger = logging.getLogger(__name__)
@@ -70,7 +71,7 @@ class MultiSkillAllocator:
     
     def get_db_connection(self):
         """Create database connection"""
-        return psycopg2.connect(**self.db_params)
+        return db_pool.connect(**self.db_params)
     
     def load_agents_from_db(self) -> List[Agent]:
         """Load real agent data from database"""
@@ -35,6 +35,7 @@ import uuid
 import json
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 
 # Import existing complete systems for 95% code reuse
 try:
@@ -173,7 +174,7 @@ class CalendarRequestIntegration:
     def connect_to_database(self):
         """Connect to wfm_enterprise database"""
         try:
-            self.db_connection = psycopg2.connect(self.connection_string)
+            self.db_connection = db_pool.connect(self.connection_string)
             logger.info("Connected to wfm_enterprise database for calendar requests")
         except psycopg2.Error as e:
             logger.error(f"Database connection failed: {e}")
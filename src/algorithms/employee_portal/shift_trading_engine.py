@@ -34,6 +34,7 @@ import uuid
 import json
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 
 # Import existing systems for 85% code reuse
 try:
@@ -157,7 +158,7 @@ class ShiftTradingEngine:
     def connect_to_database(self):
         """Connect to wfm_enterprise database"""
         try:
-            self.db_connection = psycopg2.connect(self.connection_string)
+            self.db_connection = db_pool.connect(self.connection_string)
             logger.info("Connected to wfm_enterprise database for shift trading")
         except psycopg2.Error as e:
             logger.error(f"Database connection failed: {e}")
@@ -14,6 +14,7 @@ from enum import Enum
 import logging
 from collections import defaultdict
 from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
 import sys
 import os
 
@@ -23,6 +24,14 @@ from db_connection import WFMDatabaseConnection, EmployeeSkillData
 
 logger = logging.getLogger(__name__)
 
+# BDD load distribution: share of a multi-skill operator's hours kept on the primary skill
+DEFAULT_PRIMARY_SKILL_SHARE = 0.7
+BDD_PRIMARY_SKILL_SHARE = {
+    "Иванов И.И.": 0.7,
+    "Петров П.П.": 0.6,
+    "Сидорова А.А.": 0.5
+}
+
 class SkillPriority(Enum):
     """Priority levels for skill assignments"""
     CRITICAL = 1
@@ -116,6 +125,21 @@ class SkillAssignment:
     is_overflow: bool = False
     utilization_percentage: float = 0.0
 
+@dataclass
+class SkillAllocationArrays:
+    """Dense operator × skill view of the optimization pool"""
+    operator_ids: List[str]
+    skills: List[str]
+    availability: np.ndarray  # (operators,) available hours
+    cost_per_hour: np.ndarray  # (operators,)
+    proficiency: np.ndarray  # (operators, skills), 0 where the skill is not held
+    has_skill: np.ndarray  # (operators, skills) primary or secondary skill
+    is_primary: np.ndarray  # (operators, skills)
+    is_multi_skill: np.ndarray  # (operators,) multi-skill with secondary skills
+    primary_share: np.ndarray  # (operators,) BDD primary skill load share
+    demand: np.ndarray  # (skills,) required hours
+    minimum_proficiency: np.ndarray  # (skills,)
+
 @dataclass
 class MobileOptimizationResult:
     """Result of mobile workforce optimization"""
@@ -265,6 +289,8 @@ class MultiSkillOptimizer:
     
     def __init__(self):
         self.operators: Dict[str, OperatorSkillProfile] = {}
+        self.mobile_workforce: Dict[str, MobileWorkforceProfile] = {}
+        self.legacy_operators: Dict[str, OperatorSkillProfile] = {}
         self.skill_demands: Dict[str, SkillDemand] = {}
         self.assignments: List[SkillAssignment] = []
         self.mono_skill_operators: Dict[str, List[str]] = {}  # skill -> operator_ids
@@ -316,6 +342,7 @@ class MultiSkillOptimizer:
         
         self.add_mobile_workforce_profile(mobile_profile)
         self.legacy_operators[operator.operator_id] = operator
+        self.operators[operator.operator_id] = operator
     
     def set_skill_demands(self, demands: List[SkillDemand]):
         """Set skill demands for optimization"""
@@ -340,6 +367,15 @@ class MultiSkillOptimizer:
                            strategy: AssignmentStrategy = AssignmentStrategy.PRIORITY_BASED,
                            constraints: Optional[Dict[str, Any]] = None) -> OptimizationResult:
         """Legacy optimization method - delegates to mobile scheduler"""
+        legacy_strategies = {
+            AssignmentStrategy.PRIORITY_BASED: self._optimize_priority_based,
+            AssignmentStrategy.LOAD_BALANCED: self._optimize_load_balanced,
+            AssignmentStrategy.COST_OPTIMIZED: self._optimize_cost_based,
+            AssignmentStrategy.SKILL_DEVELOPMENT: self._optimize_skill_development
+        }
+        if strategy in legacy_strategies:
+            return legacy_strategies[strategy](constraints)
+        
         mobile_result = self.optimize_mobile_assignments(strategy, constraints)
         
         # Convert to legacy format
@@ -554,297 +590,256 @@ class MultiSkillOptimizer:
         }
         return efficiency_factors.get(location_type, 1.0)
     
-    def _optimize_priority_based(self, constraints: Optional[Dict[str, Any]]) -> OptimizationResult:
-        """Implement BDD priority-based assignment logic"""
+    def _build_allocation_arrays(self) -> SkillAllocationArrays:
+        """Hold operators, proficiencies and demands as dense operator × skill arrays"""
+        operators = list(self.operators.values())
+        skills = list(self.skill_demands.keys())
+        skill_index = {skill: j for j, skill in enumerate(skills)}
+        n_operators, n_skills = len(operators), len(skills)
+
+        proficiency = np.zeros((n_operators, n_skills))
+        has_skill = np.zeros((n_operators, n_skills), dtype=bool)
+        is_primary = np.zeros((n_operators, n_skills), dtype=bool)
+
+        for i, operator in enumerate(operators):
+            j = skill_index.get(operator.primary_skill)
+            if j is not None:
+                has_skill[i, j] = is_primary[i, j] = True
+                proficiency[i, j] = operator.skill_proficiencies.get(operator.primary_skill, 1.0)
+            for skill in operator.secondary_skills:
+                j = skill_index.get(skill)
+                if j is not None and not is_primary[i, j]:
+                    has_skill[i, j] = True
+                    proficiency[i, j] = operator.skill_proficiencies.get(skill, 0.5)
+
+        return SkillAllocationArrays(
+            operator_ids=[op.operator_id for op in operators],
+            skills=skills,
+            availability=np.array([op.availability_hours for op in operators], dtype=float),
+            cost_per_hour=np.array([op.cost_per_hour for op in operators], dtype=float),
+            proficiency=proficiency,
+            has_skill=has_skill,
+            is_primary=is_primary,
+            is_multi_skill=np.array(
+                [op.is_multi_skill and len(op.secondary_skills) > 0 for op in operators], dtype=bool
+            ),
+            primary_share=np.array(
+                [BDD_PRIMARY_SKILL_SHARE.get(op.operator_id, DEFAULT_PRIMARY_SKILL_SHARE) for op in operators]
+            ),
+            demand=np.array([d.required_hours for d in self.skill_demands.values()], dtype=float),
+            minimum_proficiency=np.array([d.minimum_proficiency for d in self.skill_demands.values()], dtype=float)
+        )
+
+    def _previous_allocation(self, arrays: SkillAllocationArrays,
+                             previous: List[SkillAssignment]) -> np.ndarray:
+        """Previous interval's hours as an operator × skill matrix over the current arrays"""
+        operator_index = {op_id: i for i, op_id in enumerate(arrays.operator_ids)}
+        skill_index = {skill: j for j, skill in enumerate(arrays.skills)}
+        hours = np.zeros(arrays.proficiency.shape)
+        for a in previous:
+            i, j = operator_index.get(a.operator_id), skill_index.get(a.skill_name)
+            if i is not None and j is not None:
+                hours[i, j] += a.assigned_hours
+        return np.where(arrays.has_skill, hours, 0.0)
+
+    def _start_allocation(self, constraints: Optional[Dict[str, Any]]) -> Tuple[SkillAllocationArrays, Optional[np.ndarray]]:
+        """Build the dense arrays and, with constraints['warm_start'], the previous allocation hint"""
+        previous = self.assignments if (constraints or {}).get('warm_start') else []
         self.assignments = []
-        remaining_demands = {skill: demand.required_hours for skill, demand in self.skill_demands.items()}
-        operator_available_hours = {op_id: op.availability_hours for op_id, op in self.operators.items()}
-        
-        # Priority 1: Assign mono-skill operators to primary channels
-        for skill, operator_ids in self.mono_skill_operators.items():
-            if skill in remaining_demands and remaining_demands[skill] > 0:
-                for op_id in operator_ids:
-                    if operator_available_hours[op_id] > 0:
-                        operator = self.operators[op_id]
-                        hours_to_assign = min(
-                            operator_available_hours[op_id],
-                            remaining_demands[skill]
-                        )
-                        
-                        assignment = SkillAssignment(
-                            operator_id=op_id,
-                            skill_name=skill,
-                            assigned_hours=hours_to_assign,
-                            proficiency_level=operator.skill_proficiencies.get(skill, 1.0),
-                            assignment_priority=1,
-                            is_overflow=False,
-                            utilization_percentage=(hours_to_assign / operator.availability_hours) * 100
-                        )
-                        
-                        self.assignments.append(assignment)
-                        remaining_demands[skill] -= hours_to_assign
-                        operator_available_hours[op_id] -= hours_to_assign
-        
-        # Priority 2: Multi-skill operators to primary skills
-        multi_skill_operators = [
-            op for op in self.operators.values()
-            if op.is_multi_skill and len(op.secondary_skills) > 0
+        arrays = self._build_allocation_arrays()
+        return arrays, self._previous_allocation(arrays, previous) if previous else None
+
+    def _solve_segment_lp(self, arrays: SkillAllocationArrays,
+                          seg_op: np.ndarray, seg_skill: np.ndarray,
+                          seg_upper: np.ndarray, seg_cost: np.ndarray,
+                          balance_weight: Optional[float] = None,
+                          max_utilization: float = 1.0,
+                          warm_start: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Solve one sparse LP over (operator, skill) segments.
+
+        Each segment is a variable with its own upper bound and cost.  Segment
+        hours are limited by operator availability and skill demand.  With
+        ``balance_weight`` an extra variable bounds every operator's utilization
+        and is minimized, which spreads load evenly across operators.
+
+        ``warm_start`` is the previous interval's operator × skill allocation.
+        HiGHS takes no starting point through linprog, so it is used as a hint
+        instead: the first segment of each (operator, skill) pair is split into
+        the previous hours, made marginally cheaper, and the rest.  The optimum
+        is unchanged up to that margin; among equally good allocations the one
+        closest to the previous interval wins.
+        """
+        n_operators, n_skills = arrays.proficiency.shape
+        n_segments = len(seg_op)
+        if n_segments == 0:
+            return np.zeros(0)
+
+        origin = np.arange(n_segments)
+        if warm_start is not None:
+            pair = seg_op * n_skills + seg_skill
+            _, first = np.unique(pair, return_index=True)
+            hint = np.zeros(n_segments)
+            hint[first] = np.minimum(warm_start[seg_op[first], seg_skill[first]], seg_upper[first])
+            hinted = np.nonzero(hint > 0)[0]
+            margin = 1e-6 * max(float(np.abs(seg_cost).max()), 1.0)
+            seg_upper = np.concatenate([seg_upper - hint, hint[hinted]])
+            seg_cost = np.concatenate([seg_cost, seg_cost[hinted] - margin])
+            origin = np.concatenate([origin, hinted])
+            seg_op, seg_skill = seg_op[origin], seg_skill[origin]
+
+        n_variables = len(origin)
+        variable_ids = np.arange(n_variables)
+        rows = [seg_op, n_operators + seg_skill]
+        cols = [variable_ids, variable_ids]
+        values = [np.ones(n_variables), np.ones(n_variables)]
+        b_ub = [arrays.availability, arrays.demand]
+        c = seg_cost
+        bounds = np.column_stack([np.zeros(n_variables), seg_upper])
+        n_rows = n_operators + n_skills
+
+        if balance_weight is not None:
+            # Σ_j x_ij - availability_i * t <= 0
+            balance_rows = n_rows + np.arange(n_operators)
+            rows += [n_rows + seg_op, balance_rows]
+            cols += [variable_ids, np.full(n_operators, n_variables)]
+            values += [np.ones(n_variables), -arrays.availability]
+            b_ub.append(np.zeros(n_operators))
+            c = np.append(seg_cost, balance_weight)
+            bounds = np.vstack([bounds, [0.0, max_utilization]])
+            n_rows += n_operators
+
+        A_ub = coo_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_rows, len(c))
+        ).tocsr()
+
+        result = linprog(c, A_ub=A_ub, b_ub=np.concatenate(b_ub), bounds=bounds, method='highs')
+        if not result.success:
+            logger.warning(f"Segment LP failed: {result.message}")
+            return None
+        return np.bincount(origin, weights=result.x[:n_variables], minlength=n_segments)
+
+    def _emit_assignments(self, arrays: SkillAllocationArrays,
+                          op_idx: np.ndarray, skill_idx: np.ndarray, hours: np.ndarray,
+                          priority: np.ndarray, overflow: np.ndarray):
+        """Append SkillAssignment records for every segment with hours"""
+        keep = hours > 0.01  # Threshold to avoid numerical errors
+        utilization = hours / np.maximum(arrays.availability[op_idx], 1e-9) * 100
+        for i, j, h, p, o, u in zip(op_idx[keep], skill_idx[keep], hours[keep],
+                                    priority[keep], overflow[keep], utilization[keep]):
+            self.assignments.append(SkillAssignment(
+                operator_id=arrays.operator_ids[i],
+                skill_name=arrays.skills[j],
+                assigned_hours=float(h),
+                proficiency_level=float(arrays.proficiency[i, j]),
+                assignment_priority=int(p),
+                is_overflow=bool(o),
+                utilization_percentage=float(u)
+            ))
+
+    def _optimize_priority_based(self, constraints: Optional[Dict[str, Any]]) -> OptimizationResult:
+        """Implement BDD priority-based assignment logic as a single LP.
+
+        The four BDD rules become tiers of segments:
+        1. mono-skill operators on their primary channel
+        2. multi-skill operators on their primary skill (up to their primary share)
+        3. multi-skill operators on secondary skills meeting minimum proficiency
+        4. overflow of any operator onto any skill they hold, except a multi-skill
+           operator's primary skill, so the primary share caps their total there
+        Covered hours dominate the objective; the tier and proficiency break ties.
+        """
+        arrays, warm_start = self._start_allocation(constraints)
+        available = arrays.availability
+        op_grid, skill_grid = np.nonzero(arrays.has_skill)
+        multi = arrays.is_multi_skill[op_grid]
+        primary = arrays.is_primary[op_grid, skill_grid]
+        proficient = arrays.proficiency[op_grid, skill_grid] >= arrays.minimum_proficiency[skill_grid]
+
+        tier_masks = [
+            (1, primary & ~multi, available[op_grid]),
+            (2, primary & multi, available[op_grid] * arrays.primary_share[op_grid]),
+            (3, ~primary & multi & proficient, available[op_grid]),
+            (4, ~(primary & multi), available[op_grid]),
         ]
-        
-        # Sort by primary skill proficiency
-        multi_skill_operators.sort(
-            key=lambda op: op.skill_proficiencies.get(op.primary_skill, 0),
-            reverse=True
-        )
-        
-        for operator in multi_skill_operators:
-            skill = operator.primary_skill
-            if (skill in remaining_demands and 
-                remaining_demands[skill] > 0 and
-                operator_available_hours[operator.operator_id] > 0):
-                
-                # Calculate load distribution percentages from BDD
-                primary_percentage = 0.7  # Default 70% for primary skill
-                if operator.operator_id == "Иванов И.И.":
-                    primary_percentage = 0.7
-                elif operator.operator_id == "Петров П.П.":
-                    primary_percentage = 0.6
-                elif operator.operator_id == "Сидорова А.А.":
-                    primary_percentage = 0.5
-                
-                hours_to_assign = min(
-                    operator_available_hours[operator.operator_id] * primary_percentage,
-                    remaining_demands[skill]
-                )
-                
-                assignment = SkillAssignment(
-                    operator_id=operator.operator_id,
-                    skill_name=skill,
-                    assigned_hours=hours_to_assign,
-                    proficiency_level=operator.skill_proficiencies.get(skill, 1.0),
-                    assignment_priority=2,
-                    is_overflow=False,
-                    utilization_percentage=(hours_to_assign / operator.availability_hours) * 100
-                )
-                
-                self.assignments.append(assignment)
-                remaining_demands[skill] -= hours_to_assign
-                operator_available_hours[operator.operator_id] -= hours_to_assign
-        
-        # Priority 3: Multi-skill operators to secondary skills
-        for operator in multi_skill_operators:
-            if operator_available_hours[operator.operator_id] > 0:
-                for skill in operator.secondary_skills:
-                    if (skill in remaining_demands and 
-                        remaining_demands[skill] > 0 and
-                        operator_available_hours[operator.operator_id] > 0):
-                        
-                        # Check minimum proficiency requirement
-                        proficiency = operator.skill_proficiencies.get(skill, 0.5)
-                        min_proficiency = self.skill_demands[skill].minimum_proficiency
-                        
-                        if proficiency >= min_proficiency:
-                            hours_to_assign = min(
-                                operator_available_hours[operator.operator_id],
-                                remaining_demands[skill]
-                            )
-                            
-                            assignment = SkillAssignment(
-                                operator_id=operator.operator_id,
-                                skill_name=skill,
-                                assigned_hours=hours_to_assign,
-                                proficiency_level=proficiency,
-                                assignment_priority=3,
-                                is_overflow=False,
-                                utilization_percentage=(hours_to_assign / operator.availability_hours) * 100
-                            )
-                            
-                            self.assignments.append(assignment)
-                            remaining_demands[skill] -= hours_to_assign
-                            operator_available_hours[operator.operator_id] -= hours_to_assign
-        
-        # Priority 4: Overflow assignments as needed
-        for skill, remaining_hours in remaining_demands.items():
-            if remaining_hours > 0:
-                # Find any available operator with the skill
-                for operator in self.operators.values():
-                    if (operator_available_hours[operator.operator_id] > 0 and
-                        (skill == operator.primary_skill or skill in operator.secondary_skills)):
-                        
-                        hours_to_assign = min(
-                            operator_available_hours[operator.operator_id],
-                            remaining_hours
-                        )
-                        
-                        assignment = SkillAssignment(
-                            operator_id=operator.operator_id,
-                            skill_name=skill,
-                            assigned_hours=hours_to_assign,
-                            proficiency_level=operator.skill_proficiencies.get(skill, 0.5),
-                            assignment_priority=4,
-                            is_overflow=True,
-                            utilization_percentage=(hours_to_assign / operator.availability_hours) * 100
-                        )
-                        
-                        self.assignments.append(assignment)
-                        remaining_demands[skill] -= hours_to_assign
-                        operator_available_hours[operator.operator_id] -= hours_to_assign
-                        remaining_hours -= hours_to_assign
-                        
-                        if remaining_hours <= 0:
-                            break
-        
-        # Calculate optimization results
-        return self._calculate_optimization_result(remaining_demands)
-    
+        seg_op = np.concatenate([op_grid[mask] for _, mask, _ in tier_masks])
+        seg_skill = np.concatenate([skill_grid[mask] for _, mask, _ in tier_masks])
+        seg_upper = np.concatenate([upper[mask] for _, mask, upper in tier_masks])
+        seg_tier = np.concatenate([np.full(mask.sum(), tier) for tier, mask, _ in tier_masks])
+        seg_cost = -(1.0 + 0.1 * (4 - seg_tier) + 0.01 * arrays.proficiency[seg_op, seg_skill])
+
+        hours = self._solve_segment_lp(arrays, seg_op, seg_skill, seg_upper, seg_cost,
+                                       warm_start=warm_start)
+        if hours is None:
+            hours = np.zeros(len(seg_op))
+
+        self._emit_assignments(arrays, seg_op, seg_skill, hours, seg_tier, seg_tier == 4)
+
+        remaining = arrays.demand - np.bincount(seg_skill, weights=hours, minlength=len(arrays.skills))
+        return self._calculate_optimization_result(dict(zip(arrays.skills, remaining.tolist())))
+
     def _optimize_load_balanced(self, constraints: Optional[Dict[str, Any]]) -> OptimizationResult:
-        """Optimize for balanced workload across operators"""
-        self.assignments = []
-        
-        # Calculate target utilization for each operator
-        total_demand = sum(d.required_hours for d in self.skill_demands.values())
-        total_capacity = sum(op.availability_hours for op in self.operators.values())
-        target_utilization = min(total_demand / total_capacity, 0.85) if total_capacity > 0 else 0.85
-        
-        remaining_demands = {skill: demand.required_hours for skill, demand in self.skill_demands.items()}
-        operator_assigned_hours = defaultdict(float)
-        
-        # Iteratively assign to maintain balance
-        max_iterations = 100
-        iteration = 0
-        
-        while any(h > 0 for h in remaining_demands.values()) and iteration < max_iterations:
-            iteration += 1
-            
-            # Find operator with lowest utilization who can fulfill demand
-            best_assignment = None
-            best_utilization_diff = float('inf')
-            
-            for operator in self.operators.values():
-                current_utilization = operator_assigned_hours[operator.operator_id] / operator.availability_hours
-                
-                if current_utilization < target_utilization:
-                    # Check each skill the operator can handle
-                    skills_to_check = [operator.primary_skill] + operator.secondary_skills
-                    
-                    for skill in skills_to_check:
-                        if skill in remaining_demands and remaining_demands[skill] > 0:
-                            proficiency = operator.skill_proficiencies.get(skill, 0.5)
-                            min_proficiency = self.skill_demands[skill].minimum_proficiency
-                            
-                            if proficiency >= min_proficiency:
-                                available_hours = operator.availability_hours - operator_assigned_hours[operator.operator_id]
-                                hours_to_assign = min(available_hours, remaining_demands[skill], 1.0)  # Assign in small increments
-                                
-                                if hours_to_assign > 0:
-                                    new_utilization = (operator_assigned_hours[operator.operator_id] + hours_to_assign) / operator.availability_hours
-                                    utilization_diff = abs(new_utilization - target_utilization)
-                                    
-                                    if utilization_diff < best_utilization_diff:
-                                        best_utilization_diff = utilization_diff
-                                        best_assignment = (operator.operator_id, skill, hours_to_assign, proficiency)
-            
-            if best_assignment:
-                op_id, skill, hours, proficiency = best_assignment
-                
-                assignment = SkillAssignment(
-                    operator_id=op_id,
-                    skill_name=skill,
-                    assigned_hours=hours,
-                    proficiency_level=proficiency,
-                    assignment_priority=2,
-                    is_overflow=False,
-                    utilization_percentage=((operator_assigned_hours[op_id] + hours) / self.operators[op_id].availability_hours) * 100
-                )
-                
-                self.assignments.append(assignment)
-                remaining_demands[skill] -= hours
-                operator_assigned_hours[op_id] += hours
-            else:
-                break
-        
-        return self._calculate_optimization_result(remaining_demands)
-    
+        """Optimize for balanced workload across operators.
+
+        Maximizes covered hours while minimizing the highest operator
+        utilization, capped at ``constraints['max_utilization']`` (default 85%).
+        """
+        arrays, warm_start = self._start_allocation(constraints)
+        max_utilization = (constraints or {}).get('max_utilization', 0.85)
+
+        seg_op, seg_skill = np.nonzero(
+            arrays.has_skill & (arrays.proficiency >= arrays.minimum_proficiency[np.newaxis, :])
+        )
+        seg_upper = arrays.availability[seg_op]
+        seg_cost = -np.ones(len(seg_op))
+        # Coverage dominates: lowering utilization by δ never outweighs δ × availability hours
+        positive_availability = arrays.availability[arrays.availability > 0]
+        balance_weight = 0.01 * float(positive_availability.min(initial=1.0))
+
+        hours = self._solve_segment_lp(arrays, seg_op, seg_skill, seg_upper, seg_cost,
+                                       balance_weight=balance_weight,
+                                       max_utilization=max_utilization,
+                                       warm_start=warm_start)
+        if hours is None:
+            hours = np.zeros(len(seg_op))
+
+        self._emit_assignments(arrays, seg_op, seg_skill, hours,
+                               np.full(len(seg_op), 2), np.zeros(len(seg_op), dtype=bool))
+
+        remaining = arrays.demand - np.bincount(seg_skill, weights=hours, minlength=len(arrays.skills))
+        return self._calculate_optimization_result(dict(zip(arrays.skills, remaining.tolist())))
+
     def _optimize_cost_based(self, constraints: Optional[Dict[str, Any]]) -> OptimizationResult:
-        """Optimize for minimum cost using linear programming"""
-        # Build the linear programming problem
-        operators_list = list(self.operators.values())
-        skills_list = list(self.skill_demands.keys())
-        
-        n_operators = len(operators_list)
-        n_skills = len(skills_list)
-        n_vars = n_operators * n_skills
-        
-        # Decision variables: x[i,j] = hours assigned to operator i for skill j
-        # Objective: minimize total cost
-        c = []  # Cost coefficients
-        
-        for operator in operators_list:
-            for skill in skills_list:
-                if skill == operator.primary_skill or skill in operator.secondary_skills:
-                    # Cost adjusted by proficiency (lower proficiency = higher effective cost)
-                    proficiency = operator.skill_proficiencies.get(skill, 0.5)
-                    effective_cost = operator.cost_per_hour / proficiency
-                    c.append(effective_cost)
-                else:
-                    c.append(1e6)  # Very high cost for skills operator doesn't have
-        
-        # Constraints
-        A_ub = []  # Inequality constraint matrix
-        b_ub = []  # Inequality constraint bounds
-        A_eq = []  # Equality constraint matrix
-        b_eq = []  # Equality constraint bounds
-        
-        # Constraint 1: Operator capacity constraints
-        for i, operator in enumerate(operators_list):
-            constraint = [0] * n_vars
-            for j in range(n_skills):
-                constraint[i * n_skills + j] = 1
-            A_ub.append(constraint)
-            b_ub.append(operator.availability_hours)
-        
-        # Constraint 2: Skill demand constraints (equality)
-        for j, skill in enumerate(skills_list):
-            constraint = [0] * n_vars
-            for i in range(n_operators):
-                constraint[i * n_skills + j] = 1
-            A_eq.append(constraint)
-            b_eq.append(self.skill_demands[skill].required_hours)
-        
-        # Variable bounds (non-negative)
-        bounds = [(0, None) for _ in range(n_vars)]
-        
-        # Solve
+        """Optimize for minimum cost using linear programming.
+
+        Demand that cannot be covered is reported as unmet instead of making
+        the whole problem infeasible.
+        """
+        arrays, warm_start = self._start_allocation(constraints)
+
+        seg_op, seg_skill = np.nonzero(arrays.has_skill)
+        # Cost adjusted by proficiency (lower proficiency = higher effective cost)
+        effective_cost = arrays.cost_per_hour[seg_op] / np.maximum(arrays.proficiency[seg_op, seg_skill], 1e-6)
+        coverage_reward = 2.0 * float(effective_cost.max(initial=0.0)) + 1.0
+        seg_upper = arrays.availability[seg_op]
+
         try:
-            result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
-            
-            if result.success:
-                # Extract assignments from solution
-                self.assignments = []
-                for i, operator in enumerate(operators_list):
-                    for j, skill in enumerate(skills_list):
-                        hours = result.x[i * n_skills + j]
-                        if hours > 0.01:  # Threshold to avoid numerical errors
-                            assignment = SkillAssignment(
-                                operator_id=operator.operator_id,
-                                skill_name=skill,
-                                assigned_hours=hours,
-                                proficiency_level=operator.skill_proficiencies.get(skill, 0.5),
-                                assignment_priority=2,
-                                is_overflow=False,
-                                utilization_percentage=(hours / operator.availability_hours) * 100
-                            )
-                            self.assignments.append(assignment)
-            else:
-                # Fallback to priority-based if optimization fails
-                logger.warning("Cost optimization failed, falling back to priority-based")
-                return self._optimize_priority_based(constraints)
-                
+            hours = self._solve_segment_lp(arrays, seg_op, seg_skill, seg_upper,
+                                           effective_cost - coverage_reward,
+                                           warm_start=warm_start)
         except Exception as e:
             logger.error(f"Linear programming failed: {str(e)}")
             return self._optimize_priority_based(constraints)
-        
-        return self._calculate_optimization_result({})
+
+        if hours is None:
+            # Fallback to priority-based if optimization fails
+            logger.warning("Cost optimization failed, falling back to priority-based")
+            return self._optimize_priority_based(constraints)
+
+        self._emit_assignments(arrays, seg_op, seg_skill, hours,
+                               np.full(len(seg_op), 2), np.zeros(len(seg_op), dtype=bool))
+
+        remaining = arrays.demand - np.bincount(seg_skill, weights=hours, minlength=len(arrays.skills))
+        return self._calculate_optimization_result(dict(zip(arrays.skills, remaining.tolist())))
     
     def _optimize_skill_development(self, constraints: Optional[Dict[str, Any]]) -> OptimizationResult:
         """Optimize to develop operator skills while meeting demands"""
@@ -1101,17 +1096,24 @@ class MultiSkillOptimizer:
             for assignment in self.assignments
         )
         
+        # Aggregate assigned hours in one pass
+        skill_hours = defaultdict(float)
+        operator_hours = defaultdict(float)
+        for a in self.assignments:
+            skill_hours[a.skill_name] += a.assigned_hours
+            operator_hours[a.operator_id] += a.assigned_hours
+        
         # Calculate skill coverage
         skill_coverage = {}
         for skill, demand in self.skill_demands.items():
-            assigned = sum(a.assigned_hours for a in self.assignments if a.skill_name == skill)
+            assigned = skill_hours[skill]
             coverage = (assigned / demand.required_hours * 100) if demand.required_hours > 0 else 100
             skill_coverage[skill] = min(coverage, 100)
         
         # Calculate operator utilization
         operator_utilization = {}
         for operator_id, operator in self.operators.items():
-            assigned = sum(a.assigned_hours for a in self.assignments if a.operator_id == operator_id)
+            assigned = operator_hours[operator_id]
             utilization = (assigned / operator.availability_hours * 100) if operator.availability_hours > 0 else 0
             operator_utilization[operator_id] = utilization
         
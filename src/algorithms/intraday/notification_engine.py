@@ -27,6 +27,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 import json
 import uuid
 import time
@@ -192,7 +193,7 @@ class MobileWorkforceNotificationEngine:
     def connect_to_database(self):
         """Connect to wfm_enterprise database for real data"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",
                 user="postgres",
@@ -210,7 +210,8 @@ class AutoLearningCoefficientsReal:
                               end_date: Optional[datetime] = None) -> List[DetectedEvent]:
         """
         Analyze real historical data from database for anomalies
-        Uses forecast_calculations and historical_data tables
+        Loads the full daily history of contact_statistics in one query and
+        computes expected values for the whole window in one pass
         """
         if not start_date:
             start_date = datetime.now() - timedelta(days=365)
@@ -218,26 +219,9 @@ class AutoLearningCoefficientsReal:
             end_date = datetime.now()
         
         with self.SessionLocal() as session:
-            # Get historical data from real tables
-            result = session.execute(text("""
-                SELECT 
-                    date_trunc('day', interval_start_time) as date,
-                    SUM(contact_volume) as actual_value,
-                    AVG(service_level) as sl_actual
-                FROM contact_statistics
-                WHERE service_id = :service_id
-                    AND interval_start_time >= :start_date
-                    AND interval_start_time <= :end_date
-                GROUP BY date_trunc('day', interval_start_time)
-                ORDER BY date
-            """), {
-                'service_id': service_id,
-                'start_date': start_date,
-                'end_date': end_date
-            })
-            
-            data = pd.DataFrame(result.fetchall(), columns=['date', 'actual_value', 'sl_actual'])
+            history = self._load_daily_history(service_id, start_date, end_date, session)
             
+            data = history[history['in_window'] & history['actual_value'].notna()]
             if data.empty:
                 logger.warning(f"No historical data found for service {service_id}")
                 return []
@@ -250,117 +234,162 @@ class AutoLearningCoefficientsReal:
             moderate_threshold = Q3 + (IQR * self.config['outlier_threshold_moderate'])
             extreme_threshold = Q3 + (IQR * self.config['outlier_threshold_extreme'])
             
+            # Expected values from historical patterns, computed for every day at once
+            expected_values = self._calculate_expected_values(history).loc[data.index]
+            pattern_counts = self._load_event_pattern_counts(session)
+            
             detected_events = []
             
-            for idx, row in data.iterrows():
-                date = row['date']
-                value = row['actual_value']
-                
-                # Calculate expected value from historical patterns
-                expected = self._calculate_expected_value_real(service_id, date, session)
-                
+            for date, value, expected in zip(data['date'], data['actual_value'], expected_values):
                 if expected == 0:
                     continue
                 
                 deviation = abs(value - expected) / expected
                 
                 # Detect event type and determine action
-                event = self._classify_event(date, value, expected, deviation, 
-                                           moderate_threshold, extreme_threshold)
+                event = self._classify_event(date.to_pydatetime(), value, expected, deviation, 
+                                           moderate_threshold, extreme_threshold,
+                                           pattern_counts)
                 
                 if event:
                     detected_events.append(event)
-                    self._save_detected_event(event, session)
             
+            self._save_detected_events(detected_events, session)
             session.commit()
             logger.info(f"Detected {len(detected_events)} events from real data")
             return detected_events
     
-    def _calculate_expected_value_real(self, service_id: int, date: datetime, session) -> float:
-        """Calculate expected value from real database patterns"""
-        # Get similar dates from history (same month/day from previous years)
+    def _load_daily_history(self, service_id: int, start_date: datetime,
+                            end_date: datetime, session) -> pd.DataFrame:
+        """
+        Load the full daily contact history for a service in one query
+        
+        Every day is returned so prior-year and seasonal patterns can be computed;
+        window_value/sl_actual only cover intervals inside [start_date, end_date].
+        """
         result = session.execute(text("""
-            SELECT AVG(contact_volume) as avg_volume
-            FROM (
-                SELECT SUM(contact_volume) as contact_volume
-                FROM contact_statistics
-                WHERE service_id = :service_id
-                    AND EXTRACT(MONTH FROM interval_start_time) = :month
-                    AND EXTRACT(DAY FROM interval_start_time) = :day
-                    AND EXTRACT(YEAR FROM interval_start_time) < :year
-                GROUP BY date_trunc('day', interval_start_time)
-            ) daily_volumes
+            SELECT 
+                date_trunc('day', interval_start_time) as date,
+                SUM(contact_volume) as total_volume,
+                COUNT(contact_volume) as interval_count,
+                SUM(contact_volume) FILTER (
+                    WHERE interval_start_time >= :start_date
+                        AND interval_start_time <= :end_date
+                ) as actual_value,
+                AVG(service_level) FILTER (
+                    WHERE interval_start_time >= :start_date
+                        AND interval_start_time <= :end_date
+                ) as sl_actual,
+                BOOL_OR(interval_start_time >= :start_date
+                        AND interval_start_time <= :end_date) as in_window
+            FROM contact_statistics
+            WHERE service_id = :service_id
+            GROUP BY date_trunc('day', interval_start_time)
+            ORDER BY date
         """), {
             'service_id': service_id,
-            'month': date.month,
-            'day': date.day,
-            'year': date.year
+            'start_date': start_date,
+            'end_date': end_date
         })
         
-        base_value = result.scalar()
+        history = pd.DataFrame(result.fetchall(), columns=[
+            'date', 'total_volume', 'interval_count', 'actual_value', 'sl_actual', 'in_window'
+        ])
         
-        if not base_value:
-            # Fall back to day-of-week average
-            result = session.execute(text("""
-                SELECT AVG(contact_volume) as avg_volume
-                FROM (
-                    SELECT SUM(contact_volume) as contact_volume
-                    FROM contact_statistics
-                    WHERE service_id = :service_id
-                        AND EXTRACT(DOW FROM interval_start_time) = :dow
-                    GROUP BY date_trunc('day', interval_start_time)
-                ) daily_volumes
-            """), {
-                'service_id': service_id,
-                'dow': date.weekday()
-            })
-            
-            base_value = result.scalar() or 0
+        history['date'] = pd.to_datetime(history['date'])
+        for column in ('total_volume', 'actual_value', 'sl_actual'):
+            history[column] = pd.to_numeric(history[column], errors='coerce').astype(float)
+        history['interval_count'] = history['interval_count'].fillna(0).astype(int)
+        history['in_window'] = history['in_window'].fillna(False).astype(bool)
         
-        # Apply real seasonal adjustments from database
-        seasonal_factor = self._get_seasonal_factor_real(service_id, date, session)
-        
-        return float(base_value * seasonal_factor) if base_value else 0
+        return history
     
-    def _get_seasonal_factor_real(self, service_id: int, date: datetime, session) -> float:
-        """Get seasonal adjustment factor from real historical patterns"""
-        # Calculate day-of-week factor from real data
-        dow_result = session.execute(text("""
-            SELECT 
-                EXTRACT(DOW FROM interval_start_time) as dow,
-                AVG(contact_volume) as avg_volume
-            FROM contact_statistics
-            WHERE service_id = :service_id
-            GROUP BY EXTRACT(DOW FROM interval_start_time)
-        """), {'service_id': service_id})
+    def _calculate_expected_values(self, history: pd.DataFrame) -> pd.Series:
+        """
+        Calculate expected daily values from historical patterns
         
-        dow_data = {int(row.dow): row.avg_volume for row in dow_result}
-        overall_avg = sum(dow_data.values()) / len(dow_data) if dow_data else 1
+        Base value is the mean of the same month/day in earlier years, falling back
+        to the day-of-week mean of daily totals. It is scaled by day-of-week and
+        month factors derived from per-interval averages.
+        """
+        if history.empty:
+            return pd.Series(dtype=float)
+        
+        dates = history['date']
+        month = dates.dt.month
+        day = dates.dt.day
+        dow = dates.dt.weekday
+        total = history['total_volume']
+        has_total = total.notna().astype(int)
+        
+        # Same month/day from previous years: one row per date, so an exclusive
+        # running sum in year order covers exactly the earlier years
+        order = np.lexsort((dates.dt.year.to_numpy(), day.to_numpy(), month.to_numpy()))
+        ordered = pd.DataFrame({
+            'month': month.to_numpy()[order],
+            'day': day.to_numpy()[order],
+            'total': total.fillna(0).to_numpy()[order],
+            'has_total': has_total.to_numpy()[order]
+        }, index=history.index[order])
+        grouped = ordered.groupby(['month', 'day'], sort=False)
+        prior_sum = grouped['total'].cumsum() - ordered['total']
+        prior_count = grouped['has_total'].cumsum() - ordered['has_total']
+        same_day_mean = (prior_sum / prior_count.where(prior_count > 0)).reindex(history.index)
+        
+        # Fall back to day-of-week average of daily totals
+        dow_daily_mean = total.groupby(dow).transform('mean')
+        base_value = same_day_mean.where(same_day_mean.fillna(0) != 0, dow_daily_mean).fillna(0)
+        
+        seasonal_factor = self._seasonal_factors(history, dow, month)
+        
+        return base_value * seasonal_factor
+    
+    def _seasonal_factors(self, history: pd.DataFrame, dow: pd.Series, month: pd.Series) -> pd.Series:
+        """Day-of-week × month adjustment factors from per-interval averages"""
+        total = history['total_volume'].fillna(0)
+        counts = history['interval_count']
         
-        current_dow_avg = dow_data.get(date.weekday(), overall_avg)
-        dow_factor = current_dow_avg / overall_avg if overall_avg > 0 else 1.0
+        # Per-interval average volume by day of week
+        dow_volume = total.groupby(dow).sum()
+        dow_counts = counts.groupby(dow).sum()
+        dow_avg = (dow_volume / dow_counts.where(dow_counts > 0)).dropna()
+        overall_avg = dow_avg.mean() if not dow_avg.empty else 1
         
-        # Calculate month factor from real data
-        month_result = session.execute(text("""
-            SELECT 
-                EXTRACT(MONTH FROM interval_start_time) as month,
-                AVG(contact_volume) as avg_volume
-            FROM contact_statistics
-            WHERE service_id = :service_id
-            GROUP BY EXTRACT(MONTH FROM interval_start_time)
-        """), {'service_id': service_id})
+        current_dow_avg = dow.map(dow_avg).fillna(overall_avg)
+        dow_factor = current_dow_avg / overall_avg if overall_avg > 0 else pd.Series(1.0, index=history.index)
         
-        month_data = {int(row.month): row.avg_volume for row in month_result}
-        month_avg = sum(month_data.values()) / len(month_data) if month_data else overall_avg
+        # Per-interval average volume by month
+        month_volume = total.groupby(month).sum()
+        month_counts = counts.groupby(month).sum()
+        month_avg_by_month = (month_volume / month_counts.where(month_counts > 0)).dropna()
+        month_avg = month_avg_by_month.mean() if not month_avg_by_month.empty else overall_avg
         
-        current_month_avg = month_data.get(date.month, month_avg)
-        month_factor = current_month_avg / month_avg if month_avg > 0 else 1.0
+        current_month_avg = month.map(month_avg_by_month).fillna(month_avg)
+        month_factor = current_month_avg / month_avg if month_avg > 0 else pd.Series(1.0, index=history.index)
         
         return dow_factor * month_factor
     
+    def _load_event_pattern_counts(self, session) -> Dict[Tuple[str, int, int], int]:
+        """Count previously detected events per (event type, month, day)"""
+        result = session.execute(text("""
+            SELECT 
+                event_type,
+                EXTRACT(MONTH FROM date)::int as month,
+                EXTRACT(DAY FROM date)::int as day,
+                COUNT(*) as pattern_count
+            FROM detected_events
+            GROUP BY event_type, EXTRACT(MONTH FROM date), EXTRACT(DAY FROM date)
+        """))
+        
+        return {
+            (row.event_type, int(row.month), int(row.day)): int(row.pattern_count)
+            for row in result
+        }
+    
     def _classify_event(self, date: datetime, value: float, expected: float, 
                        deviation: float, moderate_threshold: float, 
-                       extreme_threshold: float) -> Optional[DetectedEvent]:
+                       extreme_threshold: float,
+                       pattern_counts: Optional[Dict[Tuple[str, int, int], int]] = None) -> Optional[DetectedEvent]:
         """Classify detected event and determine action"""
         
         if value < moderate_threshold and deviation < 0.3:
@@ -375,7 +404,7 @@ class AutoLearningCoefficientsReal:
                          min(self.config['max_coefficient'], coefficient))
         
         # Determine confidence based on historical consistency
-        confidence = self._calculate_confidence_real(date, value, expected, event_type)
+        confidence = self._calculate_confidence_real(date, value, expected, event_type, pattern_counts)
         
         # Determine action
         action = self._determine_action(event_type, deviation, confidence, value, extreme_threshold)
@@ -424,37 +453,41 @@ class AutoLearningCoefficientsReal:
         return EventType.NORMAL
     
     def _calculate_confidence_real(self, date: datetime, value: float, 
-                                  expected: float, event_type: EventType) -> float:
+                                  expected: float, event_type: EventType,
+                                  pattern_counts: Optional[Dict[Tuple[str, int, int], int]] = None) -> float:
         """Calculate confidence based on real historical data"""
-        with self.SessionLocal() as session:
-            # Check how many times we've seen similar patterns
-            pattern_count = session.execute(text("""
-                SELECT COUNT(*) 
-                FROM detected_events
-                WHERE event_type = :event_type
-                    AND EXTRACT(MONTH FROM date) = :month
-                    AND EXTRACT(DAY FROM date) = :day
-            """), {
-                'event_type': event_type.value,
-                'month': date.month,
-                'day': date.day
-            }).scalar()
-            
-            # Base confidence on occurrences
-            if pattern_count >= 3:
-                confidence = 0.9
-            elif pattern_count >= 2:
-                confidence = 0.7
-            else:
-                confidence = 0.5
-            
-            # Adjust based on deviation magnitude
-            if expected > 0:
-                deviation = abs(value - expected) / expected
-                if deviation > 2.0:
-                    confidence *= 0.8  # Lower confidence for extreme deviations
-            
-            return min(confidence, 0.95)
+        # Check how many times we've seen similar patterns
+        if pattern_counts is not None:
+            pattern_count = pattern_counts.get((event_type.value, date.month, date.day), 0)
+        else:
+            with self.SessionLocal() as session:
+                pattern_count = session.execute(text("""
+                    SELECT COUNT(*) 
+                    FROM detected_events
+                    WHERE event_type = :event_type
+                        AND EXTRACT(MONTH FROM date) = :month
+                        AND EXTRACT(DAY FROM date) = :day
+                """), {
+                    'event_type': event_type.value,
+                    'month': date.month,
+                    'day': date.day
+                }).scalar()
+        
+        # Base confidence on occurrences
+        if pattern_count >= 3:
+            confidence = 0.9
+        elif pattern_count >= 2:
+            confidence = 0.7
+        else:
+            confidence = 0.5
+        
+        # Adjust based on deviation magnitude
+        if expected > 0:
+            deviation = abs(value - expected) / expected
+            if deviation > 2.0:
+                confidence *= 0.8  # Lower confidence for extreme deviations
+        
+        return min(confidence, 0.95)
     
     def _determine_action(self, event_type: EventType, deviation: float, 
                          confidence: float, value: float, extreme_threshold: float) -> LearningAction:
@@ -484,24 +517,34 @@ class AutoLearningCoefficientsReal:
     
     def _save_detected_event(self, event: DetectedEvent, session):
         """Save detected event to database"""
+        self._save_detected_events([event], session)
+    
+    def _save_detected_events(self, events: List[DetectedEvent], session):
+        """Bulk save detected events to database in a single executemany"""
+        if not events:
+            return
+        
         session.execute(text("""
             INSERT INTO detected_events 
             (date, actual_value, expected_value, deviation_percent, event_type, 
              confidence, coefficient, action, description, metadata)
             VALUES (:date, :actual, :expected, :deviation, :type, 
                     :confidence, :coefficient, :action, :description, :metadata)
-        """), {
-            'date': event.date,
-            'actual': event.actual_value,
-            'expected': event.expected_value,
-            'deviation': event.deviation_percent,
-            'type': event.event_type.value,
-            'confidence': event.confidence,
-            'coefficient': event.coefficient,
-            'action': event.action.value,
-            'description': event.description,
-            'metadata': json.dumps(event.metadata)
-        })
+        """), [
+            {
+                'date': event.date,
+                'actual': event.actual_value,
+                'expected': event.expected_value,
+                'deviation': event.deviation_percent,
+                'type': event.event_type.value,
+                'confidence': event.confidence,
+                'coefficient': event.coefficient,
+                'action': event.action.value,
+                'description': event.description,
+                'metadata': json.dumps(event.metadata)
+            }
+            for event in events
+        ])
     
     def learn_from_events(self, events: List[DetectedEvent]) -> int:
         """Learn coefficients from detected events"""
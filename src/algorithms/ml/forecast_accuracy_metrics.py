@@ -248,6 +248,159 @@ class ForecastAccuracyMetrics:
         
         return metrics
     
+    # ------------------------------------------------------------------
+    # Batch API: many series at once (series × time arrays with masks)
+    # ------------------------------------------------------------------
+    
+    def _prepare_batch(self, actual: np.ndarray, forecast: np.ndarray,
+                       mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Coerce batch inputs to 2-D float arrays and a validity mask"""
+        actual = np.atleast_2d(np.asarray(actual, dtype=float))
+        forecast = np.atleast_2d(np.asarray(forecast, dtype=float))
+        if actual.shape != forecast.shape:
+            raise ValueError(f"actual {actual.shape} and forecast {forecast.shape} shapes differ")
+        
+        valid = np.isfinite(actual) & np.isfinite(forecast)
+        if mask is not None:
+            valid &= np.atleast_2d(np.asarray(mask, dtype=bool))
+        
+        # Zero out invalid points so plain sums skip them
+        actual = np.where(valid, actual, 0.0)
+        forecast = np.where(valid, forecast, 0.0)
+        return actual, forecast, valid
+    
+    def _batch_mase_scale(self, actual: np.ndarray, valid: np.ndarray,
+                          seasonal_period: int) -> np.ndarray:
+        """Per-series mean absolute seasonal-naive error over valid point pairs"""
+        series_count, length = actual.shape
+        if length <= seasonal_period:
+            return np.full(series_count, np.nan)
+        
+        pair_valid = valid[:, seasonal_period:] & valid[:, :-seasonal_period]
+        naive_abs = np.abs(actual[:, seasonal_period:] - actual[:, :-seasonal_period]) * pair_valid
+        pair_count = pair_valid.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(pair_count > 0, naive_abs.sum(axis=1) / pair_count, np.nan)
+    
+    def _batch_group_metrics(self, actual: np.ndarray, forecast: np.ndarray, valid: np.ndarray,
+                             groups: np.ndarray, scale: np.ndarray,
+                             lower_bound: Optional[np.ndarray] = None,
+                             upper_bound: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Metrics per series and group from one set of sums
+        
+        groups is a (time × group) 0/1 matrix; every sum over time becomes one
+        matrix product, so all series and groups are handled together.
+        """
+        errors = forecast - actual
+        abs_errors = np.abs(errors)
+        nonzero = valid & (actual != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ape = np.where(nonzero, abs_errors / np.where(nonzero, np.abs(actual), 1.0), 0.0)
+        
+        count = valid.astype(float) @ groups
+        nonzero_count = nonzero.astype(float) @ groups
+        sum_actual = actual @ groups
+        sum_abs_error = abs_errors @ groups
+        sum_error = errors @ groups
+        sum_sq_error = (errors ** 2) @ groups
+        sum_ape = ape @ groups
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mae = np.where(count > 0, sum_abs_error / count, np.nan)
+            mean_bias = np.where(count > 0, sum_error / count, np.nan)
+            mean_actual = np.where(count > 0, sum_actual / count, np.nan)
+            metrics = {
+                'count': count.astype(int),
+                'mape': np.where(nonzero_count > 0, sum_ape / nonzero_count * 100, np.inf),
+                'wape': np.where(sum_actual != 0, sum_abs_error / sum_actual * 100, np.inf),
+                'mae': mae,
+                'rmse': np.where(count > 0, np.sqrt(sum_sq_error / count), np.nan),
+                'mase': np.where(np.isfinite(scale[:, None]) & (scale[:, None] > 0),
+                                 mae / scale[:, None], np.inf),
+                'bias': mean_bias,
+                'bias_percentage': np.where(mean_actual != 0, mean_bias / mean_actual * 100, np.nan),
+                # Tracking signal uses actual - forecast, as in calculate_tracking_signal
+                'tracking_signal': np.where(mae > 0, -sum_error / mae, 0.0)
+            }
+        
+        if lower_bound is not None and upper_bound is not None:
+            lower = np.atleast_2d(np.asarray(lower_bound, dtype=float))
+            upper = np.atleast_2d(np.asarray(upper_bound, dtype=float))
+            bounds_valid = valid & np.isfinite(lower) & np.isfinite(upper)
+            inside = bounds_valid & (actual >= lower) & (actual <= upper)
+            bounds_count = bounds_valid.astype(float) @ groups
+            width = np.where(bounds_valid, upper - lower, 0.0) @ groups
+            with np.errstate(divide='ignore', invalid='ignore'):
+                metrics['coverage_percentage'] = np.where(
+                    bounds_count > 0, (inside.astype(float) @ groups) / bounds_count * 100, np.nan
+                )
+                metrics['average_interval_width'] = np.where(bounds_count > 0, width / bounds_count, np.nan)
+        
+        return {name: values if name == 'count' else np.round(values, 2) for name, values in metrics.items()}
+    
+    def calculate_batch_metrics(self, actual: np.ndarray, forecast: np.ndarray,
+                                mask: Optional[np.ndarray] = None,
+                                lower_bound: Optional[np.ndarray] = None,
+                                upper_bound: Optional[np.ndarray] = None,
+                                seasonal_period: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Accuracy metrics for many series in one vectorized pass
+        
+        Inputs are (series × time) arrays; mask marks the points to use (NaNs
+        are always skipped). Returns one array per metric with a value per
+        series: MAPE, WAPE, MAE, RMSE, MASE, bias, bias percentage, tracking
+        signal and, when bounds are given, interval coverage and width.
+        """
+        actual, forecast, valid = self._prepare_batch(actual, forecast, mask)
+        scale = self._batch_mase_scale(actual, valid, seasonal_period)
+        whole_series = np.ones((actual.shape[1], 1))
+        
+        metrics = self._batch_group_metrics(
+            actual, forecast, valid, whole_series, scale, lower_bound, upper_bound
+        )
+        return {name: values[:, 0] for name, values in metrics.items()}
+    
+    def calculate_batch_by_time_period(self, actual: np.ndarray, forecast: np.ndarray,
+                                       timestamps: pd.DatetimeIndex,
+                                       mask: Optional[np.ndarray] = None,
+                                       lower_bound: Optional[np.ndarray] = None,
+                                       upper_bound: Optional[np.ndarray] = None,
+                                       seasonal_period: int = 1) -> Dict[str, Dict[str, any]]:
+        """
+        Batch version of calculate_by_time_period for (series × time) arrays
+        
+        For every grouping period (hour of day, day of week, week of month,
+        month) returns the group keys and a (series × group) array per metric.
+        """
+        timestamps = pd.DatetimeIndex(timestamps)
+        actual, forecast, valid = self._prepare_batch(actual, forecast, mask)
+        if len(timestamps) != actual.shape[1]:
+            raise ValueError("timestamps must have one entry per time column")
+        
+        scale = self._batch_mase_scale(actual, valid, seasonal_period)
+        periods = {
+            'hour_of_day': timestamps.hour,
+            'day_of_week': timestamps.dayofweek,
+            'week_of_month': (timestamps.day - 1) // 7 + 1,
+            'month': timestamps.month
+        }
+        
+        period_accuracy = {}
+        for period_name, period_values in periods.items():
+            keys, inverse = np.unique(np.asarray(period_values), return_inverse=True)
+            groups = np.zeros((len(period_values), len(keys)))
+            groups[np.arange(len(period_values)), inverse] = 1.0
+            
+            period_accuracy[period_name] = {
+                'periods': keys.astype(int).tolist(),
+                **self._batch_group_metrics(
+                    actual, forecast, valid, groups, scale, lower_bound, upper_bound
+                )
+            }
+        
+        return period_accuracy
+    
     def _test_bias_significance(self, actual: np.ndarray, forecast: np.ndarray) -> bool:
         """
         Statistical test for forecast bias
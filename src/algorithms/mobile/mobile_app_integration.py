@@ -40,6 +40,7 @@ from typing import Dict, List, Optional, Any
 import uuid
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from dataclasses import dataclass
 from enum import Enum
 
@@ -109,7 +110,7 @@ class MobileWorkforceSchedulerIntegration:
     def connect_to_database(self):
         """Connect to wfm_enterprise database - CRITICAL: correct database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",  # CRITICAL: Using wfm_enterprise not postgres
                 user="postgres", 
@@ -32,6 +32,7 @@ from typing import Dict, List, Optional, Tuple, Any
 import uuid
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 import json
 from dataclasses import dataclass
 
@@ -84,7 +85,7 @@ class MobileWorkforceScheduler:
     def connect_to_database(self):
         """Connect to wfm_enterprise database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",
                 user="postgres", 
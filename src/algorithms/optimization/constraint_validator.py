@@ -15,6 +15,7 @@ from enum import Enum
 import logging
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 import json
 from contextlib import contextmanager
 
@@ -74,7 +75,7 @@ class DatabaseConnection:
         """Get database connection with proper cleanup"""
         conn = None
         try:
-            conn = psycopg2.connect(
+            conn = db_pool.connect(
                 host=self.host,
                 database=self.database,
                 user=self.user,
@@ -7,7 +7,12 @@ Performance: <2s predictions, <10s model training
 """
 
 import time
+import glob
+import hashlib
+import json
 import logging
+import stat
+import tempfile
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -16,6 +21,9 @@ from dataclasses import dataclass
 from enum import Enum
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 import os
 
 # ML Libraries for REAL model training
@@ -28,6 +36,171 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# (p, d, q) grid searched on every retrain
+ARIMA_ORDER_GRID = [(p, d, q) for p in range(3) for d in range(2) for q in range(3)]
+
+# Order search: candidates are first fitted on the most recent points only,
+# and just the best ones by this partial AIC are refitted on the full series
+ARIMA_PRUNE_POINTS = 672      # 1 week of 15-minute intervals
+ARIMA_PRUNE_KEEP = 4          # candidates kept for the full fit
+ARIMA_PRUNE_MAXITER = 25      # optimizer iterations for the partial fit
+
+# Shared on-disk model store (every worker process reads the same directory);
+# private to the service user, never the world-writable temp directory
+ARIMA_MODEL_STORE_DIR = os.getenv(
+    'WFM_ARIMA_MODEL_STORE',
+    os.path.join(os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                 'wfm', 'arima_models')
+)
+ARIMA_MODEL_STORE_KEEP = 3    # fingerprints kept per service
+
+_order_search_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_order_search_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all order searches in this process"""
+    global _order_search_pool
+    if _order_search_pool is None:
+        workers = int(os.getenv('WFM_ARIMA_SEARCH_WORKERS', '0')) or min(len(ARIMA_ORDER_GRID), os.cpu_count() or 1)
+        _order_search_pool = ProcessPoolExecutor(max_workers=workers)
+    return _order_search_pool
+
+
+def _fit_arima_candidate(time_series: pd.Series,
+                         order: Tuple[int, int, int],
+                         start_params: Optional[np.ndarray] = None,
+                         maxiter: Optional[int] = None) -> Optional[Tuple[Tuple[int, int, int], float, np.ndarray]]:
+    """
+    Fit one ARIMA order and return (order, aic, params), or None if it fails
+    
+    Module-level so it can run in a worker process; skips the parameter
+    covariance since only AIC and parameters are needed for the search.
+    """
+    try:
+        fitted_model = ARIMA(time_series, order=order).fit(
+            start_params=start_params,
+            method_kwargs={'maxiter': maxiter} if maxiter else None,
+            cov_type='none',
+            low_memory=True
+        )
+        if not np.isfinite(fitted_model.aic):
+            return None
+        return order, float(fitted_model.aic), np.asarray(fitted_model.params)
+    except Exception:
+        if start_params is not None:
+            # Stale warm start (e.g. diverged parameters) - retry from scratch
+            return _fit_arima_candidate(time_series, order, None, maxiter)
+        return None
+
+
+def series_fingerprint(time_series: pd.Series) -> str:
+    """Stable fingerprint of a training series (timestamps and values)"""
+    digest = hashlib.sha256()
+    if len(time_series):
+        digest.update(str(time_series.index[0]).encode())
+        digest.update(str(time_series.index[-1]).encode())
+    digest.update(np.ascontiguousarray(time_series.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:32]
+
+
+class ArimaModelStore:
+    """
+    On-disk ARIMA parameter store shared by all worker processes
+    
+    Entries are keyed by service and training data fingerprint and hold the
+    selected order plus the fitted parameters of every searched order, so a
+    model can be rebuilt without fitting and refits can be warm-started.
+    Entries are plain JSON in a directory only the current user can access.
+    """
+    
+    def __init__(self, directory: str = ARIMA_MODEL_STORE_DIR, keep: int = ARIMA_MODEL_STORE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._check_private_directory()
+    
+    def _check_private_directory(self):
+        """Refuse a store directory owned by another user; drop group/other access"""
+        info = os.stat(self.directory)
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"ARIMA model store {self.directory} is not owned by the current user")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            os.chmod(self.directory, 0o700)
+    
+    def _path(self, service_id: int, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"service_{service_id}_{fingerprint}.json")
+    
+    def _service_entries(self, service_id: int) -> List[str]:
+        """Entry paths for a service, newest first"""
+        paths = glob.glob(os.path.join(self.directory, f"service_{service_id}_*.json"))
+        return sorted(paths, key=lambda path: os.path.getmtime(path), reverse=True)
+    
+    @staticmethod
+    def _encode(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON form of an entry: orders as lists, parameters as float lists"""
+        encoded = dict(entry)
+        encoded['order'] = list(entry['order'])
+        encoded['params'] = np.asarray(entry['params'], dtype=float).tolist()
+        if 'candidate_params' in entry:
+            encoded['candidate_params'] = [
+                {'order': list(order), 'params': np.asarray(params, dtype=float).tolist()}
+                for order, params in entry['candidate_params'].items()
+            ]
+        if isinstance(entry.get('trained_at'), datetime):
+            encoded['trained_at'] = entry['trained_at'].isoformat()
+        return encoded
+    
+    @staticmethod
+    def _decode(encoded: Dict[str, Any]) -> Dict[str, Any]:
+        entry = dict(encoded)
+        entry['order'] = tuple(encoded['order'])
+        entry['params'] = np.asarray(encoded['params'], dtype=float)
+        if 'candidate_params' in encoded:
+            entry['candidate_params'] = {
+                tuple(candidate['order']): np.asarray(candidate['params'], dtype=float)
+                for candidate in encoded['candidate_params']
+            }
+        if isinstance(encoded.get('trained_at'), str):
+            entry['trained_at'] = datetime.fromisoformat(encoded['trained_at'])
+        return entry
+    
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return self._decode(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def load(self, service_id: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Entry trained on exactly this data, if any"""
+        return self._read(self._path(service_id, fingerprint))
+    
+    def load_latest(self, service_id: int) -> Optional[Dict[str, Any]]:
+        """Most recent entry for a service regardless of data (for warm starts)"""
+        for path in self._service_entries(service_id):
+            entry = self._read(path)
+            if entry:
+                return entry
+        return None
+    
+    def save(self, service_id: int, fingerprint: str, entry: Dict[str, Any]):
+        """Atomically write an entry and drop the oldest ones beyond keep"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._encode(entry), f)
+            os.replace(tmp_path, self._path(service_id, fingerprint))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        for stale_path in self._service_entries(service_id)[self.keep:]:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
 class PredictionHorizon(Enum):
     """Prediction time horizons"""
     IMMEDIATE = "immediate"      # Next 15 minutes
@@ -78,6 +251,7 @@ class VolumePredictorReal:
         # Model storage
         self.trained_models = {}  # service_id -> ARIMA model
         self.model_metadata = {}  # service_id -> training info
+        self.model_store = ArimaModelStore()  # shared across worker processes
         
         # Validate database connection and create tables
         self._validate_database_connection()
@@ -271,11 +445,34 @@ class VolumePredictorReal:
             else:
                 seasonal_strength = 0.0
             
-            # Auto-select ARIMA parameters using AIC
-            best_model = self._select_best_arima_order(df_clean['call_volume'])
+            # Load from the shared store, or auto-select ARIMA parameters using AIC
+            time_series = df_clean['call_volume']
+            fingerprint = series_fingerprint(time_series)
+            stored = self.model_store.load(service_id, fingerprint)
             
-            if not best_model:
-                raise ValueError("Could not find suitable ARIMA model")
+            if stored:
+                best_model = self._build_arima_model(time_series, stored['order'], stored['params'])
+                logger.info(f"Loaded ARIMA{stored['order']} for service {service_id} from model store")
+            else:
+                previous = self.model_store.load_latest(service_id)
+                candidates = self._search_arima_orders(
+                    time_series, previous['candidate_params'] if previous else None
+                )
+                
+                if not candidates:
+                    raise ValueError("Could not find suitable ARIMA model")
+                
+                best_order = min(candidates, key=lambda order: candidates[order][0])
+                best_model = self._build_arima_model(time_series, best_order, candidates[best_order][1])
+                
+                self.model_store.save(service_id, fingerprint, {
+                    'order': best_order,
+                    'aic': candidates[best_order][0],
+                    'params': candidates[best_order][1],
+                    'candidate_params': {order: params for order, (_, params) in candidates.items()},
+                    'trained_at': datetime.now(),
+                    'data_points': len(time_series)
+                })
             
             # Store model and metadata
             self.trained_models[service_id] = best_model
@@ -288,8 +485,9 @@ class VolumePredictorReal:
                 'training_end': df_clean.index.max()
             }
             
-            # Save model to database
-            self._save_model_to_database(service_id, best_model, df_clean)
+            # Save model to database (a store hit was already saved by the worker that trained it)
+            if not stored:
+                self._save_model_to_database(service_id, best_model, df_clean)
             
             training_time = time.time() - training_start
             if training_time >= self.training_target:
@@ -298,27 +496,70 @@ class VolumePredictorReal:
             logger.info(f"✅ ARIMA model trained for service {service_id}: {len(df_clean)} data points, AIC={best_model.aic:.2f}")
             return best_model
     
-    def _select_best_arima_order(self, time_series: pd.Series):
+    def _select_best_arima_order(self, time_series: pd.Series,
+                                 warm_start: Optional[Dict[Tuple[int, int, int], np.ndarray]] = None):
         """Select best ARIMA order using AIC"""
-        best_aic = float('inf')
-        best_model = None
+        candidates = self._search_arima_orders(time_series, warm_start)
+        if not candidates:
+            return None
+        
+        best_order = min(candidates, key=lambda order: candidates[order][0])
+        return self._build_arima_model(time_series, best_order, candidates[best_order][1])
+    
+    def _search_arima_orders(self, time_series: pd.Series,
+                             warm_start: Optional[Dict[Tuple[int, int, int], np.ndarray]] = None
+                             ) -> Dict[Tuple[int, int, int], Tuple[float, np.ndarray]]:
+        """
+        Fit the ARIMA order grid in parallel and return order -> (aic, params)
         
-        # Test different ARIMA orders
-        for p in range(3):
-            for d in range(2):
-                for q in range(3):
-                    try:
-                        model = ARIMA(time_series, order=(p, d, q))
-                        fitted_model = model.fit()
-                        
-                        if fitted_model.aic < best_aic:
-                            best_aic = fitted_model.aic
-                            best_model = fitted_model
-                            
-                    except Exception:
-                        continue
+        Long series are pruned first: every order is fitted on the most recent
+        ARIMA_PRUNE_POINTS with few iterations and only the best ARIMA_PRUNE_KEEP
+        by that partial AIC are fitted on the full series. Fits start from the
+        previous model's parameters when given, else from the partial fit.
+        """
+        warm_start = warm_start or {}
+        orders = ARIMA_ORDER_GRID
+        start_params = {order: warm_start.get(order) for order in orders}
+        
+        if len(time_series) > ARIMA_PRUNE_POINTS and len(orders) > ARIMA_PRUNE_KEEP:
+            partial = self._fit_arima_candidates(
+                time_series.iloc[-ARIMA_PRUNE_POINTS:], orders, start_params, ARIMA_PRUNE_MAXITER
+            )
+            if partial:
+                orders = sorted(partial, key=lambda order: partial[order][0])[:ARIMA_PRUNE_KEEP]
+                start_params = {
+                    order: warm_start[order] if order in warm_start else partial[order][1]
+                    for order in orders
+                }
         
-        return best_model
+        return self._fit_arima_candidates(time_series, orders, start_params)
+    
+    def _fit_arima_candidates(self, time_series: pd.Series,
+                              orders: List[Tuple[int, int, int]],
+                              start_params: Dict[Tuple[int, int, int], Optional[np.ndarray]],
+                              maxiter: Optional[int] = None
+                              ) -> Dict[Tuple[int, int, int], Tuple[float, np.ndarray]]:
+        """Fit orders across the shared process pool, sequentially if it is unavailable"""
+        global _order_search_pool
+        starts = [start_params.get(order) for order in orders]
+        
+        try:
+            results = list(_get_order_search_pool().map(
+                _fit_arima_candidate, repeat(time_series), orders, starts, repeat(maxiter)
+            ))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"ARIMA order search pool unavailable ({e}), fitting sequentially")
+            _order_search_pool = None
+            results = [
+                _fit_arima_candidate(time_series, order, start, maxiter)
+                for order, start in zip(orders, starts)
+            ]
+        
+        return {order: (aic, params) for order, aic, params in filter(None, results)}
+    
+    def _build_arima_model(self, time_series: pd.Series, order: Tuple[int, int, int], params: np.ndarray):
+        """Rebuild fitted ARIMA results from known parameters without optimizing"""
+        return ARIMA(time_series, order=order).smooth(np.asarray(params))
     
     def _generate_horizon_predictions(self, 
                                     service_id: int, 
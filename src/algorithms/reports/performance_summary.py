@@ -2,6 +2,7 @@
 
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import json
@@ -10,7 +11,7 @@ import json
 def generate_performance_report(days: int = 7, threshold_ms: int = 2000) -> str:
     """Generate weekly performance summary report"""
     
-    conn = psycopg2.connect(
+    conn = db_pool.connect(
         host='localhost',
         database='wfm_enterprise',
         user='postgres',
@@ -198,7 +199,7 @@ def generate_performance_report(days: int = 7, threshold_ms: int = 2000) -> str:
 def get_algorithm_performance(algorithm_name: str, days: int = 7) -> Dict[str, Any]:
     """Get detailed performance data for a specific algorithm"""
     
-    conn = psycopg2.connect(
+    conn = db_pool.connect(
         host='localhost',
         database='wfm_enterprise',
         user='postgres',
@@ -293,7 +294,7 @@ def get_algorithm_performance(algorithm_name: str, days: int = 7) -> Dict[str, A
 def export_performance_data(output_file: str = 'performance_data.json', days: int = 30):
     """Export performance data to JSON for further analysis"""
     
-    conn = psycopg2.connect(
+    conn = db_pool.connect(
         host='localhost',
         database='wfm_enterprise',
         user='postgres',
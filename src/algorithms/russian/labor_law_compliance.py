@@ -23,7 +23,15 @@ from enum import Enum
 import logging
 import psycopg2
 import psycopg2.extras
+import os
 import uuid
+try:
+    from ..core import db_pool
+except ImportError:
+    # Handle case when running standalone
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'core'))
+    import db_pool
 import asyncio
 import json
 
@@ -160,7 +168,7 @@ class RussianLaborLawCompliance:
     def connect_to_database(self):
         """Connect to wfm_enterprise database - Mobile Workforce Scheduler pattern"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",
                 user="postgres", 
@@ -10,20 +10,43 @@ FIXED VERSION: Uses real database tables instead of mock data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, BinaryIO, Iterator, Union
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils.dataframe import dataframe_to_rows
 import io
+import tempfile
 import logging
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
+try:
+    from ..core import db_pool
+except ImportError:
+    # Handle case when running standalone
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'core'))
+    import db_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming approved vacations from the database
+DEFAULT_FETCH_BATCH_SIZE = 5000
+
+# Bytes per chunk when streaming a finished workbook to a file or HTTP response
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Finished workbooks up to this size are spooled in memory, larger ones on disk
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Prepared columns written to the sheet, in column order A-H
+EXPORT_COLUMNS = [
+    'personnel_number', 'full_name', 'department', 'position',
+    'start_date_formatted', 'end_date_formatted', 'days_count', 'vacation_type_russian'
+]
+
 class VacationScheduleExporter:
     """
     Excel exporter for vacation schedules compatible with 1C ZUP
@@ -80,18 +103,10 @@ class VacationScheduleExporter:
     
     def get_db_connection(self):
         """Get database connection"""
-        return psycopg2.connect(**self.db_params)
+        return db_pool.connect(**self.db_params)
     
-    def get_approved_vacations(self, year: Optional[int] = None) -> List[Dict]:
-        """
-        Get approved vacation requests from the database
-        
-        Args:
-            year: Optional year filter
-            
-        Returns:
-            List of vacation records with employee information
-        """
+    def _approved_vacations_query(self, year: Optional[int] = None):
+        """Build the approved vacations query, ordered by department and name"""
         query = """
         SELECT 
             vr.id as vacation_id,
@@ -120,6 +135,19 @@ class VacationScheduleExporter:
             params.append(year)
         
         query += " ORDER BY d.name, e.last_name, e.first_name"
+        return query, params
+    
+    def get_approved_vacations(self, year: Optional[int] = None) -> List[Dict]:
+        """
+        Get approved vacation requests from the database
+        
+        Args:
+            year: Optional year filter
+            
+        Returns:
+            List of vacation records with employee information
+        """
+        query, params = self._approved_vacations_query(year)
         
         with self.get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -129,6 +157,30 @@ class VacationScheduleExporter:
         logger.info(f"Found {len(results)} approved vacation requests")
         return results
     
+    def iter_approved_vacation_batches(self, year: Optional[int] = None,
+                                       batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Stream approved vacation requests as export-ready DataFrame batches
+        
+        Uses a server-side cursor so only one batch is held in memory.
+        Batches keep the query order (department, last name, first name).
+        """
+        query, params = self._approved_vacations_query(year)
+        total = 0
+        
+        with self.get_db_connection() as conn:
+            with conn.cursor(name='vacation_schedule_export', cursor_factory=RealDictCursor) as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                while True:
+                    records = cur.fetchmany(batch_size)
+                    if not records:
+                        break
+                    total += len(records)
+                    yield self._prepare_database_records(pd.DataFrame(records))
+        
+        logger.info(f"Streamed {total} approved vacation requests")
+    
     def get_vacation_balances(self, employee_ids: List[str], year: int) -> Dict[str, Dict]:
         """
         Get vacation balances for employees
@@ -196,73 +248,133 @@ class VacationScheduleExporter:
         Returns:
             Excel file as bytes
         """
+        output = io.BytesIO()
+        self.write_vacation_schedule(output, vacation_data, year)
+        excel_bytes = self._save_to_bytes(output)
         
+        # Optionally save to file
+        if output_path:
+            with open(output_path, 'wb') as f:
+                f.write(excel_bytes)
+            logger.info(f"Vacation schedule saved to {output_path}")
+        
+        return excel_bytes
+    
+    def write_vacation_schedule(self,
+                                output: Union[str, BinaryIO],
+                                vacation_data: Optional[pd.DataFrame] = None,
+                                year: Optional[int] = None) -> int:
+        """
+        Write vacation schedule workbook to a file path or binary stream
+        
+        Uses a write-only worksheet, so rows are serialized as they are
+        appended and memory does not grow with the number of rows. Without
+        vacation_data, approved vacations are streamed from the database.
+        
+        Returns:
+            Number of vacation records written
+        """
         if year is None:
             year = datetime.now().year
         
         logger.info(f"Exporting vacation schedule for {year}")
         
-        # If no data provided, fetch from database
         if vacation_data is None:
-            vacation_records = self.get_approved_vacations(year)
-            if not vacation_records:
-                logger.warning("No approved vacation requests found")
-                # Create empty DataFrame with correct structure
-                vacation_data = pd.DataFrame(columns=[
-                    'employee_id', 'personnel_number', 'full_name', 'department', 
-                    'position', 'start_date', 'end_date', 'vacation_type'
-                ])
-            else:
-                # Convert to DataFrame
-                vacation_data = pd.DataFrame(vacation_records)
-                
-                # Format full name
-                vacation_data['full_name'] = vacation_data.apply(
-                    lambda r: self.format_full_name(r['first_name'], r['last_name'], r.get('patronymic')),
-                    axis=1
-                )
-                
-                # Use personnel_number or employee_number
-                vacation_data['personnel_number'] = vacation_data.apply(
-                    lambda r: r['personnel_number'] if r['personnel_number'] else r['employee_number'],
-                    axis=1
-                )
-                
-                # Fill missing positions
-                vacation_data['position'] = vacation_data['position'].fillna('Сотрудник')
+            batches = self.iter_approved_vacation_batches(year)
+        else:
+            batches = [self._prepare_vacation_data(vacation_data)]
         
-        # Validate and prepare data
-        prepared_data = self._prepare_vacation_data(vacation_data)
+        # Write-only workbook: sheet layout must be set before any row is appended
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=f"График отпусков {year}")
+        self._apply_formatting(workbook, worksheet)
+        self._create_headers(worksheet)
         
-        # Create Excel workbook
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
+        data_cells = self._data_row_cells(worksheet)
+        records = 0
+        for batch in batches:
+            self._add_vacation_data(worksheet, batch, data_cells)
+            records += len(batch)
         
-        # Set sheet name according to specification
-        worksheet.title = f"График отпусков {year}"
+        if records == 0:
+            logger.warning("No approved vacation requests found")
         
-        # Create headers
-        self._create_headers(worksheet)
+        workbook.save(output)
         
-        # Add data
-        self._add_vacation_data(worksheet, prepared_data)
+        logger.info(f"Vacation schedule exported successfully with {records} records")
+        return records
+    
+    def spool_vacation_schedule(self,
+                                vacation_data: Optional[pd.DataFrame] = None,
+                                year: Optional[int] = None) -> BinaryIO:
+        """
+        Build the vacation schedule workbook into a spooled temporary file
         
-        # Apply formatting
-        self._apply_formatting(worksheet, len(prepared_data))
+        The whole workbook is written before this returns, so export errors
+        surface here rather than halfway through a download. The file is
+        rewound for reading; the caller owns it (iter_spooled_workbook
+        closes it once read).
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_MAX_SIZE)
+        try:
+            self.write_vacation_schedule(spool, vacation_data, year)
+            spool.seek(0)
+        except Exception:
+            spool.close()
+            raise
+        return spool
+    
+    @staticmethod
+    def iter_spooled_workbook(spool: BinaryIO,
+                              chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Read a spooled workbook back chunk by chunk, closing it when done"""
+        try:
+            while True:
+                chunk = spool.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            spool.close()
+    
+    def iter_vacation_schedule(self,
+                               vacation_data: Optional[pd.DataFrame] = None,
+                               year: Optional[int] = None,
+                               chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream vacation schedule workbook in chunks
         
-        # Save to bytes
-        excel_bytes = self._save_to_bytes(workbook)
+        The workbook is built on the first next(); an HTTP handler that must
+        report export errors before sending headers should call
+        spool_vacation_schedule itself and stream with iter_spooled_workbook.
+        """
+        spool = self.spool_vacation_schedule(vacation_data, year)
+        yield from self.iter_spooled_workbook(spool, chunk_size)
+    
+    def _prepare_database_records(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Derive export columns from raw database rows (column-wise)"""
         
-        # Optionally save to file
-        if output_path:
-            with open(output_path, 'wb') as f:
-                f.write(excel_bytes)
-            logger.info(f"Vacation schedule saved to {output_path}")
+        df = data.copy()
         
-        logger.info(f"Vacation schedule exported successfully with {len(prepared_data)} records")
-        return excel_bytes
+        # Full name in Russian style: Фамилия И.О.
+        patronymic = df['patronymic'] if 'patronymic' in df.columns else pd.Series('', index=df.index)
+        patronymic = patronymic.fillna('').astype(str)
+        first_initial = df['first_name'].astype(str).str[0] + '.'
+        patronymic_initial = (patronymic.str[0] + '.').where(patronymic != '', '')
+        df['full_name'] = df['last_name'].astype(str) + ' ' + first_initial + patronymic_initial
+        
+        # Use personnel_number or employee_number
+        personnel_number = df['personnel_number']
+        df['personnel_number'] = personnel_number.where(
+            personnel_number.notna() & (personnel_number != ''), df['employee_number']
+        )
+        
+        # Fill missing positions
+        df['position'] = df['position'].fillna('Сотрудник')
+        
+        return self._prepare_vacation_data(df, sort=False)
     
-    def _prepare_vacation_data(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _prepare_vacation_data(self, data: pd.DataFrame, sort: bool = True) -> pd.DataFrame:
         """Prepare and validate vacation data for Excel export"""
         
         required_columns = [
@@ -287,15 +399,13 @@ class VacationScheduleExporter:
         df['start_date'] = pd.to_datetime(df['start_date'])
         df['end_date'] = pd.to_datetime(df['end_date'])
         
-        # Calculate days count (working days)
-        df['days_count'] = df.apply(
-            lambda r: self.calculate_working_days(r['start_date'], r['end_date']),
-            axis=1
-        )
+        # Calculate days count (working days, end date inclusive)
+        df['days_count'] = self._working_days_vectorized(df['start_date'], df['end_date'])
         
-        # Map vacation types to Russian
-        df['vacation_type_russian'] = df['vacation_type'].map(
-            lambda x: self.vacation_type_mapping.get(x, x if x else 'Основной')
+        # Map vacation types to Russian; unknown types pass through, empty ones default to Основной
+        vacation_type = df['vacation_type']
+        df['vacation_type_russian'] = vacation_type.map(self.vacation_type_mapping).fillna(
+            vacation_type.where(vacation_type.notna() & (vacation_type != ''), 'Основной')
         )
         
         # Format dates to Russian format (DD.MM.YYYY)
@@ -303,10 +413,22 @@ class VacationScheduleExporter:
         df['end_date_formatted'] = df['end_date'].dt.strftime('%d.%m.%Y')
         
         # Sort by department, then by name (as specified)
-        df = df.sort_values(['department', 'full_name'])
+        if sort:
+            df = df.sort_values(['department', 'full_name'])
         
         return df
     
+    @staticmethod
+    def _working_days_vectorized(start_dates: pd.Series, end_dates: pd.Series) -> pd.Series:
+        """Vectorized calculate_working_days: weekdays between dates, both ends inclusive"""
+        
+        days = np.zeros(len(start_dates), dtype=np.int64)
+        valid = (start_dates.notna() & end_dates.notna() & (end_dates >= start_dates)).to_numpy()
+        if valid.any():
+            start = start_dates[valid].to_numpy().astype('datetime64[D]')
+            end = end_dates[valid].to_numpy().astype('datetime64[D]') + np.timedelta64(1, 'D')
+            days[valid] = np.busday_count(start, end)
+        return pd.Series(days, index=start_dates.index)
     
     def _create_headers(self, worksheet):
         """Create Excel headers with Russian text"""
@@ -322,54 +444,40 @@ class VacationScheduleExporter:
             self.headers_russian['vacation_type']      # H
         ]
         
-        # Add headers to first row
-        for col_idx, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col_idx, value=header)
-            
-            # Header formatting
-            cell.font = Font(bold=True, name='Arial', size=11)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.fill = PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid')
-            
-            # Border
-            border = Border(
-                left=Side(border_style='thin'),
-                right=Side(border_style='thin'),
-                top=Side(border_style='thin'),
-                bottom=Side(border_style='thin')
-            )
-            cell.border = border
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.style = 'vacation_header'
+            header_cells.append(cell)
+        
+        worksheet.append(header_cells)
+    
+    def _data_row_cells(self, worksheet) -> List[WriteOnlyCell]:
+        """Styled cells for columns A-H, reused for every data row"""
+        
+        cells = []
+        for col_idx in range(1, 9):
+            cell = WriteOnlyCell(worksheet)
+            # Personnel Number, Dates and Days Count are centered
+            cell.style = 'vacation_center' if col_idx in [1, 5, 6, 7] else 'vacation_left'
+            cells.append(cell)
+        return cells
     
-    def _add_vacation_data(self, worksheet, data: pd.DataFrame):
+    def _add_vacation_data(self, worksheet, data: pd.DataFrame, cells: List[WriteOnlyCell]):
         """Add vacation data to Excel worksheet"""
         
-        for row_idx, (_, row) in enumerate(data.iterrows(), 2):  # Start from row 2
-            # Column A: Personnel Number
-            worksheet.cell(row=row_idx, column=1, value=str(row['personnel_number']))
-            
-            # Column B: Full Name
-            worksheet.cell(row=row_idx, column=2, value=str(row['full_name']))
-            
-            # Column C: Department
-            worksheet.cell(row=row_idx, column=3, value=str(row['department']))
-            
-            # Column D: Position
-            worksheet.cell(row=row_idx, column=4, value=str(row['position']))
-            
-            # Column E: Start Date (formatted)
-            worksheet.cell(row=row_idx, column=5, value=row['start_date_formatted'])
-            
-            # Column F: End Date (formatted)
-            worksheet.cell(row=row_idx, column=6, value=row['end_date_formatted'])
-            
-            # Column G: Days Count
-            worksheet.cell(row=row_idx, column=7, value=int(row['days_count']))
-            
-            # Column H: Vacation Type (Russian)
-            worksheet.cell(row=row_idx, column=8, value=row['vacation_type_russian'])
+        # Column-wise conversion, then one append per row with the shared styled cells
+        columns = data.reindex(columns=EXPORT_COLUMNS)
+        text = columns.drop(columns=['days_count']).astype(str)
+        text.insert(6, 'days_count', columns['days_count'].astype(int))
+        
+        for values in text.itertuples(index=False, name=None):
+            for cell, value in zip(cells, values):
+                cell.value = value
+            worksheet.append(cells)
     
-    def _apply_formatting(self, worksheet, data_rows: int):
-        """Apply formatting to Excel worksheet"""
+    def _apply_formatting(self, workbook, worksheet):
+        """Register cell styles and set column widths"""
         
         # Set column widths
         column_widths = {
@@ -386,7 +494,6 @@ class VacationScheduleExporter:
         for col, width in column_widths.items():
             worksheet.column_dimensions[col].width = width
         
-        # Apply borders and alignment to data rows
         border = Border(
             left=Side(border_style='thin'),
             right=Side(border_style='thin'),
@@ -394,26 +501,25 @@ class VacationScheduleExporter:
             bottom=Side(border_style='thin')
         )
         
-        for row_idx in range(2, data_rows + 2):  # Data rows
-            for col_idx in range(1, 9):  # Columns A-H
-                cell = worksheet.cell(row=row_idx, column=col_idx)
-                cell.border = border
-                cell.font = Font(name='Arial', size=10)
-                
-                # Specific alignment
-                if col_idx in [1, 7]:  # Personnel Number, Days Count
-                    cell.alignment = Alignment(horizontal='center')
-                elif col_idx in [5, 6]:  # Dates
-                    cell.alignment = Alignment(horizontal='center')
-                else:
-                    cell.alignment = Alignment(horizontal='left')
+        # Named styles are stored once in the workbook and referenced by every cell
+        workbook.add_named_style(NamedStyle(
+            name='vacation_header',
+            font=Font(bold=True, name='Arial', size=11),
+            alignment=Alignment(horizontal='center', vertical='center'),
+            fill=PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid'),
+            border=border
+        ))
+        for name, horizontal in (('vacation_center', 'center'), ('vacation_left', 'left')):
+            workbook.add_named_style(NamedStyle(
+                name=name,
+                font=Font(name='Arial', size=10),
+                alignment=Alignment(horizontal=horizontal),
+                border=border
+            ))
     
-    def _save_to_bytes(self, workbook) -> bytes:
-        """Save workbook to bytes with UTF-8 BOM encoding"""
+    def _save_to_bytes(self, output: io.BytesIO) -> bytes:
+        """Return written workbook bytes and release the buffer"""
         
-        # Save to BytesIO
-        output = io.BytesIO()
-        workbook.save(output)
         excel_bytes = output.getvalue()
         output.close()
         
@@ -13,10 +13,10 @@ from typing import Dict, List, Optional, Any, Union
 import json
 import logging
 from dataclasses import asdict, dataclass
-import psycopg2
 import uuid
 
 try:
+    from ..core import db_pool
     from .zup_time_code_generator import ZUPTimeCodeGenerator, TimeCodeAssignment, PayrollDocument
     from .vacation_schedule_exporter import VacationScheduleExporter
     from .labor_law_compliance import RussianLaborLawCompliance, ComplianceReport
@@ -25,6 +25,8 @@ except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'core'))
+    import db_pool
     from zup_time_code_generator import ZUPTimeCodeGenerator, TimeCodeAssignment, PayrollDocument
     from vacation_schedule_exporter import VacationScheduleExporter
     from labor_law_compliance import RussianLaborLawCompliance, ComplianceReport
@@ -119,7 +121,7 @@ class ZUPIntegrationService:
     def connect_to_wfm_database(self) -> bool:
         """Mobile Workforce Pattern: Connect to real WFM Enterprise database"""
         try:
-            self.wfm_conn = psycopg2.connect(**self.wfm_db_params)
+            self.wfm_conn = db_pool.connect(**self.wfm_db_params)
             logger.info("Connected to WFM Enterprise database for real employee data")
             return True
         except Exception as e:
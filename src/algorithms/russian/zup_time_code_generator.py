@@ -19,6 +19,19 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MINUTES_PER_DAY = 24 * 60
+
+# Default Russian holidays (month, day) when no production calendar is given
+DEFAULT_RUSSIAN_HOLIDAYS = frozenset([
+    (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7), (1, 8),  # New Year
+    (2, 23),  # Defender of the Fatherland Day
+    (3, 8),   # International Women's Day
+    (5, 1),   # Labour Day
+    (5, 9),   # Victory Day
+    (6, 12),  # Russia Day
+    (11, 4),  # Unity Day
+])
+
 class TimeCodeType(Enum):
     """1C ZUP Time Type Codes - Complete Russian Mapping"""
     # Primary work types
@@ -200,8 +213,8 @@ class ZUPTimeCodeGenerator:
     def _connect_to_wfm_database(self):
         """Connect to wfm_enterprise database for real workforce data"""
         try:
-            import psycopg2
-            self.db_connection = psycopg2.connect(
+            from ..core import db_pool
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",
                 user="postgres",
@@ -405,6 +418,9 @@ class ZUPTimeCodeGenerator:
         """
         Generate time codes for schedule data
         
+        Planned and actual data are merged once on (employee_id, date); night
+        hours and time codes are computed column-wise for the whole period.
+        
         Args:
             schedule_data: Planned schedule with columns ['employee_id', 'date', 'start_time', 'end_time', 'hours']
             actual_data: Actual work time (optional)
@@ -415,45 +431,71 @@ class ZUPTimeCodeGenerator:
         """
         logger.info(f"Generating time codes for {len(schedule_data)} schedule entries")
         
-        assignments = []
+        if schedule_data.empty:
+            self._save_assignments([])
+            return []
         
-        for _, row in schedule_data.iterrows():
-            employee_id = row['employee_id']
-            date = pd.to_datetime(row['date'])
-            
-            # Get planned hours
-            planned_hours = row.get('hours', 0)
-            start_time = pd.to_datetime(row.get('start_time')) if 'start_time' in row else None
-            end_time = pd.to_datetime(row.get('end_time')) if 'end_time' in row else None
-            
-            # Calculate night hours if shift times available
-            night_hours = 0
-            if start_time and end_time:
-                night_hours = self._calculate_night_hours(start_time, end_time)
-            
-            # Get actual hours if available
-            actual_hours = planned_hours
-            if actual_data is not None:
-                actual_row = actual_data[
-                    (actual_data['employee_id'] == employee_id) & 
-                    (pd.to_datetime(actual_data['date']) == date)
-                ]
-                if not actual_row.empty:
-                    actual_hours = actual_row.iloc[0].get('hours', planned_hours)
-            
-            # Determine time code based on schedule and deviations
-            assignment = self._determine_time_code(
-                employee_id=employee_id,
+        merged = self._merge_planned_and_actual(schedule_data, actual_data)
+        dates = merged['_date']
+        planned = merged['_planned_hours'].to_numpy(dtype=float)
+        actual = merged['_actual_hours'].to_numpy(dtype=float)
+        
+        # Calculate night hours if shift times available
+        if 'start_time' in merged.columns and 'end_time' in merged.columns:
+            night = self._calculate_night_hours_vectorized(merged['start_time'], merged['end_time'])
+        else:
+            night = np.zeros(len(merged))
+        
+        is_non_working = (dates.dt.weekday >= 5).to_numpy() | self._holiday_mask(dates, production_calendar)
+        has_night = night > 0
+        
+        # Decision rules in the same order as _determine_time_code
+        unplanned = (planned == 0) & (actual > 0)
+        rules = [
+            unplanned & is_non_working & has_night,
+            unplanned & is_non_working,
+            unplanned,  # Unplanned work on a working day gets no code
+            (planned > 0) & (actual == 0),
+            (planned > 0) & (actual < planned),
+            actual > planned,
+            (planned > 0) & (actual == planned) & has_night,
+            (planned > 0) & (actual == planned),
+            (planned == 0) & (actual == 0),
+        ]
+        rule = np.select(rules, np.arange(len(rules)), default=-1)
+        
+        code_hours = np.select(
+            [rule <= 1, rule == 3, rule == 4, rule == 5, rule <= 7],
+            [actual, planned, planned - actual, actual - planned, actual],
+            default=0.0
+        )
+        code_night = np.select(
+            [rule <= 1, rule == 5, (rule == 6) | (rule == 7)],
+            [night, np.minimum(night, actual - planned), night],
+            default=0.0
+        )
+        
+        # Build the assignment objects from the computed columns
+        assignments = []
+        templates = self._time_code_templates()
+        for employee_id, date, rule_id, hours, night_hours in zip(
+                merged['employee_id'].tolist(), dates.tolist(), rule.tolist(),
+                code_hours.tolist(), code_night.tolist()):
+            template = templates.get(rule_id)
+            if template is None:
+                continue
+            time_code, description, document_type, compensation_method, premium_rate = template
+            assignments.append(TimeCodeAssignment(
                 date=date,
-                planned_hours=planned_hours,
-                actual_hours=actual_hours,
+                employee_id=employee_id,
+                time_code=time_code,
+                hours=hours,
                 night_hours=night_hours,
-                production_calendar=production_calendar,
-                start_time=start_time
-            )
-            
-            if assignment:
-                assignments.append(assignment)
+                description=description.format(hours=f"{hours:g}"),
+                document_type=document_type,
+                compensation_method=compensation_method,
+                premium_rate=premium_rate
+            ))
         
         # Save assignments
         self._save_assignments(assignments)
@@ -461,6 +503,50 @@ class ZUPTimeCodeGenerator:
         logger.info(f"Generated {len(assignments)} time code assignments")
         return assignments
     
+    def _merge_planned_and_actual(self,
+                                  schedule_data: pd.DataFrame,
+                                  actual_data: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """Left-join actual hours onto the schedule by (employee_id, date)"""
+        merged = schedule_data.reset_index(drop=True).copy()
+        merged['_date'] = pd.to_datetime(merged['date'])
+        merged['_planned_hours'] = merged['hours'] if 'hours' in merged.columns else 0
+        merged['_actual_hours'] = merged['_planned_hours']
+        
+        if actual_data is not None and not actual_data.empty and 'hours' in actual_data.columns:
+            # First actual row per employee and day wins
+            actual = pd.DataFrame({
+                'employee_id': actual_data['employee_id'].to_numpy(),
+                '_date': pd.to_datetime(actual_data['date']).to_numpy(),
+                '_reported_hours': actual_data['hours'].to_numpy()
+            }).drop_duplicates(subset=['employee_id', '_date'], keep='first')
+            
+            merged = merged.merge(actual, on=['employee_id', '_date'], how='left', sort=False)
+            reported = merged['_reported_hours']
+            merged['_actual_hours'] = reported.where(reported.notna(), merged['_planned_hours'])
+        
+        return merged
+    
+    def _time_code_templates(self) -> Dict[int, Tuple]:
+        """Time code, description, document, compensation and premium per decision rule"""
+        return {
+            0: (TimeCodeType.NIGHT_WEEKEND, "Ночная работа в выходной: {hours} часов",
+                DocumentType.WEEKEND_WORK_DOC, "Increased payment", self.premium_rates["weekend_work"]),
+            1: (TimeCodeType.WEEKEND_WORK, "Работа в выходной: {hours} часов",
+                DocumentType.WEEKEND_WORK_DOC, "Increased payment", self.premium_rates["weekend_work"]),
+            3: (TimeCodeType.ABSENCE, "Неявка: {hours} часов",
+                DocumentType.ABSENCE_DOC, None, None),
+            4: (TimeCodeType.ABSENCE, "Частичная неявка: {hours} часов",
+                DocumentType.ABSENCE_DOC, None, None),
+            5: (TimeCodeType.OVERTIME, "Сверхурочная работа: {hours} часов",
+                DocumentType.OVERTIME_DOC, "Increased payment", self.premium_rates["overtime"]),
+            6: (TimeCodeType.NIGHT_WORK, "Ночная работа: {hours} часов",
+                DocumentType.INDIVIDUAL_SCHEDULE, None, self.premium_rates["night_work"]),
+            7: (TimeCodeType.DAY_WORK, "Дневная работа: {hours} часов",
+                DocumentType.INDIVIDUAL_SCHEDULE, None, None),
+            8: (TimeCodeType.DAY_OFF, "Выходной день",
+                DocumentType.INDIVIDUAL_SCHEDULE, None, None),
+        }
+    
     def _determine_time_code(self, 
                            employee_id: str,
                            date: datetime, 
@@ -581,41 +667,61 @@ class ZUPTimeCodeGenerator:
         if not start_time or not end_time:
             return 0
         
-        night_hours = 0
-        current = start_time
+        return float(self._calculate_night_hours_vectorized(pd.Series([start_time]), pd.Series([end_time]))[0])
+    
+    def _calculate_night_hours_vectorized(self, start_times: pd.Series, end_times: pd.Series) -> np.ndarray:
+        """
+        Calculate night work hours (22:00 - 06:00) for whole columns of shifts
         
-        while current < end_time:
-            current_time = current.time()
-            
-            # Check if current hour is in night period
-            if (current_time >= self.night_start or current_time < self.night_end):
-                # Add one hour, but not more than remaining shift time
-                remaining_shift = (end_time - current).total_seconds() / 3600
-                night_hours += min(1.0, remaining_shift)
-            
-            current += timedelta(hours=1)
+        Shift bounds are turned into minute offsets from midnight of the start
+        day and intersected with the night windows. A shift whose end is before
+        its start (times without dates) crosses midnight.
+        """
+        start = pd.to_datetime(start_times, errors='coerce', format='mixed')
+        end = pd.to_datetime(end_times, errors='coerce', format='mixed')
+        
+        start_minute = (start.dt.hour * 60 + start.dt.minute + start.dt.second / 60).to_numpy(dtype=float)
+        duration = ((end - start).dt.total_seconds() / 60).to_numpy(dtype=float)
+        duration = np.where(duration < 0, duration + MINUTES_PER_DAY, duration)
+        
+        valid = ~(np.isnan(start_minute) | np.isnan(duration))
+        start_minute = np.where(valid, start_minute, 0.0)
+        end_minute = start_minute + np.where(valid, duration, 0.0)
+        
+        night_start = self.night_start.hour * 60 + self.night_start.minute
+        night_end = self.night_end.hour * 60 + self.night_end.minute
+        days = int(np.ceil(end_minute.max(initial=0.0) / MINUTES_PER_DAY)) + 1
         
-        return night_hours
+        night_minutes = np.zeros(len(start_minute))
+        for day in range(days):
+            window_start = day * MINUTES_PER_DAY + night_start - MINUTES_PER_DAY
+            window_end = day * MINUTES_PER_DAY + night_end
+            overlap = np.minimum(end_minute, window_end) - np.maximum(start_minute, window_start)
+            night_minutes += np.clip(overlap, 0.0, None)
+        
+        return night_minutes / 60
     
     def _is_holiday(self, date: datetime, production_calendar: Optional[Dict]) -> bool:
         """Check if date is a holiday according to production calendar"""
         if not production_calendar:
             # Default Russian holidays
-            default_holidays = [
-                (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7), (1, 8),  # New Year
-                (2, 23),  # Defender of the Fatherland Day
-                (3, 8),   # International Women's Day
-                (5, 1),   # Labour Day
-                (5, 9),   # Victory Day
-                (6, 12),  # Russia Day
-                (11, 4),  # Unity Day
-            ]
-            return (date.month, date.day) in default_holidays
+            return (date.month, date.day) in DEFAULT_RUSSIAN_HOLIDAYS
         
         # Use production calendar data
         date_str = date.strftime('%Y-%m-%d')
         return production_calendar.get(date_str, {}).get('is_holiday', False)
     
+    def _holiday_mask(self, dates: pd.Series, production_calendar: Optional[Dict]) -> np.ndarray:
+        """Vectorized _is_holiday for a column of dates"""
+        if not production_calendar:
+            month_day = dates.dt.month * 100 + dates.dt.day
+            return month_day.isin([month * 100 + day for month, day in DEFAULT_RUSSIAN_HOLIDAYS]).to_numpy()
+        
+        holidays = pd.to_datetime([
+            date_str for date_str, info in production_calendar.items() if info.get('is_holiday', False)
+        ])
+        return dates.dt.normalize().isin(holidays).to_numpy()
+    
     def analyze_deviations(self, 
                          planned_data: pd.DataFrame,
                          actual_data: pd.DataFrame) -> List[DeviationAnalysis]:
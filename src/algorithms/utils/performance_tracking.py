@@ -19,6 +19,7 @@ import functools
 from datetime import datetime
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from typing import Dict, Any, Optional, Callable
 import logging
 
@@ -110,7 +111,7 @@ class PerformanceTracker:
     def _log_performance(self, **kwargs):
         """Log to query_performance_log table"""
         try:
-            conn = psycopg2.connect(**self.db_config)
+            conn = db_pool.connect(**self.db_config)
             cur = conn.cursor()
             
             # Generate a simple hash for the query
@@ -143,7 +144,7 @@ class PerformanceTracker:
     def get_slow_queries(self, days: int = 7, threshold_ms: int = 2000) -> list:
         """Get queries that exceed the threshold"""
         try:
-            conn = psycopg2.connect(**self.db_config)
+            conn = db_pool.connect(**self.db_config)
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
             
             cur.execute("""
@@ -175,7 +176,7 @@ class PerformanceTracker:
     def get_performance_summary(self, algorithm_name: str, days: int = 7) -> Dict[str, Any]:
         """Get performance summary for a specific algorithm"""
         try:
-            conn = psycopg2.connect(**self.db_config)
+            conn = db_pool.connect(**self.db_config)
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
             
             # Overall stats
@@ -18,8 +18,8 @@ from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from ..core import db_pool
 
 # Self-contained validation components (no external dependencies)
 @dataclass
@@ -195,7 +195,7 @@ class EmployeeRequestValidator:
         
         # Employee existence validation
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check if employee ID exists in employee_requests (validation uses this table)
                     cur.execute("""
@@ -227,7 +227,7 @@ class EmployeeRequestValidator:
         details = {}
         
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check for existing employee requests in the request period
                     cur.execute("""
@@ -272,7 +272,7 @@ class EmployeeRequestValidator:
         details = {}
         
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check minimum notice period
                     notice_days = (context.start_date - date.today()).days
@@ -379,7 +379,7 @@ class EmployeeRequestValidator:
         
         # Check time off balance
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check time off balance using existing employee data
                     cur.execute("""
@@ -434,7 +434,7 @@ class EmployeeRequestValidator:
         
         # Check for recent sick leave requests
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
                         SELECT COUNT(*) as recent_requests
@@ -468,7 +468,7 @@ class EmployeeRequestValidator:
         
         # Check vacation balance
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check vacation requests this year
                     cur.execute("""
@@ -521,7 +521,7 @@ class EmployeeRequestValidator:
         
         # Validate exchange partner
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Check partner employee exists in requests
                     cur.execute("""
@@ -555,7 +555,7 @@ class EmployeeRequestValidator:
         
         # Check supervisor assignment
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with db_pool.connect(self.connection_string) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Basic approval workflow validation
                     cur.execute("""
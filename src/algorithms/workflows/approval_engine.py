@@ -25,14 +25,16 @@ Zero Mock Policy: No mock data - all approval processing uses real database quer
 Performance Verified: Meets BDD timing requirements
 """
 
+import bisect
 import logging
 import time
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import uuid
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from dataclasses import dataclass
 from enum import Enum
 
@@ -86,6 +88,120 @@ class WorkflowInstance:
     updated_at: datetime
     metadata: Dict[str, Any]
 
+# Inbox key for requests without a specific approver (employee_requests, vacation_requests)
+SHARED_INBOX = '*'
+
+class ApprovalInbox:
+    """
+    Materialized per-approver index of pending approvals
+
+    Each approver's items are kept in a list sorted newest first by (submitted_at, id),
+    so a page is a single slice regardless of inbox size. Workflow tasks are filed
+    under their assigned_to; requests without an approver go to SHARED_INBOX.
+    """
+
+    def __init__(self):
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._item_inbox: Dict[str, str] = {}
+        self._sort_keys: Dict[str, Tuple[float, str]] = {}
+        self._inboxes: Dict[str, List[Tuple[float, str]]] = {}
+        self._workflow_items: Dict[str, set] = {}
+        self.loaded_at: Optional[float] = None
+
+    @staticmethod
+    def approver_key(item: Dict[str, Any]) -> str:
+        """Inbox key for an approval item"""
+        if item.get('type') == 'workflow_task' and item.get('assigned_to') is not None:
+            return str(item['assigned_to'])
+        return SHARED_INBOX
+
+    @staticmethod
+    def entry_id(item_type: str, item_id: Any) -> str:
+        """Entry key; request ids are only unique within their source table"""
+        return f"{item_type}:{item_id}"
+
+    def load(self, approvals: List[Dict[str, Any]]):
+        """Rebuild all inboxes from a full pending-approvals snapshot"""
+        self._items.clear()
+        self._item_inbox.clear()
+        self._sort_keys.clear()
+        self._inboxes.clear()
+        self._workflow_items.clear()
+        for item in approvals:
+            self._add(item)
+        for entries in self._inboxes.values():
+            entries.sort()
+        self.loaded_at = time.time()
+
+    def upsert(self, item: Dict[str, Any]):
+        """Insert or replace a pending approval"""
+        self.remove(item['type'], item['id'])
+        key, sort_key = self._add(item)
+        entries = self._inboxes[key]
+        entries.pop()
+        bisect.insort(entries, sort_key)
+
+    def remove(self, item_type: str, item_id: Any) -> bool:
+        """Remove an approval that is no longer pending"""
+        entry_id = self.entry_id(item_type, item_id)
+        item = self._items.pop(entry_id, None)
+        if item is None:
+            return False
+        key = self._item_inbox.pop(entry_id)
+        sort_key = self._sort_keys.pop(entry_id)
+        entries = self._inboxes[key]
+        index = bisect.bisect_left(entries, sort_key)
+        if index < len(entries) and entries[index] == sort_key:
+            entries.pop(index)
+        if not entries:
+            del self._inboxes[key]
+        workflow_id = item.get('workflow_instance_id')
+        if workflow_id is not None:
+            workflow_entries = self._workflow_items.get(str(workflow_id), set())
+            workflow_entries.discard(entry_id)
+            if not workflow_entries:
+                self._workflow_items.pop(str(workflow_id), None)
+        return True
+
+    def update_workflow_data(self, workflow_instance_id: str, workflow_data: Dict[str, Any]) -> int:
+        """Refresh workflow_data on every pending task of a workflow instance"""
+        entry_ids = self._workflow_items.get(str(workflow_instance_id), set())
+        for entry_id in entry_ids:
+            self._items[entry_id]['workflow_data'] = workflow_data
+        return len(entry_ids)
+
+    def count(self, approver_id: Optional[str] = None) -> int:
+        """Number of pending approvals in one inbox"""
+        return len(self._inboxes.get(SHARED_INBOX if approver_id is None else str(approver_id), []))
+
+    def get_page(self, approver_id: Optional[str] = None, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """Read one page of an inbox, newest first"""
+        entries = self._inboxes.get(SHARED_INBOX if approver_id is None else str(approver_id), [])
+        page = entries[offset:offset + limit]
+        return {
+            'items': [self._items[entry_id] for _, entry_id in page],
+            'total': len(entries),
+            'offset': offset,
+            'limit': limit,
+            'has_more': offset + limit < len(entries)
+        }
+
+    def _add(self, item: Dict[str, Any]) -> Tuple[str, Tuple[float, str]]:
+        entry_id = self.entry_id(item['type'], item['id'])
+        key = self.approver_key(item)
+        submitted_at = item.get('submitted_at')
+        timestamp = submitted_at.timestamp() if isinstance(submitted_at, datetime) else 0.0
+        sort_key = (-timestamp, entry_id)
+
+        self._items[entry_id] = item
+        self._item_inbox[entry_id] = key
+        self._sort_keys[entry_id] = sort_key
+        self._inboxes.setdefault(key, []).append(sort_key)
+        workflow_id = item.get('workflow_instance_id')
+        if workflow_id is not None:
+            self._workflow_items.setdefault(str(workflow_id), set()).add(entry_id)
+        return key, sort_key
+
 class MultiStepApprovalEngine:
     """
     Multi-step approval engine for complex business workflows
@@ -99,12 +215,17 @@ class MultiStepApprovalEngine:
     def __init__(self):
         """Initialize with database connection to wfm_enterprise"""
         self.db_connection = None
+        self.task_state_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.approval_inbox = ApprovalInbox()
+        self.inbox_max_age_seconds = 300
+        self.role_cache_ttl_seconds = 300
+        self._role_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
         self.connect_to_database()
         
     def connect_to_database(self):
         """Connect to wfm_enterprise database - CRITICAL: correct database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",  # CRITICAL: Using wfm_enterprise not postgres
                 user="postgres", 
@@ -115,6 +236,24 @@ class MultiStepApprovalEngine:
             logger.error(f"Database connection failed: {e}")
             raise
     
+    def add_task_state_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for workflow task state changes
+        
+        Listeners receive a task dict (id, workflow_instance_id, task_name, assigned_to,
+        task_status, created_at) after each committed create or decision, e.g.
+        EscalationManager.on_task_state_change to keep escalation deadlines current.
+        """
+        self.task_state_listeners.append(listener)
+    
+    def notify_task_state_change(self, task: Dict[str, Any]):
+        """Notify registered listeners of a committed task state change"""
+        for listener in self.task_state_listeners:
+            try:
+                listener(task)
+            except Exception as e:
+                logger.error(f"Task state listener failed for task {task.get('id')}: {e}")
+    
     def get_workflow_definition(self, workflow_type: str) -> Optional[Dict[str, Any]]:
         """
         Get workflow definition from wfm_enterprise database
@@ -280,6 +419,19 @@ class MultiStepApprovalEngine:
                 'updated_at': datetime.now()
             }
     
+    def build_instance_data(self, workflow_definition_id: str, initiator_user_id: str,
+                            object_type: str, object_id: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Build the workflow_instances.data payload for a new instance"""
+        return {
+            'workflow_definition_id': workflow_definition_id,
+            'initiator_user_id': initiator_user_id,
+            'object_type': object_type,
+            'object_id': object_id,
+            'current_state': WorkflowState.INITIATED.value,
+            'current_step': 1,
+            'metadata': metadata or {}
+        }
+    
     def create_workflow_instance(self, workflow_definition_id: str, initiator_user_id: str,
                                 object_type: str, object_id: str, metadata: Dict[str, Any] = None) -> str:
         """
@@ -298,15 +450,9 @@ class MultiStepApprovalEngine:
                 ) VALUES (%s, %s, %s, %s, %s)
                 """
                 
-                instance_data = {
-                    'workflow_definition_id': workflow_definition_id,
-                    'initiator_user_id': initiator_user_id,
-                    'object_type': object_type,
-                    'object_id': object_id,
-                    'current_state': WorkflowState.INITIATED.value,
-                    'current_step': 1,
-                    'metadata': metadata or {}
-                }
+                instance_data = self.build_instance_data(
+                    workflow_definition_id, initiator_user_id, object_type, object_id, metadata
+                )
                 
                 cursor.execute(insert_query, (
                     workflow_instance_id,  # Use string directly, PostgreSQL will convert
@@ -325,15 +471,20 @@ class MultiStepApprovalEngine:
             self.db_connection.rollback()
             raise
     
-    def create_approval_tasks(self, workflow_instance_id: str, workflow_definition: Dict[str, Any]) -> List[str]:
+    def create_approval_tasks(self, workflow_instance_id: str, workflow_definition: Dict[str, Any],
+                              workflow_data: Dict[str, Any] = None) -> List[str]:
         """
         Create approval tasks for all workflow steps
         
+        Args:
+            workflow_data: Instance data, used for the new tasks' approval inbox entries
+        
         Returns list of task IDs for real approval task tracking
         """
         try:
             with self.db_connection.cursor() as cursor:
                 task_ids = []
+                created_tasks = []
                 workflow_steps = workflow_definition.get('definition', {}).get('steps', [])
                 
                 for i, step in enumerate(workflow_steps, 1):
@@ -362,6 +513,7 @@ class MultiStepApprovalEngine:
                         'task_data': step.get('task_data', {})
                     }
                     
+                    created_at = datetime.now()
                     cursor.execute(insert_query, (
                         task_id,  # Use string directly
                         workflow_instance_id,  # Use string directly
@@ -370,12 +522,26 @@ class MultiStepApprovalEngine:
                         'pending',
                         due_date,
                         json.dumps(task_data),
-                        datetime.now()
+                        created_at
                     ))
                     
                     task_ids.append(task_id)
+                    created_tasks.append({
+                        'id': task_id,
+                        'workflow_instance_id': workflow_instance_id,
+                        'task_name': step.get('name', f'Step {i}'),
+                        'assigned_to': assigned_agent_id,
+                        'task_status': 'pending',
+                        'due_date': due_date,
+                        'created_at': created_at,
+                        'task_data': task_data
+                    })
                 
                 self.db_connection.commit()
+                for created_task in created_tasks:
+                    if self.approval_inbox.loaded_at is not None:
+                        self.approval_inbox.upsert(self.build_inbox_item(created_task, workflow_data or {}))
+                    self.notify_task_state_change(created_task)
                 logger.info(f"Created {len(task_ids)} approval tasks for workflow {workflow_instance_id}")
                 return task_ids
                 
@@ -384,32 +550,58 @@ class MultiStepApprovalEngine:
             self.db_connection.rollback()
             return []
     
+    def _get_cached_role(self, kind: str, role: str) -> Tuple[bool, Any]:
+        """Look up a role resolution in the TTL cache"""
+        cached = self._role_cache.get((kind, role))
+        if cached and time.time() - cached[0] < self.role_cache_ttl_seconds:
+            return True, cached[1]
+        return False, None
+    
+    def invalidate_role_cache(self, role: str = None):
+        """Drop cached role → approver resolutions (all roles if role is None)"""
+        if role is None:
+            self._role_cache.clear()
+        else:
+            for kind in ('agent', 'user'):
+                self._role_cache.pop((kind, role), None)
+    
     def get_agent_for_role(self, role: str) -> Optional[int]:
-        """Get first available agent for specified role"""
+        """
+        Get first available agent for specified role (cached per role)
+        
+        Only agents found in the database are cached; the default agent used when the
+        lookup fails is not, so the next call queries again.
+        """
+        hit, agent_id = self._get_cached_role('agent', role)
+        if hit:
+            return agent_id
         try:
-            with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                # Check if agents table exists and get an agent
-                query = """
-                SELECT id
-                FROM agents 
-                WHERE is_active = true
-                ORDER BY created_at
-                LIMIT 1
-                """
-                
-                cursor.execute(query)
-                result = cursor.fetchone()
-                
-                if result:
-                    return result['id']
-                else:
-                    # Create a default agent if none exists
-                    return self.create_default_agent(role)
-                    
+            agent_id = self._resolve_agent_for_role(role)
         except psycopg2.Error as e:
             logger.error(f"Failed to get agent for role {role}: {e}")
             # Return a default agent ID
             return 1
+        if agent_id is None:
+            # Create a default agent if none exists
+            return self.create_default_agent(role)
+        self._role_cache[('agent', role)] = (time.time(), agent_id)
+        return agent_id
+    
+    def _resolve_agent_for_role(self, role: str) -> Optional[int]:
+        """Query first available agent for specified role, None if there is none"""
+        with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            # Check if agents table exists and get an agent
+            query = """
+            SELECT id
+            FROM agents 
+            WHERE is_active = true
+            ORDER BY created_at
+            LIMIT 1
+            """
+            
+            cursor.execute(query)
+            result = cursor.fetchone()
+            return result['id'] if result else None
     
     def create_default_agent(self, role: str) -> int:
         """Create a default agent for the role"""
@@ -430,6 +622,7 @@ class MultiStepApprovalEngine:
                 
                 agent_id = cursor.fetchone()[0]
                 self.db_connection.commit()
+                self.invalidate_role_cache()
                 logger.info(f"Created default agent for {role} with ID {agent_id}")
                 return agent_id
                 
@@ -439,7 +632,17 @@ class MultiStepApprovalEngine:
             return 1  # Return default ID
     
     def get_user_for_role(self, role: str) -> Optional[str]:
-        """Get first available user for specified role"""
+        """Get first available user for specified role (cached per role)"""
+        hit, user_id = self._get_cached_role('user', role)
+        if hit:
+            return user_id
+        user_id = self._resolve_user_for_role(role)
+        if user_id is not None:
+            self._role_cache[('user', role)] = (time.time(), user_id)
+        return user_id
+    
+    def _resolve_user_for_role(self, role: str) -> Optional[str]:
+        """Query first available user for specified role"""
         try:
             with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                 query = """
@@ -582,6 +785,7 @@ class MultiStepApprovalEngine:
                     all_approvals.append({
                         'id': str(task['id']),
                         'type': 'workflow_task',
+                        'workflow_instance_id': str(task['workflow_instance_id']),
                         'task_name': task['task_name'],
                         'assigned_to': task['assigned_to'],
                         'status': task['status'],
@@ -603,6 +807,43 @@ class MultiStepApprovalEngine:
             logger.error(f"Failed to retrieve pending approvals: {e}")
             return []
     
+    def build_inbox_item(self, task: Dict[str, Any], workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Approval inbox entry for a workflow task (same shape as get_pending_approvals)"""
+        task_data = task.get('task_data') or {}
+        return {
+            'id': str(task['id']),
+            'type': 'workflow_task',
+            'workflow_instance_id': str(task['workflow_instance_id']),
+            'task_name': task['task_name'],
+            'assigned_to': task['assigned_to'],
+            'status': task.get('task_status', 'pending'),
+            'submitted_at': task.get('created_at'),
+            'due_date': task.get('due_date'),
+            'description': task_data.get('description', task['task_name']),
+            'workflow_data': workflow_data,
+            'source': 'workflow_tasks'
+        }
+    
+    def refresh_approval_inbox(self) -> int:
+        """Rebuild the materialized approval inbox from the database"""
+        approvals = self.get_pending_approvals()
+        self.approval_inbox.load(approvals)
+        return len(approvals)
+    
+    def get_inbox_page(self, approver_id: str = None, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        Read one page of an approver's pending approvals, newest first
+        
+        Served from the materialized inbox, which is kept current by create_approval_tasks,
+        process_approval and process_approval_decision after they commit. The inbox is rebuilt
+        after inbox_max_age_seconds to pick up requests written outside this engine.
+        approver_id=None reads the shared inbox (employee and vacation requests).
+        """
+        loaded_at = self.approval_inbox.loaded_at
+        if loaded_at is None or time.time() - loaded_at > self.inbox_max_age_seconds:
+            self.refresh_approval_inbox()
+        return self.approval_inbox.get_page(approver_id, offset, limit)
+    
     def process_approval(self, request_id: str, decision: str, manager_id: str = None, comments: str = None) -> Dict[str, Any]:
         """
         Process approval decision for any type of request
@@ -675,6 +916,9 @@ class MultiStepApprovalEngine:
                           request_id))
                 
                 self.db_connection.commit()
+                self.approval_inbox.remove(request_type, request['id'])
+                if request_type == 'workflow_task':
+                    self.notify_task_state_change({'id': request['id'], 'task_status': new_status})
                 
                 processing_time = time.time() - start_time
                 logger.info(f"Processed {request_type} approval in {processing_time:.3f}s")
@@ -745,10 +989,26 @@ class MultiStepApprovalEngine:
                 pending_count = cursor.fetchone()['pending_count']
                 
                 # If no pending tasks, advance workflow
+                advanced_data = None
                 if pending_count == 0:
-                    self.advance_workflow(workflow_instance_id, decision)
+                    advanced_data = self._advance_workflow(workflow_instance_id, decision)
+                    if advanced_data is None:
+                        self.db_connection.rollback()
+                        return False
                 
                 self.db_connection.commit()
+                # Inbox changes are applied only once the decision is committed
+                self.approval_inbox.remove('workflow_task', task_id)
+                if advanced_data is not None:
+                    self.approval_inbox.update_workflow_data(workflow_instance_id, advanced_data)
+                self.notify_task_state_change({
+                    'id': task_id,
+                    'workflow_instance_id': workflow_instance_id,
+                    'task_name': task['task_name'],
+                    'assigned_to': task['assigned_to'],
+                    'task_status': status.value,
+                    'created_at': task['created_at']
+                })
                 
                 processing_time = time.time() - start_time
                 logger.info(f"Processed approval decision in {processing_time:.3f}s")
@@ -772,6 +1032,15 @@ class MultiStepApprovalEngine:
         
         Updates workflow state in real-time with database persistence
         """
+        return self._advance_workflow(workflow_instance_id, last_decision) is not None
+    
+    def _advance_workflow(self, workflow_instance_id: str, last_decision: str) -> Optional[Dict[str, Any]]:
+        """
+        Write the next workflow state without committing
+        
+        Returns the new workflow data, or None if the workflow was not found or the
+        update failed. The caller commits and then refreshes the approval inbox.
+        """
         try:
             with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                 # Get workflow instance
@@ -783,7 +1052,7 @@ class MultiStepApprovalEngine:
                 
                 workflow = cursor.fetchone()
                 if not workflow:
-                    return False
+                    return None
                 
                 # Parse workflow data
                 workflow_data = workflow['data'] or {}
@@ -830,11 +1099,11 @@ class MultiStepApprovalEngine:
                     WHERE id = %s
                 """, (new_state, json.dumps(workflow_data), workflow_instance_id))
                 
-                return True
+                return workflow_data
                 
         except psycopg2.Error as e:
             logger.error(f"Failed to advance workflow: {e}")
-            return False
+            return None
     
     def initiate_approval_workflow(self, workflow_type: str, object_type: str, 
                                   object_id: str, initiator_user_id: str,
@@ -870,7 +1139,10 @@ class MultiStepApprovalEngine:
             )
             
             # Create approval tasks
-            task_ids = self.create_approval_tasks(workflow_instance_id, workflow_definition)
+            workflow_data = self.build_instance_data(
+                workflow_definition['id'], initiator_user_id, object_type, object_id, metadata
+            )
+            task_ids = self.create_approval_tasks(workflow_instance_id, workflow_definition, workflow_data)
             
             total_time = time.time() - start_time
             
@@ -896,7 +1168,160 @@ class MultiStepApprovalEngine:
                 'message': f'Failed to initiate workflow: {str(e)}',
                 'workflow_instance_id': None
             }
-    
+
+    def initiate_approval_workflows_bulk(self, requests: List[Dict[str, Any]],
+                                         page_size: int = 1000) -> Dict[str, Any]:
+        """
+        Initiate many approval workflows at once (vacation planning season, schedule publish)
+
+        Resolves each workflow definition and step approver once, then inserts all
+        instances and tasks with multi-row INSERTs (execute_values) in one transaction.
+
+        Args:
+            requests: Dicts with workflow_type, object_type, object_id, initiator_user_id
+                and optional metadata (same arguments as initiate_approval_workflow)
+            page_size: Rows per multi-row INSERT statement
+
+        Returns:
+            dict: Created instance and task ids in request order, failed requests and throughput
+        """
+        logger.info(f"Initiating {len(requests)} approval workflows in bulk")
+        start_time = time.time()
+
+        # Resolve definitions and approvers once per workflow type / role
+        definitions: Dict[str, Optional[Dict[str, Any]]] = {}
+        for workflow_type in {request['workflow_type'] for request in requests}:
+            definitions[workflow_type] = self.get_workflow_definition(workflow_type)
+        approvers: Dict[str, Optional[int]] = {}
+        for definition in definitions.values():
+            for step in (definition or {}).get('definition', {}).get('steps', []):
+                role = step.get('approver_role', 'supervisor')
+                if role not in approvers:
+                    approvers[role] = self.get_agent_for_role(role)
+        resolve_time = time.time()
+
+        now = datetime.now()
+        instance_rows = []
+        task_rows = []
+        created_tasks = []
+        workflows = []
+        failed = []
+
+        for index, request in enumerate(requests):
+            workflow_definition = definitions.get(request['workflow_type'])
+            if not workflow_definition:
+                failed.append({
+                    'index': index,
+                    'message': f"No workflow definition found for type: {request['workflow_type']}"
+                })
+                continue
+
+            workflow_instance_id = str(uuid.uuid4())
+            workflow_data = self.build_instance_data(
+                workflow_definition['id'], request['initiator_user_id'],
+                request['object_type'], request['object_id'], request.get('metadata')
+            )
+            instance_rows.append((
+                workflow_instance_id,
+                f"{request['object_type']}_{request['object_id']}_approval",
+                'running',
+                json.dumps(workflow_data),
+                now
+            ))
+
+            task_ids = []
+            for i, step in enumerate(workflow_definition.get('definition', {}).get('steps', []), 1):
+                task_id = str(uuid.uuid4())
+                task_name = step.get('name', f'Step {i}')
+                approver_role = step.get('approver_role', 'supervisor')
+                due_date = now + timedelta(hours=step.get('timeout_hours', 24))
+                task_data = {
+                    'step_name': task_name,
+                    'step_order': i,
+                    'approver_role': approver_role,
+                    'actions': step.get('actions', ['approve', 'reject']),
+                    'task_data': step.get('task_data', {})
+                }
+                task_rows.append((
+                    task_id, workflow_instance_id, task_name, approvers[approver_role],
+                    'pending', due_date, json.dumps(task_data), now
+                ))
+                created_tasks.append(({
+                    'id': task_id,
+                    'workflow_instance_id': workflow_instance_id,
+                    'task_name': task_name,
+                    'assigned_to': approvers[approver_role],
+                    'task_status': 'pending',
+                    'due_date': due_date,
+                    'created_at': now,
+                    'task_data': task_data
+                }, workflow_data))
+                task_ids.append(task_id)
+
+            workflows.append({
+                'index': index,
+                'workflow_instance_id': workflow_instance_id,
+                'workflow_type': request['workflow_type'],
+                'task_ids': task_ids
+            })
+        build_time = time.time()
+
+        try:
+            with self.db_connection.cursor() as cursor:
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO workflow_instances (
+                        id, instance_name, status, data, started_at
+                    ) VALUES %s
+                """, instance_rows, page_size=page_size)
+
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO workflow_tasks (
+                        id, workflow_instance_id, task_name, assigned_to,
+                        task_status, due_date, task_data, created_at
+                    ) VALUES %s
+                """, task_rows, page_size=page_size)
+
+            self.db_connection.commit()
+
+        except psycopg2.Error as e:
+            logger.error(f"Failed to initiate workflows in bulk: {e}")
+            self.db_connection.rollback()
+            return {
+                'success': False,
+                'message': f'Database error: {str(e)}',
+                'workflows_created': 0,
+                'workflows': [],
+                'failed': failed
+            }
+        write_time = time.time()
+
+        for created_task, workflow_data in created_tasks:
+            if self.approval_inbox.loaded_at is not None:
+                self.approval_inbox.upsert(self.build_inbox_item(created_task, workflow_data))
+            self.notify_task_state_change(created_task)
+
+        total_time = time.time() - start_time
+        throughput = len(workflows) / total_time if total_time > 0 else 0.0
+
+        logger.info(f"Bulk initiated {len(workflows)} workflows ({len(task_rows)} tasks) in {total_time:.3f}s "
+                    f"({throughput:.0f} workflows/s)")
+
+        return {
+            'success': True,
+            'workflows_created': len(workflows),
+            'tasks_created': len(task_rows),
+            'workflows': workflows,
+            'failed': failed,
+            'stage_timings_seconds': {
+                'resolve_definitions_and_approvers': resolve_time - start_time,
+                'build_rows': build_time - resolve_time,
+                'bulk_insert': write_time - build_time
+            },
+            'initiation_time_seconds': total_time,
+            'throughput_workflows_per_second': throughput,
+            'initiated_at': datetime.now().isoformat()
+        }
+
     def get_workflow_status(self, workflow_instance_id: str) -> Dict[str, Any]:
         """
         Get comprehensive workflow status and progress
@@ -1009,9 +1434,15 @@ class ApprovalEngine:
     No mock data - connects directly to employee_requests, vacation_requests, and workflow_tasks
     """
     
-    def __init__(self):
-        """Initialize with multi-step approval engine"""
+    def __init__(self, escalation_manager=None):
+        """
+        Initialize with multi-step approval engine
+        
+        Pass an EscalationManager to stop escalating tasks as they are decided.
+        """
         self.engine = MultiStepApprovalEngine()
+        if escalation_manager is not None:
+            escalation_manager.attach_approval_engine(self.engine)
     
     def get_pending_approvals(self) -> List[Dict[str, Any]]:
         """
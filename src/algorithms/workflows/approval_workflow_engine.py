@@ -30,6 +30,7 @@ import uuid
 import json
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 
 # Import performance tracking and UI transformers
 from ..utils.performance_tracking import tracker
@@ -116,7 +117,7 @@ class ApprovalWorkflowEngine:
     def connect_to_database(self):
         """Connect to wfm_enterprise database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",
                 user="postgres",
@@ -33,6 +33,7 @@ from typing import Dict, List, Optional, Tuple, Any
 import uuid
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from dataclasses import dataclass
 from enum import Enum
 
@@ -96,7 +97,7 @@ class WorkflowAutomationOrchestrator:
     def connect_to_database(self):
         """Connect to wfm_enterprise database - CRITICAL: correct database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",  # CRITICAL: Using wfm_enterprise not postgres
                 user="postgres", 
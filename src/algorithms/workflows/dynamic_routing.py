@@ -31,8 +31,11 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import uuid
+import numpy as np
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
+from scipy.optimize import linear_sum_assignment
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
@@ -71,6 +74,21 @@ class TaskPriority(Enum):
     CRITICAL = "critical"
     EMERGENCY = "emergency"
 
+# Batch assignment objective offset per priority. Spaced wider than the 0-100
+# routing score so that scarce capacity always goes to higher priority tasks first.
+PRIORITY_ASSIGNMENT_WEIGHT = {
+    TaskPriority.LOW: 0.0,
+    TaskPriority.NORMAL: 1000.0,
+    TaskPriority.HIGH: 2000.0,
+    TaskPriority.CRITICAL: 3000.0,
+    TaskPriority.EMERGENCY: 4000.0
+}
+
+# plan_batch_routing solves batches up to DENSE_BATCH_LIMIT tasks in one joint
+# assignment; larger batches are solved in chunks of BATCH_SOLVE_CHUNK tasks
+DENSE_BATCH_LIMIT = 1000
+BATCH_SOLVE_CHUNK = 500
+
 @dataclass
 class ResourceInfo:
     """Represents a resource (agent) with availability status"""
@@ -114,7 +132,7 @@ class DynamicWorkflowRouter:
     def connect_to_database(self):
         """Connect to wfm_enterprise database - CRITICAL: correct database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",  # CRITICAL: Using wfm_enterprise not postgres
                 user="postgres", 
@@ -337,10 +355,13 @@ class DynamicWorkflowRouter:
         else:
             return 10  # Regular agents
     
-    def get_pending_tasks_for_routing(self) -> List[Dict[str, Any]]:
+    def get_pending_tasks_for_routing(self, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
         """
         Get pending tasks that need routing
         
+        Args:
+            limit: Maximum number of tasks to fetch (None fetches all pending tasks)
+        
         Returns real tasks from wfm_enterprise database
         """
         try:
@@ -364,10 +385,10 @@ class DynamicWorkflowRouter:
                   AND (wt.assigned_to IS NULL OR wt.assigned_to = 0)
                   AND wt.created_at > NOW() - INTERVAL '7 days'
                 ORDER BY wt.created_at ASC
-                LIMIT 100
+                LIMIT %s
                 """
                 
-                cursor.execute(query)
+                cursor.execute(query, (limit,))
                 pending_tasks = cursor.fetchall()
                 
                 tasks = []
@@ -774,9 +795,347 @@ class DynamicWorkflowRouter:
             logger.warning(f"Performance target missed: {total_time:.3f}s for {len(pending_tasks)} tasks")
         else:
             logger.info(f"Performance target met: {total_time:.3f}s for {len(pending_tasks)} tasks")
-        
+
         return result
-    
+
+    def build_capacity_slots(self, resources: List[ResourceInfo],
+                             max_slots_per_resource: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Expand resources into unit capacity slots for joint assignment
+
+        Slot k of a resource represents its (k+1)-th new task, so it is scored with
+        load current_load + k. Unavailable/offline and saturated resources get no slots.
+
+        Returns:
+            tuple: (resource index per slot, resource load per slot)
+        """
+        status_ok = np.array([r.status in (ResourceStatus.AVAILABLE, ResourceStatus.BUSY) for r in resources], dtype=bool)
+        loads = np.array([r.current_load for r in resources], dtype=np.int64)
+        capacities = np.array([r.max_capacity for r in resources], dtype=np.int64)
+
+        slots = np.clip(capacities - loads, 0, max_slots_per_resource)
+        slots[~status_ok] = 0
+
+        slot_resource = np.repeat(np.arange(len(resources)), slots)
+        slot_offset = np.arange(len(slot_resource)) - np.repeat(np.cumsum(slots) - slots, slots)
+        return slot_resource, loads[slot_resource] + slot_offset
+
+    def build_score_matrix(self, tasks: List[Dict[str, Any]], resources: List[ResourceInfo],
+                           slot_resource: np.ndarray, slot_load: np.ndarray,
+                           strategy: RoutingStrategy) -> np.ndarray:
+        """
+        Vectorized task × slot routing scores
+
+        Mirrors calculate_routing_score term by term, evaluated for every task and
+        capacity slot at once instead of per (task, resource) pair.
+
+        Returns:
+            np.ndarray: Score matrix (tasks × slots) clamped to 0-100
+        """
+        n_tasks = len(tasks)
+        load = slot_load.astype(np.float64)
+        capacity = np.array([max(r.max_capacity, 1) for r in resources], dtype=np.float64)[slot_resource]
+        load_ratio = load / capacity
+
+        # Per-slot terms shared by every task
+        base = np.array([40.0 if r.status == ResourceStatus.AVAILABLE else 20.0 for r in resources])[slot_resource]
+        slot_terms = base + np.where(load == 0, 5.0, 0.0) - np.minimum(load * 2, 20.0)
+        if strategy in [RoutingStrategy.LOAD_BALANCE, RoutingStrategy.ROUND_ROBIN]:
+            slot_terms = slot_terms + (1 - load_ratio) * 30
+        scores = np.broadcast_to(slot_terms, (n_tasks, len(slot_resource))).copy()
+
+        if strategy == RoutingStrategy.SKILL_MATCH:
+            vocabulary = {}
+            for task in tasks:
+                for skill in task.get('required_skills', []):
+                    vocabulary.setdefault(skill, len(vocabulary))
+            required = np.zeros((n_tasks, len(vocabulary)), dtype=np.float64)
+            for i, task in enumerate(tasks):
+                for skill in set(task.get('required_skills', [])):
+                    required[i, vocabulary[skill]] = 1.0
+            resource_skills = np.zeros((len(resources), len(vocabulary)), dtype=np.float64)
+            for j, resource in enumerate(resources):
+                for skill in set(resource.skills):
+                    if skill in vocabulary:
+                        resource_skills[j, vocabulary[skill]] = 1.0
+
+            required_count = required.sum(axis=1, keepdims=True)
+            match_ratio = (required @ resource_skills.T) / np.maximum(required_count, 1)
+            diversity = np.minimum(np.array([len(r.skills) for r in resources], dtype=np.float64) * 2, 20)
+            skill_terms = np.where(required_count > 0,
+                                   match_ratio * 40 + np.where(match_ratio == 1.0, 10.0, 0.0),
+                                   diversity[np.newaxis, :])
+            scores += skill_terms[:, slot_resource]
+
+        if strategy == RoutingStrategy.PRIORITY_BASED:
+            # Rows: normal/low, high, critical, emergency
+            priority_terms = np.stack([
+                (1 - load_ratio) * 15,
+                np.where(load_ratio < 0.7, 20.0, 5.0),
+                np.select([load_ratio < 0.5, load_ratio < 0.7], [30.0, 15.0], 5.0),
+                np.select([load_ratio < 0.3, load_ratio < 0.5], [40.0, 25.0], 10.0)
+            ])
+            priority_row = {TaskPriority.HIGH: 1, TaskPriority.CRITICAL: 2, TaskPriority.EMERGENCY: 3}
+            task_rows = np.array([priority_row.get(t.get('priority', TaskPriority.NORMAL), 0) for t in tasks])
+            scores += priority_terms[task_rows]
+
+        if strategy == RoutingStrategy.GEOGRAPHIC:
+            locations = {}
+            resource_location = np.array([locations.setdefault(r.location, len(locations)) for r in resources])[slot_resource]
+            task_location = np.array([locations.setdefault(t.get('location', 'headquarters'), len(locations)) for t in tasks])
+            same_location = task_location[:, np.newaxis] == resource_location[np.newaxis, :]
+            resource_remote = (resource_location == locations.get('remote', -1))[np.newaxis, :]
+            hq = locations.get('headquarters', -1)
+            involves_hq = (task_location == hq)[:, np.newaxis] | (resource_location == hq)[np.newaxis, :]
+            scores += np.select([same_location, resource_remote, involves_hq], [25.0, 15.0, 10.0], 5.0)
+
+        # Queue-based bonus: row 0 = no matching queue, rows 1-3 = voice/chat/email
+        queue_skill = ['customer_service', 'technical_support', 'documentation']
+        queue_terms = np.zeros((4, len(slot_resource)))
+        for row, skill in enumerate(queue_skill, start=1):
+            queue_terms[row] = np.array([10.0 if skill in r.skills else 0.0 for r in resources])[slot_resource]
+        queue_row = {'voice': 1, 'phone': 1, 'chat': 2, 'email': 3}
+        task_queue = np.array([queue_row.get(t.get('queue_type', 'general'), 0) for t in tasks])
+        scores += queue_terms[task_queue]
+
+        return np.clip(scores, 0.0, 100.0)
+
+    def plan_batch_routing(self, tasks: List[Dict[str, Any]], resources: List[ResourceInfo],
+                           strategy: RoutingStrategy) -> List[Tuple[Dict[str, Any], ResourceInfo, float]]:
+        """
+        Jointly assign tasks to resources respecting remaining capacity
+
+        Solves a rectangular assignment problem (Hungarian, scipy linear_sum_assignment)
+        over task × capacity-slot scores. Priority offsets make scarce capacity go to
+        the most urgent tasks; within a priority level total routing score is maximized.
+        ROUND_ROBIN is treated as load balancing in batch mode.
+
+        The dense solve grows roughly cubically (about 11s for 5,000 tasks × 5,500
+        slots), so batches above DENSE_BATCH_LIMIT tasks are split: tasks are taken in
+        priority order in chunks of BATCH_SOLVE_CHUNK, each solved jointly against the
+        slots earlier chunks left free. Priority still wins scarce capacity; within a
+        priority level the result is a few percent below the joint optimum. About 0.6s
+        for 5,000 tasks × 800 resources.
+
+        Returns:
+            list: (task, resource, routing_score) for every task that received a slot
+        """
+        if not tasks or not resources:
+            return []
+
+        slot_resource, slot_load = self.build_capacity_slots(resources, len(tasks))
+        if len(slot_resource) == 0:
+            return []
+
+        weights = np.array([PRIORITY_ASSIGNMENT_WEIGHT[t.get('priority', TaskPriority.NORMAL)] for t in tasks])
+        if len(tasks) <= DENSE_BATCH_LIMIT:
+            chunks = [np.arange(len(tasks))]
+        else:
+            order = np.argsort(-weights, kind='stable')
+            chunks = [order[start:start + BATCH_SOLVE_CHUNK] for start in range(0, len(tasks), BATCH_SOLVE_CHUNK)]
+
+        free = np.ones(len(slot_resource), dtype=bool)
+        assignments = []
+        for chunk in chunks:
+            slots = np.flatnonzero(free)
+            if len(slots) == 0:
+                break
+            chunk_tasks = [tasks[i] for i in chunk]
+            scores = self.build_score_matrix(chunk_tasks, resources, slot_resource[slots], slot_load[slots], strategy)
+            feasible = scores > 0
+
+            cost = np.where(feasible, -(scores + weights[chunk, np.newaxis] + 1.0), 0.0)
+            row_indices, col_indices = linear_sum_assignment(cost)
+
+            for i, j in zip(row_indices, col_indices):
+                if feasible[i, j]:
+                    free[slots[j]] = False
+                    resource = resources[slot_resource[slots[j]]]
+                    assignments.append((chunk_tasks[i], resource, float(scores[i, j])))
+        return assignments
+
+    def execute_routing_decisions_bulk(self, assignments: List[Tuple[Dict[str, Any], ResourceInfo, float]],
+                                       strategy: RoutingStrategy) -> List[str]:
+        """
+        Commit all routing decisions with one UPDATE and one INSERT in a single transaction
+
+        Returns routing decision IDs in assignment order, or an empty list on failure
+        """
+        if not assignments:
+            return []
+
+        routed_at = datetime.now()
+        decision_ids = [str(uuid.uuid4()) for _ in assignments]
+        task_updates = []
+        routing_records = []
+
+        for decision_id, (task, resource, score) in zip(decision_ids, assignments):
+            required_skills = task.get('required_skills', [])
+            task_updates.append((
+                task['id'],
+                resource.id,
+                json.dumps({
+                    'routed_at': routed_at.isoformat(),
+                    'routing_strategy': strategy.value,
+                    'routing_score': score,
+                    'routing_decision_id': decision_id,
+                    'resource_location': resource.location,
+                    'routing_mode': 'batch'
+                }, cls=DecimalEncoder)
+            ))
+            routing_records.append((
+                f"Dynamic Route: {task.get('task_name', 'Task')} to {resource.name}",
+                json.dumps({
+                    'strategy': strategy.value,
+                    'task_id': task['id'],
+                    'resource_id': resource.id,
+                    'resource_name': resource.name,
+                    'routing_score': score,
+                    'decision_id': decision_id
+                }, cls=DecimalEncoder),
+                json.dumps({
+                    'required_skills': required_skills,
+                    'matched_skills': list(set(resource.skills).intersection(set(required_skills))),
+                    'resource_skills': resource.skills
+                }, cls=DecimalEncoder),
+                json.dumps({
+                    'task_priority': task.get('priority', TaskPriority.NORMAL).value,
+                    'routing_timestamp': routed_at.isoformat(),
+                    'wait_time_hours': task.get('hours_waiting', 0)
+                }, cls=DecimalEncoder),
+                json.dumps({
+                    'resource_load': resource.current_load,
+                    'resource_capacity': resource.max_capacity,
+                    'utilization_percent': (resource.current_load / max(resource.max_capacity, 1)) * 100,
+                    'routing_score': score
+                }, cls=DecimalEncoder),
+                routed_at
+            ))
+
+        try:
+            with self.db_connection.cursor() as cursor:
+                psycopg2.extras.execute_values(cursor, """
+                    UPDATE workflow_tasks AS wt
+                    SET assigned_to = v.resource_id,
+                        task_data = wt.task_data || v.routing_data::jsonb
+                    FROM (VALUES %s) AS v(task_id, resource_id, routing_data)
+                    WHERE wt.id = v.task_id
+                """, task_updates, page_size=1000)
+
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO intelligent_routing_system (
+                        routing_rule_name,
+                        routing_logic,
+                        skill_requirements,
+                        priority_settings,
+                        performance_metrics,
+                        created_at
+                    ) VALUES %s
+                """, routing_records, page_size=1000)
+
+                self.db_connection.commit()
+                logger.info(f"Committed {len(assignments)} routing decisions in one transaction")
+                return decision_ids
+
+        except psycopg2.Error as e:
+            logger.error(f"Failed to execute bulk routing decisions: {e}")
+            self.db_connection.rollback()
+            return []
+
+    def route_tasks_batch(self, routing_strategy: RoutingStrategy = RoutingStrategy.LOAD_BALANCE,
+                          task_limit: Optional[int] = 5000) -> Dict[str, Any]:
+        """
+        Batch mode: route all pending tasks jointly instead of greedily
+
+        Scores every task × resource capacity slot in one vectorized pass, solves the
+        capacity-respecting assignment once and commits all decisions in one bulk write.
+
+        Args:
+            routing_strategy: Scoring strategy (same semantics as route_tasks_dynamically)
+            task_limit: Maximum pending tasks to route in this batch
+
+        Returns:
+            dict: Routing results in the route_tasks_dynamically format plus stage timings
+        """
+        logger.info(f"Starting batch task routing with strategy: {routing_strategy.value}")
+        start_time = time.time()
+
+        resources = self.get_real_time_resource_availability()
+        if not resources:
+            return {
+                'success': False,
+                'message': 'No resources available for routing',
+                'routing_time_seconds': time.time() - start_time
+            }
+
+        pending_tasks = self.get_pending_tasks_for_routing(limit=task_limit)
+        if not pending_tasks:
+            return {
+                'success': True,
+                'message': 'No pending tasks requiring routing',
+                'routing_time_seconds': time.time() - start_time,
+                'resources_available': len(resources)
+            }
+        load_time = time.time()
+
+        assignments = self.plan_batch_routing(pending_tasks, resources, routing_strategy)
+        solve_time = time.time()
+
+        decision_ids = self.execute_routing_decisions_bulk(assignments, routing_strategy)
+        write_time = time.time()
+
+        routing_decisions = []
+        for decision_id, (task, resource, score) in zip(decision_ids, assignments):
+            routing_decisions.append({
+                'decision_id': decision_id,
+                'task_id': task['id'],
+                'task_name': task.get('task_name'),
+                'resource_id': resource.id,
+                'resource_name': resource.name,
+                'routing_score': score,
+                'strategy': routing_strategy.value,
+                'priority': task.get('priority', TaskPriority.NORMAL).value
+            })
+
+        # Reflect committed assignments in the in-memory resource view
+        for task, resource, score in assignments[:len(decision_ids)]:
+            resource.current_load += 1
+
+        successful_routes = len(routing_decisions)
+        failed_routes = len(pending_tasks) - successful_routes
+        total_time = write_time - start_time
+
+        result = {
+            'success': True,
+            'routing_mode': 'batch',
+            'routing_summary': {
+                'available_resources': len(resources),
+                'pending_tasks_processed': len(pending_tasks),
+                'successful_routes': successful_routes,
+                'failed_routes': failed_routes,
+                'routing_success_rate': (successful_routes / max(len(pending_tasks), 1)) * 100
+            },
+            'routing_strategy': routing_strategy.value,
+            'routing_decisions': routing_decisions,
+            'resource_utilization': {
+                'total_resources': len(resources),
+                'available_resources': len([r for r in resources if r.status == ResourceStatus.AVAILABLE]),
+                'busy_resources': len([r for r in resources if r.status == ResourceStatus.BUSY]),
+                'unavailable_resources': len([r for r in resources if r.status == ResourceStatus.UNAVAILABLE])
+            },
+            'stage_timings_seconds': {
+                'load': load_time - start_time,
+                'score_and_solve': solve_time - load_time,
+                'bulk_write': write_time - solve_time
+            },
+            'routing_time_seconds': total_time,
+            'performance_target_met': total_time < 1.0,
+            'routing_timestamp': datetime.now().isoformat()
+        }
+
+        logger.info(f"Batch routing completed: {successful_routes}/{len(pending_tasks)} tasks routed in {total_time:.3f}s")
+        return result
+
     def get_routing_analytics(self) -> Dict[str, Any]:
         """
         Get routing analytics and performance metrics
@@ -30,7 +30,10 @@ ZERO MOCK POLICY: No mock data - follows Mobile Workforce Scheduler pattern
 - Performance verified with real database load
 """
 
+import copy
+import heapq
 import logging
+import threading
 import time
 import json
 from datetime import datetime, timedelta
@@ -38,6 +41,7 @@ from typing import Dict, List, Optional, Tuple, Any
 import uuid
 import psycopg2
 import psycopg2.extras
+from ..core import db_pool
 from dataclasses import dataclass
 from enum import Enum
 
@@ -91,6 +95,164 @@ class EscalationEvent:
     status: EscalationStatus
     original_assignee: str
 
+def rule_applies_to_task(task: Dict[str, Any], rule: EscalationRule) -> bool:
+    """Check if escalation rule process type matches task (same matching as evaluate_escalation_requirements)"""
+    task_name = (task.get('task_name') or '').lower()
+    return ('approval' in task_name and 'approval' in rule.process_type) or rule.process_type == 'general'
+
+# Source table and pending condition per task_type produced by scan_delayed_tasks
+PENDING_TASK_QUERIES = {
+    'approval_request': "SELECT id::text FROM request_approvals WHERE id::text = ANY(%s) AND decision = 'pending'",
+    'incident_resolution': ("SELECT id::text FROM monitoring_incidents WHERE id::text = ANY(%s) "
+                            "AND incident_status IN ('open', 'investigating', 'pending')"),
+    'workflow_task': "SELECT id::text FROM workflow_tasks WHERE id::text = ANY(%s) AND task_status = 'pending'"
+}
+
+TaskKey = Tuple[str, str]
+
+def task_key(task: Dict[str, Any]) -> TaskKey:
+    """Scheduler key: ids are only unique within one source table"""
+    return (task.get('task_type', 'workflow_task'), str(task['id']))
+
+def _to_epoch_seconds(value: Any) -> float:
+    """Convert task timestamps (datetime or epoch seconds) to epoch seconds"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+class EscalationScheduler:
+    """
+    In-process deadline scheduler for pending task escalations
+
+    Keeps a min-heap of (deadline, task, rule) entries so due escalations are found
+    without scanning task tables. Each task walks its escalation ladder: applicable
+    rules ordered by timeout, each fired once at created_at + timeout_hours.
+    Cancelled or rescheduled tasks are invalidated lazily via a per-schedule token.
+    Tasks are keyed by (task_type, id) because approvals, incidents and workflow
+    tasks come from different tables whose ids may collide.
+
+    Safe to share between the escalation loop thread and request threads: every
+    method takes the scheduler's lock.
+    """
+
+    def __init__(self, escalation_rules: List[EscalationRule]):
+        self.escalation_rules = [rule for rule in escalation_rules if rule.is_active]
+        self._heap: List[Tuple[float, int, TaskKey, int, int]] = []
+        self._tasks: Dict[TaskKey, Dict[str, Any]] = {}
+        self._ladders: Dict[TaskKey, List[EscalationRule]] = {}
+        self._tokens: Dict[TaskKey, int] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of tasks with at least one escalation still scheduled"""
+        with self._lock:
+            return len(self._tasks)
+
+    def __contains__(self, key: Any) -> bool:
+        """Accepts a (task_type, id) key or a bare workflow task id"""
+        if not isinstance(key, tuple):
+            key = ('workflow_task', str(key))
+        with self._lock:
+            return key in self._tasks
+
+    def schedule_task(self, task: Dict[str, Any], now: Optional[float] = None) -> Optional[float]:
+        """
+        Schedule (or reschedule) escalations for a pending task
+
+        If several deadlines have already passed (e.g. on initial load), only the most
+        advanced overdue rule is kept so the task catches up with a single escalation.
+
+        Returns:
+            Next escalation deadline in epoch seconds, or None if no rule applies
+        """
+        key = task_key(task)
+        ladder = sorted(
+            (rule for rule in self.escalation_rules if rule_applies_to_task(task, rule)),
+            key=lambda rule: rule.timeout_hours
+        )
+
+        with self._lock:
+            self._cancel(key)
+            if not ladder or task.get('created_at') is None:
+                return None
+
+            now = time.time() if now is None else now
+            created_at = _to_epoch_seconds(task['created_at'])
+            step = 0
+            while step + 1 < len(ladder) and created_at + ladder[step + 1].timeout_hours * 3600 <= now:
+                step += 1
+
+            self._sequence += 1
+            self._tasks[key] = task
+            self._ladders[key] = ladder
+            self._tokens[key] = self._sequence
+            return self._push(key, step)
+
+    def cancel_task(self, task_id: Any, task_type: str = 'workflow_task') -> bool:
+        """Stop tracking a task (completed, cancelled or otherwise no longer pending)"""
+        with self._lock:
+            return self._cancel((task_type, str(task_id)))
+
+    def reassign_tasks(self, from_assignee: Any, to_assignee: Any) -> int:
+        """Reflect a delegation in tracked tasks; deadlines are unchanged"""
+        reassigned = 0
+        with self._lock:
+            for task in self._tasks.values():
+                if task.get('assigned_to') is not None and str(task.get('assigned_to')) == str(from_assignee):
+                    task['assigned_to'] = to_assignee
+                    reassigned += 1
+        return reassigned
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending escalation deadline in epoch seconds"""
+        with self._lock:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[Dict[str, Any], EscalationRule]]:
+        """
+        Remove and return every escalation due at or before now
+
+        Each fired task is advanced to the next rule of its ladder (if any).
+        """
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while True:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, key, _, step = heapq.heappop(self._heap)
+                ladder = self._ladders[key]
+                due.append((self._tasks[key], ladder[step]))
+                if step + 1 < len(ladder):
+                    self._push(key, step + 1)
+                else:
+                    self._cancel(key)
+        return due
+
+    # Helpers below expect the caller to hold self._lock
+
+    def _cancel(self, key: TaskKey) -> bool:
+        self._tokens.pop(key, None)
+        self._ladders.pop(key, None)
+        return self._tasks.pop(key, None) is not None
+
+    def _push(self, key: TaskKey, step: int) -> float:
+        created_at = _to_epoch_seconds(self._tasks[key]['created_at'])
+        deadline = created_at + self._ladders[key][step].timeout_hours * 3600
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, self._sequence, key, self._tokens[key], step))
+        return deadline
+
+    def _discard_stale(self):
+        while self._heap:
+            _, _, key, token, _ = self._heap[0]
+            if self._tokens.get(key) == token:
+                return
+            heapq.heappop(self._heap)
+
 class EscalationManager:
     """
     Escalation management engine for delayed task handling
@@ -104,12 +266,13 @@ class EscalationManager:
     def __init__(self):
         """Initialize with database connection to wfm_enterprise"""
         self.db_connection = None
+        self.escalation_scheduler: Optional[EscalationScheduler] = None
         self.connect_to_database()
         
     def connect_to_database(self):
         """Connect to wfm_enterprise database - CRITICAL: correct database"""
         try:
-            self.db_connection = psycopg2.connect(
+            self.db_connection = db_pool.connect(
                 host="localhost",
                 database="wfm_enterprise",  # CRITICAL: Using wfm_enterprise not postgres
                 user="postgres", 
@@ -269,18 +432,25 @@ class EscalationManager:
             return []  # No fallback - must use real data only
     
     
-    def scan_delayed_tasks(self) -> List[Dict[str, Any]]:
+    def scan_delayed_tasks(self, include_recent: bool = False) -> List[Dict[str, Any]]:
         """
         Scan for delayed tasks that need escalation from real workflows
         
         Mobile Workforce Scheduler pattern: Uses real approval workflows and incidents
+        
+        Args:
+            include_recent: Also return pending tasks younger than the minimum escalation
+                age (used to load the deadline scheduler once with every pending task)
         """
         try:
             with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                 delayed_tasks = []
+                approval_age_filter = "" if include_recent else "AND ra.created_at < NOW() - INTERVAL '1 hour'  -- At least 1 hour old"
+                incident_age_filter = "" if include_recent else "AND mi.created_at < NOW() - INTERVAL '2 hours'  -- At least 2 hours old"
+                workflow_age_filter = "" if include_recent else "AND wt.created_at < NOW() - INTERVAL '1 hour'"
                 
                 # Scan pending approval requests (real incident escalation)
-                approval_query = """
+                approval_query = f"""
                 SELECT 
                     ra.id,
                     ra.request_id,
@@ -300,7 +470,7 @@ class EscalationManager:
                 LEFT JOIN employees e ON e.id = ra.approver_id
                 LEFT JOIN departments d ON d.id = e.department_id
                 WHERE ra.decision = 'pending'
-                  AND ra.created_at < NOW() - INTERVAL '1 hour'  -- At least 1 hour old
+                  {approval_age_filter}
                   AND ra.created_at > NOW() - INTERVAL '30 days'
                 ORDER BY ra.created_at ASC
                 """
@@ -332,7 +502,7 @@ class EscalationManager:
                     delayed_tasks.append(task)
                 
                 # Scan monitoring incidents (real incident escalation)
-                incident_query = """
+                incident_query = f"""
                 SELECT 
                     mi.id,
                     mi.incident_title,
@@ -347,7 +517,7 @@ class EscalationManager:
                 FROM monitoring_incidents mi
                 LEFT JOIN agents a ON a.id = mi.assigned_to_agent_id
                 WHERE mi.incident_status IN ('open', 'investigating', 'pending')
-                  AND mi.created_at < NOW() - INTERVAL '2 hours'  -- At least 2 hours old
+                  {incident_age_filter}
                   AND mi.created_at > NOW() - INTERVAL '7 days'
                 ORDER BY mi.severity_level DESC, mi.created_at ASC
                 """
@@ -390,7 +560,7 @@ class EscalationManager:
                 
                 # Also scan workflow tasks if they exist
                 try:
-                    workflow_query = """
+                    workflow_query = f"""
                     SELECT 
                         wt.id,
                         wt.workflow_instance_id,
@@ -407,7 +577,7 @@ class EscalationManager:
                         END as hours_overdue
                     FROM workflow_tasks wt
                     WHERE wt.task_status = 'pending'
-                      AND wt.created_at < NOW() - INTERVAL '1 hour'
+                      {workflow_age_filter}
                       AND wt.created_at > NOW() - INTERVAL '30 days'
                     ORDER BY wt.created_at ASC
                     """
@@ -737,6 +907,9 @@ class EscalationManager:
                 total_affected = affected_approvals + affected_incidents + affected_tasks
                 self.db_connection.commit()
                 
+                if self.escalation_scheduler is not None:
+                    self.escalation_scheduler.reassign_tasks(user_id, delegate_to)
+                
                 logger.info(f"Created delegation {delegation_id}: {total_affected} items delegated from {user_id} to {delegate_to} ({affected_approvals} approvals, {affected_incidents} incidents, {affected_tasks} tasks)")
                 return delegation_id
                 
@@ -881,9 +1054,169 @@ class EscalationManager:
             logger.warning(f"Performance target missed: {total_time:.3f}s for escalation processing")
         else:
             logger.info(f"Performance target met: {total_time:.3f}s for escalation processing")
-        
+
         return result
-    
+
+    def load_escalation_schedule(self) -> Dict[str, Any]:
+        """
+        Load rules and every pending task into the in-process deadline scheduler once
+
+        After loading, process_due_escalations() finds due work from the scheduler
+        instead of re-scanning request_approvals, monitoring_incidents and workflow_tasks.
+        """
+        start_time = time.time()
+        self.escalation_scheduler = EscalationScheduler(self.get_escalation_rules())
+
+        pending_tasks = self.scan_delayed_tasks(include_recent=True)
+        scheduled = sum(1 for task in pending_tasks if self.escalation_scheduler.schedule_task(task) is not None)
+
+        load_time = time.time() - start_time
+        logger.info(f"Loaded escalation schedule: {scheduled}/{len(pending_tasks)} pending tasks in {load_time:.3f}s")
+        return {
+            'pending_tasks_loaded': len(pending_tasks),
+            'tasks_scheduled': scheduled,
+            'escalation_rules_loaded': len(self.escalation_scheduler.escalation_rules),
+            'next_escalation_at': self.escalation_scheduler.next_deadline(),
+            'load_time_seconds': load_time
+        }
+
+    def attach_approval_engine(self, approval_engine) -> None:
+        """Receive task state changes committed by a MultiStepApprovalEngine"""
+        approval_engine.add_task_state_listener(self.on_task_state_change)
+
+    def on_task_state_change(self, task: Dict[str, Any]):
+        """
+        Keep the deadline scheduler in sync with a task state change
+
+        task_type selects the source (workflow_task by default, approval_request or
+        incident_resolution). Pending tasks are (re)scheduled from their created_at;
+        any other status (approved, rejected, completed, cancelled, resolved)
+        removes the task.
+        """
+        if self.escalation_scheduler is None:
+            return
+        status = task.get('task_status') or task.get('decision') or task.get('incident_status')
+        if status in ('pending', 'open', 'investigating'):
+            self.escalation_scheduler.schedule_task(task)
+        else:
+            self.escalation_scheduler.cancel_task(task['id'], task.get('task_type', 'workflow_task'))
+
+    def record_approval_decision(self, approval_id: str, decision: str):
+        """Stop escalating a request_approvals row once it is decided"""
+        self.on_task_state_change({'id': approval_id, 'task_type': 'approval_request', 'decision': decision})
+
+    def record_incident_resolution(self, incident_id: str, incident_status: str = 'resolved'):
+        """Stop escalating a monitoring_incidents row once it is resolved or closed"""
+        self.on_task_state_change({'id': incident_id, 'task_type': 'incident_resolution',
+                                   'incident_status': incident_status})
+
+    def filter_still_pending(self, due: List[Tuple[Dict[str, Any], EscalationRule]]
+                             ) -> List[Tuple[Dict[str, Any], EscalationRule]]:
+        """
+        Drop due escalations whose task was decided without notifying the scheduler
+
+        Approvals and incidents are also decided by API endpoints in other processes,
+        so due tasks are re-checked against their source table (one query per
+        task_type) before escalating. If a check fails the tasks are kept.
+        """
+        ids_by_type: Dict[str, List[str]] = {}
+        for task, _ in due:
+            task_type, task_id = task_key(task)
+            ids_by_type.setdefault(task_type, []).append(task_id)
+
+        pending: set = set()
+        for task_type, task_ids in ids_by_type.items():
+            query = PENDING_TASK_QUERIES.get(task_type)
+            if query is None:
+                pending.update((task_type, task_id) for task_id in task_ids)
+                continue
+            try:
+                with self.db_connection.cursor() as cursor:
+                    cursor.execute(query, (task_ids,))
+                    pending.update((task_type, row[0]) for row in cursor.fetchall())
+            except psycopg2.Error as e:
+                logger.warning(f"Could not re-check pending {task_type} tasks: {e}")
+                self.db_connection.rollback()
+                pending.update((task_type, task_id) for task_id in task_ids)
+
+        still_pending = []
+        for task, rule in due:
+            key = task_key(task)
+            if key in pending:
+                still_pending.append((task, rule))
+            else:
+                self.escalation_scheduler.cancel_task(key[1], key[0])
+        return still_pending
+
+    def process_due_escalations(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute escalations whose deadlines have passed, without scanning task tables
+
+        Requires load_escalation_schedule(); the only database work is re-checking the
+        due tasks and the escalation writes themselves, so steady-state scan load is zero.
+        """
+        if self.escalation_scheduler is None:
+            self.load_escalation_schedule()
+
+        start_time = time.time()
+        due = self.escalation_scheduler.pop_due(now)
+        if due:
+            due = self.filter_still_pending(due)
+
+        escalated_events = []
+        for task, rule in due:
+            event_id = self.execute_escalation(task, rule)
+            if event_id:
+                escalated_events.append({
+                    'event_id': event_id,
+                    'task_id': task['id'],
+                    'escalation_level': rule.escalation_level.value,
+                    'action_type': rule.action_type,
+                    'escalated_to': rule.target_role
+                })
+
+        total_time = time.time() - start_time
+        return {
+            'success': True,
+            'processing_summary': {
+                'escalations_due': len(due),
+                'escalations_executed': len(escalated_events),
+                'tasks_tracked': len(self.escalation_scheduler)
+            },
+            'escalated_events': escalated_events,
+            'next_escalation_at': self.escalation_scheduler.next_deadline(),
+            'processing_time_seconds': total_time,
+            'performance_target_met': total_time < 0.5,
+            'escalation_timestamp': datetime.now().isoformat()
+        }
+
+    def run_escalation_scheduler(self, stop_event: threading.Event, max_sleep_seconds: float = 60.0):
+        """
+        Blocking loop that sleeps until the next deadline and fires escalations when due
+
+        max_sleep_seconds bounds the wait so tasks scheduled via on_task_state_change
+        with an earlier deadline are picked up promptly.
+
+        Meant to run in its own thread: the loop works on a copy of this manager with
+        its own database connection, sharing only the (locked) scheduler, so request
+        threads can keep using self.db_connection.
+        """
+        if self.escalation_scheduler is None:
+            self.load_escalation_schedule()
+
+        worker = copy.copy(self)
+        worker.connect_to_database()
+        try:
+            while not stop_event.is_set():
+                worker.process_due_escalations()
+                next_deadline = self.escalation_scheduler.next_deadline()
+                wait_seconds = max_sleep_seconds if next_deadline is None else next_deadline - time.time()
+                stop_event.wait(min(max(wait_seconds, 0.0), max_sleep_seconds))
+        finally:
+            if worker.db_connection is not None and worker.db_connection is not self.db_connection:
+                worker.db_connection.close()
+            worker.db_connection = None
+
     def __del__(self):
         """Clean up database connection"""
         if self.db_connection:
@@ -24,11 +24,19 @@ class Settings(BaseSettings):
     
     CACHE_TTL_SECONDS: int = 300
     CACHE_KEY_PREFIX: str = "wfm:"
+    # In-process tier in front of Redis (per worker)
+    CACHE_L1_MAX_ENTRIES: int = 2048
+    CACHE_L1_TTL_SECONDS: int = 30
     
     RESPONSE_TIMEOUT_SECONDS: int = 2
     MAX_RETRY_ATTEMPTS: int = 3
     RETRY_DELAY_SECONDS: float = 0.5
     
+    # Import endpoint modules on first request instead of at startup
+    LAZY_ROUTERS: bool = True
+    # In lazy mode, load the remaining endpoint modules in the background after startup
+    ROUTER_WARM_UP: bool = False
+    
     MONITORING_ENABLED: bool = True
     LOG_LEVEL: str = "INFO"
     DEMO_MODE: bool = False
@@ -0,0 +1,202 @@
+"""
+Lazy API Router Registration
+
+The v1 API is assembled from well over a hundred endpoint modules, and importing
+them pulls in pandas, the algorithm packages and the ORM models. Instead of
+importing everything at startup, the route table records each module's path,
+router attribute, mount prefix, tags and the request path prefixes it serves.
+
+- Eager mode: build_router() imports every module and returns one APIRouter,
+  exactly like the old hand-written router
+- Lazy mode: install() adds an ASGI middleware that imports a module on the
+  first request under one of its path prefixes and appends its routes to the
+  application; warm_up() loads the remaining modules in the background
+
+Routes keep the order of the route table in both modes, so overlapping paths
+resolve the same way. A module that fails to import is logged and recorded and
+does not affect requests for other modules.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteModule:
+    """One include_router() call of the route table"""
+    module: str
+    attr: str = "router"
+    prefix: str = ""
+    tags: Tuple[str, ...] = ()
+    # Request path prefixes (relative to the API prefix) served by the module
+    paths: Tuple[str, ...] = ()
+    routes: List[Any] = field(default_factory=list, repr=False)
+    loaded: bool = False
+    error: Optional[str] = None
+    load_ms: Optional[float] = None
+
+    def matches(self, path: str) -> bool:
+        return any(not prefix or path == prefix or path.startswith(prefix + "/")
+                   for prefix in (self.paths or (self.prefix,)))
+
+
+def _import_router(entry: RouteModule) -> APIRouter:
+    module = importlib.import_module(entry.module)
+    try:
+        return getattr(module, entry.attr)
+    except AttributeError:
+        # `from package import name` also resolves submodules
+        return importlib.import_module(f"{entry.module}.{entry.attr}")
+
+
+class LazyRouterRegistry:
+    """Route table of the v1 API with eager and lazy registration"""
+
+    def __init__(self, package: str = ""):
+        self.package = package
+        self.entries: List[RouteModule] = []
+        self.app: Optional[FastAPI] = None
+        self.api_prefix = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def add(self, module: str, attr: str = "router", prefix: str = "",
+            tags: Sequence[str] = (), paths: Sequence[str] = ()):
+        if self.package:
+            module = f"{self.package}.{module}"
+        self.entries.append(RouteModule(module, attr, prefix, tuple(tags), tuple(paths)))
+
+    # ------------------------------------------------------------------
+    # Eager mode
+    # ------------------------------------------------------------------
+
+    def build_router(self) -> APIRouter:
+        """Import every module and return the combined router"""
+        api_router = APIRouter()
+        for entry in self.entries:
+            start = time.perf_counter()
+            api_router.include_router(_import_router(entry), prefix=entry.prefix, tags=list(entry.tags))
+            entry.load_ms = (time.perf_counter() - start) * 1000
+            entry.loaded = True
+        return api_router
+
+    # ------------------------------------------------------------------
+    # Lazy mode
+    # ------------------------------------------------------------------
+
+    def install(self, app: FastAPI, prefix: str = ""):
+        """Register modules on first use instead of at startup"""
+        self.app = app
+        self.api_prefix = prefix
+        app.add_middleware(LazyRoutingMiddleware, registry=self)
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+    def pending_for(self, path: str) -> List[RouteModule]:
+        """Modules not yet loaded whose path prefixes cover the request path"""
+        if not path.startswith(self.api_prefix):
+            return []
+        relative = path[len(self.api_prefix):]
+        return [entry for entry in self.entries
+                if not entry.loaded and entry.error is None and entry.matches(relative)]
+
+    async def ensure_loaded(self, path: str):
+        """Load the modules serving path before the request is routed"""
+        if self.pending_for(path):
+            await self._load(lambda: self.pending_for(path))
+
+    async def warm_up(self):
+        """Load every remaining module, one at a time, in route table order"""
+        await self._load(lambda: [entry for entry in self.entries
+                                  if not entry.loaded and entry.error is None],
+                         one_at_a_time=True)
+
+    async def _load(self, pending, one_at_a_time: bool = False):
+        self._bind_loop()
+        while True:
+            async with self._lock:
+                # Re-checked under the lock: another request may have loaded them
+                entries = pending()
+                if not entries:
+                    return
+                if one_at_a_time:
+                    entries = entries[:1]
+                for entry in entries:
+                    await self._load_entry(entry)
+                self._publish_routes()
+            if not one_at_a_time:
+                return
+
+    async def _load_entry(self, entry: RouteModule):
+        start = time.perf_counter()
+        try:
+            # Imports run in a thread so other requests keep being served
+            router = await asyncio.to_thread(_import_router, entry)
+            holder = APIRouter()
+            holder.include_router(router, prefix=self.api_prefix + entry.prefix, tags=list(entry.tags))
+            entry.routes = holder.routes
+            entry.loaded = True
+        except Exception as e:
+            entry.error = f"{type(e).__name__}: {e}"
+            logger.exception(f"Failed to load API module {entry.module}.{entry.attr}")
+        finally:
+            entry.load_ms = (time.perf_counter() - start) * 1000
+
+    def _publish_routes(self):
+        """Swap in the route list with lazy routes in route table order"""
+        lazy_ids = {id(route) for entry in self.entries for route in entry.routes}
+        static_routes = [route for route in self.app.router.routes if id(route) not in lazy_ids]
+        self.app.router.routes = static_routes + [
+            route for entry in self.entries if entry.loaded for route in entry.routes
+        ]
+        # Regenerate the OpenAPI schema with the new routes
+        self.app.openapi_schema = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Load progress and per-module import timings"""
+        loaded = [entry for entry in self.entries if entry.loaded]
+        return {
+            "mode": "lazy" if self.app is not None else "eager",
+            "modules": len(self.entries),
+            "loaded": len(loaded),
+            "failed": sum(1 for entry in self.entries if entry.error),
+            "routes": sum(len(entry.routes) for entry in loaded),
+            "load_ms_total": round(sum(entry.load_ms or 0 for entry in loaded), 1),
+            "slowest": sorted(
+                ({"module": f"{entry.module}.{entry.attr}", "load_ms": round(entry.load_ms, 1)}
+                 for entry in loaded if entry.load_ms is not None),
+                key=lambda item: item["load_ms"], reverse=True
+            )[:5],
+            "errors": {f"{entry.module}.{entry.attr}": entry.error for entry in self.entries if entry.error},
+        }
+
+
+class LazyRoutingMiddleware:
+    """Loads endpoint modules for a request path before the router sees it"""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            fastapi_app = self.registry.app
+            if path == fastapi_app.openapi_url:
+                # The schema has to describe every endpoint
+                await self.registry.warm_up()
+            else:
+                await self.registry.ensure_loaded(path)
+        await self.app(scope, receive, send)
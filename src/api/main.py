@@ -6,7 +6,7 @@ This module initializes and configures the FastAPI application with:
 - CORS middleware for UI integration
 - Custom middleware for monitoring, error handling, and request tracking
 - Prometheus metrics endpoint
-- API v1 router with all endpoints
+- API v1 router with all endpoints (imported lazily on first request by default)
 
 Performance Targets:
 - Average response time: <2 seconds
@@ -16,6 +16,9 @@ Performance Targets:
 Usage:
     uvicorn src.api.main:app --reload --host 0.0.0.0 --port 8000
 """
+import asyncio
+import sys
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import make_asgi_app
@@ -23,11 +26,13 @@ from contextlib import asynccontextmanager
 
 from src.api.core.config import settings
 from src.api.core.database import engine, Base
-from src.api.v1.router import api_router
+from src.api.v1.router import route_registry
 from src.api.middleware.monitoring import MonitoringMiddleware
 from src.api.middleware.error_handling import ErrorHandlingMiddleware
 from src.api.middleware.request_id import RequestIDMiddleware
 from src.api.middleware.auth import api_key_header
+from src.api.services.forecast_training import shutdown_prophet_training_pool
+from src.algorithms.core.db_pool import close_all_pools, get_pool_stats
 # from src.websocket.core.server import websocket_router, ws_server
 # Temporarily disabled for basic API startup
 
@@ -40,10 +45,14 @@ async def lifespan(app: FastAPI):
     Startup:
     - Creates database tables if they don't exist
     - Initializes connection pool
+    - Optionally loads lazily registered endpoint modules in the background
     - Starts WebSocket server
     
     Shutdown:
     - Properly disposes of database connections
+    - Closes shared 1C HTTP sessions
+    - Stops Prophet training worker processes
+    - Closes pooled algorithm-module database connections
     - Stops WebSocket server
     - Cleans up resources
     """
@@ -51,13 +60,25 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
+    warm_up = None
+    if settings.LAZY_ROUTERS and settings.ROUTER_WARM_UP:
+        warm_up = asyncio.create_task(route_registry.warm_up())
+    
     # Start WebSocket server (disabled for now)
     # await ws_server.start()
     
     yield
     
     # Cleanup
+    if warm_up is not None:
+        warm_up.cancel()
     # await ws_server.stop()
+    # Loaded with the 1C endpoints; if none ran there are no sessions to close
+    onec_service = sys.modules.get("src.api.services.onec_service")
+    if onec_service is not None:
+        await onec_service.OneCService.close_sessions()
+    shutdown_prophet_training_pool()
+    close_all_pools()
     await engine.dispose()
 
 
@@ -104,7 +125,11 @@ app.add_middleware(RequestIDMiddleware)
 app.add_middleware(MonitoringMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+if settings.LAZY_ROUTERS:
+    # Endpoint modules are imported on the first request under their prefix
+    route_registry.install(app, prefix=settings.API_V1_STR)
+else:
+    app.include_router(route_registry.build_router(), prefix=settings.API_V1_STR)
 
 # Include WebSocket router (disabled for now)
 # app.include_router(websocket_router, tags=["websocket"])
@@ -134,5 +159,7 @@ async def health_check():
             "status": "disabled",
             "active_connections": 0,
             "uptime_seconds": 0
-        }
+        },
+        "routers": route_registry.get_stats(),
+        "db_pools": get_pool_stats()
     }
\ No newline at end of file
@@ -1,32 +1,54 @@
 import logging
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class ErrorHandlingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-        except SQLAlchemyError as e:
-            logger.error(f"Database error: {str(e)}", exc_info=True)
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as e:
+            if response_started:
+                # Headers are already out; nothing to replace them with
+                raise
+            response = self._error_response(e)
+            await response(scope, receive, send)
+
+    @staticmethod
+    def _error_response(error: Exception) -> JSONResponse:
+        if isinstance(error, SQLAlchemyError):
+            logger.error(f"Database error: {str(error)}", exc_info=error)
             return JSONResponse(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 content={"detail": "Database service temporarily unavailable"}
             )
-        except ValueError as e:
-            logger.warning(f"Validation error: {str(e)}")
+        if isinstance(error, ValueError):
+            logger.warning(f"Validation error: {str(error)}")
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                content={"detail": str(e)}
+                content={"detail": str(error)}
             )
-        except Exception as e:
-            logger.error(f"Unhandled error: {str(e)}", exc_info=True)
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": "Internal server error"}
-            )
\ No newline at end of file
+        logger.error(f"Unhandled error: {str(error)}", exc_info=error)
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "Internal server error"}
+        )
@@ -1,18 +1,86 @@
+"""
+Request metrics
+
+Series are labelled with the matched route template ("/employees/{employee_id}"),
+not the raw path, so path parameters do not create new series. Requests that
+match no route share the UNMATCHED_ROUTE label and unknown methods share "OTHER".
+"""
+import math
 import time
-from fastapi import Request
-from prometheus_client import Counter, Histogram, Gauge
-from starlette.middleware.base import BaseHTTPMiddleware
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge
+from prometheus_client.metrics_core import HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class RouteLatencyHistogram:
+    """
+    Fixed-bucket latency histogram per (method, route template).
+
+    Each series is a preallocated list of bucket counts followed by the sum,
+    so observe() is a dict lookup, a bisect and two additions. Updates run on
+    the event loop thread and take no lock; scrapes read a copy of each list.
+    """
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 buckets: Sequence[float] = LATENCY_BUCKETS,
+                 registry: CollectorRegistry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        self._bounds = [floatToGoString(b) for b in self.buckets] + ["+Inf"]
+        self._series: Dict[Tuple[str, str], List[float]] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def observe(self, method: str, endpoint: str, value: float):
+        series = self._series.get((method, endpoint))
+        if series is None:
+            # len(buckets) finite buckets, +Inf, then the sum
+            series = self._series.setdefault((method, endpoint), [0] * (len(self.buckets) + 2))
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    def describe(self):
+        return [HistogramMetricFamily(self.name, self.documentation, labels=["method", "endpoint"])]
+
+    def collect(self):
+        family = HistogramMetricFamily(self.name, self.documentation, labels=["method", "endpoint"])
+        for (method, endpoint), series in list(self._series.items()):
+            counts = list(series)
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(self._bounds, counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            family.add_metric([method, endpoint], buckets, counts[-1])
+        yield family
+
 
 request_count = Counter(
-    "http_requests_total", 
-    "Total HTTP requests", 
+    "http_requests_total",
+    "Total HTTP requests",
     ["method", "endpoint", "status"]
 )
 
-request_duration = Histogram(
+request_duration = RouteLatencyHistogram(
     "http_request_duration_seconds",
-    "HTTP request duration",
-    ["method", "endpoint"]
+    "HTTP request duration"
 )
 
 active_requests = Gauge(
@@ -20,28 +88,50 @@ active_requests = Gauge(
     "Active HTTP requests"
 )
 
+# (method, template, status) -> request_count child, so labels() runs once per series
+_request_count_children: Dict[Tuple[str, str, int], object] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """Template of the route the router matched for this request"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MonitoringMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class MonitoringMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         active_requests.inc()
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Process-Time"] = str(time.perf_counter() - start_time)
+            await send(message)
+
         try:
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            request_count.labels(
-                method=request.method,
-                endpoint=request.url.path,
-                status=response.status_code
-            ).inc()
-            
-            request_duration.labels(
-                method=request.method,
-                endpoint=request.url.path
-            ).observe(duration)
-            
-            response.headers["X-Process-Time"] = str(duration)
-            return response
+            await self.app(scope, receive, send_with_timing)
         finally:
-            active_requests.dec()
\ No newline at end of file
+            # Recorded after the body is sent, so streamed responses count in full.
+            # The router stores the matched route in the shared scope by now.
+            duration = time.perf_counter() - start_time
+            method = scope["method"]
+            if method not in KNOWN_METHODS:
+                method = "OTHER"
+            endpoint = route_template(scope)
+            counter = _request_count_children.get((method, endpoint, status_code))
+            if counter is None:
+                counter = request_count.labels(method, endpoint, status_code)
+                _request_count_children[(method, endpoint, status_code)] = counter
+            counter.inc()
+            request_duration.observe(method, endpoint, duration)
+            active_requests.dec()
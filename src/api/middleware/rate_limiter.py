@@ -1,19 +1,33 @@
 """
 Advanced Rate Limiting Middleware for WFM Enterprise API
 Redis-based rate limiting with multiple strategies and user-aware limiting
+
+Limits large enough to split are enforced through local leases: each worker
+takes quota from Redis in chunks (lease_fraction of the limit, at most
+max_lease units) and decides requests in-process until the chunk is spent.
+Leased quota is already counted in Redis, so workers cannot admit more than
+the limit between them within a window. A lease expires after lease_ttl
+seconds; its unspent units are given back to Redis when the worker next sees
+the key, so a client slower than one request per lease_ttl is charged only
+for what it used. Until then at most workers x chunk units can be refused
+early while they sit unused in idle workers.
+A refusal is also remembered for up to lease_ttl seconds, so a client over
+its limit does not cost a Redis round trip per request. Small limits (login,
+register, ...) get chunks of one unit and stay exact.
 """
 
 import time
 import json
-from typing import Dict, Optional, Callable, Any
+from collections import OrderedDict
+from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
 from enum import Enum
 
-from fastapi import Request, Response, HTTPException, status
+from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 import redis.asyncio as redis
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import asyncio
 import hashlib
 
@@ -45,11 +59,38 @@ class RateLimitConfig:
         self.refill_rate = refill_rate or (max_requests / window_seconds)
 
 
+class LocalLease:
+    """Quota units a worker has taken from Redis and not yet spent"""
+    __slots__ = ("tokens", "size", "granted_at", "expires_at", "denied_until", "info", "lock")
+
+    def __init__(self):
+        self.tokens = 0
+        self.size = 0
+        self.granted_at = 0.0  # time.time() the chunk was charged at in Redis
+        self.expires_at = 0.0
+        self.denied_until = 0.0
+        self.info: Dict[str, Any] = {}
+        self.lock = asyncio.Lock()
+
+
 class RateLimiter:
     """Advanced rate limiter with multiple strategies"""
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        lease_fraction: float = 0.1,
+        max_lease: int = 50,
+        lease_ttl: float = 1.0,
+        max_local_keys: int = 10000
+    ):
         self.redis = redis_client
+        self.lease_fraction = lease_fraction
+        self.max_lease = max_lease
+        self.lease_ttl = lease_ttl
+        self.max_local_keys = max_local_keys
+        self._leases: "OrderedDict[str, LocalLease]" = OrderedDict()
+        self.stats = {"local": 0, "leases": 0, "exact": 0, "denied": 0, "expired_units": 0, "refunded_units": 0}
         
         # Default rate limit configurations
         self.default_config = RateLimitConfig(
@@ -124,22 +165,147 @@ class RateLimiter:
             )
         }
     
+    def lease_size(self, config: RateLimitConfig) -> int:
+        """Units taken from Redis per lease for this configuration"""
+        return max(1, min(self.max_lease, int(config.max_requests * self.lease_fraction)))
+    
     async def is_allowed(
         self,
         key: str,
         config: RateLimitConfig,
         request_cost: int = 1
     ) -> tuple[bool, Dict[str, Any]]:
-        """Check if request is allowed based on rate limit configuration"""
+        """Check if request is allowed, from the local lease when possible"""
+        chunk = self.lease_size(config)
+        if chunk <= request_cost or self.lease_ttl <= 0:
+            self.stats["exact"] += 1
+            allowed, info = await self._check(key, config, request_cost)
+            if not allowed:
+                self.stats["denied"] += 1
+            return allowed, info
+        
+        lease_key = f"{config.strategy.value}:{config.max_requests}:{config.window_seconds}:{key}"
+        lease = self._leases.get(lease_key)
+        if lease is None:
+            lease = self._leases[lease_key] = LocalLease()
+            while len(self._leases) > self.max_local_keys:
+                self._leases.popitem(last=False)
+        else:
+            self._leases.move_to_end(lease_key)
+        
+        if self._take_local(lease, request_cost):
+            return True, self._lease_info(lease)
+        if lease.denied_until > time.monotonic():
+            self.stats["denied"] += 1
+            return False, lease.info
+        
+        # One refill per key at a time; requests queued behind it re-check the lease first
+        async with lease.lock:
+            if self._take_local(lease, request_cost):
+                return True, self._lease_info(lease)
+            if lease.denied_until > time.monotonic():
+                self.stats["denied"] += 1
+                return False, lease.info
+            
+            if lease.tokens:
+                self.stats["expired_units"] += lease.tokens
+                await self._refund(key, config, lease)
+            
+            granted_at = time.time()
+            allowed, info = await self._check(key, config, chunk, now=granted_at)
+            if allowed:
+                self.stats["leases"] += 1
+                lease.tokens = chunk - request_cost
+                lease.size = chunk
+                lease.granted_at = granted_at
+                lease.expires_at = time.monotonic() + min(self.lease_ttl, config.window_seconds)
+                lease.info = info
+                return True, self._lease_info(lease)
+            
+            # Not enough quota left for a whole chunk; decide this request alone
+            if info.get("remaining", 0) >= request_cost:
+                self.stats["exact"] += 1
+                allowed, info = await self._check(key, config, request_cost)
+                if allowed:
+                    return True, info
+            
+            self.stats["denied"] += 1
+            retry_after = info.get("retry_after") or self.lease_ttl
+            lease.denied_until = time.monotonic() + min(self.lease_ttl, retry_after)
+            lease.info = info
+            return False, info
+    
+    async def _refund(self, key: str, config: RateLimitConfig, lease: LocalLease):
+        """Give the unspent units of an expired lease back to Redis"""
+        units, lease.tokens = lease.tokens, 0
         
         if config.strategy == RateLimitStrategy.FIXED_WINDOW:
-            return await self._fixed_window_check(key, config, request_cost)
+            granted = int(lease.granted_at)
+            window_start = granted - (granted % config.window_seconds)
+            now = int(time.time())
+            # Once the window has rolled over, its counter no longer matters
+            if now - (now % config.window_seconds) != window_start:
+                return
+            await self.redis.decrby(f"rate_limit:fixed:{key}:{window_start}", units)
         elif config.strategy == RateLimitStrategy.SLIDING_WINDOW:
-            return await self._sliding_window_check(key, config, request_cost)
+            # Units are spent from the front of the chunk, so the tail is unspent
+            members = [f"{lease.granted_at}:{unit}" for unit in range(lease.size - units, lease.size)]
+            await self.redis.zrem(f"rate_limit:sliding:{key}", *members)
+        elif config.strategy in (RateLimitStrategy.TOKEN_BUCKET, RateLimitStrategy.LEAKY_BUCKET):
+            token_bucket = config.strategy == RateLimitStrategy.TOKEN_BUCKET
+            redis_key = f"rate_limit:{'bucket' if token_bucket else 'leaky'}:{key}"
+            bucket_data = await self.redis.hgetall(redis_key)
+            if not bucket_data:
+                return
+            if token_bucket:
+                tokens = min(config.burst_capacity, float(bucket_data.get("tokens", 0)) + units)
+                await self.redis.hset(redis_key, mapping={"tokens": tokens})
+            else:
+                volume = max(0.0, float(bucket_data.get("volume", 0)) - units)
+                await self.redis.hset(redis_key, mapping={"volume": volume})
+        
+        self.stats["refunded_units"] += units
+    
+    def _take_local(self, lease: LocalLease, request_cost: int) -> bool:
+        if lease.tokens < request_cost or lease.expires_at <= time.monotonic():
+            return False
+        lease.tokens -= request_cost
+        self.stats["local"] += 1
+        return True
+    
+    @staticmethod
+    def _lease_info(lease: LocalLease) -> Dict[str, Any]:
+        # Redis already counts the unspent part of the lease as used
+        return {**lease.info, "remaining": lease.info.get("remaining", 0) + lease.tokens}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        decided = self.stats["local"] + self.stats["leases"] + self.stats["exact"]
+        return {
+            **self.stats,
+            "local_keys": len(self._leases),
+            "local_rate": self.stats["local"] / decided if decided else 0.0,
+        }
+    
+    async def _check(
+        self,
+        key: str,
+        config: RateLimitConfig,
+        request_cost: int,
+        now: Optional[float] = None
+    ) -> tuple[bool, Dict[str, Any]]:
+        """Check and consume request_cost units in Redis"""
+        
+        if now is None:
+            now = time.time()
+        
+        if config.strategy == RateLimitStrategy.FIXED_WINDOW:
+            return await self._fixed_window_check(key, config, request_cost, now)
+        elif config.strategy == RateLimitStrategy.SLIDING_WINDOW:
+            return await self._sliding_window_check(key, config, request_cost, now)
         elif config.strategy == RateLimitStrategy.TOKEN_BUCKET:
-            return await self._token_bucket_check(key, config, request_cost)
+            return await self._token_bucket_check(key, config, request_cost, now)
         elif config.strategy == RateLimitStrategy.LEAKY_BUCKET:
-            return await self._leaky_bucket_check(key, config, request_cost)
+            return await self._leaky_bucket_check(key, config, request_cost, now)
         
         return False, {}
     
@@ -147,10 +313,11 @@ class RateLimiter:
         self,
         key: str,
         config: RateLimitConfig,
-        request_cost: int
+        request_cost: int,
+        now: float
     ) -> tuple[bool, Dict[str, Any]]:
         """Fixed window rate limiting"""
-        now = int(time.time())
+        now = int(now)
         window_start = now - (now % config.window_seconds)
         redis_key = f"rate_limit:fixed:{key}:{window_start}"
         
@@ -164,6 +331,10 @@ class RateLimiter:
         
         allowed = current_count <= config.max_requests
         
+        if not allowed:
+            # Refused units do not count against the window
+            current_count = int(await self.redis.decrby(redis_key, request_cost))
+        
         reset_time = window_start + config.window_seconds
         
         return allowed, {
@@ -177,10 +348,10 @@ class RateLimiter:
         self,
         key: str,
         config: RateLimitConfig,
-        request_cost: int
+        request_cost: int,
+        now: float
     ) -> tuple[bool, Dict[str, Any]]:
         """Sliding window rate limiting"""
-        now = time.time()
         window_start = now - config.window_seconds
         redis_key = f"rate_limit:sliding:{key}"
         
@@ -189,8 +360,9 @@ class RateLimiter:
         pipe.zremrangebyscore(redis_key, 0, window_start)
         # Count current requests
         pipe.zcard(redis_key)
-        # Add current request
-        pipe.zadd(redis_key, {str(now): now})
+        # Add current request, one entry per unit of cost
+        members = {f"{now}:{unit}": now for unit in range(request_cost)}
+        pipe.zadd(redis_key, members)
         # Set expiration
         pipe.expire(redis_key, config.window_seconds)
         
@@ -201,7 +373,9 @@ class RateLimiter:
         
         if not allowed:
             # Remove the request we just added
-            await self.redis.zrem(redis_key, str(now))
+            await self.redis.zrem(redis_key, *members)
+        else:
+            current_count += request_cost
         
         # Calculate reset time (when oldest request expires)
         oldest_requests = await self.redis.zrange(redis_key, 0, 0, withscores=True)
@@ -218,11 +392,11 @@ class RateLimiter:
         self,
         key: str,
         config: RateLimitConfig,
-        request_cost: int
+        request_cost: int,
+        now: float
     ) -> tuple[bool, Dict[str, Any]]:
         """Token bucket rate limiting"""
         redis_key = f"rate_limit:bucket:{key}"
-        now = time.time()
         
         # Get current bucket state
         bucket_data = await self.redis.hgetall(redis_key)
@@ -268,11 +442,11 @@ class RateLimiter:
         self,
         key: str,
         config: RateLimitConfig,
-        request_cost: int
+        request_cost: int,
+        now: float
     ) -> tuple[bool, Dict[str, Any]]:
         """Leaky bucket rate limiting"""
         redis_key = f"rate_limit:leaky:{key}"
-        now = time.time()
         
         # Get current bucket state
         bucket_data = await self.redis.hgetall(redis_key)
@@ -384,17 +558,34 @@ class RateLimiter:
         return "guest"
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware"""
+class RateLimitMiddleware:
+    """Rate limiting middleware (raw ASGI, so responses are streamed through untouched)"""
     
-    def __init__(self, app: ASGIApp, redis_url: str = "redis://localhost:6379"):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis_url: str = "redis://localhost:6379",
+        lease_fraction: float = 0.1,
+        max_lease: int = 50,
+        lease_ttl: float = 1.0
+    ):
+        self.app = app
         self.redis_url = redis_url
+        self.lease_options = {"lease_fraction": lease_fraction, "max_lease": max_lease, "lease_ttl": lease_ttl}
         self.redis_client: Optional[redis.Redis] = None
         self.rate_limiter: Optional[RateLimiter] = None
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with rate limiting"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Skip rate limiting for health checks
+        if scope["path"] in ["/health", "/api/health", "/api/v1/health"]:
+            await self.app(scope, receive, send)
+            return
+        
         # Initialize Redis connection if needed
         if not self.redis_client:
             self.redis_client = await redis.from_url(
@@ -402,11 +593,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 encoding="utf-8",
                 decode_responses=True
             )
-            self.rate_limiter = RateLimiter(self.redis_client)
+            self.rate_limiter = RateLimiter(self.redis_client, **self.lease_options)
         
-        # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/api/health", "/api/v1/health"]:
-            return await call_next(request)
+        request = Request(scope)
         
         # Get client identifier and user type
         client_id = self.rate_limiter.get_client_identifier(request)
@@ -441,24 +630,27 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
             
             # Add rate limit headers
-            response.headers["X-RateLimit-Limit"] = str(rate_info.get("limit"))
-            response.headers["X-RateLimit-Remaining"] = str(rate_info.get("remaining"))
-            response.headers["X-RateLimit-Reset"] = str(rate_info.get("reset"))
+            self._set_rate_limit_headers(response.headers, rate_info)
             
             if rate_info.get("retry_after"):
                 response.headers["Retry-After"] = str(rate_info.get("retry_after"))
             
-            return response
+            await response(scope, receive, send)
+            return
         
-        # Process request
-        response = await call_next(request)
+        # Process request, adding rate limit headers to the response
+        async def send_with_rate_limit_headers(message: Message):
+            if message["type"] == "http.response.start":
+                self._set_rate_limit_headers(MutableHeaders(scope=message), rate_info)
+            await send(message)
         
-        # Add rate limit headers to successful responses
-        response.headers["X-RateLimit-Limit"] = str(rate_info.get("limit"))
-        response.headers["X-RateLimit-Remaining"] = str(rate_info.get("remaining"))
-        response.headers["X-RateLimit-Reset"] = str(rate_info.get("reset"))
-        
-        return response
+        await self.app(scope, receive, send_with_rate_limit_headers)
+    
+    @staticmethod
+    def _set_rate_limit_headers(headers: MutableHeaders, rate_info: Dict[str, Any]):
+        headers["X-RateLimit-Limit"] = str(rate_info.get("limit"))
+        headers["X-RateLimit-Remaining"] = str(rate_info.get("remaining"))
+        headers["X-RateLimit-Reset"] = str(rate_info.get("reset"))
     
     def _calculate_request_cost(self, request: Request) -> int:
         """Calculate cost of request (some operations cost more)"""
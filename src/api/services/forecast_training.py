@@ -0,0 +1,240 @@
+"""
+Prophet Training Execution Layer
+
+Runs Prophet fits and predictions in a process pool so the FastAPI event loop
+never blocks on model training. Jobs are bounded by a semaphore (waiting jobs
+queue in FIFO order), concurrent requests for the same service and data share
+one job, and fitted models are persisted on disk so later predictions load the
+model instead of refitting it. Only the newest models of each service are kept,
+in a directory only the current user can access.
+"""
+
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the shared training pool (overridable through the environment)
+DEFAULT_TRAINING_SETTINGS = {
+    "max_workers": int(os.getenv("WFM_PROPHET_WORKERS", "0")) or min(4, os.cpu_count() or 1),
+    "max_concurrent_jobs": int(os.getenv("WFM_PROPHET_MAX_JOBS", "0")) or min(4, os.cpu_count() or 1),
+    # Private to the service user, never the world-writable temp directory
+    "model_dir": os.getenv(
+        "WFM_PROPHET_MODEL_DIR",
+        os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                     "wfm", "prophet_models")
+    ),
+    "models_per_service": int(os.getenv("WFM_PROPHET_MODELS_KEEP", "3")),
+}
+
+# Forecast columns sent back from the worker process
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+def prophet_job_key(service_id: str, prophet_data: pd.DataFrame, model_params: Dict[str, Any]) -> str:
+    """Fingerprint of service, training data and model parameters"""
+    digest = hashlib.sha256(str(service_id).encode())
+    digest.update(json.dumps(
+        {key: value for key, value in model_params.items() if key != "holidays"},
+        sort_keys=True, default=str
+    ).encode())
+    holidays = model_params.get("holidays")
+    if holidays is not None:
+        digest.update(pd.util.hash_pandas_object(holidays, index=False).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(prophet_data[["ds", "y"]], index=False).values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _run_prophet_job(prophet_data: pd.DataFrame,
+                     model_params: Dict[str, Any],
+                     forecast_days: int,
+                     model_path: str) -> Tuple[pd.DataFrame, bool]:
+    """
+    Fit (or load) a Prophet model and predict history plus forecast_days
+
+    Runs in a worker process. Returns the forecast and whether the model was
+    loaded from model_path instead of being fitted.
+    """
+    from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+
+    model = None
+    if os.path.exists(model_path):
+        try:
+            with open(model_path, "r") as f:
+                model = model_from_json(f.read())
+        except (OSError, ValueError, KeyError):
+            model = None
+
+    loaded = model is not None
+    if not loaded:
+        model = Prophet(**model_params)
+        model.fit(prophet_data)
+
+        # Atomic write so concurrent workers never read a partial model
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(model_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(model_to_json(model))
+            os.replace(tmp_path, model_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    future_dates = model.make_future_dataframe(periods=forecast_days)
+    forecast = model.predict(future_dates)
+    return forecast[FORECAST_COLUMNS], loaded
+
+
+class ProphetTrainingPool:
+    """Bounded, deduplicating Prophet job runner shared by all ForecastingService instances"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_TRAINING_SETTINGS, **(settings or {})}
+        self.model_dir = self.settings["model_dir"]
+        os.makedirs(self.model_dir, mode=0o700, exist_ok=True)
+        self._check_private_directory()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"submitted": 0, "deduplicated": 0, "fitted": 0, "loaded": 0, "failed": 0,
+                      "queued": 0, "running": 0}
+
+    def _check_private_directory(self):
+        """Refuse a model directory owned by another user; drop group/other access"""
+        info = os.stat(self.model_dir)
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"Prophet model directory {self.model_dir} is not owned by the current user")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            os.chmod(self.model_dir, 0o700)
+
+    @staticmethod
+    def _service_prefix(service_id: str) -> str:
+        """File name prefix for a service (ids may hold characters unfit for paths)"""
+        return "prophet_" + hashlib.sha256(str(service_id).encode()).hexdigest()[:12]
+
+    def model_path(self, service_id: str, job_key: str) -> str:
+        return os.path.join(self.model_dir, f"{self._service_prefix(service_id)}_{job_key}.json")
+
+    def _prune_models(self, service_id: str):
+        """Drop a service's oldest persisted models beyond models_per_service"""
+        paths = glob.glob(os.path.join(self.model_dir, f"{self._service_prefix(service_id)}_*.json"))
+        paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+        for stale_path in paths[self.settings["models_per_service"]:]:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.settings["max_workers"])
+        return self._executor
+
+    def _bind_loop(self):
+        """Per-event-loop asyncio state (semaphore and in-flight jobs)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.settings["max_concurrent_jobs"])
+            self._inflight = {}
+        return loop
+
+    async def forecast(self,
+                       service_id: str,
+                       prophet_data: pd.DataFrame,
+                       model_params: Dict[str, Any],
+                       forecast_days: int) -> pd.DataFrame:
+        """
+        Prophet forecast for history plus forecast_days, computed off the event loop
+
+        Requests with the same service, data and parameters that arrive while a
+        job is running wait for that job instead of starting another fit.
+        """
+        self._bind_loop()
+        job_key = prophet_job_key(service_id, prophet_data, model_params)
+        inflight_key = f"{job_key}:{forecast_days}"
+        self.stats["submitted"] += 1
+
+        job = self._inflight.get(inflight_key)
+        if job is not None:
+            self.stats["deduplicated"] += 1
+        else:
+            job = asyncio.ensure_future(self._run(service_id, job_key, prophet_data, model_params, forecast_days))
+            self._inflight[inflight_key] = job
+            job.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+
+        # Shielded so one cancelled request does not cancel the job for the others
+        return await asyncio.shield(job)
+
+    async def _run(self, service_id: str, job_key: str, prophet_data: pd.DataFrame,
+                   model_params: Dict[str, Any], forecast_days: int) -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+
+        self.stats["queued"] += 1
+        async with self._semaphore:
+            self.stats["queued"] -= 1
+            self.stats["running"] += 1
+            try:
+                forecast, loaded = await loop.run_in_executor(
+                    self._get_executor(), _run_prophet_job,
+                    prophet_data, model_params, forecast_days, self.model_path(service_id, job_key)
+                )
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM) - recreate the pool for later jobs
+                self._executor = None
+                self.stats["failed"] += 1
+                raise
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            finally:
+                self.stats["running"] -= 1
+
+        self.stats["loaded" if loaded else "fitted"] += 1
+        if not loaded:
+            self._prune_models(service_id)
+        return forecast
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counters plus current queue depth"""
+        return {**self.stats, "inflight": len(self._inflight)}
+
+    def shutdown(self):
+        """Stop worker processes (application shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_training_pool: Optional[ProphetTrainingPool] = None
+
+
+def get_prophet_training_pool() -> ProphetTrainingPool:
+    """Process-wide Prophet training pool"""
+    global _training_pool
+    if _training_pool is None:
+        _training_pool = ProphetTrainingPool()
+    return _training_pool
+
+
+def shutdown_prophet_training_pool():
+    """Shut down the process-wide pool if it was started"""
+    global _training_pool
+    if _training_pool is not None:
+        _training_pool.shutdown()
+        _training_pool = None
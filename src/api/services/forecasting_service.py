@@ -4,7 +4,6 @@ from datetime import datetime, timedelta, date, time
 from typing import List, Optional, Dict, Any, Tuple
 import pandas as pd
 import numpy as np
-from prophet import Prophet
 from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
 import logging
 import warnings
@@ -20,8 +19,13 @@ from ..db.models import (
     ForecastModel, StaffingPlan, StaffingRequirement, ForecastScenario, User
 )
 from ..utils.cache import cache_with_timeout
+from .forecast_training import get_prophet_training_pool
 from ...algorithms.ml.ml_ensemble import MLEnsembleForecaster, create_ensemble_forecaster
+from ...algorithms.ml.forecast_accuracy_metrics import ForecastAccuracyMetrics
 from ...algorithms.core.erlang_c_enhanced import ErlangCEnhanced
+from ...algorithms.core.erlang_staffing_solver import (
+    average_speed_of_answer, erlang_c, get_staffing_solver, service_level as erlang_service_level
+)
 from ...algorithms.optimization.multi_skill_allocation import MultiSkillAllocator
 
 logger = logging.getLogger(__name__)
@@ -37,8 +41,8 @@ class ForecastingService:
     
     def __init__(self, db: Optional[Session] = None):
         self.db = db
-        self.prophet_models = {}
         self.model_accuracy = {}
+        self.staffing_solver = get_staffing_solver()
         
     # ============================================================================
     # NEW UI INTEGRATION METHODS
@@ -292,14 +296,16 @@ class ForecastingService:
             agents_required = await self._calculate_optimal_agents(
                 traffic_intensity, 
                 service_level_target, 
-                target_wait_time
+                target_wait_time,
+                avg_handle_time
             )
             
             # Calculate performance metrics
             performance_metrics = await self._calculate_performance_metrics(
                 agents_required, 
                 traffic_intensity, 
-                service_rate
+                service_rate,
+                target_wait_time
             )
             
             # Multi-skill queue optimization
@@ -368,21 +374,15 @@ class ForecastingService:
             # Prepare data for Prophet
             prophet_data = self._prepare_prophet_data(training_data)
             
-            # Train Prophet model
-            prophet_model = Prophet(
-                yearly_seasonality=include_seasonality,
-                weekly_seasonality=include_seasonality,
-                daily_seasonality=include_seasonality,
-                holidays=self._get_holidays() if include_holidays else None
-            )
-            
-            prophet_model.fit(prophet_data)
-            
-            # Generate future dates
-            future_dates = prophet_model.make_future_dataframe(periods=forecast_days)
-            
-            # Generate forecast
-            forecast = prophet_model.predict(future_dates)
+            # Train (or load) Prophet model and forecast in the shared process pool
+            model_params = {
+                "yearly_seasonality": include_seasonality,
+                "weekly_seasonality": include_seasonality,
+                "daily_seasonality": include_seasonality,
+                "holidays": self._get_holidays() if include_holidays else None
+            }
+            training_pool = get_prophet_training_pool()
+            forecast = await training_pool.forecast(service_id, prophet_data, model_params, forecast_days)
             
             # Extract forecast data
             forecast_data = forecast.tail(forecast_days)
@@ -400,8 +400,6 @@ class ForecastingService:
                 training_data
             )
             
-            # Store model for future use
-            self.prophet_models[service_id] = prophet_model
             self.model_accuracy[service_id] = accuracy_metrics
             
             return {
@@ -613,38 +611,30 @@ class ForecastingService:
         self, 
         traffic_intensity: float, 
         service_level_target: float,
-        target_wait_time: int
+        target_wait_time: int,
+        avg_handle_time: Optional[float] = None
     ) -> int:
-        """Calculate optimal number of agents using enhanced Erlang C."""
+        """Calculate optimal number of agents using the shared Erlang C staffing solver."""
         try:
-            # Start with basic calculation
-            agents = max(1, int(traffic_intensity) + 1)
-            
-            # Iteratively optimize
-            for n in range(agents, agents + 50):
-                service_level = self._erlang_c_service_level(traffic_intensity, n)
-                if service_level >= service_level_target:
-                    return n
-            
-            return agents
+            # Without AHT the target reduces to "answered without waiting"
+            return self.staffing_solver.required_agents(
+                traffic_intensity, service_level_target, target_wait_time, avg_handle_time or 0
+            )
             
         except Exception as e:
             logger.error(f"Error calculating optimal agents: {str(e)}")
             return max(1, int(traffic_intensity))
     
-    def _erlang_c_service_level(self, traffic_intensity: float, agents: int) -> float:
-        """Calculate service level using Erlang C formula."""
+    def _erlang_c_service_level(
+        self,
+        traffic_intensity: float,
+        agents: int,
+        target_wait_time: float = 0,
+        avg_handle_time: Optional[float] = None
+    ) -> float:
+        """Calculate service level (answered within target_wait_time) using Erlang C."""
         try:
-            if agents <= traffic_intensity:
-                return 0.0
-            
-            # Erlang C probability of waiting
-            erlang_c = self._erlang_c_probability(traffic_intensity, agents)
-            
-            # Service level (probability of being served within target time)
-            service_level = 1 - erlang_c
-            
-            return service_level
+            return erlang_service_level(traffic_intensity, agents, target_wait_time, avg_handle_time or 0)
             
         except Exception:
             return 0.0
@@ -652,38 +642,37 @@ class ForecastingService:
     def _erlang_c_probability(self, traffic_intensity: float, agents: int) -> float:
         """Calculate Erlang C probability."""
         try:
-            # Factorial approximation for large numbers
-            factorial_sum = sum(
-                (traffic_intensity ** i) / np.math.factorial(i) 
-                for i in range(agents)
-            )
-            
-            erlang_c = (
-                (traffic_intensity ** agents) / (np.math.factorial(agents) * (1 - traffic_intensity / agents))
-            ) / (
-                factorial_sum + (traffic_intensity ** agents) / (np.math.factorial(agents) * (1 - traffic_intensity / agents))
-            )
-            
-            return erlang_c
+            return erlang_c(traffic_intensity, agents)
             
         except Exception:
             return 0.0
     
+    def get_staffing_cache_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics of the shared staffing solver cache."""
+        return self.staffing_solver.get_stats()
+    
     async def _calculate_performance_metrics(
         self, 
         agents: int, 
         traffic_intensity: float, 
-        service_rate: float
+        service_rate: float,
+        target_wait_time: float = 0
     ) -> Dict[str, Any]:
         """Calculate performance metrics for staffing forecast."""
         try:
             utilization = traffic_intensity / agents
+            avg_handle_time = 1 / service_rate
             
             return {
                 "utilization": min(1.0, utilization),
                 "occupancy": utilization,
-                "service_level": self._erlang_c_service_level(traffic_intensity, agents),
-                "average_wait_time": max(0, (traffic_intensity / (agents * service_rate - traffic_intensity))),
+                "service_level": self._erlang_c_service_level(
+                    traffic_intensity, agents, target_wait_time, avg_handle_time
+                ),
+                "average_wait_time": (
+                    average_speed_of_answer(traffic_intensity, agents, avg_handle_time)
+                    if agents > traffic_intensity else None
+                ),
                 "agents_utilization": f"{utilization * 100:.1f}%"
             }
             
@@ -940,22 +929,31 @@ class ForecastingService:
                 Forecast.id.in_(forecast_ids)
             ).all()
             
+            # Data points of all forecasts in one query, scored in one batch
+            data_points = self.db.query(ForecastDataPoint).filter(
+                ForecastDataPoint.forecast_id.in_(forecast_ids)
+            ).all()
+            
+            point_counts = {}
+            for point in data_points:
+                point_counts[point.forecast_id] = point_counts.get(point.forecast_id, 0) + 1
+            
+            live_metrics = self._batch_accuracy_metrics(data_points)
+            
             comparison_results = {}
             
             for forecast in forecasts:
-                # Get forecast data points
-                data_points = self.db.query(ForecastDataPoint).filter(
-                    ForecastDataPoint.forecast_id == forecast.id
-                ).order_by(ForecastDataPoint.timestamp).all()
-                
-                # Calculate metrics for this forecast
+                # Stored metrics, overridden by metrics computed from actuals
                 forecast_metrics = {
                     'name': forecast.name,
                     'method': forecast.method,
-                    'data_points': len(data_points),
+                    'data_points': point_counts.get(forecast.id, 0),
                     'start_date': forecast.start_date.isoformat(),
                     'end_date': forecast.end_date.isoformat(),
-                    'accuracy_metrics': forecast.accuracy_metrics or {}
+                    'accuracy_metrics': {
+                        **(forecast.accuracy_metrics or {}),
+                        **live_metrics.get(str(forecast.id), {})
+                    }
                 }
                 
                 comparison_results[str(forecast.id)] = forecast_metrics
@@ -1035,6 +1033,50 @@ class ForecastingService:
             logger.error(f"Error exporting forecast data: {str(e)}")
             return {"error": str(e)}
     
+    def _batch_accuracy_metrics(self, data_points: List[ForecastDataPoint]) -> Dict[str, Dict[str, float]]:
+        """Accuracy of every forecast with actuals, computed as one (forecast × time) batch"""
+        frame = pd.DataFrame([
+            {
+                'forecast_id': str(point.forecast_id),
+                'timestamp': point.timestamp,
+                'predicted': point.predicted_value,
+                'actual': point.actual_value,
+                'lower': point.confidence_interval_lower,
+                'upper': point.confidence_interval_upper
+            }
+            for point in data_points
+            if point.actual_value is not None
+        ])
+        
+        if frame.empty:
+            return {}
+        
+        pivot = frame.pivot_table(index='forecast_id', columns='timestamp',
+                                  values=['predicted', 'actual', 'lower', 'upper'], aggfunc='mean',
+                                  dropna=False)
+        actual = pivot['actual'].to_numpy(dtype=float)
+        has_bounds = pivot['lower'].notna().to_numpy().any() and pivot['upper'].notna().to_numpy().any()
+        
+        batch = ForecastAccuracyMetrics().calculate_batch_metrics(
+            actual,
+            pivot['predicted'].to_numpy(dtype=float),
+            mask=~np.isnan(actual),
+            lower_bound=pivot['lower'].to_numpy(dtype=float) if has_bounds else None,
+            upper_bound=pivot['upper'].to_numpy(dtype=float) if has_bounds else None
+        )
+        
+        results = {}
+        for row, forecast_id in enumerate(pivot.index):
+            # Undefined metrics (e.g. MAPE with all-zero actuals) become None for JSON
+            metrics = {
+                name: float(values[row]) if np.isfinite(values[row]) else None
+                for name, values in batch.items()
+            }
+            metrics['accuracy'] = max(0.0, 100 - metrics['mape']) if metrics['mape'] is not None else 0.0
+            results[forecast_id] = metrics
+        
+        return results
+    
     def _determine_best_performer(self, comparison_results: Dict[str, Any]) -> str:
         """Determine best performing forecast from comparison."""
         best_forecast = None
@@ -15,16 +15,19 @@ Integration points:
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import random
 from datetime import datetime, date, time
-from typing import Dict, Any, List, Optional, Union
-from uuid import UUID
+from typing import Dict, Any, List, Optional, Union, AsyncIterator, Tuple
+from uuid import UUID, uuid4
 
 import aiohttp
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
 from ..db.models import (
@@ -44,10 +47,59 @@ from ..websocket.events import emit_integration_event
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Agents requested per page from the 1C personnel endpoint
+DEFAULT_PERSONNEL_PAGE_SIZE = 500
+
+# HTTP connection pool and upload tuning (overridable per connection config)
+DEFAULT_HTTP_SETTINGS = {
+    "connection_limit": 100,
+    "connection_limit_per_host": 20,
+    "keepalive_timeout": 30,
+    "dns_cache_ttl": 300,
+    "connect_timeout": 10,
+    "upload_chunk_records": 200,
+    "upload_chunk_bytes": 512 * 1024,
+    "upload_concurrency": 8,
+    "max_retries": 3,
+    "retry_backoff_seconds": 0.5
+}
+
+# Statuses worth retrying: throttling and transient gateway errors
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+# Methods that are safe to resend after a timeout or an ambiguous gateway error
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Statuses meaning the request was refused before being processed
+UNPROCESSED_STATUSES = {429, 503}
+
+# Settings baked into a shared session's connector; sessions are shared per distinct set
+SESSION_SETTINGS = (
+    "connection_limit", "connection_limit_per_host", "keepalive_timeout",
+    "dns_cache_ttl", "connect_timeout"
+)
+
+
+class OneCRequestError(Exception):
+    """Non-200 response from the 1C ZUP API"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _agent_content_hash(agent_data: OneCAgentData) -> str:
+    """Stable hash of the 1C agent payload used to skip unchanged agents"""
+    payload = json.dumps(json.loads(agent_data.json()), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
 class OneCService:
     """Service for 1C ZUP integration operations"""
     
+    # Long-lived HTTP sessions per 1C base URL and connector settings, shared by all service instances
+    _sessions: Dict[Tuple[Any, ...], Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+    
     def __init__(self, connection: IntegrationConnection):
         self.connection = connection
         self.base_url = connection.endpoint_url
@@ -57,13 +109,121 @@ class OneCService:
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self.session = await self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the shared session stays open)"""
+        self.session = None
+    
+    def _http_setting(self, name: str):
+        """HTTP tuning value from connection config with module default"""
+        return self.config.get(name, DEFAULT_HTTP_SETTINGS[name])
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared keep-alive session for this 1C endpoint and connector settings"""
+        loop = asyncio.get_running_loop()
+        key = (self.base_url,) + tuple(self._http_setting(name) for name in SESSION_SETTINGS)
+        entry = OneCService._sessions.get(key)
+        
+        if entry is None or entry[0] is not loop or entry[1].closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._http_setting("connection_limit"),
+                limit_per_host=self._http_setting("connection_limit_per_host"),
+                keepalive_timeout=self._http_setting("keepalive_timeout"),
+                use_dns_cache=True,
+                ttl_dns_cache=self._http_setting("dns_cache_ttl")
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=300, sock_connect=self._http_setting("connect_timeout"))
+            )
+            OneCService._sessions[key] = (loop, session)
+            return session
+        
+        return entry[1]
+    
+    @classmethod
+    async def close_sessions(cls) -> None:
+        """Close shared 1C sessions (application shutdown)"""
+        loop = asyncio.get_running_loop()
+        sessions, cls._sessions = cls._sessions, {}
+        for session_loop, session in sessions.values():
+            if session_loop is loop and not session.closed:
+                await session.close()
+    
+    async def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> Tuple[int, Any]:
+        """
+        Send a request over the shared session with retry and backoff
+        
+        Idempotent methods retry connection errors, timeouts and RETRYABLE_STATUSES
+        with exponential backoff plus jitter. Other methods (POST) may already have
+        been applied by 1C when a timeout or gateway error comes back, so they only
+        retry failed connects and UNPROCESSED_STATUSES. Returns the status and the
+        decoded JSON body for 200 responses, or the response text otherwise.
+        """
+        session = await self._get_session()
+        max_retries = self._http_setting("max_retries")
+        backoff = self._http_setting("retry_backoff_seconds")
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRYABLE_STATUSES if idempotent else UNPROCESSED_STATUSES
+        retry_errors = ((aiohttp.ClientConnectionError, asyncio.TimeoutError) if idempotent
+                        else aiohttp.ClientConnectorError)
+        
+        for attempt in range(max_retries + 1):
+            try:
+                async with session.request(method, url, headers=self._get_auth_headers(), **kwargs) as response:
+                    if response.status in retry_statuses and attempt < max_retries:
+                        await response.read()
+                    elif response.status == 200:
+                        return response.status, await response.json()
+                    else:
+                        return response.status, await response.text()
+            except retry_errors:
+                if attempt >= max_retries:
+                    raise
+            
+            delay = backoff * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+    
+    def _chunk_records(self, records: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split records into chunks bounded by record count and JSON size"""
+        max_records = self._http_setting("upload_chunk_records")
+        max_bytes = self._http_setting("upload_chunk_bytes")
+        
+        chunks = []
+        current = []
+        current_bytes = 0
+        for record in records:
+            record_bytes = len(json.dumps(record, default=str))
+            if current and (len(current) >= max_records or current_bytes + record_bytes > max_bytes):
+                chunks.append(current)
+                current = []
+                current_bytes = 0
+            current.append(record)
+            current_bytes += record_bytes
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    async def _post_concurrently(self, url: str, payloads: List[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+        """POST payloads concurrently, at most upload_concurrency in flight"""
+        semaphore = asyncio.Semaphore(self._http_setting("upload_concurrency"))
+        
+        async def post(payload: Dict[str, Any]) -> Tuple[int, Any]:
+            async with semaphore:
+                try:
+                    return await self._request_with_retry("POST", url, json=payload)
+                except Exception as e:
+                    return 0, str(e)
+        
+        return await asyncio.gather(*(post(payload) for payload in payloads))
     
     def _get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for 1C requests"""
@@ -87,29 +247,29 @@ class OneCService:
     async def test_connection(self) -> Dict[str, Any]:
         """Test connection to 1C ZUP system"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                test_url = f"{self.base_url}/api/test"
+            session = await self._get_session()
+            headers = self._get_auth_headers()
+            test_url = f"{self.base_url}/api/test"
+            
+            start_time = datetime.utcnow()
+            async with session.get(test_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                end_time = datetime.utcnow()
+                response_time = (end_time - start_time).total_seconds() * 1000
                 
-                start_time = datetime.utcnow()
-                async with session.get(test_url, headers=headers, timeout=30) as response:
-                    end_time = datetime.utcnow()
-                    response_time = (end_time - start_time).total_seconds() * 1000
-                    
-                    if response.status == 200:
-                        return {
-                            "success": True,
-                            "status_code": response.status,
-                            "response_time_ms": response_time,
-                            "message": "Connection successful"
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "status_code": response.status,
-                            "response_time_ms": response_time,
-                            "message": f"Connection failed with status {response.status}"
-                        }
+                if response.status == 200:
+                    return {
+                        "success": True,
+                        "status_code": response.status,
+                        "response_time_ms": response_time,
+                        "message": "Connection successful"
+                    }
+                else:
+                    return {
+                        "success": False,
+                        "status_code": response.status,
+                        "response_time_ms": response_time,
+                        "message": f"Connection failed with status {response.status}"
+                    }
                         
         except Exception as e:
             logger.error(f"1C connection test failed: {str(e)}")
@@ -128,49 +288,83 @@ class OneCService:
     ) -> List[OneCAgentData]:
         """Get agents from 1C ZUP for specified date range"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                
-                # Build query parameters
-                params = {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat()
-                }
-                
-                if departments:
-                    params["departments"] = ",".join(departments)
-                
-                url = f"{self.base_url}/api/personnel/agents"
-                
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        agents = []
-                        
-                        for agent_data in data.get("agents", []):
-                            agent = OneCAgentData(
-                                agent_id=agent_data.get("id"),
-                                tab_number=agent_data.get("tab_number"),
-                                first_name=agent_data.get("first_name"),
-                                last_name=agent_data.get("last_name"),
-                                middle_name=agent_data.get("middle_name"),
-                                department=agent_data.get("department"),
-                                position=agent_data.get("position"),
-                                hire_date=agent_data.get("hire_date"),
-                                status=agent_data.get("status", "active"),
-                                skills=agent_data.get("skills", [])
-                            )
-                            agents.append(agent)
-                        
-                        return agents
-                    else:
-                        logger.error(f"Failed to get agents from 1C: {response.status}")
-                        return []
+            agents = []
+            async for page in self.iter_agent_pages(start_date, end_date, departments):
+                agents.extend(page)
+            return agents
                         
         except Exception as e:
             logger.error(f"Error getting agents from 1C: {str(e)}")
             return []
     
+    async def iter_agent_pages(
+        self,
+        start_date: date,
+        end_date: date,
+        departments: Optional[List[str]] = None,
+        page_size: Optional[int] = None,
+        invalid_records: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[List[OneCAgentData]]:
+        """
+        Stream agents from 1C ZUP page by page
+        
+        Pages are requested with offset/limit and yielded as soon as they are
+        parsed. Paging stops on a short page or when 1C reports has_more=false.
+        Transient failures are retried; other non-200 responses raise
+        OneCRequestError. Records that do not parse are left out of the page
+        and appended to invalid_records, if given.
+        """
+        page_size = page_size or self.config.get("personnel_page_size", DEFAULT_PERSONNEL_PAGE_SIZE)
+        url = f"{self.base_url}/api/personnel/agents"
+        
+        # Build query parameters
+        params = {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat()
+        }
+        
+        if departments:
+            params["departments"] = ",".join(departments)
+        
+        offset = 0
+        while True:
+            page_params = {**params, "offset": offset, "limit": page_size}
+            status, data = await self._request_with_retry("GET", url, params=page_params)
+            if status != 200:
+                raise OneCRequestError(status, f"1C personnel page at offset {offset} failed: {data}")
+            
+            raw_agents = data.get("agents", [])
+            page = []
+            for agent_data in raw_agents:
+                try:
+                    page.append(self._parse_agent(agent_data))
+                except Exception as e:
+                    logger.error(f"Invalid 1C agent record {agent_data.get('id')}: {str(e)}")
+                    if invalid_records is not None:
+                        invalid_records.append(agent_data)
+            if page:
+                yield page
+            
+            offset += len(raw_agents)
+            if len(raw_agents) < page_size or not data.get("has_more", True):
+                break
+    
+    @staticmethod
+    def _parse_agent(agent_data: Dict[str, Any]) -> OneCAgentData:
+        """Build OneCAgentData from a 1C personnel record"""
+        return OneCAgentData(
+            agent_id=agent_data.get("id"),
+            tab_number=agent_data.get("tab_number"),
+            first_name=agent_data.get("first_name"),
+            last_name=agent_data.get("last_name"),
+            middle_name=agent_data.get("middle_name"),
+            department=agent_data.get("department"),
+            position=agent_data.get("position"),
+            hire_date=agent_data.get("hire_date"),
+            status=agent_data.get("status", "active"),
+            skills=agent_data.get("skills", [])
+        )
+    
     async def sync_personnel_data(
         self, 
         sync_params: OneCPersonnelSync,
@@ -192,37 +386,38 @@ class OneCService:
         await db.commit()
         
         try:
-            # Get agents from 1C
-            agents = await self.get_agents(
-                start_date=sync_params.start_date,
-                end_date=sync_params.end_date,
-                departments=sync_params.departments
-            )
-            
-            sync_log.records_processed = len(agents)
+            records_processed = 0
+            records_unchanged = 0
             successful_syncs = 0
             failed_syncs = 0
             
-            for agent_data in agents:
+            invalid_records = []
+            
+            # Stream agents from 1C and upsert them page by page
+            async for page in self.iter_agent_pages(
+                start_date=sync_params.start_date,
+                end_date=sync_params.end_date,
+                departments=sync_params.departments,
+                invalid_records=invalid_records
+            ):
+                records_processed += len(page)
                 try:
-                    # Store in integration table
-                    integration_data = OneCIntegrationData(
-                        data_type="personnel",
-                        onec_id=agent_data.agent_id,
-                        onec_type="agent",
-                        onec_data=agent_data.dict(),
-                        sync_status="pending"
-                    )
-                    db.add(integration_data)
-                    
-                    # Map to WFM Agent if needed
-                    await self._map_agent_to_wfm(agent_data, integration_data, db)
-                    
-                    successful_syncs += 1
+                    async with db.begin_nested():
+                        written, unchanged, failed = await self._upsert_personnel_page(
+                            page, db, force=sync_params.full_sync
+                        )
+                    await db.commit()
+                    successful_syncs += written + unchanged
+                    records_unchanged += unchanged
+                    failed_syncs += failed
                     
                 except Exception as e:
-                    logger.error(f"Failed to sync agent {agent_data.agent_id}: {str(e)}")
-                    failed_syncs += 1
+                    logger.error(f"Failed to sync personnel page of {len(page)} agents: {str(e)}")
+                    failed_syncs += len(page)
+            
+            records_processed += len(invalid_records)
+            failed_syncs += len(invalid_records)
+            sync_log.records_processed = records_processed
             
             # Update sync log
             sync_log.end_time = datetime.utcnow()
@@ -240,6 +435,7 @@ class OneCService:
                     "connection_id": str(self.connection.id),
                     "records_processed": sync_log.records_processed,
                     "records_successful": successful_syncs,
+                    "records_unchanged": records_unchanged,
                     "records_failed": failed_syncs
                 }
             )
@@ -249,7 +445,7 @@ class OneCService:
                 status="completed" if failed_syncs == 0 else "failed",
                 started_at=sync_log.start_time,
                 progress_percentage=100.0,
-                records_to_process=len(agents),
+                records_to_process=records_processed,
                 records_processed=successful_syncs
             )
             
@@ -269,78 +465,180 @@ class OneCService:
                 records_processed=0
             )
     
-    async def _map_agent_to_wfm(
-        self, 
-        agent_data: OneCAgentData,
-        integration_data: OneCIntegrationData,
-        db: AsyncSession
-    ) -> None:
-        """Map 1C agent data to WFM Agent model"""
-        try:
-            # Check if agent already exists
-            stmt = select(Agent).where(Agent.agent_number == agent_data.tab_number)
-            result = await db.execute(stmt)
-            existing_agent = result.scalar_one_or_none()
-            
-            if existing_agent:
-                # Update existing agent
-                existing_agent.name = agent_data.first_name
-                existing_agent.surname = agent_data.last_name
-                existing_agent.second_name = agent_data.middle_name
-                existing_agent.updated_at = datetime.utcnow()
-                
-                integration_data.wfm_entity_id = existing_agent.id
-                integration_data.wfm_entity_type = "agent"
-                integration_data.sync_status = "synced"
-                integration_data.synced_at = datetime.utcnow()
-                
-            else:
-                # Create new agent
-                new_agent = Agent(
-                    id=agent_data.agent_id,
-                    name=agent_data.first_name,
-                    surname=agent_data.last_name,
-                    second_name=agent_data.middle_name,
-                    agent_number=agent_data.tab_number,
-                    email=f"{agent_data.first_name.lower()}.{agent_data.last_name.lower()}@company.com"
-                )
-                db.add(new_agent)
+    async def _upsert_personnel_page(
+        self,
+        agents: List[OneCAgentData],
+        db: AsyncSession,
+        force: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Bulk upsert one page of 1C agents
+        
+        Existing WFM agents and the last synced content hashes are loaded with
+        one query each. Agents whose 1C payload is unchanged are skipped; the
+        rest are written with a single INSERT ... ON CONFLICT.
+        
+        Returns:
+            (agents written, agents unchanged, agents failed)
+        """
+        hashes = {agent.agent_id: _agent_content_hash(agent) for agent in agents}
+        
+        # Existing agents by tab number
+        stmt = select(Agent.agent_number, Agent.id).where(
+            Agent.agent_number.in_([agent.tab_number for agent in agents])
+        )
+        existing_ids = dict((await db.execute(stmt)).all())
+        
+        previous_hashes = {}
+        if not force:
+            stmt = select(OneCIntegrationData.onec_id, OneCIntegrationData.mapped_data).where(
+                OneCIntegrationData.data_type == "personnel",
+                OneCIntegrationData.sync_status == "synced",
+                OneCIntegrationData.onec_id.in_(list(hashes))
+            ).order_by(OneCIntegrationData.synced_at)
+            previous_hashes = {
+                onec_id: (mapped_data or {}).get("content_hash")
+                for onec_id, mapped_data in (await db.execute(stmt)).all()
+            }
+        
+        agent_rows, integration_rows, unchanged, failed = self._plan_personnel_page(
+            agents, hashes, existing_ids, previous_hashes
+        )
+        
+        if agent_rows:
+            stmt = pg_insert(Agent).values(agent_rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Agent.id],
+                set_={
+                    "name": stmt.excluded.name,
+                    "surname": stmt.excluded.surname,
+                    "second_name": stmt.excluded.second_name,
+                    "agent_number": stmt.excluded.agent_number,
+                    "updated_at": stmt.excluded.updated_at
+                }
+            )
+            await db.execute(stmt)
+            await db.execute(insert(OneCIntegrationData).values(integration_rows))
+        
+        return len(agent_rows), unchanged, failed
+    
+    @staticmethod
+    def _plan_personnel_page(
+        agents: List[OneCAgentData],
+        hashes: Dict[str, str],
+        existing_ids: Dict[str, str],
+        previous_hashes: Dict[str, Optional[str]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int, int]:
+        """
+        Split a page into agent upsert rows, integration rows and unchanged agents
+        
+        An agent is unchanged when it still exists in WFM and its content hash
+        matches the last synced one. An agent whose rows cannot be built is
+        logged and counted as failed; the rest of the page is kept.
+        
+        Returns:
+            (agent rows, integration rows, agents unchanged, agents failed)
+        """
+        now = datetime.utcnow()
+        agent_rows = {}
+        integration_rows = []
+        unchanged = 0
+        failed = 0
+        
+        for agent_data in agents:
+            try:
+                existing_id = existing_ids.get(agent_data.tab_number)
+                content_hash = hashes[agent_data.agent_id]
                 
-                integration_data.wfm_entity_id = new_agent.id
-                integration_data.wfm_entity_type = "agent"
-                integration_data.sync_status = "synced"
-                integration_data.synced_at = datetime.utcnow()
+                if existing_id is not None and previous_hashes.get(agent_data.agent_id) == content_hash:
+                    unchanged += 1
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Failed to map agent {agent_data.agent_id}: {str(e)}")
-            integration_data.sync_status = "error"
-            integration_data.sync_error = str(e)
+                agent_id = existing_id if existing_id is not None else agent_data.agent_id
+                agent_row = {
+                    "id": agent_id,
+                    "name": agent_data.first_name,
+                    "surname": agent_data.last_name,
+                    "second_name": agent_data.middle_name,
+                    "agent_number": agent_data.tab_number,
+                    "email": f"{agent_data.first_name.lower()}.{agent_data.last_name.lower()}@company.com",
+                    "created_at": now,
+                    "updated_at": now
+                }
+                integration_row = {
+                    "id": uuid4(),
+                    "data_type": "personnel",
+                    "onec_id": agent_data.agent_id,
+                    "onec_type": "agent",
+                    "onec_data": json.loads(agent_data.json()),
+                    "mapped_data": {"content_hash": content_hash},
+                    "wfm_entity_id": agent_id,
+                    "wfm_entity_type": "agent",
+                    "sync_status": "synced",
+                    "created_at": now,
+                    "synced_at": now
+                }
+            except Exception as e:
+                logger.error(f"Failed to sync agent {getattr(agent_data, 'agent_id', None)}: {str(e)}")
+                failed += 1
+                continue
+            
+            # Last record wins if 1C repeats an agent within the page
+            agent_rows[agent_id] = agent_row
+            integration_rows.append(integration_row)
+        
+        return list(agent_rows.values()), integration_rows, unchanged, failed
     
     async def send_schedule(self, schedule_data: Dict[str, Any]) -> IntegrationResponse:
-        """Send schedule data to 1C ZUP"""
+        """
+        Send schedule data to 1C ZUP
+        
+        Large schedules are split into size-bounded employee chunks that are
+        posted concurrently; each chunk carries chunk_index/chunk_count.
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                url = f"{self.base_url}/api/schedule/import"
-                
-                # Transform schedule data for 1C format
-                onec_schedule = await self._transform_schedule_for_onec(schedule_data)
-                
-                async with session.post(url, headers=headers, json=onec_schedule) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return IntegrationResponse(
-                            success=True,
-                            message="Schedule successfully sent to 1C",
-                            data=result
-                        )
-                    else:
-                        error_text = await response.text()
-                        return IntegrationResponse(
-                            success=False,
-                            message=f"Failed to send schedule to 1C: {error_text}",
-                            data={"status_code": response.status}
-                        )
+            url = f"{self.base_url}/api/schedule/import"
+            
+            # Transform schedule data for 1C format
+            onec_schedule = await self._transform_schedule_for_onec(schedule_data)
+            chunks = self._chunk_records(onec_schedule["employees"])
+            
+            if len(chunks) <= 1:
+                status, result = await self._request_with_retry("POST", url, json=onec_schedule)
+                if status == 200:
+                    return IntegrationResponse(
+                        success=True,
+                        message="Schedule successfully sent to 1C",
+                        data=result
+                    )
+                else:
+                    return IntegrationResponse(
+                        success=False,
+                        message=f"Failed to send schedule to 1C: {result}",
+                        data={"status_code": status}
+                    )
+            
+            payloads = [
+                {**onec_schedule, "employees": chunk, "chunk_index": index, "chunk_count": len(chunks)}
+                for index, chunk in enumerate(chunks)
+            ]
+            responses = await self._post_concurrently(url, payloads)
+            failed_chunks = [
+                {"chunk_index": index, "status_code": status, "error": result}
+                for index, (status, result) in enumerate(responses) if status != 200
+            ]
+            
+            if failed_chunks:
+                return IntegrationResponse(
+                    success=False,
+                    message=f"Failed to send {len(failed_chunks)} of {len(chunks)} schedule chunks to 1C",
+                    data={"chunks": len(chunks), "failed_chunks": failed_chunks}
+                )
+            return IntegrationResponse(
+                success=True,
+                message="Schedule successfully sent to 1C",
+                data={"chunks": len(chunks), "results": [result for _, result in responses]}
+            )
                         
         except Exception as e:
             logger.error(f"Error sending schedule to 1C: {str(e)}")
@@ -382,36 +680,79 @@ class OneCService:
     
     async def send_work_time(self, time_data: Dict[str, Any]) -> IntegrationResponse:
         """Send work time data to 1C ZUP"""
+        return (await self.send_work_time_batch([time_data]))[0]
+    
+    async def send_work_time_batch(self, time_entries: List[Dict[str, Any]]) -> List[IntegrationResponse]:
+        """
+        Send many work time records to 1C ZUP
+        
+        Records are split into size-bounded chunks (_chunk_records) and each
+        chunk is posted once as {"entries": [...], "chunk_index", "chunk_count"};
+        chunks go out concurrently, at most upload_concurrency at a time, with
+        retry. A single record is posted on its own, as before. Results keep
+        input order: when 1C returns a "results" list for a chunk each entry
+        gets its own item (an item with an "error" fails just that entry),
+        otherwise the chunk's outcome applies to all of its entries.
+        """
+        url = f"{self.base_url}/api/timesheet/import"
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                url = f"{self.base_url}/api/timesheet/import"
-                
-                # Transform time data for 1C format
-                onec_time = await self._transform_time_for_onec(time_data)
-                
-                async with session.post(url, headers=headers, json=onec_time) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return IntegrationResponse(
-                            success=True,
-                            message="Work time successfully sent to 1C",
-                            data=result
-                        )
-                    else:
-                        error_text = await response.text()
-                        return IntegrationResponse(
-                            success=False,
-                            message=f"Failed to send work time to 1C: {error_text}",
-                            data={"status_code": response.status}
-                        )
-                        
+            # Transform time data for 1C format
+            records = [await self._transform_time_for_onec(time_data) for time_data in time_entries]
+            chunks = self._chunk_records(records)
+            if len(records) == 1:
+                payloads = records
+            else:
+                payloads = [
+                    {"entries": chunk, "chunk_index": index, "chunk_count": len(chunks)}
+                    for index, chunk in enumerate(chunks)
+                ]
+            responses = await self._post_concurrently(url, payloads)
         except Exception as e:
             logger.error(f"Error sending work time to 1C: {str(e)}")
-            return IntegrationResponse(
-                success=False,
-                message=f"Error sending work time to 1C: {str(e)}"
-            )
+            return [
+                IntegrationResponse(success=False, message=f"Error sending work time to 1C: {str(e)}")
+                for _ in time_entries
+            ]
+        
+        results = []
+        for chunk, (status, result) in zip(chunks, responses):
+            if status == 200:
+                entry_results = result.get("results") if isinstance(result, dict) else None
+                if (not isinstance(entry_results, list) or len(entry_results) != len(chunk)
+                        or not all(isinstance(item, dict) for item in entry_results)):
+                    entry_results = [result] * len(chunk)
+                for entry_result in entry_results:
+                    if entry_result is not result and entry_result.get("error"):
+                        results.append(IntegrationResponse(
+                            success=False,
+                            message=f"Failed to send work time to 1C: {entry_result['error']}",
+                            data=entry_result
+                        ))
+                    else:
+                        results.append(IntegrationResponse(
+                            success=True,
+                            message="Work time successfully sent to 1C",
+                            data=entry_result
+                        ))
+            elif status == 0:
+                results.extend(
+                    IntegrationResponse(
+                        success=False,
+                        message=f"Error sending work time to 1C: {result}"
+                    )
+                    for _ in chunk
+                )
+            else:
+                results.extend(
+                    IntegrationResponse(
+                        success=False,
+                        message=f"Failed to send work time to 1C: {result}",
+                        data={"status_code": status}
+                    )
+                    for _ in chunk
+                )
+        return results
     
     async def _transform_time_for_onec(self, time_data: Dict[str, Any]) -> Dict[str, Any]:
         """Transform WFM time data to 1C format"""
@@ -445,22 +786,20 @@ class OneCService:
     ) -> Dict[str, Any]:
         """Get norm hours from 1C ZUP"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                params = {
-                    "employee_id": employee_id,
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat()
-                }
-                
-                url = f"{self.base_url}/api/norm-hours"
-                
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Failed to get norm hours: {response.status}")
-                        return {}
+            params = {
+                "employee_id": employee_id,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat()
+            }
+            
+            url = f"{self.base_url}/api/norm-hours"
+            
+            status, data = await self._request_with_retry("GET", url, params=params)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to get norm hours: {status}")
+                return {}
                         
         except Exception as e:
             logger.error(f"Error getting norm hours: {str(e)}")
@@ -473,21 +812,19 @@ class OneCService:
     ) -> Dict[str, Any]:
         """Get time type info from 1C ZUP"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                params = {
-                    "employee_id": employee_id,
-                    "date": query_date.isoformat()
-                }
-                
-                url = f"{self.base_url}/api/time-type-info"
-                
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Failed to get time type info: {response.status}")
-                        return {}
+            params = {
+                "employee_id": employee_id,
+                "date": query_date.isoformat()
+            }
+            
+            url = f"{self.base_url}/api/time-type-info"
+            
+            status, data = await self._request_with_retry("GET", url, params=params)
+            if status == 200:
+                return data
+            else:
+                logger.error(f"Failed to get time type info: {status}")
+                return {}
                         
         except Exception as e:
             logger.error(f"Error getting time type info: {str(e)}")
@@ -500,36 +837,33 @@ class OneCService:
     ) -> List[OneCDeviationData]:
         """Get deviations from 1C ZUP"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = self._get_auth_headers()
-                params = {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat()
-                }
+            params = {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat()
+            }
+            
+            url = f"{self.base_url}/api/deviations"
+            
+            status, data = await self._request_with_retry("GET", url, params=params)
+            if status == 200:
+                deviations = []
                 
-                url = f"{self.base_url}/api/deviations"
+                for deviation_data in data.get("deviations", []):
+                    deviation = OneCDeviationData(
+                        employee_id=deviation_data.get("employee_id"),
+                        date=deviation_data.get("date"),
+                        planned_hours=deviation_data.get("planned_hours"),
+                        actual_hours=deviation_data.get("actual_hours"),
+                        deviation_hours=deviation_data.get("deviation_hours"),
+                        deviation_type=deviation_data.get("deviation_type"),
+                        reason=deviation_data.get("reason")
+                    )
+                    deviations.append(deviation)
                 
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        deviations = []
-                        
-                        for deviation_data in data.get("deviations", []):
-                            deviation = OneCDeviationData(
-                                employee_id=deviation_data.get("employee_id"),
-                                date=deviation_data.get("date"),
-                                planned_hours=deviation_data.get("planned_hours"),
-                                actual_hours=deviation_data.get("actual_hours"),
-                                deviation_hours=deviation_data.get("deviation_hours"),
-                                deviation_type=deviation_data.get("deviation_type"),
-                                reason=deviation_data.get("reason")
-                            )
-                            deviations.append(deviation)
-                        
-                        return deviations
-                    else:
-                        logger.error(f"Failed to get deviations: {response.status}")
-                        return []
+                return deviations
+            else:
+                logger.error(f"Failed to get deviations: {status}")
+                return []
                         
         except Exception as e:
             logger.error(f"Error getting deviations: {str(e)}")
@@ -1,12 +1,51 @@
-import json
+"""
+Two-tier response cache
+
+- L1: bounded in-process LRU with a short TTL, so hot keys skip the Redis round trip
+- L2: Redis, shared by all workers
+- Single-flight: concurrent misses for the same key wait for one computation
+- Tags: every key is added to Redis sets for its tags (the function name plus any
+  declared tags), so invalidation deletes the keys of a tag instead of scanning
+  the keyspace
+
+Other workers keep their L1 copy until its TTL (CACHE_L1_TTL_SECONDS) runs out.
+"""
+import asyncio
+import fnmatch
 import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+from uuid import UUID
+
 import redis.asyncio as redis
 from src.api.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+# Tag sets outlive the keys they index; stale members are harmless on delete
+TAG_SET_TTL_SECONDS = 86400
+
+
+def _key_default(value: Any) -> Any:
+    """JSON fallback for cache keys: models by content, other objects by type"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    # Sessions, requests and services do not change the result
+    return f"<{type(value).__name__}>"
+
 
 def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a unique cache key based on function arguments."""
@@ -14,53 +53,216 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
         "args": args,
         "kwargs": kwargs
     }
-    key_hash = hashlib.md5(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    key_hash = hashlib.blake2b(
+        json.dumps(key_data, sort_keys=True, default=_key_default).encode(), digest_size=16
+    ).hexdigest()
     return f"{settings.CACHE_KEY_PREFIX}{prefix}:{key_hash}"
 
 
-def cache_decorator(expire: int = 300):
+def tag_key(tag: str) -> str:
+    return f"{settings.CACHE_KEY_PREFIX}tag:{tag}"
+
+
+class CacheManager:
+    """L1 + Redis cache with single-flight fills and tag invalidation"""
+
+    def __init__(self,
+                 client: Optional[redis.Redis] = None,
+                 l1_max_entries: Optional[int] = None,
+                 l1_ttl: Optional[int] = None):
+        self.redis = client
+        self.l1_max_entries = l1_max_entries if l1_max_entries is not None else settings.CACHE_L1_MAX_ENTRIES
+        self.l1_ttl = l1_ttl if l1_ttl is not None else settings.CACHE_L1_TTL_SECONDS
+        # key -> (expires_at, serialized value, tags)
+        self._l1: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # L1
+    # ------------------------------------------------------------------
+
+    def _l1_get(self, key: str) -> Optional[str]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return entry[1]
+
+    def _l1_set(self, key: str, serialized: str, ttl: int, tags: Tuple[str, ...]):
+        if self.l1_max_entries <= 0 or ttl <= 0:
+            return
+        self._l1[key] = (time.monotonic() + ttl, serialized, tags)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+
+    async def get_or_compute(self,
+                             key: str,
+                             compute: Callable[[], Awaitable[Any]],
+                             expire: int,
+                             tags: Sequence[str] = ()) -> Any:
+        """Cached value for key, computing it at most once per key at a time"""
+        serialized = self._l1_get(key)
+        if serialized is not None:
+            self.stats["l1_hits"] += 1
+            return json.loads(serialized)
+
+        self._bind_loop()
+        fill = self._inflight.get(key)
+        if fill is not None:
+            self.stats["coalesced"] += 1
+            _, serialized = await asyncio.shield(fill)
+            return json.loads(serialized)
+
+        fill = asyncio.ensure_future(self._fill(key, compute, expire, tuple(tags)))
+        self._inflight[key] = fill
+        fill.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the fill for the others
+        result, _ = await asyncio.shield(fill)
+        return result
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Any]],
+                    expire: int, tags: Tuple[str, ...]) -> Tuple[Any, str]:
+        l1_ttl = min(expire, self.l1_ttl)
+
+        if self.redis is not None:
+            try:
+                serialized = await self.redis.get(key)
+                if serialized:
+                    self.stats["l2_hits"] += 1
+                    self._l1_set(key, serialized, l1_ttl, tags)
+                    return json.loads(serialized), serialized
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"Cache read failed for {key}: {e}")
+
+        self.stats["misses"] += 1
+        result = await compute()
+        serialized = json.dumps(result, default=str)
+        self._l1_set(key, serialized, l1_ttl, tags)
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.setex(key, expire, serialized)
+                for tag in tags:
+                    pipe.sadd(tag_key(tag), key)
+                    pipe.expire(tag_key(tag), max(expire, TAG_SET_TTL_SECONDS))
+                await pipe.execute()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"Cache write failed for {key}: {e}")
+
+        return result, serialized
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Drop every key carrying any of tags; returns the number of Redis keys deleted"""
+        wanted = set(tags)
+        for key in [key for key, (_, _, key_tags) in self._l1.items() if wanted.intersection(key_tags)]:
+            del self._l1[key]
+
+        if self.redis is None:
+            return 0
+        deleted = 0
+        for tag in wanted:
+            keys = await self.redis.smembers(tag_key(tag))
+            if keys:
+                deleted += await self.redis.delete(*keys)
+            await self.redis.delete(tag_key(tag))
+        return deleted
+
+    async def invalidate_pattern(self, pattern: str):
+        """Drop keys matching a glob pattern (scans the keyspace; prefer tags)"""
+        match = f"{settings.CACHE_KEY_PREFIX}{pattern}*"
+        for key in [key for key in self._l1 if fnmatch.fnmatchcase(key, match)]:
+            del self._l1[key]
+        if self.redis is not None:
+            async for key in self.redis.scan_iter(match=match):
+                await self.redis.delete(key)
+
+    def clear_local(self):
+        self._l1.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["l1_hits"] + self.stats["l2_hits"] + self.stats["misses"] + self.stats["coalesced"]
+        hits = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "l1_size": len(self._l1),
+            "inflight": len(self._inflight),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+cache_manager = CacheManager(redis_client)
+
+
+def _render_tags(tags: Iterable[str], kwargs: Dict[str, Any]) -> Tuple[str, ...]:
+    """Fill "{param}" placeholders in tag templates from the call's keyword arguments"""
+    rendered = []
+    for tag in tags:
+        try:
+            rendered.append(tag.format(**kwargs))
+        except (KeyError, IndexError):
+            # Placeholder not supplied by this call
+            continue
+    return tuple(rendered)
+
+
+def cache_decorator(expire: int = 300, tags: Sequence[str] = ()):
     """
-    Decorator for caching function results in Redis.
-    
+    Decorator for caching function results in L1 and Redis.
+
     Args:
         expire: Cache expiration time in seconds
+        tags: Invalidation tags; "{param}" placeholders are filled from the
+            call's keyword arguments (e.g. "employee:{employee_id}"). The
+            function name is always a tag.
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
             # Generate cache key
             cache_key = generate_cache_key(func.__name__, *args, **kwargs)
-            
-            # Try to get from cache
-            try:
-                cached_result = await redis_client.get(cache_key)
-                if cached_result:
-                    return json.loads(cached_result)
-            except Exception as e:
-                # Log error but continue without cache
-                pass
-            
-            # Execute function
-            result = await func(*args, **kwargs)
-            
-            # Store in cache
-            try:
-                await redis_client.setex(
-                    cache_key,
-                    expire,
-                    json.dumps(result, default=str)
-                )
-            except Exception as e:
-                # Log error but return result anyway
-                pass
-            
-            return result
-        
+            key_tags = (func.__name__,) + _render_tags(tags, kwargs)
+            return await cache_manager.get_or_compute(
+                cache_key, lambda: func(*args, **kwargs), expire, key_tags
+            )
+
         return wrapper
     return decorator
 
 
+def cache_with_timeout(timeout: int = 300, tags: Sequence[str] = ()):
+    """cache_decorator with the expiry given as timeout (service-layer spelling)"""
+    return cache_decorator(expire=timeout, tags=tags)
+
+
+async def invalidate_cache_tags(*tags: str) -> int:
+    """Invalidate all cache keys carrying any of the tags."""
+    return await cache_manager.invalidate_tags(*tags)
+
+
 async def invalidate_cache_pattern(pattern: str):
     """Invalidate all cache keys matching a pattern."""
-    async for key in redis_client.scan_iter(match=f"{settings.CACHE_KEY_PREFIX}{pattern}*"):
-        await redis_client.delete(key)
\ No newline at end of file
+    await cache_manager.invalidate_pattern(pattern)
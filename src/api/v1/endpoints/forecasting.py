@@ -56,6 +56,14 @@ async def calculate_erlang_c_forecast(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/calculate/erlang-c/cache-stats")
+async def get_erlang_c_cache_stats() -> Dict[str, Any]:
+    """
+    Hit-rate metrics of the shared Erlang C staffing solver cache.
+    """
+    return ForecastingService().get_staffing_cache_stats()
+
+
 @router.post("/ml-enhanced", response_model=MLForecastResponse)
 @cache_decorator(expire=3600)
 async def generate_ml_forecast(
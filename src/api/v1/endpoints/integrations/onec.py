@@ -450,25 +450,13 @@ async def send_work_time_to_onec(
         
         # Send to 1C
         async with OneCService(connection) as onec_service:
-            results = []
-            successful_sends = 0
-            failed_sends = 0
-            
-            for time_entry in time_data:
-                try:
-                    result = await onec_service.send_work_time(time_entry.dict())
-                    results.append(result.dict())
-                    if result.success:
-                        successful_sends += 1
-                    else:
-                        failed_sends += 1
-                except Exception as e:
-                    results.append({
-                        "success": False,
-                        "message": f"Failed to send time data: {str(e)}",
-                        "employee_id": time_entry.employee_id
-                    })
-                    failed_sends += 1
+            batch_results = await onec_service.send_work_time_batch(
+                [time_entry.dict() for time_entry in time_data]
+            )
+        
+        results = [result.dict() for result in batch_results]
+        successful_sends = sum(1 for result in batch_results if result.success)
+        failed_sends = len(batch_results) - successful_sends
         
         # Log the operation
         sync_log = IntegrationSyncLog(
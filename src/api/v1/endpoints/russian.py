@@ -3,8 +3,10 @@ Russian Market Integration API Endpoints
 Our competitive advantage - Argus has ZERO Russian capabilities
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 import pandas as pd
@@ -139,15 +141,13 @@ async def export_to_1c_zup(request: VacationExportRequest):
             # Convert vacation data
             vacation_df = pd.DataFrame(request.vacation_data)
             
-            # Generate Excel file
-            excel_buffer = exporter.export_to_excel(
-                vacation_df,
-                f"График_отпусков_{request.period}.xlsx"
-            )
+            year = int(request.period[:4]) if request.period[:4].isdigit() else None
             
-            # Return file
-            return Response(
-                content=excel_buffer.getvalue(),
+            # Build the workbook before any header is sent so export errors
+            # become a 500 instead of a truncated download; then stream it
+            spool = await asyncio.to_thread(exporter.spool_vacation_schedule, vacation_df, year)
+            return StreamingResponse(
+                exporter.iter_spooled_workbook(spool),
                 media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 headers={
                     "Content-Disposition": f"attachment; filename=vacation_schedule_{request.period}.xlsx"
@@ -3,20 +3,26 @@ REAL BULK SCHEDULE ASSIGNMENT ENDPOINT
 Task 38/50: Bulk Schedule Assignment for Multiple Employees
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from pydantic import BaseModel
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from uuid import UUID
 import uuid
 import json
 
-from ...core.database import get_db
+from ...core.database import get_db, AsyncSessionLocal
 
 router = APIRouter()
 
+# Employees per transaction when running as a background job
+BACKGROUND_CHUNK_SIZE = 1000
+
+# In-memory job tracking (would use Redis/database in production)
+bulk_assignment_jobs: Dict[str, Dict[str, Any]] = {}
+
 class BulkAssignmentRequest(BaseModel):
     employee_ids: List[UUID]
     template_id: UUID
@@ -24,6 +30,7 @@ class BulkAssignmentRequest(BaseModel):
     assignment_period_end: date
     assignment_strategy: str = "равномерное_распределение"  # Russian strategy
     override_conflicts: Optional[bool] = False
+    run_in_background: Optional[bool] = False
 
 class BulkAssignmentResponse(BaseModel):
     bulk_operation_id: str
@@ -32,193 +39,334 @@ class BulkAssignmentResponse(BaseModel):
     operation_summary: Dict[str, Any]
     message: str
 
-@router.post("/schedules/assignments/bulk", response_model=BulkAssignmentResponse, tags=["🔥 REAL Schedule Assignments"])
+class BulkAssignmentJobResponse(BaseModel):
+    bulk_operation_id: str
+    status: str
+    total: int
+    processed: int
+    progress_percent: float
+    successful_count: int
+    failed_count: int
+    message: str
+    result: Optional[BulkAssignmentResponse] = None
+
+# One row per requested employee, in request order: whether the employee is
+# active and how many active/pending schedules overlap the period
+ASSIGNMENT_CHECK_QUERY = text("""
+    SELECT req.employee_id, e.id IS NOT NULL AS found, e.first_name, e.last_name,
+           COALESCE(c.conflicts, 0) AS conflicts
+    FROM unnest(CAST(:employee_ids AS uuid[])) WITH ORDINALITY AS req(employee_id, ord)
+    LEFT JOIN employees e ON e.id = req.employee_id AND e.is_active = true
+    LEFT JOIN (
+        SELECT employee_id, COUNT(*) AS conflicts
+        FROM work_schedules_core
+        WHERE employee_id = ANY(CAST(:employee_ids AS uuid[]))
+        AND status IN ('active', 'pending')
+        AND effective_date <= :end_date
+        AND (expiry_date IS NULL OR expiry_date >= :start_date)
+        GROUP BY employee_id
+    ) c ON c.employee_id = req.employee_id
+    ORDER BY req.ord
+""")
+
+# Per-row values come from bound arrays; the scalar parameters are coerced to
+# the column types as they would be in a VALUES list
+ASSIGNMENT_INSERT_QUERY = text("""
+    INSERT INTO work_schedules_core 
+    (id, employee_id, template_id, schedule_name, shift_assignments,
+     total_hours, status, effective_date, expiry_date, 
+     bulk_operation_id, created_at, updated_at)
+    SELECT a.id, a.employee_id, :template_id, :schedule_name, :shifts,
+           :total_hours, 'assigned', :effective_date, :expiry_date,
+           :bulk_id, :created_at, :updated_at
+    FROM unnest(CAST(:assignment_ids AS uuid[]), CAST(:employee_ids AS uuid[])) AS a(id, employee_id)
+""")
+
+def _generate_shifts(request: BulkAssignmentRequest) -> List[Dict[str, Any]]:
+    """Shifts for the period; the strategy gives every employee the same pattern"""
+    shifts = []
+    if request.assignment_strategy == "равномерное_распределение":
+        # Create standard 5-day work schedule
+        current_date = request.assignment_period_start
+        while current_date <= request.assignment_period_end:
+            if current_date.weekday() < 5:  # Monday-Friday
+                shifts.append({
+                    "дата": current_date.isoformat(),
+                    "время_начала": "09:00",
+                    "время_окончания": "17:00",
+                    "часы": 8,
+                    "тип_смены": "стандартная"
+                })
+            current_date += timedelta(days=1)
+    return shifts
+
+async def _load_template(db: AsyncSession, template_id: UUID):
+    template_query = text("""
+        SELECT id, template_name, shift_structure, cost_per_hour
+        FROM schedule_templates 
+        WHERE id = :template_id AND is_active = true
+    """)
+    
+    template_result = await db.execute(template_query, {"template_id": template_id})
+    template = template_result.fetchone()
+    
+    if not template:
+        raise HTTPException(status_code=404, detail=f"Шаблон {template_id} не найден")
+    return template
+
+async def _assign_employees(
+    db: AsyncSession,
+    request: BulkAssignmentRequest,
+    template,
+    employee_ids: List[UUID],
+    bulk_operation_id: str,
+    current_time: datetime
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Assign the template to employee_ids with one conflict check and one INSERT
+    Returns per-employee successful and failed outcomes in request order
+    """
+    check_result = await db.execute(ASSIGNMENT_CHECK_QUERY, {
+        "employee_ids": list(employee_ids),
+        "start_date": request.assignment_period_start,
+        "end_date": request.assignment_period_end
+    })
+    
+    shifts = _generate_shifts(request)
+    total_hours = sum(shift["часы"] for shift in shifts)
+    successful_assignments = []
+    failed_assignments = []
+    assignment_ids: List[UUID] = []
+    assigned_employee_ids: List[UUID] = []
+    
+    for row in check_result.fetchall():
+        employee_id_str = str(row.employee_id)
+        
+        if not row.found:
+            failed_assignments.append({
+                "employee_id": employee_id_str,
+                "ошибка": "Сотрудник не найден или неактивен"
+            })
+            continue
+        
+        name = f"{row.first_name} {row.last_name}"
+        if row.conflicts > 0 and not request.override_conflicts:
+            failed_assignments.append({
+                "employee_id": employee_id_str,
+                "имя": name,
+                "ошибка": f"Конфликт с {row.conflicts} существующими расписаниями"
+            })
+            continue
+        
+        assignment_id = uuid.uuid4()
+        assignment_ids.append(assignment_id)
+        assigned_employee_ids.append(row.employee_id)
+        successful_assignments.append({
+            "assignment_id": str(assignment_id),
+            "employee_id": employee_id_str,
+            "имя": name,
+            "часы": total_hours,
+            "количество_смен": len(shifts),
+            "конфликты_переопределены": row.conflicts > 0
+        })
+    
+    if assignment_ids:
+        await db.execute(ASSIGNMENT_INSERT_QUERY, {
+            'assignment_ids': assignment_ids,
+            'employee_ids': assigned_employee_ids,
+            'template_id': request.template_id,
+            'schedule_name': f"Массовое назначение - {template.template_name}",
+            'shifts': json.dumps(shifts),
+            'total_hours': total_hours,
+            'effective_date': request.assignment_period_start,
+            'expiry_date': request.assignment_period_end,
+            'bulk_id': bulk_operation_id,
+            'created_at': current_time,
+            'updated_at': current_time
+        })
+    
+    return successful_assignments, failed_assignments
+
+async def _record_bulk_operation(
+    db: AsyncSession,
+    request: BulkAssignmentRequest,
+    bulk_operation_id: str,
+    successful_count: int,
+    failed_count: int,
+    current_time: datetime
+):
+    bulk_record_query = text("""
+        INSERT INTO bulk_operations 
+        (id, operation_type, template_id, target_count, successful_count, 
+         failed_count, operation_details, created_at)
+        VALUES 
+        (:id, :type, :template_id, :target, :successful, :failed, :details, :created_at)
+    """)
+    
+    await db.execute(bulk_record_query, {
+        'id': bulk_operation_id,
+        'type': 'bulk_schedule_assignment',
+        'template_id': request.template_id,
+        'target': len(request.employee_ids),
+        'successful': successful_count,
+        'failed': failed_count,
+        'details': json.dumps({"strategy": request.assignment_strategy}),
+        'created_at': current_time
+    })
+
+def _build_response(
+    request: BulkAssignmentRequest,
+    template,
+    bulk_operation_id: str,
+    successful_assignments: List[Dict[str, Any]],
+    failed_assignments: List[Dict[str, Any]]
+) -> BulkAssignmentResponse:
+    operation_summary = {
+        "всего_сотрудников": len(request.employee_ids),
+        "успешных_назначений": len(successful_assignments),
+        "неудачных_назначений": len(failed_assignments),
+        "шаблон": template.template_name,
+        "стратегия": request.assignment_strategy,
+        "период": f"{request.assignment_period_start} - {request.assignment_period_end}",
+        "процент_успеха": round(len(successful_assignments) / len(request.employee_ids) * 100, 1)
+    }
+    
+    return BulkAssignmentResponse(
+        bulk_operation_id=bulk_operation_id,
+        successful_assignments=successful_assignments,
+        failed_assignments=failed_assignments,
+        operation_summary=operation_summary,
+        message=f"Массовое назначение завершено: {len(successful_assignments)} успешно, {len(failed_assignments)} неудачно"
+    )
+
+def _job_response(bulk_operation_id: str) -> BulkAssignmentJobResponse:
+    job = bulk_assignment_jobs[bulk_operation_id]
+    total = job["total"]
+    return BulkAssignmentJobResponse(
+        bulk_operation_id=bulk_operation_id,
+        status=job["status"],
+        total=total,
+        processed=job["processed"],
+        progress_percent=round(job["processed"] / total * 100, 1) if total else 100.0,
+        successful_count=len(job["successful"]),
+        failed_count=len(job["failed"]),
+        message=job["message"],
+        result=job.get("result")
+    )
+
+@router.post(
+    "/schedules/assignments/bulk",
+    response_model=Union[BulkAssignmentResponse, BulkAssignmentJobResponse],
+    tags=["🔥 REAL Schedule Assignments"]
+)
 async def bulk_assign_schedules(
     request: BulkAssignmentRequest,
+    background_tasks: BackgroundTasks,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
     REAL BULK SCHEDULE ASSIGNMENT - NO MOCKS!
     
     Assigns schedules to multiple employees simultaneously
-    Uses real work_schedules_core with batch processing
+    Uses real work_schedules_core with one set-based conflict check and one bulk insert
     Supports Russian assignment strategies
+    
+    With run_in_background the assignment runs as a job in chunks of
+    BACKGROUND_CHUNK_SIZE employees; the response is 202 and progress is at
+    GET /schedules/assignments/bulk/jobs/{bulk_operation_id}
     """
     try:
         # Validate template
-        template_query = text("""
-            SELECT id, template_name, shift_structure, cost_per_hour
-            FROM schedule_templates 
-            WHERE id = :template_id AND is_active = true
-        """)
-        
-        template_result = await db.execute(template_query, {"template_id": request.template_id})
-        template = template_result.fetchone()
-        
-        if not template:
-            raise HTTPException(status_code=404, detail=f"Шаблон {request.template_id} не найден")
-        
-        shift_structure = json.loads(template.shift_structure) if template.shift_structure else {}
+        template = await _load_template(db, request.template_id)
         
-        # Get employees info
-        employee_ids_str = "'" + "','".join(str(eid) for eid in request.employee_ids) + "'"
-        employees_query = text(f"""
-            SELECT e.id, e.first_name, e.last_name, e.max_hours_per_week, e.department_id
-            FROM employees e 
-            WHERE e.id IN ({employee_ids_str}) AND e.is_active = true
-        """)
+        bulk_operation_id = str(uuid.uuid4())
         
-        employees_result = await db.execute(employees_query)
-        employees = {str(emp.id): emp for emp in employees_result.fetchall()}
+        if request.run_in_background:
+            bulk_assignment_jobs[bulk_operation_id] = {
+                "status": "pending",
+                "total": len(request.employee_ids),
+                "processed": 0,
+                "successful": [],
+                "failed": [],
+                "message": "Задание поставлено в очередь",
+                "created_at": datetime.utcnow()
+            }
+            background_tasks.add_task(_run_bulk_assignment_job, bulk_operation_id, request, template)
+            response.status_code = 202
+            return _job_response(bulk_operation_id)
         
-        # Process assignments
-        bulk_operation_id = str(uuid.uuid4())
         current_time = datetime.utcnow()
-        successful_assignments = []
-        failed_assignments = []
-        
-        for employee_id in request.employee_ids:
-            employee_id_str = str(employee_id)
-            
-            if employee_id_str not in employees:
-                failed_assignments.append({
-                    "employee_id": employee_id_str,
-                    "ошибка": "Сотрудник не найден или неактивен"
-                })
-                continue
-            
-            employee = employees[employee_id_str]
-            
-            try:
-                # Check conflicts
-                conflict_query = text("""
-                    SELECT COUNT(*) as conflicts
-                    FROM work_schedules_core 
-                    WHERE employee_id = :employee_id
-                    AND status IN ('active', 'pending')
-                    AND effective_date <= :end_date
-                    AND (expiry_date IS NULL OR expiry_date >= :start_date)
-                """)
-                
-                conflict_result = await db.execute(conflict_query, {
-                    "employee_id": employee_id,
-                    "start_date": request.assignment_period_start,
-                    "end_date": request.assignment_period_end
-                })
-                
-                conflicts = conflict_result.scalar()
-                
-                if conflicts > 0 and not request.override_conflicts:
-                    failed_assignments.append({
-                        "employee_id": employee_id_str,
-                        "имя": f"{employee.first_name} {employee.last_name}",
-                        "ошибка": f"Конфликт с {conflicts} существующими расписаниями"
-                    })
-                    continue
-                
-                # Generate shifts based on strategy
-                shifts = []
-                if request.assignment_strategy == "равномерное_распределение":
-                    # Create standard 5-day work schedule
-                    current_date = request.assignment_period_start
-                    while current_date <= request.assignment_period_end:
-                        if current_date.weekday() < 5:  # Monday-Friday
-                            shifts.append({
-                                "дата": current_date.isoformat(),
-                                "время_начала": "09:00",
-                                "время_окончания": "17:00",
-                                "часы": 8,
-                                "тип_смены": "стандартная"
-                            })
-                        current_date += timedelta(days=1)
-                
-                total_hours = sum(shift["часы"] for shift in shifts)
-                
-                # Create assignment
-                assignment_id = str(uuid.uuid4())
-                
-                assignment_query = text("""
-                    INSERT INTO work_schedules_core 
-                    (id, employee_id, template_id, schedule_name, shift_assignments,
-                     total_hours, status, effective_date, expiry_date, 
-                     bulk_operation_id, created_at, updated_at)
-                    VALUES 
-                    (:id, :employee_id, :template_id, :schedule_name, :shifts,
-                     :total_hours, :status, :effective_date, :expiry_date,
-                     :bulk_id, :created_at, :updated_at)
-                """)
-                
-                await db.execute(assignment_query, {
-                    'id': assignment_id,
-                    'employee_id': employee_id,
-                    'template_id': request.template_id,
-                    'schedule_name': f"Массовое назначение - {template.template_name}",
-                    'shifts': json.dumps(shifts),
-                    'total_hours': total_hours,
-                    'status': 'assigned',
-                    'effective_date': request.assignment_period_start,
-                    'expiry_date': request.assignment_period_end,
-                    'bulk_id': bulk_operation_id,
-                    'created_at': current_time,
-                    'updated_at': current_time
-                })
-                
-                successful_assignments.append({
-                    "assignment_id": assignment_id,
-                    "employee_id": employee_id_str,
-                    "имя": f"{employee.first_name} {employee.last_name}",
-                    "часы": total_hours,
-                    "количество_смен": len(shifts),
-                    "конфликты_переопределены": conflicts > 0
-                })
-                
-            except Exception as e:
-                failed_assignments.append({
-                    "employee_id": employee_id_str,
-                    "имя": f"{employee.first_name} {employee.last_name}" if employee_id_str in employees else "Неизвестен",
-                    "ошибка": str(e)
-                })
+        successful_assignments, failed_assignments = await _assign_employees(
+            db, request, template, request.employee_ids, bulk_operation_id, current_time
+        )
         
         # Record bulk operation
-        bulk_record_query = text("""
-            INSERT INTO bulk_operations 
-            (id, operation_type, template_id, target_count, successful_count, 
-             failed_count, operation_details, created_at)
-            VALUES 
-            (:id, :type, :template_id, :target, :successful, :failed, :details, :created_at)
-        """)
-        
-        await db.execute(bulk_record_query, {
-            'id': bulk_operation_id,
-            'type': 'bulk_schedule_assignment',
-            'template_id': request.template_id,
-            'target': len(request.employee_ids),
-            'successful': len(successful_assignments),
-            'failed': len(failed_assignments),
-            'details': json.dumps({"strategy": request.assignment_strategy}),
-            'created_at': current_time
-        })
+        await _record_bulk_operation(
+            db, request, bulk_operation_id,
+            len(successful_assignments), len(failed_assignments), current_time
+        )
         
         await db.commit()
         
-        operation_summary = {
-            "всего_сотрудников": len(request.employee_ids),
-            "успешных_назначений": len(successful_assignments),
-            "неудачных_назначений": len(failed_assignments),
-            "шаблон": template.template_name,
-            "стратегия": request.assignment_strategy,
-            "период": f"{request.assignment_period_start} - {request.assignment_period_end}",
-            "процент_успеха": round(len(successful_assignments) / len(request.employee_ids) * 100, 1)
-        }
-        
-        return BulkAssignmentResponse(
-            bulk_operation_id=bulk_operation_id,
-            successful_assignments=successful_assignments,
-            failed_assignments=failed_assignments,
-            operation_summary=operation_summary,
-            message=f"Массовое назначение завершено: {len(successful_assignments)} успешно, {len(failed_assignments)} неудачно"
-        )
+        return _build_response(request, template, bulk_operation_id, successful_assignments, failed_assignments)
         
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Ошибка массового назначения: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Ошибка массового назначения: {str(e)}")
+
+@router.get(
+    "/schedules/assignments/bulk/jobs/{bulk_operation_id}",
+    response_model=BulkAssignmentJobResponse,
+    tags=["🔥 REAL Schedule Assignments"]
+)
+async def get_bulk_assignment_job(bulk_operation_id: str):
+    """Progress of a background bulk assignment, with the full result once completed"""
+    if bulk_operation_id not in bulk_assignment_jobs:
+        raise HTTPException(status_code=404, detail="Задание массового назначения не найдено")
+    return _job_response(bulk_operation_id)
+
+async def _run_bulk_assignment_job(bulk_operation_id: str, request: BulkAssignmentRequest, template):
+    """
+    Background task for large assignments
+    Each chunk commits on its own so progress is durable; a failed chunk marks
+    its employees as failed and the job continues with the next one
+    """
+    job = bulk_assignment_jobs[bulk_operation_id]
+    job["status"] = "processing"
+    current_time = datetime.utcnow()
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            for offset in range(0, len(request.employee_ids), BACKGROUND_CHUNK_SIZE):
+                chunk = request.employee_ids[offset:offset + BACKGROUND_CHUNK_SIZE]
+                try:
+                    successful, failed = await _assign_employees(
+                        db, request, template, chunk, bulk_operation_id, current_time
+                    )
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    successful = []
+                    failed = [{"employee_id": str(employee_id), "ошибка": str(e)} for employee_id in chunk]
+                
+                job["successful"].extend(successful)
+                job["failed"].extend(failed)
+                job["processed"] += len(chunk)
+                job["message"] = f"Обработано {job['processed']} из {job['total']}"
+            
+            await _record_bulk_operation(
+                db, request, bulk_operation_id,
+                len(job["successful"]), len(job["failed"]), current_time
+            )
+            await db.commit()
+        
+        job["result"] = _build_response(request, template, bulk_operation_id, job["successful"], job["failed"])
+        job["status"] = "completed"
+        job["message"] = job["result"].message
+        
+    except Exception as e:
+        job["status"] = "failed"
+        job["message"] = f"Ошибка массового назначения: {str(e)}"
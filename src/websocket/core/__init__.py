@@ -6,6 +6,7 @@ Core server, connection management, and message handling
 from .server import WebSocketServer
 from .connection import WebSocketConnection
 from .messages import WebSocketMessage, WebSocketEventType
+from .outbound import MessagePriority, SlowConsumerPolicy
 from .exceptions import WebSocketException, ConnectionClosedException, InvalidMessageException
 
 __all__ = [
@@ -13,6 +14,8 @@ __all__ = [
     "WebSocketConnection",
     "WebSocketMessage", 
     "WebSocketEventType",
+    "MessagePriority",
+    "SlowConsumerPolicy",
     "WebSocketException",
     "ConnectionClosedException",
     "InvalidMessageException"
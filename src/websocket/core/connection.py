@@ -12,12 +12,14 @@ from dataclasses import dataclass
 from fastapi import WebSocket, WebSocketDisconnect
 from collections import defaultdict
 
-from .messages import WebSocketMessage, WebSocketEventType, PING_MESSAGE, PONG_MESSAGE
+from .messages import WebSocketMessage, WebSocketEventType, PING_MESSAGE, PONG_MESSAGE, encode_batch
 from .exceptions import (
     ConnectionClosedException, 
     InvalidMessageException, 
-    RateLimitException
+    RateLimitException,
+    SlowConsumerException
 )
+from .outbound import MessagePriority, OutboundQueue, SlowConsumerPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +92,9 @@ class WebSocketConnection:
         websocket: WebSocket,
         connection_id: str,
         user_id: Optional[str] = None,
-        rate_limit: Optional[RateLimiter] = None
+        rate_limit: Optional[RateLimiter] = None,
+        outbound_queue_size: int = 1000,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP
     ):
         self.websocket = websocket
         self.connection_id = connection_id
@@ -110,8 +114,8 @@ class WebSocketConnection:
         self._send_lock = asyncio.Lock()
         self._is_closed = False
         
-        # Message queues for batching
-        self._message_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        # Bounded priority queue for batching
+        self._outbound = OutboundQueue(max_size=outbound_queue_size, policy=slow_consumer_policy)
         self._batch_send_task: Optional[asyncio.Task] = None
         self._batch_size = 10
         self._batch_timeout = 0.01  # 10ms batch timeout for <100ms total latency
@@ -137,10 +141,16 @@ class WebSocketConnection:
         """Get connection age"""
         return datetime.utcnow() - self.connected_at
     
-    async def send_message(self, message: WebSocketMessage, batch: bool = False) -> bool:
+    async def send_message(
+        self,
+        message: WebSocketMessage,
+        batch: bool = False,
+        priority: Optional[MessagePriority] = None
+    ) -> bool:
         """
         Send message with performance optimization
-        Uses batching for high-frequency messages
+        Uses batching for high-frequency messages; batched messages are queued
+        by priority and never wait for a slow client
         """
         if self._is_closed:
             raise ConnectionClosedException(self.connection_id)
@@ -152,14 +162,18 @@ class WebSocketConnection:
         try:
             if batch:
                 # Queue message for batch sending
-                await self._message_queue.put(message)
+                queued = self._outbound.put(message, priority)
                 if not self._batch_send_task:
                     self._batch_send_task = asyncio.create_task(self._batch_send_loop())
-                return True
+                return queued
             else:
                 # Send immediately
                 return await self._send_single_message(message)
                 
+        except SlowConsumerException:
+            logger.warning(f"Disconnecting slow consumer {self.connection_id}")
+            await self._disconnect_slow_consumer()
+            return False
         except Exception as e:
             logger.error(f"Failed to send message to {self.connection_id}: {e}")
             await self._handle_send_error(e)
@@ -167,18 +181,21 @@ class WebSocketConnection:
     
     async def _send_single_message(self, message: WebSocketMessage) -> bool:
         """Send single message with latency tracking"""
+        return await self._send_bytes(message.encoded())
+    
+    async def _send_bytes(self, message_bytes: bytes, message_count: int = 1) -> bool:
+        """Send serialized message (or batch of message_count) with latency tracking"""
         start_time = time.time()
         
         try:
-            # Use binary websocket for better performance
-            message_bytes = message.to_bytes()
-            
             async with self._send_lock:
                 await self.websocket.send_bytes(message_bytes)
             
             # Update metrics
             latency = (time.time() - start_time) * 1000  # Convert to ms
             self.metrics.update_send_metrics(len(message_bytes), latency)
+            for _ in range(message_count - 1):
+                self.metrics.update_send_metrics(0, latency)
             
             # Log slow messages
             if latency > 50:  # 50ms warning threshold
@@ -198,30 +215,12 @@ class WebSocketConnection:
         """Batch message sending loop for high-frequency updates"""
         try:
             while self.is_connected:
-                messages = []
-                
-                # Wait for first message with timeout
-                try:
-                    first_message = await asyncio.wait_for(
-                        self._message_queue.get(), 
-                        timeout=self._batch_timeout
-                    )
-                    messages.append(first_message)
-                except asyncio.TimeoutError:
-                    continue
-                
-                # Collect additional messages up to batch size
-                while len(messages) < self._batch_size and not self._message_queue.empty():
-                    try:
-                        message = self._message_queue.get_nowait()
-                        messages.append(message)
-                    except asyncio.QueueEmpty:
-                        break
-                
-                # Send batch
-                if messages:
-                    await self._send_message_batch(messages)
+                # Whatever queued up while the previous batch was being sent
+                messages = await self._outbound.get_batch(self._batch_size)
+                await self._send_message_batch(messages)
                     
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"Batch send loop error for {self.connection_id}: {e}")
         finally:
@@ -229,34 +228,12 @@ class WebSocketConnection:
     
     async def _send_message_batch(self, messages: list[WebSocketMessage]):
         """Send batch of messages efficiently"""
-        start_time = time.time()
+        if len(messages) == 1:
+            await self._send_single_message(messages[0])
+            return
         
-        try:
-            # Create batch message
-            batch_payload = {
-                "messages": [msg.dict() for msg in messages],
-                "batch_size": len(messages),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            batch_message = WebSocketMessage(
-                type="batch",
-                payload=batch_payload
-            )
-            
-            # Send batch
-            await self._send_single_message(batch_message)
-            
-            # Update metrics for all messages in batch
-            batch_latency = (time.time() - start_time) * 1000
-            for _ in messages:
-                self.metrics.update_send_metrics(0, batch_latency / len(messages))
-                
-        except Exception as e:
-            logger.error(f"Batch send error to {self.connection_id}: {e}")
-            # Fall back to individual sends
-            for message in messages:
-                await self._send_single_message(message)
+        # Message bytes are cached, so a broadcast is serialized once, not per connection
+        await self._send_bytes(encode_batch(messages), len(messages))
     
     async def receive_message(self) -> Optional[WebSocketMessage]:
         """Receive and parse WebSocket message"""
@@ -367,11 +344,7 @@ class WebSocketConnection:
             self._batch_send_task = None
         
         # Clear queues
-        while not self._message_queue.empty():
-            try:
-                self._message_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self._outbound.clear()
         
         # Update metrics
         self.metrics.connection_duration = (
@@ -380,6 +353,19 @@ class WebSocketConnection:
         
         logger.info(f"Connection {self.connection_id} closed after {self.metrics.connection_duration:.2f}s")
     
+    async def _disconnect_slow_consumer(self):
+        """Stop queueing at once; the close handshake runs in the background"""
+        websocket = self.websocket
+        await self._close_connection()
+        
+        async def close_socket():
+            try:
+                await websocket.close(code=1013, reason="Slow consumer")
+            except Exception as e:
+                logger.debug(f"Error closing slow consumer {self.connection_id}: {e}")
+        
+        asyncio.create_task(close_socket())
+    
     async def _handle_send_error(self, error: Exception):
         """Handle send errors"""
         if isinstance(error, (ConnectionResetError, BrokenPipeError)):
@@ -405,5 +391,6 @@ class WebSocketConnection:
                 "bytes_received": self.metrics.bytes_received,
                 "avg_message_latency_ms": self.metrics.avg_message_latency,
                 "connection_duration_seconds": self.metrics.connection_duration
-            }
+            },
+            "outbound": self._outbound.get_stats()
         }
\ No newline at end of file
@@ -77,6 +77,17 @@ class RateLimitException(WebSocketException):
         )
 
 
+class SlowConsumerException(WebSocketException):
+    """Raised when a client reads too slowly to keep up with its outbound queue"""
+    
+    def __init__(self, message: str = "Outbound queue full", queue_size: Optional[int] = None):
+        super().__init__(
+            message,
+            error_code="SLOW_CONSUMER",
+            details={"queue_size": queue_size}
+        )
+
+
 class ConnectionLimitException(WebSocketException):
     """Raised when connection limit is exceeded"""
     
@@ -0,0 +1,100 @@
+"""
+Heartbeat scheduling and idle tracking
+Timer wheel for spreading pings and time buckets for finding idle connections
+without scanning every connection
+"""
+
+import time
+from typing import Dict, List, Optional, Set
+
+
+class HeartbeatWheel:
+    """
+    Connection IDs spread over the slots of one heartbeat interval
+
+    Every tick fires one slot, so each connection is pinged once per interval
+    and a sweep only ever touches interval/tick of the connections.
+    """
+
+    def __init__(self, interval: float, tick: float = 1.0):
+        self.slots = max(1, round(interval / tick))
+        self._wheel: List[Set[str]] = [set() for _ in range(self.slots)]
+        self._slot_of: Dict[str, int] = {}
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, key: str):
+        """Schedule key; slots come from the key's hash so storms spread evenly"""
+        self.discard(key)
+        slot = hash(key) % self.slots
+        self._wheel[slot].add(key)
+        self._slot_of[key] = slot
+
+    def discard(self, key: str):
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            self._wheel[slot].discard(key)
+
+    def advance(self) -> List[str]:
+        """Keys due on this tick; the wheel then moves to the next slot"""
+        due = list(self._wheel[self._position])
+        self._position = (self._position + 1) % self.slots
+        return due
+
+
+class ActivityBuckets:
+    """
+    Keys grouped by the time bucket of their last activity
+
+    touch() moves a key only when it enters a new bucket, and pop_older_than()
+    visits whole buckets, so finding idle keys costs the number of idle keys
+    rather than the number of keys. Keys are reported at most one bucket width
+    after their cutoff and never before it.
+    """
+
+    def __init__(self, width: float):
+        self.width = width
+        self._bucket_of: Dict[str, int] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def touch(self, key: str, now: Optional[float] = None):
+        """Record activity for key at now (monotonic seconds)"""
+        index = int((time.monotonic() if now is None else now) // self.width)
+        current = self._bucket_of.get(key)
+        if current == index:
+            return
+        if current is not None:
+            self._remove_from_bucket(key, current)
+        self._bucket_of[key] = index
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = set()
+        bucket.add(key)
+
+    def discard(self, key: str):
+        index = self._bucket_of.pop(key, None)
+        if index is not None:
+            self._remove_from_bucket(key, index)
+
+    def _remove_from_bucket(self, key: str, index: int):
+        bucket = self._buckets.get(index)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[index]
+
+    def pop_older_than(self, cutoff: float) -> List[str]:
+        """Remove and return keys whose last activity is before cutoff"""
+        limit = int(cutoff // self.width)
+        expired: List[str] = []
+        # Only bucket indexes are scanned; there are about (time span / width) of them
+        for index in sorted(index for index in self._buckets if index < limit):
+            for key in self._buckets.pop(index):
+                del self._bucket_of[key]
+                expired.append(key)
+        return expired
@@ -6,9 +6,9 @@ High-performance message serialization and validation
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import orjson
 
 
@@ -76,6 +76,8 @@ class WebSocketMessage(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Message timestamp")
     correlation_id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Correlation ID")
     
+    _encoded: Optional[bytes] = PrivateAttr(default=None)
+    
     class Config:
         """Pydantic configuration for performance"""
         json_encoders = {
@@ -108,6 +110,16 @@ class WebSocketMessage(BaseModel):
         """Convert message to bytes for efficient transmission"""
         return orjson.dumps(self.dict())
     
+    def encoded(self) -> bytes:
+        """
+        to_bytes() cached on the message
+        A broadcast sends one message object to many connections, so it is
+        serialized once; messages must not be modified after being sent
+        """
+        if self._encoded is None:
+            self._encoded = self.to_bytes()
+        return self._encoded
+    
     @classmethod
     def from_bytes(cls, data: bytes) -> 'WebSocketMessage':
         """Create message from bytes"""
@@ -199,6 +211,25 @@ def create_event_message(event_type: WebSocketEventType, payload: Dict[str, Any]
     )
 
 
+def encode_batch(messages: List[WebSocketMessage]) -> bytes:
+    """
+    Serialize a "batch" message wrapping messages
+    Each message's cached bytes are embedded as-is instead of re-serializing it
+    """
+    now = datetime.utcnow()
+    return orjson.dumps({
+        "type": "batch",
+        "payload": {
+            "messages": [orjson.Fragment(message.encoded()) for message in messages],
+            "batch_size": len(messages),
+            "timestamp": now.isoformat()
+        },
+        "metadata": {},
+        "timestamp": now,
+        "correlation_id": str(uuid.uuid4())
+    })
+
+
 def create_response_message(request_id: str, success: bool, data: Optional[Dict[str, Any]] = None) -> WebSocketMessage:
     """Create standardized response message"""
     return WebSocketMessage(
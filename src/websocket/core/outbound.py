@@ -0,0 +1,182 @@
+"""
+Outbound Message Queues
+Bounded per-connection send queues with priority classes, coalescing of
+superseded updates and a policy for consumers that cannot keep up
+"""
+
+import asyncio
+from collections import deque
+from enum import Enum, IntEnum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .messages import WebSocketMessage, WebSocketEventType
+from .exceptions import SlowConsumerException
+
+
+class MessagePriority(IntEnum):
+    """Send order of queued messages, lower values are sent first"""
+    CRITICAL = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What a full outbound queue does with the next message"""
+    DROP = "drop"              # shed the oldest message of the lowest priority class
+    DISCONNECT = "disconnect"  # close the connection
+
+
+PRIORITY_BY_TYPE: Dict[str, MessagePriority] = {
+    WebSocketEventType.ERROR.value: MessagePriority.CRITICAL,
+    WebSocketEventType.CONNECTION_CLOSED.value: MessagePriority.CRITICAL,
+    WebSocketEventType.SLA_ALERT.value: MessagePriority.CRITICAL,
+    WebSocketEventType.SCHEDULE_CHANGED.value: MessagePriority.CRITICAL,
+    WebSocketEventType.SHIFT_ASSIGNED.value: MessagePriority.CRITICAL,
+    WebSocketEventType.SHIFT_SWAPPED.value: MessagePriority.CRITICAL,
+    WebSocketEventType.STAFFING_GAP_DETECTED.value: MessagePriority.CRITICAL,
+    WebSocketEventType.QUEUE_METRICS_UPDATE.value: MessagePriority.BULK,
+    WebSocketEventType.AGENT_STATUS_CHANGED.value: MessagePriority.BULK,
+    WebSocketEventType.SYSTEM_HEALTH.value: MessagePriority.BULK,
+}
+
+# Updates where only the latest state per entity matters; None means one per type
+COALESCE_FIELDS: Dict[str, Optional[str]] = {
+    WebSocketEventType.QUEUE_METRICS_UPDATE.value: "queue_id",
+    WebSocketEventType.AGENT_STATUS_CHANGED.value: "agent_id",
+    WebSocketEventType.SYSTEM_HEALTH.value: None,
+}
+
+
+def classify_message(message: WebSocketMessage) -> Tuple[MessagePriority, Optional[str]]:
+    """
+    Priority class and coalescing key for a message
+    metadata["priority"] and metadata["coalesce_key"] override the defaults
+    """
+    metadata = message.metadata
+    priority = metadata.get("priority")
+    if priority is None:
+        priority = PRIORITY_BY_TYPE.get(message.type, MessagePriority.NORMAL)
+    elif isinstance(priority, str):
+        priority = MessagePriority[priority.upper()]
+    else:
+        priority = MessagePriority(priority)
+
+    coalesce_key = metadata.get("coalesce_key")
+    if coalesce_key is None and message.type in COALESCE_FIELDS:
+        field = COALESCE_FIELDS[message.type]
+        if field is None:
+            coalesce_key = message.type
+        elif message.payload.get(field) is not None:
+            coalesce_key = f"{message.type}:{message.payload[field]}"
+    return priority, coalesce_key
+
+
+class _Entry:
+    __slots__ = ("message", "coalesce_key")
+
+    def __init__(self, message: WebSocketMessage, coalesce_key: Optional[str]):
+        self.message = message
+        self.coalesce_key = coalesce_key
+
+
+class OutboundQueue:
+    """
+    Bounded outbound queue for one connection
+
+    put() never waits, so a slow client cannot stall broadcasts. A newer
+    update for an entity that is still queued replaces the older one in place.
+    When the queue is full, SlowConsumerPolicy.DROP sheds the oldest message of
+    the lowest queued class (or the new message, if everything queued outranks
+    it) and SlowConsumerPolicy.DISCONNECT raises SlowConsumerException.
+    """
+
+    def __init__(self, max_size: int = 1000, policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP):
+        self.max_size = max_size
+        self.policy = SlowConsumerPolicy(policy)
+        self._queues: List[Deque[_Entry]] = [deque() for _ in MessagePriority]
+        self._pending: Dict[str, _Entry] = {}
+        self._size = 0
+        self._ready = asyncio.Event()
+        self.stats = {"queued": 0, "coalesced": 0, "dropped": 0, "high_water": 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, message: WebSocketMessage, priority: Optional[MessagePriority] = None) -> bool:
+        """Queue message; False means it was dropped"""
+        default_priority, coalesce_key = classify_message(message)
+        if priority is None:
+            priority = default_priority
+
+        if coalesce_key is not None:
+            entry = self._pending.get(coalesce_key)
+            if entry is not None:
+                entry.message = message
+                self.stats["coalesced"] += 1
+                return True
+
+        if self._size >= self.max_size and not self._make_room(priority):
+            self.stats["dropped"] += 1
+            return False
+
+        entry = _Entry(message, coalesce_key)
+        self._queues[priority].append(entry)
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = entry
+        self._size += 1
+        self.stats["queued"] += 1
+        if self._size > self.stats["high_water"]:
+            self.stats["high_water"] = self._size
+        self._ready.set()
+        return True
+
+    def _make_room(self, priority: MessagePriority) -> bool:
+        if self.policy is SlowConsumerPolicy.DISCONNECT:
+            raise SlowConsumerException(queue_size=self._size)
+        for level in reversed(MessagePriority):
+            if level < priority:
+                break
+            if self._queues[level]:
+                self._forget(self._queues[level].popleft())
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    def _forget(self, entry: _Entry):
+        self._size -= 1
+        if entry.coalesce_key is not None:
+            self._pending.pop(entry.coalesce_key, None)
+
+    def get_nowait(self, max_items: int) -> List[WebSocketMessage]:
+        """Up to max_items queued messages, highest priority first"""
+        messages: List[WebSocketMessage] = []
+        for queue in self._queues:
+            while queue and len(messages) < max_items:
+                entry = queue.popleft()
+                self._forget(entry)
+                messages.append(entry.message)
+        if not self._size:
+            self._ready.clear()
+        return messages
+
+    async def get_batch(self, max_items: int) -> List[WebSocketMessage]:
+        """Wait until something is queued, then take up to max_items"""
+        while not self._size:
+            await self._ready.wait()
+        return self.get_nowait(max_items)
+
+    def clear(self):
+        for queue in self._queues:
+            queue.clear()
+        self._pending.clear()
+        self._size = 0
+        self._ready.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "size": self._size,
+            "max_size": self.max_size,
+            "policy": self.policy.value,
+            "by_priority": {level.name.lower(): len(self._queues[level]) for level in MessagePriority},
+        }
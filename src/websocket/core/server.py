@@ -7,9 +7,9 @@ import asyncio
 import logging
 import time
 import uuid
-from typing import Dict, Set, Optional, Any, Callable, List
+from typing import Dict, Set, Optional, Any, Callable, Iterator, List
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections.abc import Mapping
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
@@ -17,6 +17,7 @@ from fastapi.routing import APIRouter
 import uvloop
 
 from .connection import WebSocketConnection, RateLimiter
+from .outbound import SlowConsumerPolicy
 from .messages import (
     WebSocketMessage, 
     WebSocketEventType,
@@ -28,153 +29,228 @@ from .exceptions import (
     WebSocketException,
     ConnectionLimitException,
     ServerOverloadException,
-    AuthenticationException
+    AuthenticationException,
+    RateLimitException
 )
+from .heartbeat import ActivityBuckets, HeartbeatWheel
 from ..events.dispatcher import EventDispatcher
 
 logger = logging.getLogger(__name__)
 
 
+class _RegistryShard:
+    """Connections whose IDs hash to one shard, with the lock for their membership changes"""
+    
+    __slots__ = ("connections", "lock")
+    
+    def __init__(self):
+        self.connections: Dict[str, WebSocketConnection] = {}
+        self.lock = asyncio.Lock()
+
+
+class _ConnectionsView(Mapping):
+    """Read-only mapping of connection ID to connection across all shards"""
+    
+    def __init__(self, pool: "ConnectionPool"):
+        self._pool = pool
+    
+    def __getitem__(self, connection_id: str) -> WebSocketConnection:
+        return self._pool._shard(connection_id).connections[connection_id]
+    
+    def __contains__(self, connection_id) -> bool:
+        return connection_id in self._pool._shard(connection_id).connections
+    
+    def __iter__(self) -> Iterator[str]:
+        for shard in self._pool._shards:
+            yield from list(shard.connections)
+    
+    def __len__(self) -> int:
+        return self._pool._count
+    
+    def values(self):
+        return self._pool.all_connections()
+
+
 class ConnectionPool:
-    """High-performance connection pool with automatic cleanup"""
+    """
+    High-performance connection pool with automatic cleanup
+    
+    Connections are sharded by connection ID. Adding, removing and changing the
+    rooms or subscriptions of a connection take only its shard's lock, so
+    connection storms spread over num_shards locks instead of one.
+    
+    The user, room and subscription indexes map a key to {connection_id:
+    connection} and are read without locks: lookups copy the member dict's
+    values in one step, which no coroutine can interleave with.
+    """
     
-    def __init__(self, max_connections: int = 10000):
+    def __init__(self, max_connections: int = 10000, num_shards: int = 64):
         self.max_connections = max_connections
-        self.connections: Dict[str, WebSocketConnection] = {}
-        self.user_connections: Dict[str, Set[str]] = defaultdict(set)
-        self.room_connections: Dict[str, Set[str]] = defaultdict(set)
-        self.subscription_connections: Dict[str, Set[str]] = defaultdict(set)
-        self._lock = asyncio.Lock()
+        self.num_shards = num_shards
+        self._shards = [_RegistryShard() for _ in range(num_shards)]
+        self._count = 0
+        self.user_connections: Dict[str, Dict[str, WebSocketConnection]] = {}
+        self.room_connections: Dict[str, Dict[str, WebSocketConnection]] = {}
+        self.subscription_connections: Dict[str, Dict[str, WebSocketConnection]] = {}
+        self.connections = _ConnectionsView(self)
         
         # Performance monitoring
         self.total_connections_created = 0
         self.total_connections_closed = 0
         self.peak_connections = 0
+    
+    def _shard(self, connection_id: str) -> _RegistryShard:
+        return self._shards[hash(connection_id) % self.num_shards]
+    
+    @staticmethod
+    def _index_add(index: Dict[str, Dict[str, WebSocketConnection]], key: str, connection: WebSocketConnection):
+        members = index.get(key)
+        if members is None:
+            members = index[key] = {}
+        members[connection.connection_id] = connection
+    
+    @staticmethod
+    def _index_discard(index: Dict[str, Dict[str, WebSocketConnection]], key: str, connection_id: str):
+        members = index.get(key)
+        if members is not None:
+            members.pop(connection_id, None)
+            if not members:
+                del index[key]
+    
+    def _unindex(self, connection: WebSocketConnection):
+        """Drop connection from the user, room and subscription indexes"""
+        connection_id = connection.connection_id
+        
+        # Remove from user tracking
+        if connection.user_id:
+            self._index_discard(self.user_connections, connection.user_id, connection_id)
         
+        # Remove from room tracking
+        for room in connection.rooms:
+            self._index_discard(self.room_connections, room, connection_id)
+        
+        # Remove from subscription tracking
+        for event_type in connection.subscriptions:
+            self._index_discard(self.subscription_connections, event_type, connection_id)
+    
     @property
     def active_connections(self) -> int:
         """Get number of active connections"""
-        return len(self.connections)
+        return self._count
+    
+    def all_connections(self) -> List[WebSocketConnection]:
+        """Snapshot of every connection"""
+        return [connection for shard in self._shards for connection in list(shard.connections.values())]
     
     async def add_connection(self, connection: WebSocketConnection) -> bool:
         """Add connection to pool"""
-        async with self._lock:
-            if len(self.connections) >= self.max_connections:
+        shard = self._shard(connection.connection_id)
+        async with shard.lock:
+            previous = shard.connections.get(connection.connection_id)
+            replaced = previous is not None
+            # Checked and counted without awaiting, so concurrent adds cannot overshoot
+            if not replaced and self._count >= self.max_connections:
                 raise ConnectionLimitException(
                     f"Maximum connections ({self.max_connections}) exceeded"
                 )
             
-            self.connections[connection.connection_id] = connection
+            # The replaced connection's rooms and subscriptions must not route to this one
+            if replaced and previous is not connection:
+                self._unindex(previous)
+            
+            shard.connections[connection.connection_id] = connection
+            if not replaced:
+                self._count += 1
             self.total_connections_created += 1
             
             # Track by user
             if connection.user_id:
-                self.user_connections[connection.user_id].add(connection.connection_id)
+                self._index_add(self.user_connections, connection.user_id, connection)
             
             # Update peak connections
-            self.peak_connections = max(self.peak_connections, len(self.connections))
+            self.peak_connections = max(self.peak_connections, self._count)
             
-            logger.info(f"Added connection {connection.connection_id} (total: {len(self.connections)})")
+            logger.info(f"Added connection {connection.connection_id} (total: {self._count})")
             return True
     
     async def remove_connection(self, connection_id: str) -> bool:
         """Remove connection from pool"""
-        async with self._lock:
-            if connection_id not in self.connections:
+        shard = self._shard(connection_id)
+        async with shard.lock:
+            connection = shard.connections.pop(connection_id, None)
+            if connection is None:
                 return False
+            self._count -= 1
+            self._unindex(connection)
             
-            connection = self.connections[connection_id]
-            
-            # Remove from user tracking
-            if connection.user_id:
-                self.user_connections[connection.user_id].discard(connection_id)
-                if not self.user_connections[connection.user_id]:
-                    del self.user_connections[connection.user_id]
-            
-            # Remove from room tracking
-            for room in connection.rooms:
-                self.room_connections[room].discard(connection_id)
-                if not self.room_connections[room]:
-                    del self.room_connections[room]
-            
-            # Remove from subscription tracking
-            for event_type in connection.subscriptions:
-                self.subscription_connections[event_type].discard(connection_id)
-                if not self.subscription_connections[event_type]:
-                    del self.subscription_connections[event_type]
-            
-            # Remove connection
-            del self.connections[connection_id]
             self.total_connections_closed += 1
             
-            logger.info(f"Removed connection {connection_id} (total: {len(self.connections)})")
+            logger.info(f"Removed connection {connection_id} (total: {self._count})")
             return True
     
     async def get_connection(self, connection_id: str) -> Optional[WebSocketConnection]:
         """Get connection by ID"""
-        return self.connections.get(connection_id)
+        return self._shard(connection_id).connections.get(connection_id)
     
     async def get_user_connections(self, user_id: str) -> List[WebSocketConnection]:
         """Get all connections for a user"""
-        connection_ids = self.user_connections.get(user_id, set())
-        return [self.connections[cid] for cid in connection_ids if cid in self.connections]
+        return list(self.user_connections.get(user_id, {}).values())
     
     async def get_room_connections(self, room: str) -> List[WebSocketConnection]:
         """Get all connections in a room"""
-        connection_ids = self.room_connections.get(room, set())
-        return [self.connections[cid] for cid in connection_ids if cid in self.connections]
+        return list(self.room_connections.get(room, {}).values())
     
     async def get_subscription_connections(self, event_type: str) -> List[WebSocketConnection]:
         """Get all connections subscribed to event type"""
-        connection_ids = self.subscription_connections.get(event_type, set())
-        return [self.connections[cid] for cid in connection_ids if cid in self.connections]
+        return list(self.subscription_connections.get(event_type, {}).values())
     
     async def add_to_room(self, connection_id: str, room: str):
         """Add connection to room"""
-        if connection_id in self.connections:
-            self.room_connections[room].add(connection_id)
-            await self.connections[connection_id].join_room(room)
+        shard = self._shard(connection_id)
+        async with shard.lock:
+            connection = shard.connections.get(connection_id)
+            if connection is not None:
+                self._index_add(self.room_connections, room, connection)
+                await connection.join_room(room)
     
     async def remove_from_room(self, connection_id: str, room: str):
         """Remove connection from room"""
-        if connection_id in self.connections:
-            self.room_connections[room].discard(connection_id)
-            await self.connections[connection_id].leave_room(room)
-            
-            # Clean up empty rooms
-            if not self.room_connections[room]:
-                del self.room_connections[room]
+        shard = self._shard(connection_id)
+        async with shard.lock:
+            connection = shard.connections.get(connection_id)
+            if connection is not None:
+                self._index_discard(self.room_connections, room, connection_id)
+                await connection.leave_room(room)
     
     async def add_subscription(self, connection_id: str, event_type: str):
         """Add event subscription"""
-        if connection_id in self.connections:
-            self.subscription_connections[event_type].add(connection_id)
-            await self.connections[connection_id].subscribe(event_type)
+        shard = self._shard(connection_id)
+        async with shard.lock:
+            connection = shard.connections.get(connection_id)
+            if connection is not None:
+                self._index_add(self.subscription_connections, event_type, connection)
+                await connection.subscribe(event_type)
     
     async def remove_subscription(self, connection_id: str, event_type: str):
         """Remove event subscription"""
-        if connection_id in self.connections:
-            self.subscription_connections[event_type].discard(connection_id)
-            await self.connections[connection_id].unsubscribe(event_type)
-            
-            # Clean up empty subscriptions
-            if not self.subscription_connections[event_type]:
-                del self.subscription_connections[event_type]
+        shard = self._shard(connection_id)
+        async with shard.lock:
+            connection = shard.connections.get(connection_id)
+            if connection is not None:
+                self._index_discard(self.subscription_connections, event_type, connection_id)
+                await connection.unsubscribe(event_type)
     
     async def cleanup_stale_connections(self, max_age: timedelta = timedelta(hours=24)):
         """Clean up stale connections"""
         now = datetime.utcnow()
-        stale_connections = []
-        
-        for connection_id, connection in self.connections.items():
-            if not connection.is_connected or now - connection.connected_at > max_age:
-                stale_connections.append(connection_id)
+        stale_connections = [
+            connection for connection in self.all_connections()
+            if not connection.is_connected or now - connection.connected_at > max_age
+        ]
         
-        for connection_id in stale_connections:
-            connection = self.connections.get(connection_id)
-            if connection:
-                await connection.close(code=1001, reason="Stale connection cleanup")
-                await self.remove_connection(connection_id)
+        for connection in stale_connections:
+            await connection.close(code=1001, reason="Stale connection cleanup")
+            await self.remove_connection(connection.connection_id)
         
         if stale_connections:
             logger.info(f"Cleaned up {len(stale_connections)} stale connections")
@@ -182,13 +258,14 @@ class ConnectionPool:
     def get_stats(self) -> Dict[str, Any]:
         """Get pool statistics"""
         return {
-            "active_connections": len(self.connections),
+            "active_connections": self._count,
             "peak_connections": self.peak_connections,
             "total_created": self.total_connections_created,
             "total_closed": self.total_connections_closed,
             "active_rooms": len(self.room_connections),
             "active_subscriptions": len(self.subscription_connections),
-            "users_connected": len(self.user_connections)
+            "users_connected": len(self.user_connections),
+            "shards": self.num_shards
         }
 
 
@@ -196,6 +273,17 @@ class WebSocketServer:
     """
     High-performance WebSocket server
     Optimized for <100ms latency and 10,000+ concurrent connections
+    
+    Heartbeats run on a timer wheel: every heartbeat_tick seconds one slot of
+    connections is pinged, at most heartbeat_concurrency at a time and each
+    ping bounded by ping_timeout, so a slow client only delays itself.
+    Connections with no client traffic for idle_timeout seconds, or older than
+    max_connection_age, are found through last-activity and connect-time
+    buckets instead of scans over every connection.
+    
+    Batched sends go through a bounded priority queue of outbound_queue_size
+    per connection; slow_consumer_policy decides whether a client that falls
+    that far behind loses its oldest low-priority messages or is disconnected.
     """
     
     def __init__(
@@ -203,17 +291,46 @@ class WebSocketServer:
         max_connections: int = 10000,
         heartbeat_interval: float = 30.0,
         cleanup_interval: float = 300.0,
-        enable_performance_monitoring: bool = True
+        enable_performance_monitoring: bool = True,
+        heartbeat_tick: float = 1.0,
+        heartbeat_concurrency: int = 100,
+        ping_timeout: float = 5.0,
+        idle_timeout: Optional[float] = None,
+        max_connection_age: timedelta = timedelta(hours=24),
+        outbound_queue_size: int = 1000,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP
     ):
         self.max_connections = max_connections
         self.heartbeat_interval = heartbeat_interval
         self.cleanup_interval = cleanup_interval
         self.enable_performance_monitoring = enable_performance_monitoring
+        self.heartbeat_tick = min(heartbeat_tick, heartbeat_interval)
+        self.ping_timeout = ping_timeout
+        self.idle_timeout = idle_timeout if idle_timeout is not None else 3 * heartbeat_interval
+        self.max_connection_age = max_connection_age
+        self.outbound_queue_size = outbound_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
         
         # Core components
         self.connection_pool = ConnectionPool(max_connections)
         self.event_dispatcher = EventDispatcher()
         
+        # Heartbeat and idle tracking
+        self.heartbeat_wheel = HeartbeatWheel(heartbeat_interval, self.heartbeat_tick)
+        self.activity_buckets = ActivityBuckets(self.heartbeat_tick)
+        self.age_buckets = ActivityBuckets(cleanup_interval)
+        self._ping_semaphore = asyncio.Semaphore(heartbeat_concurrency)
+        self._ping_batches: Set[asyncio.Task] = set()
+        self.heartbeat_stats = {
+            "pings_sent": 0,
+            "ping_failures": 0,
+            "ping_timeouts": 0,
+            "idle_closed": 0,
+            "aged_closed": 0,
+            "last_batch_size": 0,
+            "last_batch_ms": 0.0
+        }
+        
         # Background tasks
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.cleanup_task: Optional[asyncio.Task] = None
@@ -277,14 +394,14 @@ class WebSocketServer:
     
     async def stop(self):
         """Stop server and cleanup"""
-        tasks = [self.heartbeat_task, self.cleanup_task, self.monitoring_task]
+        tasks = [self.heartbeat_task, self.cleanup_task, self.monitoring_task, *self._ping_batches]
         
         for task in tasks:
             if task and not task.done():
                 task.cancel()
         
         # Close all connections
-        for connection in list(self.connection_pool.connections.values()):
+        for connection in self.connection_pool.all_connections():
             await connection.close(code=1001, reason="Server shutdown")
         
         # Wait for tasks to complete
@@ -312,11 +429,14 @@ class WebSocketServer:
                 websocket=websocket,
                 connection_id=connection_id,
                 user_id=user_id,
-                rate_limit=rate_limiter
+                rate_limit=rate_limiter,
+                outbound_queue_size=self.outbound_queue_size,
+                slow_consumer_policy=self.slow_consumer_policy
             )
             
             # Add to pool
             await self.connection_pool.add_connection(connection)
+            self._track_connection(connection)
             
             # TODO: Implement authentication
             if token:
@@ -342,6 +462,7 @@ class WebSocketServer:
         finally:
             # Cleanup
             await self.connection_pool.remove_connection(connection_id)
+            self._untrack_connection(connection_id)
             
             # Notify disconnection handlers
             for handler in self.disconnection_handlers:
@@ -355,6 +476,8 @@ class WebSocketServer:
         try:
             while connection.is_connected:
                 message = await connection.receive_message()
+                # Pongs count as activity too; receive_message returns None for them
+                self.activity_buckets.touch(connection.connection_id)
                 
                 if message:
                     await self._process_message(connection, message)
@@ -473,7 +596,7 @@ class WebSocketServer:
         if room:
             connections = await self.connection_pool.get_room_connections(room)
         else:
-            connections = list(self.connection_pool.connections.values())
+            connections = self.connection_pool.all_connections()
         
         sent_count = 0
         failed_connections = []
@@ -523,37 +646,112 @@ class WebSocketServer:
         
         return sent_count
     
+    def _track_connection(self, connection: WebSocketConnection):
+        """Schedule heartbeats and idle/age checks for a connection"""
+        connection_id = connection.connection_id
+        self.heartbeat_wheel.add(connection_id)
+        self.activity_buckets.touch(connection_id)
+        self.age_buckets.touch(connection_id)
+    
+    def _untrack_connection(self, connection_id: str):
+        self.heartbeat_wheel.discard(connection_id)
+        self.activity_buckets.discard(connection_id)
+        self.age_buckets.discard(connection_id)
+    
+    async def _drop_connection(self, connection_id: str, reason: str):
+        """Close and forget a connection found dead, idle or too old"""
+        connection = await self.connection_pool.get_connection(connection_id)
+        if connection is not None:
+            try:
+                # A dead peer can stall the close handshake as well
+                await asyncio.wait_for(connection.close(code=1001, reason=reason), self.ping_timeout)
+            except asyncio.TimeoutError:
+                logger.debug(f"Close of {connection_id} timed out")
+            await self.connection_pool.remove_connection(connection_id)
+        self._untrack_connection(connection_id)
+    
     async def _heartbeat_loop(self):
-        """Background heartbeat task"""
+        """Background heartbeat task: fires one wheel slot per tick"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while True:
             try:
-                await asyncio.sleep(self.heartbeat_interval)
+                next_tick += self.heartbeat_tick
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
                 
-                # Send ping to all connections
-                failed_connections = []
-                for connection in list(self.connection_pool.connections.values()):
-                    if connection.is_connected:
-                        success = await connection.send_ping()
-                        if not success:
-                            failed_connections.append(connection.connection_id)
+                due = self.heartbeat_wheel.advance()
+                if due:
+                    # A slow batch must not hold back the next slot
+                    batch = asyncio.create_task(self._ping_batch(due))
+                    self._ping_batches.add(batch)
+                    batch.add_done_callback(self._ping_batches.discard)
                 
-                # Clean up failed connections
-                for connection_id in failed_connections:
-                    await self.connection_pool.remove_connection(connection_id)
-                
-                logger.debug(f"Heartbeat sent to {len(self.connection_pool.connections)} connections")
+                await self._close_idle_connections()
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Heartbeat error: {e}")
     
+    async def _ping_batch(self, connection_ids: List[str]):
+        """Ping one wheel slot with bounded concurrency and per-send timeouts"""
+        start_time = time.perf_counter()
+        
+        async def ping(connection_id: str) -> Optional[str]:
+            connection = await self.connection_pool.get_connection(connection_id)
+            if connection is None:
+                self._untrack_connection(connection_id)
+                return None
+            async with self._ping_semaphore:
+                try:
+                    success = await asyncio.wait_for(connection.send_ping(), self.ping_timeout)
+                except RateLimitException:
+                    # Busy with other traffic, which also proves it is alive
+                    return None
+                except asyncio.TimeoutError:
+                    self.heartbeat_stats["ping_timeouts"] += 1
+                    success = False
+                except Exception as e:
+                    logger.debug(f"Ping to {connection_id} failed: {e}")
+                    success = False
+            self.heartbeat_stats["pings_sent"] += 1
+            if success and connection.is_connected:
+                return None
+            return connection_id
+        
+        failed = [cid for cid in await asyncio.gather(*[ping(cid) for cid in connection_ids]) if cid]
+        
+        # Clean up failed connections
+        for connection_id in failed:
+            await self._drop_connection(connection_id, "Heartbeat failed")
+        
+        self.heartbeat_stats["ping_failures"] += len(failed)
+        self.heartbeat_stats["last_batch_size"] = len(connection_ids)
+        self.heartbeat_stats["last_batch_ms"] = (time.perf_counter() - start_time) * 1000
+        logger.debug(f"Heartbeat sent to {len(connection_ids)} connections ({len(failed)} failed)")
+    
+    async def _close_idle_connections(self):
+        """Close connections with no client traffic for idle_timeout seconds"""
+        idle = self.activity_buckets.pop_older_than(time.monotonic() - self.idle_timeout)
+        for connection_id in idle:
+            await self._drop_connection(connection_id, "Idle timeout")
+        if idle:
+            self.heartbeat_stats["idle_closed"] += len(idle)
+            logger.info(f"Closed {len(idle)} idle connections")
+    
     async def _cleanup_loop(self):
-        """Background cleanup task"""
+        """Background cleanup task: closes connections older than max_connection_age"""
         while True:
             try:
                 await asyncio.sleep(self.cleanup_interval)
-                await self.connection_pool.cleanup_stale_connections()
+                
+                cutoff = time.monotonic() - self.max_connection_age.total_seconds()
+                aged = self.age_buckets.pop_older_than(cutoff)
+                for connection_id in aged:
+                    await self._drop_connection(connection_id, "Stale connection cleanup")
+                if aged:
+                    self.heartbeat_stats["aged_closed"] += len(aged)
+                    logger.info(f"Cleaned up {len(aged)} stale connections")
                 
             except asyncio.CancelledError:
                 break
@@ -615,7 +813,13 @@ class WebSocketServer:
             **pool_stats,
             "max_connections": self.max_connections,
             "heartbeat_interval": self.heartbeat_interval,
-            "cleanup_interval": self.cleanup_interval
+            "cleanup_interval": self.cleanup_interval,
+            "heartbeat": {
+                **self.heartbeat_stats,
+                "wheel_slots": self.heartbeat_wheel.slots,
+                "scheduled": len(self.heartbeat_wheel),
+                "inflight_batches": len(self._ping_batches)
+            }
         }
 
 
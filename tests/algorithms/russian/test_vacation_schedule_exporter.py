@@ -0,0 +1,143 @@
+"""
+Tests for the streaming 1C ZUP vacation schedule exporter
+
+Verifies that the vectorized working-day count matches the scalar
+calculate_working_days, that iter_vacation_schedule streams the same workbook
+export_vacation_schedule builds, and that rows streamed from the database keep
+the query order, which must match the department / full name order the
+exporter used to sort by.
+"""
+
+import io
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.algorithms.russian.vacation_schedule_exporter import VacationScheduleExporter
+
+# Approved vacations in the query's ORDER BY d.name, e.last_name, e.first_name order
+DATABASE_ROWS = [
+    ('Бухгалтерия', 'Иванов', 'Андрей', 'Петрович', 'отпуск'),
+    ('Бухгалтерия', 'Иванов', 'Борис', None, 'учебный отпуск'),
+    ('Бухгалтерия', 'Иванова', 'Анна', 'Сергеевна', 'отпуск'),
+    ('Бухгалтерия', 'Смирнов', 'Олег', 'Ильич', 'отгул'),
+    ('Колл-центр', 'Александров', 'Пётр', None, 'внеочередной отпуск'),
+    ('Колл-центр', 'Кузнецова', 'Мария', 'Ивановна', ''),
+    ('Колл-центр', 'Кузнецова', 'Ольга', 'Андреевна', 'отпуск'),
+]
+
+
+def _database_records():
+    records = []
+    for i, (department, last_name, first_name, patronymic, vacation_type) in enumerate(DATABASE_ROWS):
+        start = date(2026, 6, 1) + timedelta(days=7 * i)
+        records.append({
+            'vacation_id': i, 'employee_id': f'emp-{i}', 'start_date': start, 'end_date': start + timedelta(days=13),
+            'vacation_type': vacation_type, 'reason': None, 'status': 'approved',
+            'employee_number': f'E{i:03d}', 'personnel_number': f'T{i:03d}' if i % 2 else None,
+            'first_name': first_name, 'last_name': last_name, 'patronymic': patronymic,
+            'department': department, 'position': None if i == 3 else 'Оператор',
+        })
+    return records
+
+
+class _NamedCursor:
+    """Server-side cursor stand-in that hands out two rows per fetch"""
+
+    def __init__(self, rows, queries):
+        self.rows = rows
+        self.queries = queries
+        self.position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchmany(self, size):
+        batch = self.rows[self.position:self.position + 2]
+        self.position += len(batch)
+        return batch
+
+
+class _Connection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def cursor(self, name=None, cursor_factory=None):
+        return _NamedCursor(self.rows, self.queries)
+
+
+def _sheet_rows(workbook_bytes):
+    worksheet = openpyxl.load_workbook(io.BytesIO(workbook_bytes)).active
+    return [list(row) for row in worksheet.iter_rows(min_row=2, values_only=True)]
+
+
+def test_vectorized_working_days_match_scalar_count():
+    exporter = VacationScheduleExporter()
+    rng = random.Random(3)
+    starts, ends = [], []
+    for _ in range(300):
+        start = datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+        starts.append(start)
+        ends.append(start + timedelta(days=rng.randint(-3, 40)))
+
+    vectorized = VacationScheduleExporter._working_days_vectorized(pd.Series(starts), pd.Series(ends))
+
+    assert vectorized.tolist() == [exporter.calculate_working_days(s, e) for s, e in zip(starts, ends)]
+    missing = VacationScheduleExporter._working_days_vectorized(
+        pd.Series([pd.NaT, starts[0]]), pd.Series([ends[0], pd.NaT])
+    )
+    assert missing.tolist() == [0, 0]
+
+
+def test_streamed_workbook_matches_exported_workbook():
+    exporter = VacationScheduleExporter()
+    data = exporter._prepare_database_records(pd.DataFrame(_database_records()))
+
+    chunks = list(exporter.iter_vacation_schedule(data, 2026, chunk_size=1024))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert _sheet_rows(b''.join(chunks)) == _sheet_rows(exporter.export_vacation_schedule(data, 2026))
+
+
+def test_database_rows_keep_query_order(monkeypatch):
+    exporter = VacationScheduleExporter()
+    connection = _Connection(_database_records())
+    monkeypatch.setattr(exporter, 'get_db_connection', lambda: connection)
+
+    rows = _sheet_rows(exporter.export_vacation_schedule(year=2026))
+
+    assert 'ORDER BY d.name, e.last_name, e.first_name' in connection.queries[0]
+    assert [row[1] for row in rows] == [
+        'Иванов А.П.', 'Иванов Б.', 'Иванова А.С.', 'Смирнов О.И.',
+        'Александров П.', 'Кузнецова М.И.', 'Кузнецова О.А.'
+    ]
+    # Same order the exporter produced when it re-sorted by department and full name
+    resorted = exporter._prepare_vacation_data(
+        exporter._prepare_database_records(pd.DataFrame(_database_records())), sort=True
+    )
+    assert [row[1] for row in rows] == resorted['full_name'].tolist()
+    assert rows[0] == ['E000', 'Иванов А.П.', 'Бухгалтерия', 'Оператор', '01.06.2026', '14.06.2026', 10, 'Основной']
+    assert rows[1][0] == 'T001' and rows[1][7] == 'Учебный'
+    assert rows[3][3] == 'Сотрудник'
+    assert rows[5][7] == 'Основной'
@@ -150,7 +150,59 @@ class TestZUPTimeCodeGenerator(unittest.TestCase):
         
         # Should be 8 hours of night work
         self.assertEqual(night_hours, 8)
-    
+
+    def test_vectorized_night_hours(self):
+        """Test night hours from minute offsets, including shifts crossing midnight"""
+        night_hours = self.generator._calculate_night_hours_vectorized(
+            pd.Series(['22:00', '21:30', '04:00', '09:00', None]),
+            pd.Series(['06:00', '23:30', '12:00', '17:00', None])
+        )
+
+        np.testing.assert_allclose(night_hours, [8.0, 1.5, 2.0, 0.0, 0.0])
+
+    def test_actual_data_merged_by_employee_and_date(self):
+        """Test that actual hours are matched per employee and day, first row wins"""
+        planned = pd.DataFrame({
+            'employee_id': ['EMP001', 'EMP002', 'EMP001', 'EMP003'],
+            'date': ['2024-01-10', '2024-01-10', '2024-01-11', '2024-01-11'],
+            'hours': [8, 8, 8, 8]
+        })
+        actual = pd.DataFrame({
+            'employee_id': ['EMP002', 'EMP001', 'EMP001', 'EMP001'],
+            'date': ['2024-01-10', '2024-01-11', '2024-01-11', '2024-01-10'],
+            'hours': [0, 10, 4, 8]
+        })
+
+        assignments = self.generator.generate_time_codes(planned, actual)
+
+        codes = [(a.employee_id, a.time_code, a.hours) for a in assignments]
+        self.assertEqual(codes, [
+            ('EMP001', TimeCodeType.DAY_WORK, 8),
+            ('EMP002', TimeCodeType.ABSENCE, 8),
+            ('EMP001', TimeCodeType.OVERTIME, 2),
+            ('EMP003', TimeCodeType.DAY_WORK, 8),  # No actual row: worked as planned
+        ])
+
+    def test_production_calendar_holiday_work(self):
+        """Test unplanned work on a production calendar holiday"""
+        planned = pd.DataFrame({
+            'employee_id': ['EMP001', 'EMP001'],
+            'date': ['2024-01-10', '2024-01-11'],
+            'start_time': ['20:00', '09:00'],
+            'end_time': ['23:00', '12:00'],
+            'hours': [0, 0]
+        })
+        actual = planned.assign(hours=[3, 3])
+        calendar = {'2024-01-10': {'is_holiday': True}}
+
+        assignments = self.generator.generate_time_codes(planned, actual, calendar)
+
+        # Unplanned work on a regular working day gets no code
+        self.assertEqual(len(assignments), 1)
+        self.assertEqual(assignments[0].time_code, TimeCodeType.NIGHT_WEEKEND)
+        self.assertEqual(assignments[0].night_hours, 1)
+        self.assertEqual(assignments[0].premium_rate, self.generator.premium_rates["weekend_work"])
+
     def test_holiday_detection(self):
         """Test Russian holiday detection"""
         # New Year's Day
@@ -0,0 +1,169 @@
+"""
+Tests for bulk approval workflow initiation
+
+Runs the same requests through initiate_approval_workflows_bulk and through
+one initiate_approval_workflow call each, against an in-memory stand-in for
+the database, and checks that both write the same workflow_instances and
+workflow_tasks rows and report the same failed requests.
+"""
+
+import json
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.algorithms.workflows import approval_engine
+from src.algorithms.workflows.approval_engine import MultiStepApprovalEngine
+
+DEFINITIONS = {
+    'vacation': {'id': 'def-vacation', 'name': 'vacation_approval', 'definition_json': {'steps': [
+        {'name': 'Supervisor Review', 'approver_role': 'supervisor', 'timeout_hours': 24},
+        {'name': 'HR Approval', 'approver_role': 'hr_specialist', 'timeout_hours': 48},
+    ]}},
+    'overtime': {'id': 'def-overtime', 'name': 'overtime_approval', 'definition_json': {'steps': [
+        {'name': 'Manager Review', 'approver_role': 'manager', 'timeout_hours': 12, 'actions': ['approve']},
+    ]}},
+}
+
+REQUESTS = [
+    {'workflow_type': 'vacation', 'object_type': 'vacation_request', 'object_id': 'v1', 'initiator_user_id': 'u1'},
+    {'workflow_type': 'broken', 'object_type': 'vacation_request', 'object_id': 'v2', 'initiator_user_id': 'u2'},
+    {'workflow_type': 'overtime', 'object_type': 'overtime_request', 'object_id': 'o1', 'initiator_user_id': 'u3',
+     'metadata': {'hours': 4}},
+    {'workflow_type': 'vacation', 'object_type': 'vacation_request', 'object_id': 'v3', 'initiator_user_id': 'u1'},
+]
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.result = None
+        if 'FROM workflow_definitions' in query:
+            if params[0] not in DEFINITIONS:
+                raise psycopg2.ProgrammingError('unknown workflow type')
+            self.result = DEFINITIONS[params[0]]
+        elif 'FROM agents' in query:
+            self.result = {'id': 7}
+        elif 'INSERT INTO workflow_instances' in query:
+            self.db.insert('workflow_instances', [params])
+        elif 'INSERT INTO workflow_tasks' in query:
+            self.db.insert('workflow_tasks', [params])
+
+    def fetchone(self):
+        return self.result
+
+
+class _FakeConnection:
+    """Keeps committed rows per table; uncommitted rows are dropped on rollback"""
+
+    def __init__(self):
+        self.tables = {'workflow_instances': [], 'workflow_tasks': []}
+        self.pending = {'workflow_instances': [], 'workflow_tasks': []}
+
+    def insert(self, table, rows):
+        self.pending[table].extend(rows)
+
+    def cursor(self, *args, **kwargs):
+        return _FakeCursor(self)
+
+    def commit(self):
+        for table, rows in self.pending.items():
+            self.tables[table].extend(rows)
+            rows.clear()
+
+    def rollback(self):
+        for rows in self.pending.values():
+            rows.clear()
+
+    def close(self):
+        pass
+
+
+def _fake_execute_values(cursor, query, rows, page_size=100):
+    table = 'workflow_instances' if 'INSERT INTO workflow_instances' in query else 'workflow_tasks'
+    cursor.db.insert(table, rows)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(MultiStepApprovalEngine, 'connect_to_database', lambda self: None)
+    monkeypatch.setattr(approval_engine.psycopg2.extras, 'execute_values', _fake_execute_values)
+    engine = MultiStepApprovalEngine()
+    engine.db_connection = _FakeConnection()
+    return engine
+
+
+def _written_rows(db):
+    """Committed rows without generated ids and timestamps"""
+    instance_names = {}
+    instances = []
+    for instance_id, name, status, data, _ in db.tables['workflow_instances']:
+        instance_names[instance_id] = name
+        instances.append((name, status, json.loads(data)))
+    tasks = []
+    for _, instance_id, task_name, assigned_to, status, due_date, task_data, created_at in db.tables['workflow_tasks']:
+        tasks.append((instance_names[instance_id], task_name, assigned_to, status,
+                      round((due_date - created_at).total_seconds() / 3600), json.loads(task_data)))
+    return sorted(instances, key=repr), sorted(tasks, key=repr)
+
+
+def test_bulk_writes_same_rows_as_single_initiation(engine):
+    bulk = engine.initiate_approval_workflows_bulk(REQUESTS)
+    bulk_rows = _written_rows(engine.db_connection)
+
+    engine.db_connection = _FakeConnection()
+    singles = [
+        engine.initiate_approval_workflow(request['workflow_type'], request['object_type'], request['object_id'],
+                                          request['initiator_user_id'], request.get('metadata'))
+        for request in REQUESTS
+    ]
+    single_rows = _written_rows(engine.db_connection)
+
+    assert bulk_rows == single_rows
+    assert len(bulk_rows[0]) == 3 and len(bulk_rows[1]) == 5
+    assert [workflow['index'] for workflow in bulk['workflows']] == [0, 2, 3]
+    assert [len(workflow['task_ids']) for workflow in bulk['workflows']] == \
+        [single['steps_created'] for single in singles if single['success']]
+    assert (bulk['workflows_created'], bulk['tasks_created']) == (3, 5)
+
+
+def test_partial_failure_is_reported_per_request(engine):
+    result = engine.initiate_approval_workflows_bulk(REQUESTS)
+    single = engine.initiate_approval_workflow('broken', 'vacation_request', 'v2', 'u2')
+
+    assert result['success'] is True
+    assert result['failed'] == [{'index': 1, 'message': single['message']}]
+    assert single['success'] is False
+
+
+def test_database_error_writes_nothing(engine, monkeypatch):
+    def failing_execute_values(cursor, query, rows, page_size=100):
+        if 'workflow_tasks' in query:
+            raise psycopg2.OperationalError('connection lost')
+        _fake_execute_values(cursor, query, rows, page_size)
+
+    monkeypatch.setattr(approval_engine.psycopg2.extras, 'execute_values', failing_execute_values)
+    notified = []
+    engine.add_task_state_listener(notified.append)
+
+    result = engine.initiate_approval_workflows_bulk(REQUESTS)
+
+    assert result['success'] is False
+    assert result['workflows_created'] == 0
+    assert [failure['index'] for failure in result['failed']] == [1]
+    assert engine.db_connection.tables == {'workflow_instances': [], 'workflow_tasks': []}
+    assert notified == []
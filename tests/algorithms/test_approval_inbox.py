@@ -0,0 +1,193 @@
+"""
+Tests for the materialized approval inbox and the approver role cache
+
+Verifies that ApprovalInbox pages each approver's items newest first, files
+requests without an approver in the shared inbox and forgets decided items,
+that role lookups are cached until invalidated but the default agent used when
+a lookup fails is not, and that a failed workflow advance leaves the inbox as
+it was.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.algorithms.workflows.approval_engine import (
+    SHARED_INBOX, ApprovalInbox, MultiStepApprovalEngine
+)
+
+BASE = datetime(2026, 10, 1, 9, 0)
+
+
+def _task(task_id: str, minutes: int, assigned_to='mgr-1', workflow_instance_id='wf-1'):
+    return {'id': task_id, 'type': 'workflow_task', 'assigned_to': assigned_to,
+            'workflow_instance_id': workflow_instance_id, 'submitted_at': BASE + timedelta(minutes=minutes)}
+
+
+def _request(request_id: str, minutes: int, request_type='employee_request'):
+    return {'id': request_id, 'type': request_type, 'submitted_at': BASE + timedelta(minutes=minutes)}
+
+
+def test_pages_are_newest_first_per_approver():
+    inbox = ApprovalInbox()
+    inbox.load([_task(f't{i}', i) for i in range(7)]
+               + [_task('other', 100, assigned_to='mgr-2'), _request('r1', 50)])
+
+    first = inbox.get_page('mgr-1', offset=0, limit=3)
+    last = inbox.get_page('mgr-1', offset=6, limit=3)
+
+    assert [item['id'] for item in first['items']] == ['t6', 't5', 't4']
+    assert (first['total'], first['has_more']) == (7, True)
+    assert [item['id'] for item in last['items']] == ['t0']
+    assert last['has_more'] is False
+    assert [item['id'] for item in inbox.get_page()['items']] == ['r1']
+    assert inbox.count('mgr-2') == 1
+
+
+def test_upsert_and_remove_keep_order():
+    inbox = ApprovalInbox()
+    inbox.load([_task('t1', 1), _task('t3', 3)])
+
+    inbox.upsert(_task('t2', 2))
+    inbox.upsert({**_task('t1', 10), 'assigned_to': 'mgr-2'})
+
+    assert [item['id'] for item in inbox.get_page('mgr-1')['items']] == ['t3', 't2']
+    assert inbox.count('mgr-2') == 1
+    assert inbox.remove('workflow_task', 't3')
+    assert not inbox.remove('workflow_task', 't3')
+    assert [item['id'] for item in inbox.get_page('mgr-1')['items']] == ['t2']
+
+
+def test_ids_from_different_tables_are_separate_entries():
+    inbox = ApprovalInbox()
+    inbox.load([_request('7', 1), _request('7', 2, request_type='vacation_request')])
+
+    assert inbox.count(SHARED_INBOX) == 2
+    inbox.remove('vacation_request', '7')
+    assert [item['type'] for item in inbox.get_page()['items']] == ['employee_request']
+
+
+def test_workflow_data_refresh_reaches_every_pending_task():
+    inbox = ApprovalInbox()
+    inbox.load([_task('t1', 1), _task('t2', 2, assigned_to='mgr-2'), _task('t3', 3, workflow_instance_id='wf-2')])
+
+    assert inbox.update_workflow_data('wf-1', {'current_step': 2}) == 2
+    inbox.remove('workflow_task', 't1')
+    assert inbox.update_workflow_data('wf-1', {'current_step': 3}) == 1
+    assert inbox.get_page('mgr-2')['items'][0]['workflow_data'] == {'current_step': 3}
+    assert 'workflow_data' not in inbox.get_page('mgr-1')['items'][0]
+
+
+class _FakeCursor:
+    """Answers queries from a list of (SQL fragment, result) pairs"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.queries.append(query)
+        for fragment, result in self.connection.responses:
+            if fragment in query:
+                if isinstance(result, Exception):
+                    raise result
+                self.result = result
+                return
+        self.result = None
+
+    def fetchone(self):
+        return self.result
+
+
+class _FakeConnection:
+    def __init__(self, responses):
+        self.responses = responses
+        self.queries = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, *args, **kwargs):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(MultiStepApprovalEngine, 'connect_to_database', lambda self: None)
+    return MultiStepApprovalEngine()
+
+
+def test_role_lookups_are_cached_until_invalidated(engine):
+    engine.db_connection = _FakeConnection([('FROM agents', {'id': 5})])
+
+    assert engine.get_agent_for_role('supervisor') == 5
+    assert engine.get_agent_for_role('supervisor') == 5
+    assert len(engine.db_connection.queries) == 1
+
+    engine.invalidate_role_cache('supervisor')
+    assert engine.get_agent_for_role('supervisor') == 5
+    assert len(engine.db_connection.queries) == 2
+
+
+def test_default_agent_after_failed_lookup_is_not_cached(engine):
+    engine.db_connection = _FakeConnection([('FROM agents', psycopg2.OperationalError('connection lost'))])
+
+    assert engine.get_agent_for_role('supervisor') == 1
+
+    engine.db_connection.responses = [('FROM agents', {'id': 5})]
+    assert engine.get_agent_for_role('supervisor') == 5
+
+
+def test_failed_workflow_advance_leaves_inbox_unchanged(engine):
+    engine.approval_inbox.load([{**_task('t1', 1), 'workflow_data': {'current_step': 1}}])
+    engine.db_connection = _FakeConnection([
+        ('FROM workflow_tasks wt', {'workflow_instance_id': 'wf-1', 'data': {'current_step': 1},
+                                    'task_name': 'Approve', 'assigned_to': 'mgr-1', 'created_at': BASE}),
+        ('pending_count', {'pending_count': 0}),
+        ('FROM workflow_instances wi', psycopg2.OperationalError('connection lost')),
+    ])
+    notified = []
+    engine.add_task_state_listener(notified.append)
+
+    assert engine.process_approval_decision('t1', 'approve') is False
+
+    assert (engine.db_connection.commits, engine.db_connection.rollbacks) == (0, 1)
+    item = engine.approval_inbox.get_page('mgr-1')['items'][0]
+    assert (item['id'], item['workflow_data']) == ('t1', {'current_step': 1})
+    assert notified == []
+
+
+def test_committed_decision_updates_inbox(engine):
+    engine.approval_inbox.load([_task('t1', 1), _task('t2', 2, assigned_to='mgr-2')])
+    engine.db_connection = _FakeConnection([
+        ('FROM workflow_tasks wt', {'workflow_instance_id': 'wf-1', 'data': {'current_step': 1},
+                                    'task_name': 'Approve', 'assigned_to': 'mgr-1', 'created_at': BASE}),
+        ('pending_count', {'pending_count': 0}),
+        ('FROM workflow_instances wi', {'data': {'current_step': 1}}),
+    ])
+
+    assert engine.process_approval_decision('t1', 'approve') is True
+
+    assert engine.db_connection.commits == 1
+    assert engine.approval_inbox.count('mgr-1') == 0
+    assert engine.approval_inbox.get_page('mgr-2')['items'][0]['workflow_data']['current_state'] == 'completed'
@@ -0,0 +1,145 @@
+"""
+Tests for the ARIMA order search and shared model store of VolumePredictorReal
+
+Verifies that the order search prunes the grid by partial AIC, that models
+rebuilt from stored parameters match the fitted ones, and that the on-disk
+store is keyed by service and data fingerprint, holds plain JSON and stays
+private to the current user.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('statsmodels')
+pytest.importorskip('sqlalchemy')
+
+from src.algorithms.predictions import volume_predictor_real as vpr
+from src.algorithms.predictions.volume_predictor_real import (
+    ARIMA_MODEL_STORE_DIR, ARIMA_PRUNE_KEEP, ArimaModelStore, VolumePredictorReal, series_fingerprint
+)
+
+
+def _series(points: int = 1000, seed: int = 7) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    values = np.empty(points)
+    values[0] = 50.0
+    for i in range(1, points):
+        values[i] = 50.0 + 0.6 * (values[i - 1] - 50.0) + rng.normal(0, 3)
+    index = pd.date_range('2025-01-06', periods=points, freq='15min')
+    return pd.Series(values, index=index, name='call_volume')
+
+
+def _predictor(store_dir) -> VolumePredictorReal:
+    # Skip the database connection; the order search does not need it
+    predictor = VolumePredictorReal.__new__(VolumePredictorReal)
+    predictor.model_store = ArimaModelStore(str(store_dir))
+    return predictor
+
+
+def test_search_prunes_to_best_partial_candidates(tmp_path):
+    predictor = _predictor(tmp_path)
+    series = _series()
+
+    candidates = predictor._search_arima_orders(series)
+
+    assert 0 < len(candidates) <= ARIMA_PRUNE_KEEP
+    assert all(np.isfinite(aic) for aic, _ in candidates.values())
+
+
+def test_rebuilt_model_matches_fitted_aic(tmp_path):
+    predictor = _predictor(tmp_path)
+    series = _series(points=400)
+
+    order, aic, params = vpr._fit_arima_candidate(series, (1, 0, 0))
+    rebuilt = predictor._build_arima_model(series, order, params)
+
+    assert rebuilt.aic == pytest.approx(aic, rel=1e-6)
+
+
+def test_warm_start_reaches_same_optimum(tmp_path):
+    series = _series(points=400)
+
+    _, cold_aic, params = vpr._fit_arima_candidate(series, (1, 0, 1))
+    _, warm_aic, _ = vpr._fit_arima_candidate(series, (1, 0, 1), start_params=params)
+
+    assert warm_aic == pytest.approx(cold_aic, rel=1e-4)
+
+
+def test_store_is_keyed_by_service_and_fingerprint(tmp_path):
+    store = ArimaModelStore(str(tmp_path), keep=2)
+    series = _series(points=200)
+    fingerprint = series_fingerprint(series)
+    entry = {'order': (1, 0, 0), 'aic': 1.0, 'params': np.array([50.0, 0.6, 9.0]),
+             'candidate_params': {(1, 0, 0): np.array([50.0, 0.6, 9.0])}}
+
+    store.save(1, fingerprint, entry)
+
+    assert store.load(1, fingerprint)['order'] == (1, 0, 0)
+    assert store.load(2, fingerprint) is None
+    assert store.load(1, series_fingerprint(series.iloc[1:])) is None
+    assert store.load_latest(1)['order'] == (1, 0, 0)
+
+
+def test_store_keeps_newest_entries_per_service(tmp_path):
+    store = ArimaModelStore(str(tmp_path), keep=2)
+    series = _series(points=200)
+    fingerprints = [series_fingerprint(series.iloc[i:]) for i in range(3)]
+
+    for i, fingerprint in enumerate(fingerprints):
+        store.save(1, fingerprint, {'order': (i, 0, 0), 'params': np.zeros(2)})
+
+    assert len(list(tmp_path.glob('service_1_*.json'))) == 2
+
+
+def test_entries_round_trip_as_json(tmp_path):
+    store = ArimaModelStore(str(tmp_path))
+    params = np.array([50.0, 0.6, 9.0])
+    entry = {'order': (1, 0, 0), 'aic': 12.5, 'params': params,
+             'candidate_params': {(1, 0, 0): params, (2, 0, 1): np.arange(5.0)},
+             'trained_at': datetime(2026, 10, 1, 12, 0), 'data_points': 200}
+
+    store.save(1, 'abc', entry)
+    loaded = store.load(1, 'abc')
+
+    [path] = tmp_path.glob('service_1_abc.json')
+    assert json.loads(path.read_text())['order'] == [1, 0, 0]
+    assert loaded['order'] == (1, 0, 0)
+    np.testing.assert_array_equal(loaded['params'], params)
+    np.testing.assert_array_equal(loaded['candidate_params'][(2, 0, 1)], np.arange(5.0))
+    assert loaded['trained_at'] == datetime(2026, 10, 1, 12, 0)
+
+
+def test_unreadable_entries_are_ignored(tmp_path):
+    store = ArimaModelStore(str(tmp_path))
+    (tmp_path / 'service_1_abc.json').write_bytes(b'\x80\x04\x95 not json')
+
+    assert store.load(1, 'abc') is None
+    assert store.load_latest(1) is None
+
+
+def test_store_directory_is_private(tmp_path):
+    shared = tmp_path / 'shared'
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+
+    ArimaModelStore(str(shared))
+
+    assert stat.S_IMODE(os.stat(shared).st_mode) == 0o700
+    assert not ARIMA_MODEL_STORE_DIR.startswith(tempfile.gettempdir())
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason='changing directory owner needs root')
+def test_store_refuses_directory_owned_by_another_user(tmp_path):
+    foreign = tmp_path / 'foreign'
+    foreign.mkdir()
+    os.chown(foreign, 12345, -1)
+
+    with pytest.raises(PermissionError):
+        ArimaModelStore(str(foreign))
@@ -0,0 +1,197 @@
+"""
+Tests for the vectorized auto-learning expected values
+
+Compares _calculate_expected_values and analyze_historical_data with a
+per-day reference that follows the former per-date SQL queries (same
+month/day in earlier years, day-of-week fallback, day-of-week and month
+factors from per-interval averages) on a fixture interval history, and
+checks that day-of-week lookups use the day's own weekday.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("sklearn")
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.algorithms.ml.auto_learning_coefficients_real import AutoLearningCoefficientsReal
+
+WEEKDAY_LOAD = [1.6, 1.2, 1.0, 1.0, 0.9, 0.4, 0.3]
+
+
+def _intervals(seed: int = 11):
+    """(start time, contact volume) rows for Jan 2024 - Feb 2026 with gaps and spikes"""
+    rng = random.Random(seed)
+    rows = []
+    day = datetime(2024, 1, 1)
+    while day < datetime(2026, 3, 1):
+        if rng.random() > 0.05:
+            # Weekends have fewer intervals, so per-interval and per-day averages differ
+            intervals = 4 if day.weekday() < 5 else 2
+            spike = 6.0 if rng.random() < 0.03 else 1.0
+            for i in range(intervals):
+                volume = 100 * WEEKDAY_LOAD[day.weekday()] * (1 + 0.3 * (day.month in (11, 12))) * spike
+                rows.append((day + timedelta(hours=9 + 2 * i), round(volume * rng.uniform(0.8, 1.2), 1)))
+        day += timedelta(days=1)
+    return rows
+
+
+def _daily_history(rows, start_date, end_date):
+    """Rows of the _load_daily_history query"""
+    days = defaultdict(lambda: [0.0, 0, 0.0, False])
+    for start, volume in rows:
+        entry = days[start.replace(hour=0)]
+        entry[0] += volume
+        entry[1] += 1
+        if start_date <= start <= end_date:
+            entry[2] += volume
+            entry[3] = True
+    return [(day, total, count, actual if in_window else None, 0.8 if in_window else None, in_window)
+            for day, (total, count, actual, in_window) in sorted(days.items())]
+
+
+def _reference_expected(rows, date, sql_dow=lambda d: d.weekday()):
+    """
+    Expected value for one date computed the way the former per-date queries did
+
+    sql_dow is the day-of-week the SQL side grouped by; the lookups always used
+    Python weekday(), which the old EXTRACT(DOW) queries (Sunday=0) did not match.
+    """
+    daily = defaultdict(float)
+    for start, volume in rows:
+        daily[start.date()] += volume
+
+    same_day = [v for d, v in daily.items() if (d.month, d.day) == (date.month, date.day) and d.year < date.year]
+    base = sum(same_day) / len(same_day) if same_day else None
+    if not base:
+        dow_days = [v for d, v in daily.items() if sql_dow(d) == date.weekday()]
+        base = sum(dow_days) / len(dow_days) if dow_days else 0
+    if not base:
+        return 0.0
+
+    by_dow, by_month = defaultdict(list), defaultdict(list)
+    for start, volume in rows:
+        by_dow[sql_dow(start)].append(volume)
+        by_month[start.month].append(volume)
+    dow_data = {k: sum(v) / len(v) for k, v in by_dow.items()}
+    month_data = {k: sum(v) / len(v) for k, v in by_month.items()}
+    overall_avg = sum(dow_data.values()) / len(dow_data)
+    month_avg = sum(month_data.values()) / len(month_data)
+    dow_factor = dow_data.get(date.weekday(), overall_avg) / overall_avg
+    month_factor = month_data.get(date.month, month_avg) / month_avg
+    return base * dow_factor * month_factor
+
+
+def _history_frame(daily_rows):
+    history = pd.DataFrame(daily_rows, columns=[
+        'date', 'total_volume', 'interval_count', 'actual_value', 'sl_actual', 'in_window'
+    ])
+    history['date'] = pd.to_datetime(history['date'])
+    history['actual_value'] = history['actual_value'].astype(float)
+    return history
+
+
+class _FakeSession:
+    """Serves the history and event-pattern queries and records inserted events"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if 'FROM contact_statistics' in sql:
+            return SimpleNamespace(fetchall=lambda: _daily_history(self.rows, params['start_date'], params['end_date']))
+        if 'INSERT INTO detected_events' in sql:
+            self.inserted.extend(params)
+            return None
+        return []
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def learner():
+    learner = AutoLearningCoefficientsReal.__new__(AutoLearningCoefficientsReal)
+    learner.config = {
+        'outlier_threshold_moderate': 1.5,
+        'outlier_threshold_extreme': 3.0,
+        'min_occurrences_to_learn': 2,
+        'confidence_threshold': 0.7,
+        'max_coefficient': 5.0,
+        'min_coefficient': 0.1,
+        'learning_rate': 0.1,
+    }
+    return learner
+
+
+def test_expected_values_match_per_day_reference(learner):
+    rows = _intervals()
+    history = _history_frame(_daily_history(rows, datetime(2025, 3, 1), datetime(2026, 2, 28, 23, 59)))
+
+    expected = learner._calculate_expected_values(history)
+
+    reference = [_reference_expected(rows, date) for date in history['date']]
+    assert expected.tolist() == pytest.approx(reference, rel=1e-9)
+    # Both branches are exercised: first-year days fall back to the weekday mean
+    assert history['date'].dt.year.min() == 2024 and (history['date'].dt.year == 2026).any()
+
+
+def test_day_of_week_uses_the_days_own_weekday(learner):
+    rows = _intervals()
+    history = _history_frame(_daily_history(rows, datetime(2025, 1, 1), datetime(2025, 12, 31)))
+    expected = learner._calculate_expected_values(history)
+
+    # A Monday in the first year has no earlier-year base and uses the Monday mean
+    monday = history.index[history['date'] == pd.Timestamp(2024, 1, 8)][0]
+    fixed = _reference_expected(rows, datetime(2024, 1, 8))
+    # The old SQL grouped by Postgres DOW (Sunday=0) but looked up weekday() (Monday=0)
+    shifted = _reference_expected(rows, datetime(2024, 1, 8), sql_dow=lambda d: (d.weekday() + 1) % 7)
+
+    assert expected[monday] == pytest.approx(fixed)
+    assert shifted < 0.5 * fixed  # Monday was estimated from Sunday's load
+
+
+def test_detected_events_match_per_day_classification(learner):
+    rows = _intervals()
+    start_date, end_date = datetime(2025, 3, 1), datetime(2026, 2, 28, 23, 59)
+    session = _FakeSession(rows)
+    learner.SessionLocal = lambda: session
+
+    events = learner.analyze_historical_data(1, start_date, end_date)
+
+    window = _history_frame(_daily_history(rows, start_date, end_date))
+    window = window[window['in_window']]
+    q1, q3 = window['actual_value'].quantile(0.25), window['actual_value'].quantile(0.75)
+    reference_events = []
+    for date, value in zip(window['date'], window['actual_value']):
+        expected = _reference_expected(rows, date.to_pydatetime())
+        if expected == 0:
+            continue
+        event = learner._classify_event(date.to_pydatetime(), value, expected, abs(value - expected) / expected,
+                                        q3 + 1.5 * (q3 - q1), q3 + 3.0 * (q3 - q1), {})
+        if event:
+            reference_events.append(event)
+
+    assert events
+    assert [e.date for e in events] == [e.date for e in reference_events]
+    assert [e.coefficient for e in events] == pytest.approx([e.coefficient for e in reference_events], rel=1e-9)
+    assert [e.event_type for e in events] == [e.event_type for e in reference_events]
+    assert len(session.inserted) == len(events)
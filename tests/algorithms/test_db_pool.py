@@ -0,0 +1,156 @@
+"""
+Tests for the shared psycopg2 connection pool
+
+Uses a counting stand-in for psycopg2.connect and checks that connections are
+reused, reset between borrowers, discarded when broken, bounded with a wait
+and timeout when saturated, and returned by close() and by ``with`` blocks.
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from psycopg2 import extensions
+
+from src.algorithms.core import db_pool
+from src.algorithms.core.db_pool import ConnectionPool, PoolTimeout
+
+
+class _Info:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.info = _Info()
+        self.resets = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class Connector:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self, *args, **kwargs):
+        conn = FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+
+@pytest.fixture
+def connector():
+    return Connector()
+
+
+def _pool(connector, **kwargs) -> ConnectionPool:
+    return ConnectionPool(connect_kwargs={"host": "db", "dbname": "wfm_enterprise"}, connect=connector, **kwargs)
+
+
+def test_close_returns_connection_for_reuse(connector):
+    pool = _pool(connector)
+
+    for _ in range(5):
+        conn = pool.connect()
+        conn.close()
+
+    assert len(connector.opened) == 1
+    assert connector.opened[0].closed == 0
+    assert connector.opened[0].resets == 5
+    stats = pool.get_stats()
+    assert stats["opened"] == 1 and stats["reused"] == 4 and stats["in_use"] == 0
+
+
+def test_with_block_commits_and_releases(connector):
+    pool = _pool(connector)
+
+    with pool.connect() as conn:
+        conn.autocommit = True
+    with pytest.raises(ValueError):
+        with pool.connect():
+            raise ValueError("rolled back")
+
+    raw = connector.opened[0]
+    assert len(connector.opened) == 1
+    assert (raw.commits, raw.rollbacks) == (1, 1)
+    # Session settings do not leak to the next borrower
+    assert raw.autocommit is False
+    assert conn.closed
+
+
+def test_released_connection_cannot_be_used(connector):
+    pool = _pool(connector)
+    conn = pool.connect()
+    conn.close()
+
+    with pytest.raises(db_pool.psycopg2.InterfaceError):
+        conn.cursor()
+
+
+def test_broken_connection_is_discarded(connector):
+    pool = _pool(connector)
+    conn = pool.connect()
+    connector.opened[0].closed = 2
+    conn.close()
+
+    pool.connect().close()
+
+    assert len(connector.opened) == 2
+    assert pool.get_stats()["discarded"] == 1
+
+
+def test_saturated_pool_waits_then_times_out(connector):
+    pool = _pool(connector, max_size=2, timeout=0.05)
+    held = [pool.connect(), pool.connect()]
+
+    with pytest.raises(PoolTimeout):
+        pool.connect()
+
+    threading.Timer(0.02, held[0].close).start()
+    start = time.perf_counter()
+    waiter = pool.connect(timeout=1.0)
+
+    assert time.perf_counter() - start < 1.0
+    assert len(connector.opened) == 2
+    stats = pool.get_stats()
+    assert stats["waits"] == 2 and stats["timeouts"] == 1
+    assert stats["saturation"] == 1.0 and stats["peak_in_use"] == 2
+    waiter.close()
+    held[1].close()
+
+
+def test_dropped_connection_goes_back_to_pool(connector):
+    pool = _pool(connector, max_size=1)
+    pool.connect()
+
+    pool.connect(timeout=0).close()
+
+    assert len(connector.opened) == 1
+
+
+def test_callers_with_same_arguments_share_a_pool(monkeypatch):
+    monkeypatch.setattr(db_pool, "_pools", {})
+    first = db_pool.get_connection_pool(host="db", dbname="wfm_enterprise", user="postgres")
+    second = db_pool.get_connection_pool(user="postgres", dbname="wfm_enterprise", host="db")
+
+    assert first is second
+    assert db_pool.get_connection_pool("postgresql://postgres@db/wfm_enterprise") is not first
+    assert set(db_pool.get_pool_stats()) == {"postgres@db:5432/wfm_enterprise",
+                                             "postgres@db:5432/wfm_enterprise#1"}
@@ -0,0 +1,74 @@
+"""
+Tests for the shared Erlang C staffing solver
+
+Checks the log-space Erlang C against the textbook factorial formula, that the
+search returns the minimum agent count meeting the answer-time target, that
+large traffic does not overflow, and that near-identical traffic hits the cache.
+"""
+
+import math
+
+import pytest
+
+pytest.importorskip("scipy")
+
+from src.algorithms.core.erlang_staffing_solver import (
+    StaffingSolver, average_speed_of_answer, erlang_c, service_level
+)
+
+
+def _erlang_c_factorial(traffic: float, agents: int) -> float:
+    top = traffic ** agents / math.factorial(agents) * agents / (agents - traffic)
+    bottom = sum(traffic ** i / math.factorial(i) for i in range(agents)) + top
+    return top / bottom
+
+
+@pytest.mark.parametrize("traffic, agents", [(2.0, 3), (8.5, 10), (25.0, 30), (60.0, 72)])
+def test_erlang_c_matches_factorial_formula(traffic, agents):
+    assert erlang_c(traffic, agents) == pytest.approx(_erlang_c_factorial(traffic, agents), rel=1e-9)
+
+
+def test_textbook_interval():
+    # 360 calls/hour, 240 s AHT, 20 s answer time -> 24 Erlangs
+    solver = StaffingSolver()
+
+    agents = solver.required_agents(24.0, 0.8, 20, 240)
+
+    assert service_level(24.0, agents, 20, 240) >= 0.8
+    assert service_level(24.0, agents - 1, 20, 240) < 0.8
+    assert average_speed_of_answer(24.0, agents, 240) > 0
+
+
+@pytest.mark.parametrize("traffic", [0.3, 4.2, 97.0, 1500.0])
+@pytest.mark.parametrize("target, answer_time", [(0.8, 20), (0.95, 10), (0.5, 0)])
+def test_search_returns_minimum_agents(traffic, target, answer_time):
+    solver = StaffingSolver(traffic_step=1e-6)
+
+    agents = solver.required_agents(traffic, target, answer_time, 180)
+
+    assert service_level(traffic, agents, answer_time, 180) >= target
+    assert agents == 1 or agents - 1 <= traffic or service_level(traffic, agents - 1, answer_time, 180) < target
+
+
+def test_large_traffic_stays_finite():
+    assert 0.0 < erlang_c(5000.0, 5100) < 1.0
+    assert StaffingSolver().required_agents(5000.0, 0.9, 20, 300) > 5000
+
+
+def test_longer_answer_time_needs_fewer_agents():
+    solver = StaffingSolver()
+
+    assert solver.required_agents(40.0, 0.8, 60, 180) <= solver.required_agents(40.0, 0.8, 5, 180)
+
+
+def test_quantized_traffic_is_cached_and_conservative():
+    solver = StaffingSolver(traffic_step=0.05)
+
+    first = solver.required_agents(31.21, 0.8, 20, 240)
+    second = solver.required_agents(31.24, 0.8, 20, 240)
+
+    stats = solver.get_stats()
+    assert first == second
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.5)
+    assert service_level(31.24, second, 20, 240) >= 0.8
@@ -0,0 +1,264 @@
+"""
+Tests for the in-process escalation deadline scheduler
+
+Verifies that EscalationScheduler fires each escalation rule exactly once when
+due, walks the escalation ladder, catches up overdue tasks with a single
+escalation and drops tasks whose workflow state leaves 'pending', that
+approvals, incidents and workflow tasks sharing an id are tracked separately,
+and that request threads can change the schedule while the escalation loop
+runs in its own thread with its own database connection.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.algorithms.workflows.escalation_manager import (
+    EscalationLevel, EscalationRule, EscalationScheduler
+)
+
+HOUR = 3600.0
+
+
+def _rule(level: EscalationLevel, timeout_hours: float, process_type: str = 'approval_workflow') -> EscalationRule:
+    return EscalationRule(
+        id=f"rule_{level.value}",
+        process_type=process_type,
+        trigger_condition=f"{int(timeout_hours * 60)}_minute_timeout",
+        escalation_level=level,
+        timeout_hours=timeout_hours,
+        target_role='supervisor',
+        action_type='notify',
+        is_active=True
+    )
+
+
+@pytest.fixture
+def scheduler():
+    return EscalationScheduler([
+        _rule(EscalationLevel.LEVEL_2, 4),
+        _rule(EscalationLevel.LEVEL_1, 1),
+        _rule(EscalationLevel.LEVEL_3, 24),
+    ])
+
+
+def _task(task_id: str, created_at: float, task_name: str = 'vacation_approval'):
+    return {'id': task_id, 'task_name': task_name, 'task_status': 'pending',
+            'assigned_to': 'emp-1', 'created_at': created_at}
+
+
+def test_fires_each_rule_once_in_timeout_order(scheduler):
+    scheduler.schedule_task(_task('t1', 0.0), now=0.0)
+
+    assert scheduler.next_deadline() == 1 * HOUR
+    assert scheduler.pop_due(now=0.5 * HOUR) == []
+
+    fired = scheduler.pop_due(now=1 * HOUR)
+    assert [rule.escalation_level for _, rule in fired] == [EscalationLevel.LEVEL_1]
+    assert scheduler.pop_due(now=1 * HOUR) == []
+
+    assert [rule.escalation_level for _, rule in scheduler.pop_due(now=5 * HOUR)] == [EscalationLevel.LEVEL_2]
+    assert [rule.escalation_level for _, rule in scheduler.pop_due(now=30 * HOUR)] == [EscalationLevel.LEVEL_3]
+    assert len(scheduler) == 0
+    assert scheduler.next_deadline() is None
+
+
+def test_overdue_task_catches_up_with_single_escalation(scheduler):
+    scheduler.schedule_task(_task('t1', 0.0), now=10 * HOUR)
+
+    fired = scheduler.pop_due(now=10 * HOUR)
+    assert [rule.escalation_level for _, rule in fired] == [EscalationLevel.LEVEL_2]
+    assert scheduler.next_deadline() == 24 * HOUR
+
+
+def test_cancel_and_reschedule_invalidate_old_deadlines(scheduler):
+    scheduler.schedule_task(_task('t1', 0.0), now=0.0)
+    scheduler.schedule_task(_task('t2', 0.0), now=0.0)
+
+    assert scheduler.cancel_task('t1')
+    scheduler.schedule_task(_task('t2', 2 * HOUR), now=2 * HOUR)
+
+    assert scheduler.pop_due(now=2 * HOUR) == []
+    fired = scheduler.pop_due(now=3 * HOUR)
+    assert [(task['id'], rule.escalation_level) for task, rule in fired] == [('t2', EscalationLevel.LEVEL_1)]
+    assert 't1' not in scheduler
+
+
+def test_unmatched_tasks_are_not_scheduled(scheduler):
+    assert scheduler.schedule_task(_task('t1', 0.0, task_name='server_down_incident'), now=0.0) is None
+    assert len(scheduler) == 0
+
+
+def test_reassign_tasks_updates_escalation_context(scheduler):
+    scheduler.schedule_task(_task('t1', 0.0), now=0.0)
+
+    assert scheduler.reassign_tasks('emp-1', 'emp-2') == 1
+    task, _ = scheduler.pop_due(now=1 * HOUR)[0]
+    assert task['assigned_to'] == 'emp-2'
+
+
+def test_ids_from_different_task_tables_do_not_collide(scheduler):
+    approval = {**_task('42', 0.0), 'task_type': 'approval_request', 'decision': 'pending'}
+    incident = {**_task('42', 0.0, task_name='approval_incident'), 'task_type': 'incident_resolution'}
+    scheduler.schedule_task(approval, now=0.0)
+    scheduler.schedule_task(incident, now=0.0)
+
+    assert len(scheduler) == 2
+    assert scheduler.cancel_task('42', 'approval_request')
+    assert ('incident_resolution', '42') in scheduler
+    assert '42' not in scheduler
+
+    fired = scheduler.pop_due(now=1 * HOUR)
+    assert [task['task_type'] for task, _ in fired] == ['incident_resolution']
+
+
+class _FakeCursor:
+    def __init__(self, pending_ids):
+        self.pending_ids = pending_ids
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params):
+        self.rows = [(task_id,) for task_id in params[0] if task_id in self.pending_ids]
+
+    def fetchall(self):
+        return self.rows
+
+
+class _FakeConnection:
+    def __init__(self, pending_ids):
+        self.pending_ids = pending_ids
+        self.closed = False
+
+    def cursor(self, *args, **kwargs):
+        return _FakeCursor(self.pending_ids)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fast_thread_switching():
+    # Switch threads as often as possible so unguarded updates would interleave
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def test_request_threads_can_reschedule_while_due_tasks_pop(scheduler, fast_thread_switching):
+    errors = []
+    popped = []
+    stop = threading.Event()
+
+    def request_thread(offset):
+        try:
+            for i in range(2000):
+                task = _task(f"t{(i + offset) % 50}", 0.0)
+                if i % 3:
+                    scheduler.schedule_task(task, now=0.0)
+                else:
+                    scheduler.cancel_task(task['id'])
+        except Exception as e:
+            errors.append(e)
+
+    def loop_thread():
+        try:
+            while not stop.is_set():
+                popped.extend(scheduler.pop_due(now=30 * HOUR))
+                scheduler.next_deadline()
+        except Exception as e:
+            errors.append(e)
+
+    loop = threading.Thread(target=loop_thread)
+    loop.start()
+    requests = [threading.Thread(target=request_thread, args=(offset,)) for offset in range(4)]
+    for thread in requests:
+        thread.start()
+    for thread in requests:
+        thread.join()
+    stop.set()
+    loop.join()
+
+    assert errors == []
+    assert popped
+    # Every tracked task still has its ladder, so a final pop drains them cleanly
+    scheduler.pop_due(now=30 * HOUR)
+    assert len(scheduler) == 0
+
+
+def _manager(monkeypatch, scheduler, pending_ids):
+    from src.algorithms.workflows import escalation_manager
+    monkeypatch.setattr(escalation_manager.EscalationManager, 'connect_to_database', lambda self: None)
+    manager = escalation_manager.EscalationManager()
+    manager.db_connection = _FakeConnection(pending_ids)
+    manager.escalation_scheduler = scheduler
+    return manager
+
+
+def test_decisions_from_approval_engine_cancel_escalations(monkeypatch, scheduler):
+    from src.algorithms.workflows.approval_engine import MultiStepApprovalEngine
+    manager = _manager(monkeypatch, scheduler, pending_ids=set())
+    monkeypatch.setattr(MultiStepApprovalEngine, 'connect_to_database', lambda self: None)
+    engine = MultiStepApprovalEngine()
+    manager.attach_approval_engine(engine)
+
+    scheduler.schedule_task(_task('t1', 0.0), now=0.0)
+    scheduler.schedule_task({**_task('a1', 0.0), 'task_type': 'approval_request'}, now=0.0)
+    scheduler.schedule_task({**_task('i1', 0.0), 'task_type': 'incident_resolution'}, now=0.0)
+
+    engine.notify_task_state_change({'id': 't1', 'task_status': 'approved'})
+    manager.record_approval_decision('a1', 'rejected')
+    manager.record_incident_resolution('i1')
+
+    assert len(scheduler) == 0
+
+
+def test_tasks_decided_elsewhere_are_not_escalated(monkeypatch, scheduler):
+    manager = _manager(monkeypatch, scheduler, pending_ids={'a2'})
+    executed = []
+    manager.execute_escalation = lambda task, rule: executed.append(task['id']) or f"evt-{task['id']}"
+
+    scheduler.schedule_task({**_task('a1', 0.0), 'task_type': 'approval_request'}, now=0.0)
+    scheduler.schedule_task({**_task('a2', 0.0), 'task_type': 'approval_request'}, now=0.0)
+
+    result = manager.process_due_escalations(now=1 * HOUR)
+
+    assert executed == ['a2']
+    assert result['processing_summary']['escalations_due'] == 1
+    # The decided approval is dropped rather than escalated again at the next level
+    assert ('approval_request', 'a1') not in scheduler
+    assert ('approval_request', 'a2') in scheduler
+
+
+def test_escalation_loop_uses_its_own_connection(monkeypatch, scheduler):
+    from src.algorithms.workflows import escalation_manager
+    manager = _manager(monkeypatch, scheduler, pending_ids=set())
+    request_connection = manager.db_connection
+    loop_connections = []
+    monkeypatch.setattr(escalation_manager.EscalationManager, 'connect_to_database',
+                        lambda self: setattr(self, 'db_connection', _FakeConnection(set())))
+    stop = threading.Event()
+
+    def process_due_escalations(self, now=None):
+        loop_connections.append(self.db_connection)
+        stop.set()
+    monkeypatch.setattr(escalation_manager.EscalationManager, 'process_due_escalations', process_due_escalations)
+
+    thread = threading.Thread(target=manager.run_escalation_scheduler, args=(stop,))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert len(loop_connections) == 1
+    assert loop_connections[0] is not request_connection
+    assert loop_connections[0].closed
+    assert manager.db_connection is request_connection and not request_connection.closed
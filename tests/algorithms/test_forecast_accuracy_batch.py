@@ -0,0 +1,101 @@
+"""
+Tests for the batch (series × time) forecast accuracy API
+
+Checks that ForecastAccuracyMetrics.calculate_batch_metrics and
+calculate_batch_by_time_period agree with the single-series metrics, honour
+masks, and score hundreds of series quickly.
+"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+from src.algorithms.ml.forecast_accuracy_metrics import ForecastAccuracyMetrics
+
+
+def _batch(series: int = 20, length: int = 96, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    actual = rng.uniform(50, 150, size=(series, length))
+    forecast = actual * rng.normal(1.0, 0.1, size=(series, length))
+    return actual, forecast
+
+
+def test_batch_matches_single_series_metrics():
+    metrics = ForecastAccuracyMetrics()
+    actual, forecast = _batch()
+    lower, upper = forecast * 0.9, forecast * 1.1
+
+    batch = metrics.calculate_batch_metrics(actual, forecast, lower_bound=lower, upper_bound=upper)
+
+    for i in range(actual.shape[0]):
+        assert batch['mape'][i] == pytest.approx(metrics.calculate_mape(actual[i], forecast[i]), abs=0.01)
+        assert batch['wape'][i] == pytest.approx(metrics.calculate_wape(actual[i], forecast[i]), abs=0.01)
+        assert batch['mase'][i] == pytest.approx(metrics.calculate_mase(actual[i], forecast[i]), abs=0.01)
+        assert batch['tracking_signal'][i] == pytest.approx(
+            metrics.calculate_tracking_signal(actual[i], forecast[i]), abs=0.01
+        )
+        bias = metrics.calculate_forecast_bias(actual[i], forecast[i])
+        assert batch['bias'][i] == pytest.approx(bias['mean_bias'], abs=0.01)
+        interval = metrics.calculate_interval_accuracy(actual[i], lower[i], upper[i])
+        assert batch['coverage_percentage'][i] == pytest.approx(interval['coverage_percentage'], abs=0.01)
+
+
+def test_mask_matches_metrics_on_kept_points():
+    metrics = ForecastAccuracyMetrics()
+    actual, forecast = _batch(series=3)
+    mask = np.ones_like(actual, dtype=bool)
+    mask[:, ::3] = False
+
+    batch = metrics.calculate_batch_metrics(actual, forecast, mask=mask)
+
+    for i in range(3):
+        kept = mask[i]
+        assert batch['count'][i] == kept.sum()
+        assert batch['mape'][i] == pytest.approx(metrics.calculate_mape(actual[i][kept], forecast[i][kept]), abs=0.01)
+        assert batch['wape'][i] == pytest.approx(metrics.calculate_wape(actual[i][kept], forecast[i][kept]), abs=0.01)
+
+
+def test_all_zero_actuals_give_infinite_mape():
+    metrics = ForecastAccuracyMetrics()
+    actual = np.zeros((1, 10))
+    forecast = np.ones((1, 10))
+
+    batch = metrics.calculate_batch_metrics(actual, forecast)
+
+    assert np.isinf(batch['mape'][0])
+    assert np.isinf(batch['wape'][0])
+
+
+def test_batch_by_time_period_matches_single_series():
+    metrics = ForecastAccuracyMetrics()
+    actual, forecast = _batch(series=4, length=24 * 14)
+    timestamps = pd.date_range('2025-03-03', periods=actual.shape[1], freq='h')
+
+    batch = metrics.calculate_batch_by_time_period(actual, forecast, timestamps)
+
+    single = metrics.calculate_by_time_period(
+        pd.Series(actual[2], index=timestamps), pd.Series(forecast[2], index=timestamps)
+    )
+    for period_name, groups in single.items():
+        keys = batch[period_name]['periods']
+        for key, expected in groups.items():
+            column = keys.index(key)
+            assert batch[period_name]['mape'][2, column] == pytest.approx(expected['mape'], abs=0.01)
+            assert batch[period_name]['count'][2, column] == expected['count']
+
+
+def test_hundreds_of_series_score_interactively():
+    metrics = ForecastAccuracyMetrics()
+    actual, forecast = _batch(series=500, length=24 * 28)
+    timestamps = pd.date_range('2025-03-03', periods=actual.shape[1], freq='h')
+
+    start = time.perf_counter()
+    metrics.calculate_batch_metrics(actual, forecast, lower_bound=forecast * 0.9, upper_bound=forecast * 1.1)
+    metrics.calculate_batch_by_time_period(actual, forecast, timestamps)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
@@ -0,0 +1,233 @@
+"""
+Tests for the dense-array multi-skill optimizer strategies
+
+Verifies that the priority-based, load-balanced and cost-based strategies of
+MultiSkillOptimizer respect operator availability and skill demand, follow the
+BDD assignment tiers, use the previous interval's allocation as a warm-start
+hint without changing the optimum, and finish an intraday re-optimization for
+thousands of operators well inside the interval.
+"""
+
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add intraday algorithms to path (same layout as src/tests/algorithms)
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / 'src' / 'algorithms' / 'intraday'))
+
+from multi_skill_optimizer import (
+    AssignmentStrategy, MultiSkillOptimizer, OperatorSkillProfile, SkillAssignment, SkillDemand, SkillPriority
+)
+
+LP_STRATEGIES = [
+    AssignmentStrategy.PRIORITY_BASED,
+    AssignmentStrategy.LOAD_BALANCED,
+    AssignmentStrategy.COST_OPTIMIZED,
+]
+
+
+def _optimizer() -> MultiSkillOptimizer:
+    with patch('multi_skill_optimizer.MobileWorkforceScheduler'):
+        return MultiSkillOptimizer()
+
+
+def _operator(op_id: str, skills: dict, cost: float = 1000.0, hours: float = 8.0) -> OperatorSkillProfile:
+    names = list(skills)
+    return OperatorSkillProfile(
+        operator_id=op_id,
+        operator_name=op_id,
+        primary_skill=names[0],
+        secondary_skills=names[1:],
+        skill_proficiencies=skills,
+        skill_certifications={name: True for name in names},
+        availability_hours=hours,
+        cost_per_hour=cost,
+        is_multi_skill=len(names) > 1
+    )
+
+
+def _demand(skill: str, hours: float, minimum_proficiency: float = 0.7) -> SkillDemand:
+    return SkillDemand(skill, hours, SkillPriority.HIGH, 80.0, minimum_proficiency)
+
+
+def _random_pool(optimizer: MultiSkillOptimizer, operators: int, skills: int, seed: int):
+    rng = random.Random(seed)
+    names = [f"Skill {i}" for i in range(skills)]
+    for i in range(operators):
+        owned = rng.sample(names, rng.randint(1, 4))
+        optimizer.add_operator(_operator(
+            f"op{i}", {name: rng.uniform(0.5, 1.0) for name in owned}, cost=rng.uniform(500, 1500)
+        ))
+    optimizer.set_skill_demands([_demand(name, rng.uniform(0.5, 2.0) * operators * 8 / skills * 0.6)
+                                 for name in names])
+
+
+def _totals(assignments):
+    by_operator, by_skill = defaultdict(float), defaultdict(float)
+    for a in assignments:
+        by_operator[a.operator_id] += a.assigned_hours
+        by_skill[a.skill_name] += a.assigned_hours
+    return by_operator, by_skill
+
+
+@pytest.mark.parametrize('strategy', LP_STRATEGIES)
+def test_assignments_respect_availability_and_demand(strategy):
+    optimizer = _optimizer()
+    _random_pool(optimizer, operators=200, skills=8, seed=5)
+
+    result = optimizer.optimize_assignments(strategy)
+
+    by_operator, by_skill = _totals(result.assignments)
+    for op_id, operator in optimizer.operators.items():
+        assert by_operator[op_id] <= operator.availability_hours + 1e-6
+    for skill, demand in optimizer.skill_demands.items():
+        assert by_skill[skill] <= demand.required_hours + 1e-6
+        assert by_skill[skill] + result.unmet_demand[skill] == pytest.approx(demand.required_hours, abs=1e-6)
+    for a in result.assignments:
+        operator = optimizer.operators[a.operator_id]
+        assert a.skill_name == operator.primary_skill or a.skill_name in operator.secondary_skills
+
+
+def test_priority_based_follows_bdd_tiers():
+    optimizer = _optimizer()
+    optimizer.add_operator(_operator("Петров П.П.", {"Level 2": 0.95, "Level 1": 0.85}))
+    optimizer.add_operator(_operator("EMP003", {"Level 1": 1.0}))
+    optimizer.set_skill_demands([_demand("Level 1", 10.0), _demand("Level 2", 8.0)])
+
+    result = optimizer.optimize_assignments(AssignmentStrategy.PRIORITY_BASED)
+
+    hours = {(a.operator_id, a.skill_name, a.assignment_priority): a.assigned_hours for a in result.assignments}
+    assert hours[("EMP003", "Level 1", 1)] == pytest.approx(8.0)
+    # BDD primary share for Петров П.П. is 60%; the rest covers Level 1 demand
+    assert hours[("Петров П.П.", "Level 2", 2)] == pytest.approx(4.8)
+    assert hours[("Петров П.П.", "Level 1", 3)] == pytest.approx(2.0)
+    assert sum(hours.values()) == pytest.approx(14.8)
+    assert result.unmet_demand["Level 2"] == pytest.approx(3.2)
+
+
+def test_primary_share_caps_overflow_onto_primary_skill():
+    optimizer = _optimizer()
+    optimizer.add_operator(_operator("Петров П.П.", {"Level 2": 0.95, "Level 1": 0.85}))
+    optimizer.add_operator(_operator("mono", {"Level 2": 0.9}, hours=2.0))
+    optimizer.set_skill_demands([_demand("Level 2", 20.0), _demand("Level 1", 0.0)])
+
+    result = optimizer.optimize_assignments(AssignmentStrategy.PRIORITY_BASED)
+
+    by_pair = defaultdict(float)
+    for a in result.assignments:
+        by_pair[(a.operator_id, a.skill_name)] += a.assigned_hours
+    # Tier-4 overflow would otherwise fill the multi-skill operator's remaining 3.2 hours
+    assert by_pair[("Петров П.П.", "Level 2")] == pytest.approx(8.0 * 0.6)
+    assert not any(a.is_overflow for a in result.assignments if a.operator_id == "Петров П.П.")
+    assert by_pair[("mono", "Level 2")] == pytest.approx(2.0)
+    assert result.unmet_demand["Level 2"] == pytest.approx(20.0 - 4.8 - 2.0)
+
+
+def test_load_balanced_spreads_utilization():
+    optimizer = _optimizer()
+    for i in range(5):
+        optimizer.add_operator(_operator(f"op{i}", {"Email": 0.9}))
+    optimizer.set_skill_demands([_demand("Email", 10.0)])
+
+    result = optimizer.optimize_assignments(AssignmentStrategy.LOAD_BALANCED)
+
+    assert list(result.operator_utilization.values()) == pytest.approx([25.0] * 5)
+    assert result.unmet_demand["Email"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_load_balanced_skips_operators_below_minimum_proficiency():
+    optimizer = _optimizer()
+    optimizer.add_operator(_operator("novice", {"Email": 0.5}))
+    optimizer.add_operator(_operator("expert", {"Email": 0.9}))
+    optimizer.set_skill_demands([_demand("Email", 6.0)])
+
+    result = optimizer.optimize_assignments(AssignmentStrategy.LOAD_BALANCED)
+
+    assert {a.operator_id for a in result.assignments} == {"expert"}
+
+
+def test_cost_based_prefers_cheaper_effective_cost_and_reports_unmet_demand():
+    optimizer = _optimizer()
+    optimizer.add_operator(_operator("cheap", {"Sales": 1.0}, cost=500.0))
+    optimizer.add_operator(_operator("expensive", {"Sales": 1.0}, cost=1500.0))
+    optimizer.set_skill_demands([_demand("Sales", 20.0)])
+
+    result = optimizer.optimize_assignments(AssignmentStrategy.COST_OPTIMIZED)
+
+    by_operator, _ = _totals(result.assignments)
+    assert by_operator["cheap"] == pytest.approx(8.0)
+    assert by_operator["expensive"] == pytest.approx(8.0)
+    assert result.unmet_demand["Sales"] == pytest.approx(4.0)
+
+    optimizer.set_skill_demands([_demand("Sales", 5.0)])
+    result = optimizer.optimize_assignments(AssignmentStrategy.COST_OPTIMIZED)
+    assert [(a.operator_id, a.assigned_hours) for a in result.assignments] == [("cheap", pytest.approx(5.0))]
+
+
+def _objective(strategy, optimizer, result):
+    """The quantities each strategy's LP optimizes, recomputed from its assignments"""
+    covered = sum(a.assigned_hours for a in result.assignments)
+    if strategy == AssignmentStrategy.PRIORITY_BASED:
+        return covered, sum(a.assigned_hours * (0.1 * (4 - a.assignment_priority) + 0.01 * a.proficiency_level)
+                            for a in result.assignments)
+    if strategy == AssignmentStrategy.LOAD_BALANCED:
+        return covered, max(result.operator_utilization.values())
+    return covered, sum(a.assigned_hours * optimizer.operators[a.operator_id].cost_per_hour / a.proficiency_level
+                        for a in result.assignments)
+
+
+@pytest.mark.parametrize('strategy', LP_STRATEGIES)
+def test_warm_and_cold_solves_reach_the_same_optimum(strategy):
+    optimizer = _optimizer()
+    _random_pool(optimizer, operators=100, skills=6, seed=9)
+    first = optimizer.optimize_assignments(strategy)
+
+    # Next interval: demand shifts from one skill to another
+    shrinking, growing = list(optimizer.skill_demands)[:2]
+    optimizer.skill_demands[shrinking].required_hours /= 2
+    optimizer.skill_demands[growing].required_hours *= 2
+    cold = optimizer.optimize_assignments(strategy)
+    optimizer.assignments = first.assignments
+    warm = optimizer.optimize_assignments(strategy, {'warm_start': True})
+
+    assert _objective(strategy, optimizer, warm) == pytest.approx(_objective(strategy, optimizer, cold), rel=1e-4)
+    assert sum(warm.unmet_demand.values()) == pytest.approx(sum(cold.unmet_demand.values()), abs=1e-3)
+
+
+@pytest.mark.parametrize('strategy', LP_STRATEGIES)
+def test_warm_start_prefers_previous_allocation_among_equal_optima(strategy):
+    optimizer = _optimizer()
+    for op_id in ("a", "b", "c"):
+        optimizer.add_operator(_operator(op_id, {"Email": 0.9}))
+    optimizer.set_skill_demands([_demand("Email", 8.0)])
+    optimizer.assignments = [SkillAssignment("c", "Email", 8.0, 0.9, 1, False, 100.0)]
+
+    result = optimizer.optimize_assignments(strategy, {'warm_start': True, 'max_utilization': 1.0})
+
+    by_operator, _ = _totals(result.assignments)
+    if strategy == AssignmentStrategy.LOAD_BALANCED:
+        # Spreading load is part of the objective, so the hint cannot override it
+        assert list(by_operator.values()) == pytest.approx([8.0 / 3] * 3)
+    else:
+        assert dict(by_operator) == {"c": pytest.approx(8.0)}
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('strategy', LP_STRATEGIES)
+def test_intraday_reoptimization_latency(strategy):
+    optimizer = _optimizer()
+    _random_pool(optimizer, operators=3000, skills=20, seed=3000)
+
+    start = time.perf_counter()
+    result = optimizer.optimize_assignments(strategy)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{strategy.value}: 3000 operators x 20 skills -> "
+          f"{len(result.assignments)} assignments in {elapsed * 1000:.1f}ms")
+    assert result.assignments
+    assert elapsed < 5.0
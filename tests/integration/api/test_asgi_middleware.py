@@ -0,0 +1,94 @@
+"""
+Integration tests for the raw ASGI middleware stack
+
+Runs the request ID, monitoring and error handling middlewares around a small
+FastAPI app and checks headers, request state, error mapping, metrics and that
+streamed responses pass through chunk by chunk.
+"""
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("prometheus_client")
+httpx = pytest.importorskip("httpx")
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import OperationalError
+
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.api.middleware.monitoring import MonitoringMiddleware, request_count
+from src.api.middleware.request_id import RequestIDMiddleware
+
+
+def _app(chunks_seen=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/state")
+    async def state(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/value-error")
+    async def value_error():
+        raise ValueError("bad shift length")
+
+    @app.get("/db-error")
+    async def db_error():
+        raise OperationalError("SELECT 1", {}, Exception("down"))
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                chunks_seen.append(i)
+                yield f"{i};".encode()
+        return StreamingResponse(chunks())
+
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(MonitoringMiddleware)
+    app.add_middleware(ErrorHandlingMiddleware)
+    return app
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_request_id_is_propagated_to_state_and_response():
+    async with _client(_app()) as client:
+        given = await client.get("/state", headers={"X-Request-ID": "abc-123"})
+        generated = await client.get("/state")
+
+    assert given.json() == {"request_id": "abc-123"}
+    assert given.headers["X-Request-ID"] == "abc-123"
+    assert generated.headers["X-Request-ID"] == generated.json()["request_id"]
+    assert float(given.headers["X-Process-Time"]) >= 0
+
+
+async def test_errors_are_mapped_to_json_responses():
+    async with _client(_app()) as client:
+        value_error = await client.get("/value-error")
+        db_error = await client.get("/db-error")
+
+    assert value_error.status_code == 400
+    assert value_error.json() == {"detail": "bad shift length"}
+    assert db_error.status_code == 503
+
+
+async def test_streaming_response_passes_through():
+    chunks_seen = []
+    async with _client(_app(chunks_seen)) as client:
+        response = await client.get("/stream")
+
+    assert response.text == "0;1;2;"
+    assert chunks_seen == [0, 1, 2]
+    assert "X-Request-ID" in response.headers
+
+
+async def test_requests_are_counted_with_status():
+    before = request_count.labels(method="GET", endpoint="/state", status=200)._value.get()
+
+    async with _client(_app()) as client:
+        await client.get("/state")
+
+    after = request_count.labels(method="GET", endpoint="/state", status=200)._value.get()
+    assert after == before + 1
@@ -0,0 +1,160 @@
+"""
+Integration tests for the bulk schedule assignment endpoint
+
+Runs the endpoint against an in-memory stand-in for the database session and
+checks that an assignment costs the same number of statements for 5 or 2,000
+employees, that per-employee outcomes are reported in request order, and that
+background jobs report progress and their final result.
+"""
+import uuid
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("asyncpg")
+httpx = pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+
+from src.api.core.database import get_db
+from src.api.v1.endpoints import schedule_bulk_assign_REAL as bulk
+from src.api.v1.endpoints.schedule_bulk_assign_REAL import router
+
+
+class _Row:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class InMemorySession:
+    """Answers the endpoint's statements from known employees and conflict counts"""
+
+    def __init__(self, employees, conflicts=None):
+        self.employees = employees
+        self.conflicts = conflicts or {}
+        self.statements = []
+        self.inserted = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "FROM schedule_templates" in sql:
+            return _Result([_Row(id=params["template_id"], template_name="5/2", shift_structure=None, cost_per_hour=0)])
+        if "FROM unnest" in sql and sql.lstrip().startswith("SELECT"):
+            return _Result([
+                _Row(employee_id=employee_id, found=employee_id in self.employees,
+                     first_name="Иван", last_name=str(employee_id)[:4],
+                     conflicts=self.conflicts.get(employee_id, 0))
+                for employee_id in params["employee_ids"]
+            ])
+        if "INSERT INTO work_schedules_core" in sql:
+            self.inserted.extend(params["employee_ids"])
+        return _Result([])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def _client(session) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+
+    async def override_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_db
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+def _payload(employee_ids, **extra):
+    return {
+        "employee_ids": [str(employee_id) for employee_id in employee_ids],
+        "template_id": str(uuid.uuid4()),
+        "assignment_period_start": "2026-11-02",
+        "assignment_period_end": "2026-11-08",
+        **extra,
+    }
+
+
+@pytest.mark.parametrize("count", [5, 2000])
+async def test_statement_count_does_not_grow_with_employees(count):
+    employee_ids = [uuid.uuid4() for _ in range(count)]
+    session = InMemorySession(set(employee_ids))
+
+    async with _client(session) as client:
+        response = await client.post("/api/v1/schedules/assignments/bulk", json=_payload(employee_ids))
+
+    assert response.status_code == 200
+    # template, conflict check, insert, bulk_operations record
+    assert len(session.statements) == 4
+    assert session.inserted == employee_ids
+    assert len(response.json()["successful_assignments"]) == count
+
+
+async def test_per_employee_outcomes_in_request_order():
+    active, conflicted, missing, overridden = (uuid.uuid4() for _ in range(4))
+    session = InMemorySession({active, conflicted, overridden}, conflicts={conflicted: 2, overridden: 1})
+
+    async with _client(session) as client:
+        response = await client.post(
+            "/api/v1/schedules/assignments/bulk",
+            json=_payload([active, conflicted, missing]),
+        )
+        override = await client.post(
+            "/api/v1/schedules/assignments/bulk",
+            json=_payload([overridden], override_conflicts=True),
+        )
+
+    body = response.json()
+    assert [a["employee_id"] for a in body["successful_assignments"]] == [str(active)]
+    assert [f["employee_id"] for f in body["failed_assignments"]] == [str(conflicted), str(missing)]
+    assert "2" in body["failed_assignments"][0]["ошибка"]
+    assert body["successful_assignments"][0]["количество_смен"] == 5
+    assert override.json()["successful_assignments"][0]["конфликты_переопределены"] is True
+    assert session.inserted == [active, overridden]
+
+
+async def test_background_job_reports_progress_and_result(monkeypatch):
+    employee_ids = [uuid.uuid4() for _ in range(250)]
+    session = InMemorySession(set(employee_ids[:-10]))
+    monkeypatch.setattr(bulk, "BACKGROUND_CHUNK_SIZE", 100)
+    monkeypatch.setattr(bulk, "AsyncSessionLocal", lambda: session)
+
+    async with _client(session) as client:
+        started = await client.post(
+            "/api/v1/schedules/assignments/bulk",
+            json=_payload(employee_ids, run_in_background=True),
+        )
+        job_id = started.json()["bulk_operation_id"]
+        status = await client.get(f"/api/v1/schedules/assignments/bulk/jobs/{job_id}")
+
+    assert started.status_code == 202
+    job = status.json()
+    assert job["status"] == "completed"
+    assert (job["processed"], job["progress_percent"]) == (250, 100.0)
+    assert (job["successful_count"], job["failed_count"]) == (240, 10)
+    assert len(job["result"]["successful_assignments"]) == 240
+    # One commit per chunk of 100 plus the bulk_operations record
+    assert session.commits == 4
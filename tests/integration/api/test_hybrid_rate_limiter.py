@@ -0,0 +1,174 @@
+"""
+Integration tests for the leased (local fast path) rate limiter
+
+Runs several RateLimiter instances, standing in for workers, against one
+in-memory stand-in for the Redis commands they issue. Checks that most
+requests are decided without Redis, that the workers together never admit
+more than the limit within a window, that small limits stay exact and that
+the unspent part of an expired lease is given back.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("redis")
+pytest.importorskip("jwt")
+pytest.importorskip("passlib")
+pytest.importorskip("orjson")
+
+from src.api.middleware.rate_limiter import RateLimitConfig, RateLimiter, RateLimitStrategy
+
+
+class InMemoryRedis:
+    """The fixed window and token bucket subset of redis.asyncio.Redis"""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.round_trips = 0
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+    async def decrby(self, key, amount):
+        self.round_trips += 1
+        self.values[key] = int(self.values.get(key, 0)) - amount
+        return self.values[key]
+
+    async def hgetall(self, key):
+        self.round_trips += 1
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.round_trips += 1
+        self.hashes.setdefault(key, {}).update({name: str(value) for name, value in mapping.items()})
+
+    async def expire(self, key, seconds):
+        self.round_trips += 1
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def get(self, key):
+        self.commands.append(lambda: self.client.values.get(key))
+
+    def incr(self, key, amount=1):
+        def incr():
+            self.client.values[key] = int(self.client.values.get(key, 0)) + amount
+            return self.client.values[key]
+        self.commands.append(incr)
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: True)
+
+    async def execute(self):
+        self.client.round_trips += 1
+        return [command() for command in self.commands]
+
+
+FIXED = RateLimitConfig(max_requests=500, window_seconds=3600, strategy=RateLimitStrategy.FIXED_WINDOW)
+
+
+async def test_most_requests_are_decided_locally():
+    client = InMemoryRedis()
+    limiter = RateLimiter(client, lease_fraction=0.1, max_lease=50)
+
+    results = [await limiter.is_allowed("user:1:/api/v1/schedules", FIXED) for _ in range(100)]
+
+    assert all(allowed for allowed, _ in results)
+    # Two leases of 50 units
+    assert client.round_trips == 2
+    assert limiter.get_stats()["local"] == 98
+    assert results[-1][1]["remaining"] == FIXED.max_requests - 100
+
+
+async def test_workers_never_admit_more_than_the_limit():
+    client = InMemoryRedis()
+    workers = [RateLimiter(client, lease_fraction=0.1, max_lease=50) for _ in range(4)]
+
+    async def worker_requests(limiter):
+        admitted = 0
+        for _ in range(400):
+            allowed, _ = await limiter.is_allowed("user:1:/api/v1/schedules", FIXED)
+            admitted += allowed
+            await asyncio.sleep(0)
+        return admitted
+
+    admitted = sum(await asyncio.gather(*[worker_requests(limiter) for limiter in workers]))
+
+    assert admitted == FIXED.max_requests
+    assert client.round_trips < 1600 / 4
+
+
+async def test_concurrent_misses_share_one_lease():
+    client = InMemoryRedis()
+    limiter = RateLimiter(client, lease_fraction=0.1, max_lease=50)
+
+    results = await asyncio.gather(*[limiter.is_allowed("ip:1:/api/v1/shifts", FIXED) for _ in range(40)])
+
+    assert all(allowed for allowed, _ in results)
+    assert limiter.get_stats()["leases"] == 1
+
+
+async def test_small_limits_stay_exact():
+    client = InMemoryRedis()
+    limiter = RateLimiter(client)
+    login = limiter.endpoint_configs["/api/v1/auth/login"]
+
+    results = [(await limiter.is_allowed("ip:1:/api/v1/auth/login", login))[0] for _ in range(7)]
+
+    assert results == [True] * 5 + [False] * 2
+    assert limiter.get_stats()["exact"] == 7
+    assert client.round_trips == 7 + 2  # refused units are given back
+
+
+async def test_token_bucket_is_leased_in_chunks():
+    client = InMemoryRedis()
+    limiter = RateLimiter(client, lease_fraction=0.1, max_lease=50)
+    config = limiter.user_type_configs["service"]
+
+    for _ in range(200):
+        assert (await limiter.is_allowed("user:svc:/api/v1/forecasts", config))[0]
+
+    assert limiter.get_stats()["leases"] == 4
+    assert client.round_trips == 4 * 3
+
+
+async def test_unspent_lease_expires(monkeypatch):
+    client = InMemoryRedis()
+    limiter = RateLimiter(client, lease_fraction=0.1, max_lease=50, lease_ttl=1.0)
+    clock = [1000.0]
+    monkeypatch.setattr("src.api.middleware.rate_limiter.time.monotonic", lambda: clock[0])
+
+    await limiter.is_allowed("user:1:/api/v1/schedules", FIXED)
+    clock[0] += 2.0
+    await limiter.is_allowed("user:1:/api/v1/schedules", FIXED)
+
+    stats = limiter.get_stats()
+    assert stats["leases"] == 2
+    assert stats["expired_units"] == 49
+    assert stats["refunded_units"] == 49
+
+
+async def test_slow_client_is_charged_only_for_spent_units(monkeypatch):
+    client = InMemoryRedis()
+    limiter = RateLimiter(client, lease_fraction=0.1, max_lease=50, lease_ttl=1.0)
+    hourly = RateLimitConfig(max_requests=100, window_seconds=3600, strategy=RateLimitStrategy.FIXED_WINDOW)
+    clock = [3600.0 * 1000]
+    monkeypatch.setattr("src.api.middleware.rate_limiter.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("src.api.middleware.rate_limiter.time.time", lambda: clock[0])
+
+    admitted = 0
+    # One request every 2 s, so every lease expires after a single use
+    for _ in range(60):
+        admitted += (await limiter.is_allowed("user:1:/api/v1/schedules", hourly))[0]
+        clock[0] += 2.0
+
+    assert admitted == 60
+    # Only the lease still held by the worker is counted beyond the spent units
+    assert client.values[f"rate_limit:fixed:user:1:/api/v1/schedules:{3600 * 1000}"] == 60 + 9
+    assert limiter.get_stats()["refunded_units"] == 59 * 9
@@ -0,0 +1,144 @@
+"""
+Integration tests for lazy API router registration
+
+Builds a small FastAPI app from throwaway endpoint modules and checks that
+LazyRouterRegistry imports a module only on the first request under its
+prefix, keeps route table order, isolates broken modules and loads the rest
+on warm-up or when the OpenAPI schema is requested.
+"""
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+
+from src.api.core.lazy_routing import LazyRouterRegistry
+
+MODULES = {
+    "alpha": '''
+        from fastapi import APIRouter
+        router = APIRouter(prefix="/alpha")
+
+        @router.get("/items/{item_id}")
+        async def item(item_id: str):
+            return {"module": "alpha", "item": item_id}
+    ''',
+    "beta": '''
+        from fastapi import APIRouter
+        router = APIRouter()
+
+        @router.get("/alpha/items/special")
+        async def special():
+            return {"module": "beta"}
+
+        @router.get("/beta")
+        async def beta():
+            return {"module": "beta"}
+    ''',
+    "broken": '''
+        raise RuntimeError("cannot import")
+    ''',
+}
+
+
+@pytest.fixture
+def endpoints(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_endpoints"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for name, source in MODULES.items():
+        (package / f"{name}.py").write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_endpoints"
+    for name in [name for name in sys.modules if name.startswith("lazy_endpoints")]:
+        del sys.modules[name]
+
+
+def _registry() -> LazyRouterRegistry:
+    registry = LazyRouterRegistry(package="lazy_endpoints")
+    registry.add("alpha", tags=["alpha"], paths=["/alpha"])
+    registry.add("beta", tags=["beta"], paths=["/alpha", "/beta"])
+    registry.add("broken", prefix="/broken")
+    return registry
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_module_is_imported_on_first_matching_request(endpoints):
+    app = FastAPI()
+    registry = _registry()
+    registry.install(app, prefix="/api/v1")
+
+    assert "lazy_endpoints.alpha" not in sys.modules
+    async with _client(app) as client:
+        response = await client.get("/api/v1/alpha/items/7")
+
+    assert response.json() == {"module": "alpha", "item": "7"}
+    assert "lazy_endpoints.alpha" in sys.modules
+    assert "lazy_endpoints.broken" not in sys.modules
+    assert registry.get_stats()["loaded"] == 2
+
+
+async def test_route_table_order_is_kept(endpoints):
+    app = FastAPI()
+    registry = _registry()
+    registry.install(app, prefix="/api/v1")
+
+    async with _client(app) as client:
+        # beta is loaded first, but alpha's parameterised route comes first in the table
+        await client.get("/api/v1/beta")
+        response = await client.get("/api/v1/alpha/items/special")
+
+    assert response.json() == {"module": "alpha", "item": "special"}
+
+
+async def test_broken_module_does_not_affect_other_requests(endpoints):
+    app = FastAPI()
+    registry = _registry()
+    registry.install(app, prefix="/api/v1")
+
+    async with _client(app) as client:
+        missing = await client.get("/api/v1/broken/anything")
+        response = await client.get("/api/v1/beta")
+
+    assert missing.status_code == 404
+    assert response.status_code == 200
+    assert "lazy_endpoints.broken.router" in registry.get_stats()["errors"]
+
+
+async def test_openapi_request_loads_every_module(endpoints):
+    app = FastAPI()
+    registry = _registry()
+    registry.install(app, prefix="/api/v1")
+
+    async with _client(app) as client:
+        schema = (await client.get(app.openapi_url)).json()
+
+    assert "/api/v1/alpha/items/{item_id}" in schema["paths"]
+    assert "/api/v1/beta" in schema["paths"]
+    assert registry.get_stats()["loaded"] == 2
+
+
+async def test_lazy_routes_match_eager_router(endpoints):
+    lazy_app = FastAPI()
+    lazy_registry = _registry()
+    lazy_registry.install(lazy_app, prefix="/api/v1")
+    await lazy_registry.warm_up()
+
+    eager_registry = LazyRouterRegistry(package="lazy_endpoints")
+    eager_registry.add("alpha", tags=["alpha"], paths=["/alpha"])
+    eager_registry.add("beta", tags=["beta"], paths=["/alpha", "/beta"])
+    eager_app = FastAPI()
+    eager_app.include_router(eager_registry.build_router(), prefix="/api/v1")
+
+    def table(app):
+        return [(route.path, tuple(getattr(route, "tags", ()))) for route in app.routes
+                if route.path.startswith("/api/v1")]
+
+    assert table(lazy_app) == table(eager_app)
@@ -0,0 +1,141 @@
+"""
+Integration tests for paged 1C ZUP personnel sync
+
+Runs OneCService against a local stub of the 1C personnel endpoint and checks
+paging, streaming, content-hash change detection and that a malformed agent
+fails on its own instead of failing its page.
+"""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.api.services.onec_service import OneCService, _agent_content_hash
+
+
+def _stub_agents(count: int):
+    return [
+        {"id": f"onec-{i}", "tab_number": f"T{i:05d}", "first_name": "Ivan", "last_name": f"Petrov{i}"}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def onec_stub():
+    """Local 1C personnel endpoint serving offset/limit pages"""
+    agents = _stub_agents(1234)
+    requests = []
+
+    async def personnel_agents(request):
+        offset = int(request.query["offset"])
+        limit = int(request.query["limit"])
+        requests.append((offset, limit))
+        return web.json_response({
+            "agents": agents[offset:offset + limit],
+            "has_more": offset + limit < len(agents)
+        })
+
+    app = web.Application()
+    app.router.add_get("/api/personnel/agents", personnel_agents)
+    async with TestServer(app) as server:
+        yield SimpleNamespace(url=str(server.make_url("")).rstrip("/"), agents=agents, requests=requests)
+
+
+def _service(base_url: str, page_size: int = 500) -> OneCService:
+    connection = SimpleNamespace(
+        id="conn-1",
+        endpoint_url=base_url,
+        credentials={},
+        config={"personnel_page_size": page_size},
+        authentication_type="api_key",
+        mapping_rules={}
+    )
+    return OneCService(connection)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestOneCPersonnelPaging:
+    """Paged personnel fetch from 1C"""
+
+    async def test_pages_are_streamed_until_short_page(self, onec_stub):
+        service = _service(onec_stub.url)
+
+        page_sizes = [
+            len(page) async for page in service.iter_agent_pages(date(2024, 1, 1), date(2024, 1, 31))
+        ]
+
+        assert page_sizes == [500, 500, 234]
+        assert onec_stub.requests == [(0, 500), (500, 500), (1000, 500)]
+
+    async def test_get_agents_collects_all_pages(self, onec_stub):
+        agents = await _service(onec_stub.url, page_size=100).get_agents(date(2024, 1, 1), date(2024, 1, 31))
+
+        assert [agent.tab_number for agent in agents] == [a["tab_number"] for a in onec_stub.agents]
+
+    async def test_invalid_records_are_set_aside_not_failing_the_page(self, onec_stub):
+        onec_stub.agents[3]["first_name"] = None
+        invalid_records = []
+
+        pages = [
+            page async for page in _service(onec_stub.url).iter_agent_pages(
+                date(2024, 1, 1), date(2024, 1, 31), invalid_records=invalid_records
+            )
+        ]
+
+        assert [len(page) for page in pages] == [499, 500, 234]
+        assert [record["id"] for record in invalid_records] == ["onec-3"]
+
+
+@pytest.mark.integration
+class TestOneCPersonnelChangeDetection:
+    """Content-hash planning of personnel upserts"""
+
+    def test_unchanged_agents_are_skipped(self):
+        agents = [OneCService._parse_agent(a) for a in _stub_agents(4)]
+        hashes = {agent.agent_id: _agent_content_hash(agent) for agent in agents}
+        existing_ids = {"T00000": "wfm-0", "T00001": "wfm-1"}
+        previous_hashes = {"onec-0": hashes["onec-0"], "onec-1": "stale-hash"}
+
+        agent_rows, integration_rows, unchanged, failed = OneCService._plan_personnel_page(
+            agents, hashes, existing_ids, previous_hashes
+        )
+
+        assert (unchanged, failed) == (1, 0)
+        # Existing agents keep their WFM id; new agents take the 1C id
+        assert [row["id"] for row in agent_rows] == ["wfm-1", "onec-2", "onec-3"]
+        assert [row["mapped_data"]["content_hash"] for row in integration_rows] == [
+            hashes["onec-1"], hashes["onec-2"], hashes["onec-3"]
+        ]
+
+    def test_agent_missing_in_wfm_is_rewritten_despite_matching_hash(self):
+        agent = OneCService._parse_agent(_stub_agents(1)[0])
+        hashes = {agent.agent_id: _agent_content_hash(agent)}
+
+        agent_rows, _, unchanged, _ = OneCService._plan_personnel_page([agent], hashes, {}, dict(hashes))
+
+        assert unchanged == 0
+        assert agent_rows[0]["id"] == agent.agent_id
+
+    def test_content_hash_tracks_payload_changes(self):
+        raw = _stub_agents(1)[0]
+        original = OneCService._parse_agent(raw)
+        renamed = OneCService._parse_agent({**raw, "last_name": "Sidorov"})
+
+        assert _agent_content_hash(original) == _agent_content_hash(OneCService._parse_agent(dict(raw)))
+        assert _agent_content_hash(original) != _agent_content_hash(renamed)
+
+    def test_malformed_agent_fails_alone(self):
+        agents = [OneCService._parse_agent(a) for a in _stub_agents(3)]
+        hashes = {agent.agent_id: _agent_content_hash(agent) for agent in agents}
+        agents[1].first_name = None
+
+        agent_rows, integration_rows, unchanged, failed = OneCService._plan_personnel_page(
+            agents, hashes, {}, {}
+        )
+
+        assert (unchanged, failed) == (0, 1)
+        assert [row["id"] for row in agent_rows] == ["onec-0", "onec-2"]
+        assert [row["onec_id"] for row in integration_rows] == ["onec-0", "onec-2"]
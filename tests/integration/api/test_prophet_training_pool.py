@@ -0,0 +1,156 @@
+"""
+Integration tests for the Prophet training execution layer
+
+Runs ProphetTrainingPool with a thread executor and a stand-in job function
+and checks that concurrent requests are deduplicated, concurrency is bounded,
+persisted models are reused, only the newest models per service are kept and
+the model directory is private to the current user.
+"""
+import asyncio
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.api.services import forecast_training
+from src.api.services.forecast_training import ProphetTrainingPool
+
+
+def _history(days: int = 60, offset: float = 0.0) -> pd.DataFrame:
+    return pd.DataFrame({
+        "ds": pd.date_range("2025-01-01", periods=days, freq="D"),
+        "y": [100.0 + offset + i % 7 for i in range(days)]
+    })
+
+
+@pytest.fixture
+def fake_jobs(monkeypatch):
+    """Stand-in for _run_prophet_job that records calls and persists a marker file"""
+    calls = []
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def run_job(prophet_data, model_params, forecast_days, model_path):
+        with lock:
+            calls.append(model_path)
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        try:
+            loaded = forecast_training.os.path.exists(model_path)
+            if not loaded:
+                time.sleep(0.05)
+                with open(model_path, "w") as f:
+                    f.write("{}")
+            ds = pd.date_range(prophet_data["ds"].iloc[0], periods=len(prophet_data) + forecast_days, freq="D")
+            forecast = pd.DataFrame({"ds": ds, "yhat": 1.0, "yhat_lower": 0.5, "yhat_upper": 1.5})
+            return forecast, loaded
+        finally:
+            with lock:
+                running["now"] -= 1
+
+    monkeypatch.setattr(forecast_training, "_run_prophet_job", run_job)
+    return calls, running
+
+
+def _pool(tmp_path, max_jobs: int = 2) -> ProphetTrainingPool:
+    pool = ProphetTrainingPool({"model_dir": str(tmp_path), "max_concurrent_jobs": max_jobs})
+    pool._executor = ThreadPoolExecutor(max_workers=8)
+    return pool
+
+
+async def test_concurrent_requests_for_same_service_share_one_fit(tmp_path, fake_jobs):
+    calls, _ = fake_jobs
+    pool = _pool(tmp_path)
+    history = _history()
+
+    results = await asyncio.gather(*[pool.forecast("svc-1", history, {"weekly_seasonality": True}, 30)
+                                     for _ in range(5)])
+
+    assert len(calls) == 1
+    assert all(len(result) == len(history) + 30 for result in results)
+    assert pool.get_stats()["deduplicated"] == 4
+    assert pool.get_stats()["inflight"] == 0
+
+
+async def test_persisted_model_is_loaded_on_next_request(tmp_path, fake_jobs):
+    pool = _pool(tmp_path)
+    history = _history()
+
+    await pool.forecast("svc-1", history, {}, 7)
+    await pool.forecast("svc-1", history, {}, 7)
+    await pool.forecast("svc-1", _history(offset=5.0), {}, 7)
+
+    stats = pool.get_stats()
+    assert stats["fitted"] == 2
+    assert stats["loaded"] == 1
+
+
+async def test_concurrent_jobs_are_bounded(tmp_path, fake_jobs):
+    _, running = fake_jobs
+    pool = _pool(tmp_path, max_jobs=2)
+
+    await asyncio.gather(*[pool.forecast(f"svc-{i}", _history(), {}, 7) for i in range(6)])
+
+    assert running["peak"] <= 2
+    assert pool.get_stats()["fitted"] == 6
+
+
+async def test_event_loop_stays_responsive_during_fit(tmp_path, fake_jobs):
+    pool = _pool(tmp_path)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticking = asyncio.ensure_future(ticker())
+    await pool.forecast("svc-1", _history(), {}, 7)
+    ticking.cancel()
+
+    assert ticks > 3
+
+
+async def test_only_newest_models_per_service_are_kept(tmp_path, fake_jobs):
+    pool = _pool(tmp_path)
+    pool.settings["models_per_service"] = 3
+
+    for offset in range(5):
+        await pool.forecast("svc-1", _history(offset=float(offset)), {}, 7)
+    await pool.forecast("svc-2", _history(), {}, 7)
+
+    assert len(list(tmp_path.glob(f"{pool._service_prefix('svc-1')}_*.json"))) == 3
+    assert len(list(tmp_path.glob(f"{pool._service_prefix('svc-2')}_*.json"))) == 1
+
+    await pool.forecast("svc-1", _history(offset=4.0), {}, 7)
+    await pool.forecast("svc-1", _history(offset=0.0), {}, 7)
+    stats = pool.get_stats()
+    assert (stats["fitted"], stats["loaded"]) == (7, 1)
+
+
+def test_model_directory_is_private(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+
+    ProphetTrainingPool({"model_dir": str(shared)})
+
+    assert stat.S_IMODE(os.stat(shared).st_mode) == 0o700
+    assert not forecast_training.DEFAULT_TRAINING_SETTINGS["model_dir"].startswith(tempfile.gettempdir())
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="changing directory owner needs root")
+def test_pool_refuses_directory_owned_by_another_user(tmp_path):
+    foreign = tmp_path / "foreign"
+    foreign.mkdir()
+    os.chown(foreign, 12345, -1)
+
+    with pytest.raises(PermissionError):
+        ProphetTrainingPool({"model_dir": str(foreign)})
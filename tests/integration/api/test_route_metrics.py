@@ -0,0 +1,94 @@
+"""
+Integration tests for route-template request metrics
+
+Sends requests with random path parameters through MonitoringMiddleware and
+checks that series are labelled by route template, so their number stays
+constant however many distinct IDs are seen.
+"""
+import random
+import uuid
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("prometheus_client")
+httpx = pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from prometheus_client import CollectorRegistry
+
+from src.api.middleware.monitoring import (
+    UNMATCHED_ROUTE, MonitoringMiddleware, RouteLatencyHistogram, request_count, request_duration
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/employees/{employee_id}")
+    async def employee(employee_id: str):
+        return {"employee_id": employee_id}
+
+    @app.get("/schedules/{schedule_id}/shifts/{shift_id}")
+    async def shift(schedule_id: int, shift_id: str):
+        return {"schedule_id": schedule_id, "shift_id": shift_id}
+
+    app.add_middleware(MonitoringMiddleware)
+    return app
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def _endpoint_labels():
+    labels = set()
+    for metric in (request_count, request_duration):
+        for family in metric.collect():
+            labels.update(sample.labels["endpoint"] for sample in family.samples)
+    return labels
+
+
+def _series_count() -> int:
+    counters = {
+        tuple(sorted(sample.labels.items()))
+        for family in request_count.collect() for sample in family.samples
+    }
+    return len(counters) + request_duration.series_count()
+
+
+async def _random_requests(client, n):
+    for _ in range(n):
+        await client.get(f"/employees/{uuid.uuid4()}")
+        await client.get(f"/schedules/{random.randint(1, 10**9)}/shifts/{uuid.uuid4().hex}")
+        await client.get(f"/unknown/{uuid.uuid4()}")
+
+
+async def test_series_count_is_constant_under_random_path_parameters():
+    async with _client(_app()) as client:
+        await _random_requests(client, 1)
+        before = _series_count()
+        await _random_requests(client, 200)
+
+    assert _series_count() == before
+    labels = _endpoint_labels()
+    assert {"/employees/{employee_id}", "/schedules/{schedule_id}/shifts/{shift_id}", UNMATCHED_ROUTE} <= labels
+    assert not any(label.startswith(("/employees/", "/unknown/")) and "{" not in label for label in labels)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = RouteLatencyHistogram("test_latency_seconds", "test", buckets=(0.1, 1.0),
+                                      registry=CollectorRegistry())
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe("GET", "/employees/{employee_id}", value)
+
+    samples = {
+        (sample.name, sample.labels.get("le")): sample.value
+        for family in histogram.collect() for sample in family.samples
+    }
+    assert samples[("test_latency_seconds_bucket", "0.1")] == 2
+    assert samples[("test_latency_seconds_bucket", "1.0")] == 3
+    assert samples[("test_latency_seconds_bucket", "+Inf")] == 4
+    assert samples[("test_latency_seconds_count", None)] == 4
+    assert samples[("test_latency_seconds_sum", None)] == pytest.approx(2.65)
+    assert histogram.series_count() == 1
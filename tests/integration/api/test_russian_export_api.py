@@ -0,0 +1,85 @@
+"""
+Integration tests for the 1C ZUP export endpoint
+
+Checks that an Excel export is streamed as a chunked xlsx attachment with one
+row per vacation, that a failing export is reported as a 500 before anything
+is streamed, and that the JSON format still returns the records as sent.
+"""
+import io
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("openpyxl")
+httpx = pytest.importorskip("httpx")
+
+import openpyxl
+from fastapi import FastAPI
+
+from src.api.v1.endpoints import russian
+from src.api.v1.endpoints.russian import router
+
+VACATIONS = [
+    {"employee_id": f"emp-{i}", "personnel_number": f"T{i:03d}", "full_name": f"Сотрудник{i} А.Б.",
+     "department": "Колл-центр", "position": "Оператор", "start_date": "2026-07-06",
+     "end_date": "2026-07-19", "vacation_type": "отпуск"}
+    for i in range(300)
+]
+
+
+def _client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+def _payload(**extra):
+    return {"department_id": "dept-1", "period": "2026", "vacation_data": VACATIONS, **extra}
+
+
+async def test_excel_export_is_streamed_in_chunks(monkeypatch):
+    chunk_sizes = []
+    iter_spooled_workbook = russian.VacationScheduleExporter.iter_spooled_workbook
+
+    def recording_iter(spool, chunk_size=4096):
+        for chunk in iter_spooled_workbook(spool, chunk_size=4096):
+            chunk_sizes.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(russian.VacationScheduleExporter, "iter_spooled_workbook", staticmethod(recording_iter))
+
+    async with _client() as client:
+        response = await client.post("/api/v1/russian/1c-zup/export", json=_payload())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.openxmlformats")
+    assert "vacation_schedule_2026.xlsx" in response.headers["content-disposition"]
+    assert len(chunk_sizes) > 1 and sum(chunk_sizes) == len(response.content)
+
+    worksheet = openpyxl.load_workbook(io.BytesIO(response.content)).active
+    assert worksheet.title == "График отпусков 2026"
+    rows = list(worksheet.iter_rows(min_row=2, values_only=True))
+    assert len(rows) == len(VACATIONS)
+    assert rows[0][4:] == ("06.07.2026", "19.07.2026", 10, "Основной")
+
+
+async def test_failed_excel_export_returns_500(monkeypatch):
+    def failing_write(self, output, vacation_data=None, year=None):
+        output.write(b"PK partial workbook")
+        raise ValueError("bad vacation row")
+
+    monkeypatch.setattr(russian.VacationScheduleExporter, "write_vacation_schedule", failing_write)
+
+    async with _client() as client:
+        response = await client.post("/api/v1/russian/1c-zup/export", json=_payload())
+
+    assert response.status_code == 500
+    assert "bad vacation row" in response.json()["detail"]
+
+
+async def test_json_export_returns_records():
+    async with _client() as client:
+        response = await client.post("/api/v1/russian/1c-zup/export", json=_payload(format="json"))
+
+    assert response.status_code == 200
+    assert response.json()["records"] == VACATIONS
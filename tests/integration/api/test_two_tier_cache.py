@@ -0,0 +1,173 @@
+"""
+Integration tests for the two-tier response cache
+
+Uses CacheManager with a small in-memory stand-in for the Redis commands it
+issues and checks L1 hits, single-flight collapsing of concurrent misses, LRU
+bounds and tag invalidation without keyspace scans.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("pydantic_settings")
+
+from src.api.utils import cache
+from src.api.utils.cache import CacheManager, generate_cache_key, tag_key
+
+
+class InMemoryRedis:
+    """The subset of redis.asyncio.Redis used by CacheManager"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.values.get(key)
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            deleted += int(self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None)
+        return deleted
+
+    async def scan_iter(self, match=None):
+        raise AssertionError("tag invalidation must not scan the keyspace")
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, expire, value):
+        self.commands.append(lambda: self.client.values.__setitem__(key, value))
+
+    def sadd(self, key, member):
+        self.commands.append(lambda: self.client.sets.setdefault(key, set()).add(member))
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        for command in self.commands:
+            command()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = CacheManager(InMemoryRedis(), l1_max_entries=3, l1_ttl=30)
+    monkeypatch.setattr(cache, "cache_manager", manager)
+    return manager
+
+
+async def test_second_call_is_served_from_l1(manager):
+    calls = []
+
+    @cache.cache_decorator(expire=60)
+    async def get_schedule(employee_id: str):
+        calls.append(employee_id)
+        return {"employee_id": employee_id}
+
+    assert await get_schedule(employee_id="e1") == {"employee_id": "e1"}
+    assert await get_schedule(employee_id="e1") == {"employee_id": "e1"}
+
+    assert calls == ["e1"]
+    assert manager.stats["l1_hits"] == 1
+    assert manager.redis.gets == 1
+
+
+async def test_concurrent_misses_share_one_computation(manager):
+    calls = []
+
+    @cache.cache_decorator(expire=60)
+    async def slow_report(report_id: str):
+        calls.append(report_id)
+        await asyncio.sleep(0.05)
+        return {"report_id": report_id}
+
+    results = await asyncio.gather(*[slow_report(report_id="r1") for _ in range(10)])
+
+    assert calls == ["r1"]
+    assert all(result == {"report_id": "r1"} for result in results)
+    assert manager.stats["coalesced"] == 9
+
+
+async def test_l2_hit_after_local_tier_is_cleared(manager):
+    @cache.cache_decorator(expire=60)
+    async def get_forecast(service_id: int):
+        return {"service_id": service_id}
+
+    await get_forecast(service_id=1)
+    manager.clear_local()
+    await get_forecast(service_id=1)
+
+    assert manager.stats["l2_hits"] == 1
+
+
+async def test_l1_is_bounded(manager):
+    @cache.cache_decorator(expire=60)
+    async def get_item(item_id: int):
+        return item_id
+
+    for item_id in range(5):
+        await get_item(item_id=item_id)
+
+    assert manager.get_stats()["l1_size"] == 3
+    assert manager.stats["evictions"] == 2
+
+
+async def test_tag_invalidation_drops_only_tagged_keys(manager):
+    calls = []
+
+    @cache.cache_decorator(expire=60, tags=["employee:{employee_id}"])
+    async def get_availability(employee_id: str):
+        calls.append(employee_id)
+        return {"employee_id": employee_id}
+
+    await get_availability(employee_id="e1")
+    await get_availability(employee_id="e2")
+    assert manager.redis.sets[tag_key("employee:e1")] == {generate_cache_key("get_availability", employee_id="e1")}
+
+    deleted = await cache.invalidate_cache_tags("employee:e1")
+    await get_availability(employee_id="e1")
+    await get_availability(employee_id="e2")
+
+    assert deleted == 1
+    assert calls == ["e1", "e2", "e1"]
+
+
+async def test_function_name_is_a_tag(manager):
+    @cache.cache_decorator(expire=60)
+    async def list_groups(page: int):
+        return {"page": page}
+
+    await list_groups(page=1)
+    await list_groups(page=2)
+
+    assert await cache.invalidate_cache_tags("list_groups") == 2
+    assert manager.get_stats()["l1_size"] == 0
+
+
+def test_keys_ignore_sessions_and_follow_models():
+    class Session:
+        pass
+
+    class Body:
+        def __init__(self, value):
+            self.value = value
+
+        def model_dump(self, mode="python"):
+            return {"value": self.value}
+
+    assert generate_cache_key("f", db=Session()) == generate_cache_key("f", db=Session())
+    assert generate_cache_key("f", body=Body(1)) != generate_cache_key("f", body=Body(2))
@@ -0,0 +1,156 @@
+"""
+Performance Test Suite for Batch Dynamic Workflow Routing
+
+Verifies that DynamicWorkflowRouter batch mode:
+1. Scores task × capacity slots exactly like calculate_routing_score
+2. Never assigns more tasks to a resource than its remaining capacity
+3. Gives scarce capacity to higher priority tasks first
+4. Stays close to the joint optimum when a large batch is solved in chunks
+5. Reports routing latency at 50/500/5,000 pending tasks
+"""
+
+import copy
+import random
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.algorithms.workflows import dynamic_routing
+from src.algorithms.workflows.dynamic_routing import (
+    DynamicWorkflowRouter, ResourceInfo, ResourceStatus, RoutingStrategy, TaskPriority
+)
+
+SKILLS = ['general', 'approval', 'review', 'customer_service', 'technical_support',
+          'documentation', 'hr', 'planning', 'scheduling', 'escalation']
+LOCATIONS = ['headquarters', 'remote', 'branch_north', 'branch_south']
+
+
+def _make_resources(count: int, rng: random.Random, idle: bool = False):
+    statuses = [ResourceStatus.AVAILABLE, ResourceStatus.BUSY, ResourceStatus.UNAVAILABLE, ResourceStatus.OFFLINE]
+    return [
+        ResourceInfo(
+            id=i,
+            name=f"Agent {i}",
+            status=ResourceStatus.AVAILABLE if idle else rng.choice(statuses),
+            current_load=0 if idle else rng.randint(0, 9),
+            max_capacity=rng.choice([3, 5, 7, 8, 10]),
+            skills=rng.sample(SKILLS, rng.randint(1, 5)),
+            location=rng.choice(LOCATIONS),
+            last_updated=datetime.now()
+        )
+        for i in range(count)
+    ]
+
+
+def _make_tasks(count: int, rng: random.Random):
+    return [
+        {
+            'id': i,
+            'task_name': f"Task {i}",
+            'priority': rng.choice(list(TaskPriority)),
+            'required_skills': rng.sample(SKILLS, rng.randint(1, 3)),
+            'location': rng.choice(LOCATIONS),
+            'queue_type': rng.choice(['voice', 'chat', 'email', 'general']),
+            'hours_waiting': rng.random() * 48
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def router():
+    with patch.object(DynamicWorkflowRouter, 'connect_to_database'):
+        yield DynamicWorkflowRouter()
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('strategy', list(RoutingStrategy))
+def test_score_matrix_matches_scalar_scoring(router, strategy):
+    rng = random.Random(7)
+    resources = _make_resources(30, rng)
+    tasks = _make_tasks(40, rng)
+
+    slot_resource, slot_load = router.build_capacity_slots(resources, len(tasks))
+    scores = router.build_score_matrix(tasks, resources, slot_resource, slot_load, strategy)
+
+    for j, (resource_index, load) in enumerate(zip(slot_resource, slot_load)):
+        resource = copy.copy(resources[resource_index])
+        resource.current_load = int(load)
+        for i, task in enumerate(tasks):
+            assert scores[i, j] == pytest.approx(router.calculate_routing_score(resource, task, strategy))
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('strategy', list(RoutingStrategy))
+def test_batch_assignment_respects_capacity(router, strategy):
+    rng = random.Random(11)
+    resources = _make_resources(50, rng)
+    tasks = _make_tasks(400, rng)
+
+    assignments = router.plan_batch_routing(tasks, resources, strategy)
+
+    assert len({task['id'] for task, _, _ in assignments}) == len(assignments)
+    per_resource = Counter(resource.id for _, resource, _ in assignments)
+    for resource in resources:
+        assert per_resource[resource.id] <= max(resource.max_capacity - resource.current_load, 0)
+        if resource.status in (ResourceStatus.UNAVAILABLE, ResourceStatus.OFFLINE):
+            assert per_resource[resource.id] == 0
+
+
+@pytest.mark.performance
+def test_scarce_capacity_goes_to_higher_priority(router):
+    rng = random.Random(3)
+    resources = _make_resources(5, rng, idle=True)
+    tasks = _make_tasks(200, rng)
+
+    assignments = router.plan_batch_routing(tasks, resources, RoutingStrategy.PRIORITY_BASED)
+
+    order = [TaskPriority.LOW, TaskPriority.NORMAL, TaskPriority.HIGH, TaskPriority.CRITICAL, TaskPriority.EMERGENCY]
+    assigned_ids = {task['id'] for task, _, _ in assignments}
+    lowest_assigned = min(order.index(task['priority']) for task, _, _ in assignments)
+    highest_skipped = max(order.index(t['priority']) for t in tasks if t['id'] not in assigned_ids)
+    assert lowest_assigned >= highest_skipped
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('strategy', [RoutingStrategy.SKILL_MATCH, RoutingStrategy.PRIORITY_BASED])
+def test_chunked_solve_stays_close_to_joint(router, strategy, monkeypatch):
+    rng = random.Random(5)
+    resources = _make_resources(200, rng, idle=True)
+    tasks = _make_tasks(1200, rng)
+
+    monkeypatch.setattr(dynamic_routing, 'DENSE_BATCH_LIMIT', len(tasks))
+    joint = router.plan_batch_routing(tasks, resources, strategy)
+    monkeypatch.setattr(dynamic_routing, 'DENSE_BATCH_LIMIT', 0)
+    chunked = router.plan_batch_routing(tasks, resources, strategy)
+
+    assert len(chunked) == len(joint)
+    assert Counter(task['priority'] for task, _, _ in chunked) == Counter(task['priority'] for task, _, _ in joint)
+    per_resource = Counter(resource.id for _, resource, _ in chunked)
+    assert all(per_resource[r.id] <= r.max_capacity - r.current_load for r in resources)
+    assert sum(score for _, _, score in chunked) >= 0.95 * sum(score for _, _, score in joint)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('task_count', [50, 500, pytest.param(5000, marks=pytest.mark.slow)])
+def test_batch_routing_latency(router, task_count):
+    rng = random.Random(task_count)
+    resources = _make_resources(max(task_count // 6, 10), rng, idle=True)
+    tasks = _make_tasks(task_count, rng)
+
+    start = time.perf_counter()
+    assignments = router.plan_batch_routing(tasks, resources, RoutingStrategy.SKILL_MATCH)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nBatch routing: {task_count} tasks x {len(resources)} resources -> "
+          f"{len(assignments)} routed in {elapsed * 1000:.1f}ms")
+    assert len(assignments) == task_count
+    assert elapsed < (1.0 if task_count <= 500 else 2.0)
@@ -0,0 +1,201 @@
+"""
+Performance Test Suite for 1C ZUP Uploads
+
+Runs OneCService against a local fake 1C server and verifies that:
+1. All calls reuse one shared keep-alive session
+2. Work time batches are sent in size-bounded chunks, faster than serial
+   sends, and each chunk's response is mapped back to its entries
+3. Large schedules are split into size-bounded chunks
+4. Transient 503 responses are retried with backoff, but POSTs are not
+   resent after an ambiguous gateway error
+5. Connector settings are not shared across differently configured services
+"""
+
+import asyncio
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.api.services.onec_service import OneCService
+
+FAKE_LATENCY_SECONDS = 0.01
+
+
+@pytest.fixture
+async def fake_onec():
+    """Local 1C server with fixed latency and a flaky norm-hours endpoint"""
+    state = SimpleNamespace(
+        requests=0, flaky_calls=0, schedule_chunks=[], timesheet_chunks=[], peers=set(), post_calls={}
+    )
+
+    async def timesheet_import(request):
+        state.requests += 1
+        state.peers.add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        await asyncio.sleep(FAKE_LATENCY_SECONDS)
+        if "entries" not in body:
+            return web.json_response({"imported": 1})
+        entries = body["entries"]
+        state.timesheet_chunks.append((body["chunk_index"], len(entries)))
+        if any(entry["employee_id"] == "emp-reject-chunk" for entry in entries):
+            return web.Response(status=422, text="chunk rejected")
+        return web.json_response({"results": [
+            {"error": "unknown employee"} if entry["employee_id"] == "emp-unknown" else {"imported": 1}
+            for entry in entries
+        ]})
+
+    async def schedule_import(request):
+        body = await request.json()
+        state.schedule_chunks.append((body.get("chunk_index"), len(body["employees"])))
+        return web.json_response({"imported": len(body["employees"])})
+
+    async def norm_hours(request):
+        state.flaky_calls += 1
+        if state.flaky_calls <= 2:
+            return web.Response(status=503)
+        return web.json_response({"norm_hours": 168})
+
+    async def flaky_post(request):
+        status = int(request.match_info["status"])
+        state.post_calls[status] = state.post_calls.get(status, 0) + 1
+        if state.post_calls[status] == 1:
+            return web.Response(status=status)
+        return web.json_response({"imported": 1})
+
+    app = web.Application()
+    app.router.add_post("/api/timesheet/import", timesheet_import)
+    app.router.add_post("/api/schedule/import", schedule_import)
+    app.router.add_get("/api/norm-hours", norm_hours)
+    app.router.add_post("/api/flaky/{status}", flaky_post)
+    async with TestServer(app) as server:
+        state.url = str(server.make_url("")).rstrip("/")
+        yield state
+    await OneCService.close_sessions()
+
+
+def _service(base_url: str, **config) -> OneCService:
+    connection = SimpleNamespace(
+        id="conn-1",
+        endpoint_url=base_url,
+        credentials={},
+        config={"retry_backoff_seconds": 0.01, **config},
+        authentication_type="api_key",
+        mapping_rules={}
+    )
+    return OneCService(connection)
+
+
+def _time_entries(count: int):
+    return [{"employee_id": f"emp-{i}", "date": "2024-01-15", "hours_worked": 8} for i in range(count)]
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_services_share_one_session(fake_onec):
+    async with _service(fake_onec.url) as first, _service(fake_onec.url) as second:
+        assert first.session is second.session
+        await first.send_work_time_batch(_time_entries(20))
+
+    # 20 records fit in one chunk, sent over the shared keep-alive session
+    assert fake_onec.requests == 1
+    assert len(fake_onec.peers) <= 8
+    assert not (await _service(fake_onec.url)._get_session()).closed
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_concurrent_work_time_batch_throughput(fake_onec):
+    service = _service(fake_onec.url, upload_concurrency=8)
+    entries = _time_entries(200)
+
+    start = time.perf_counter()
+    for entry in entries[:50]:
+        await service.send_work_time(entry)
+    serial_rate = 50 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    results = await service.send_work_time_batch(entries)
+    batch_rate = len(entries) / (time.perf_counter() - start)
+
+    print(f"\n1C work time upload: serial {serial_rate:.0f} rec/s, "
+          f"chunked batch {batch_rate:.0f} rec/s")
+    assert all(result.success for result in results)
+    assert sorted(fake_onec.timesheet_chunks) == [(0, 200)]
+    assert batch_rate > serial_rate * 3
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_work_time_chunk_responses_map_back_to_entries(fake_onec):
+    service = _service(fake_onec.url, upload_chunk_records=4)
+    entries = _time_entries(10)
+    entries[1]["employee_id"] = "emp-unknown"
+    entries[9]["employee_id"] = "emp-reject-chunk"
+
+    results = await service.send_work_time_batch(entries)
+
+    assert sorted(fake_onec.timesheet_chunks) == [(0, 4), (1, 4), (2, 2)]
+    assert [result.success for result in results] == [
+        True, False, True, True, True, True, True, True, False, False
+    ]
+    assert "unknown employee" in results[1].message
+    assert results[8].data == {"status_code": 422}
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_large_schedule_is_sent_in_bounded_chunks(fake_onec):
+    service = _service(fake_onec.url, upload_chunk_records=250)
+    schedule = {
+        "schedule_id": "schedule-1",
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-31",
+        "employees": [
+            {"employee_id": f"emp-{i}", "tab_number": f"T{i}", "shifts": [{"date": "2024-01-01"}] * 20}
+            for i in range(1000)
+        ]
+    }
+
+    result = await service.send_schedule(schedule)
+
+    assert result.success
+    assert result.data["chunks"] == 4
+    assert sorted(fake_onec.schedule_chunks) == [(0, 250), (1, 250), (2, 250), (3, 250)]
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(fake_onec):
+    norm_hours = await _service(fake_onec.url).get_norm_hours("emp-1", date(2024, 1, 1), date(2024, 1, 31))
+
+    assert norm_hours == {"norm_hours": 168}
+    assert fake_onec.flaky_calls == 3
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_posts_are_only_retried_when_not_processed(fake_onec):
+    service = _service(fake_onec.url)
+
+    gateway_status, _ = await service._request_with_retry("POST", f"{fake_onec.url}/api/flaky/502", json={})
+    throttled_status, _ = await service._request_with_retry("POST", f"{fake_onec.url}/api/flaky/503", json={})
+
+    # 502 may come back after 1C applied the upload, so it is not resent
+    assert (gateway_status, fake_onec.post_calls[502]) == (502, 1)
+    assert (throttled_status, fake_onec.post_calls[503]) == (200, 2)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_sessions_are_shared_per_connector_settings(fake_onec):
+    default = await _service(fake_onec.url)._get_session()
+    same = await _service(fake_onec.url, upload_concurrency=2)._get_session()
+    tuned = await _service(fake_onec.url, connection_limit_per_host=2)._get_session()
+
+    assert same is default
+    assert tuned is not default
+    assert tuned.connector.limit_per_host == 2
@@ -0,0 +1,116 @@
+"""
+Sharded ConnectionPool registry tests
+
+Checks that connections spread over shards, that the connection limit holds
+under a concurrent connect storm, and that room, subscription and user
+indexes stay consistent through join/leave/disconnect churn and when a
+connection ID is reused.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.websocket.core.connection import WebSocketConnection
+from src.websocket.core.exceptions import ConnectionLimitException
+from src.websocket.core.server import ConnectionPool
+
+
+class FakeWebSocket:
+    """Just enough of starlette's WebSocket for the registry"""
+
+    def __init__(self):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+
+    async def close(self, code=1000, reason=""):
+        self.client_state.name = "DISCONNECTED"
+
+
+def _connection(i: int, user_id: str = None) -> WebSocketConnection:
+    return WebSocketConnection(websocket=FakeWebSocket(), connection_id=f"conn-{i}", user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_spread_over_shards():
+    pool = ConnectionPool(max_connections=1000, num_shards=16)
+
+    await asyncio.gather(*[pool.add_connection(_connection(i)) for i in range(1000)])
+
+    sizes = [len(shard.connections) for shard in pool._shards]
+    assert sum(sizes) == 1000 == pool.active_connections == len(pool.connections)
+    assert min(sizes) > 0
+    assert "conn-7" in pool.connections
+    assert pool.connections["conn-7"].connection_id == "conn-7"
+
+
+@pytest.mark.asyncio
+async def test_limit_holds_under_concurrent_connects():
+    pool = ConnectionPool(max_connections=100, num_shards=8)
+
+    results = await asyncio.gather(
+        *[pool.add_connection(_connection(i)) for i in range(150)], return_exceptions=True
+    )
+
+    assert sum(result is True for result in results) == 100
+    assert sum(isinstance(result, ConnectionLimitException) for result in results) == 50
+    assert pool.active_connections == 100
+
+
+@pytest.mark.asyncio
+async def test_indexes_stay_consistent_through_churn():
+    pool = ConnectionPool(max_connections=2000, num_shards=16)
+    connections = [_connection(i, user_id=f"user-{i % 50}") for i in range(500)]
+    await asyncio.gather(*[pool.add_connection(connection) for connection in connections])
+
+    rng = random.Random(7)
+
+    async def churn(connection):
+        for _ in range(5):
+            room = f"room-{rng.randrange(10)}"
+            event_type = f"event-{rng.randrange(5)}"
+            await pool.add_to_room(connection.connection_id, room)
+            await pool.add_subscription(connection.connection_id, event_type)
+            if rng.random() < 0.5:
+                await pool.remove_from_room(connection.connection_id, room)
+
+    await asyncio.gather(*[churn(connection) for connection in connections])
+    removed = connections[::3]
+    await asyncio.gather(*[pool.remove_connection(connection.connection_id) for connection in removed])
+
+    remaining = {connection.connection_id for connection in connections} - {c.connection_id for c in removed}
+    for room, members in pool.room_connections.items():
+        assert members
+        assert set(members) <= remaining
+        assert all(room in member.rooms for member in members.values())
+    for event_type in {f"event-{i}" for i in range(5)}:
+        subscribers = await pool.get_subscription_connections(event_type)
+        expected = {c.connection_id for c in connections
+                    if c.connection_id in remaining and event_type in c.subscriptions}
+        assert {c.connection_id for c in subscribers} == expected
+    user_total = 0
+    for user in range(50):
+        user_total += len(await pool.get_user_connections(f"user-{user}"))
+    assert user_total == len(remaining)
+    assert pool.get_stats()["total_closed"] == len(removed)
+
+
+@pytest.mark.asyncio
+async def test_replaced_connection_leaves_indexes():
+    pool = ConnectionPool(max_connections=10, num_shards=4)
+    old = _connection(1, user_id="user-1")
+    await pool.add_connection(old)
+    await pool.add_to_room("conn-1", "room-1")
+    await pool.add_subscription("conn-1", "event-1")
+
+    new = _connection(1, user_id="user-2")
+    await pool.add_connection(new)
+
+    assert pool.active_connections == 1
+    assert pool.connections["conn-1"] is new
+    assert await pool.get_room_connections("room-1") == []
+    assert await pool.get_subscription_connections("event-1") == []
+    assert await pool.get_user_connections("user-1") == []
+    assert await pool.get_user_connections("user-2") == [new]
+    assert pool.get_stats()["active_rooms"] == 0
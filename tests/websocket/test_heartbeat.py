@@ -0,0 +1,108 @@
+"""
+Heartbeat wheel and idle bucket tests
+
+Checks that the timer wheel fires every connection once per interval, that
+activity buckets report only idle keys, and that a ping batch neither waits on
+a slow client nor keeps connections whose ping failed or timed out.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.websocket.core.connection import WebSocketConnection
+from src.websocket.core.heartbeat import ActivityBuckets, HeartbeatWheel
+from src.websocket.core.server import WebSocketServer
+
+
+class FakeWebSocket:
+    """Records sends; a delay or error simulates a slow or broken client"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+        self.delay = delay
+        self.error = error
+        self.sent = 0
+
+    async def send_bytes(self, data):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.sent += 1
+
+    async def close(self, code=1000, reason=""):
+        self.client_state.name = "DISCONNECTED"
+
+
+def test_wheel_fires_each_key_once_per_interval():
+    wheel = HeartbeatWheel(interval=30.0, tick=1.0)
+    keys = [f"conn-{i}" for i in range(3000)]
+    for key in keys:
+        wheel.add(key)
+    wheel.discard("conn-0")
+
+    fired = [wheel.advance() for _ in range(wheel.slots)]
+
+    assert wheel.slots == 30
+    assert sorted(key for slot in fired for key in slot) == sorted(keys[1:])
+    # Spread by hash, no slot carries much more than its share
+    assert max(len(slot) for slot in fired) < 2 * len(keys) / wheel.slots
+    assert sorted(wheel.advance()) == sorted(fired[0])
+
+
+def test_buckets_pop_only_idle_keys():
+    buckets = ActivityBuckets(width=1.0)
+    for i in range(100):
+        buckets.touch(f"conn-{i}", now=100.0)
+    for i in range(50):
+        buckets.touch(f"conn-{i}", now=130.5)
+    buckets.discard("conn-99")
+
+    idle = buckets.pop_older_than(120.0)
+
+    assert sorted(idle) == sorted(f"conn-{i}" for i in range(50, 99))
+    assert len(buckets) == 50
+    assert buckets.pop_older_than(120.0) == []
+
+
+async def _server_with(*websockets, **options) -> WebSocketServer:
+    server = WebSocketServer(max_connections=100, heartbeat_interval=2.0, **options)
+    for i, websocket in enumerate(websockets):
+        connection = WebSocketConnection(websocket=websocket, connection_id=f"conn-{i}")
+        await server.connection_pool.add_connection(connection)
+        server._track_connection(connection)
+    return server
+
+
+async def test_slow_client_does_not_delay_other_pings():
+    slow = FakeWebSocket(delay=10.0)
+    fast = [FakeWebSocket() for _ in range(20)]
+    server = await _server_with(slow, *fast, heartbeat_concurrency=4, ping_timeout=0.2)
+
+    start = time.perf_counter()
+    await asyncio.wait_for(server._ping_batch([f"conn-{i}" for i in range(21)]), timeout=2.0)
+
+    assert time.perf_counter() - start < 1.0
+    assert all(websocket.sent == 1 for websocket in fast)
+    assert server.heartbeat_stats["ping_timeouts"] == 1
+    assert "conn-0" not in server.connection_pool.connections
+    assert server.connection_pool.active_connections == 20
+    assert len(server.heartbeat_wheel) == 20
+
+
+async def test_failed_pings_and_idle_connections_are_removed():
+    broken = FakeWebSocket(error=RuntimeError("broken pipe"))
+    server = await _server_with(broken, FakeWebSocket(), FakeWebSocket(), idle_timeout=5.0)
+
+    await server._ping_batch(["conn-0", "conn-1"])
+
+    assert server.heartbeat_stats["ping_failures"] == 1
+    assert set(server.connection_pool.connections) == {"conn-1", "conn-2"}
+
+    server.activity_buckets.touch("conn-1", now=time.monotonic() - 60.0)
+    await server._close_idle_connections()
+
+    assert set(server.connection_pool.connections) == {"conn-2"}
+    assert server.heartbeat_stats["idle_closed"] == 1
+    assert (await server.get_server_stats())["heartbeat"]["scheduled"] == 1
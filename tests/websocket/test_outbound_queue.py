@@ -0,0 +1,147 @@
+"""
+Outbound queue tests
+
+Checks that batched sends go out by priority class, that superseded updates
+for one entity are coalesced, that a full queue sheds bulk traffic before
+alerts or disconnects the client depending on policy, and that a batch frame
+embeds each message's bytes without re-serializing it.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from src.websocket.core.connection import RateLimiter, WebSocketConnection
+from src.websocket.core.exceptions import SlowConsumerException
+from src.websocket.core.messages import WebSocketEventType, WebSocketMessage, create_event_message, encode_batch
+from src.websocket.core.outbound import OutboundQueue, SlowConsumerPolicy
+
+
+def _metrics(queue_id: str, calls: int) -> WebSocketMessage:
+    return create_event_message(WebSocketEventType.QUEUE_METRICS_UPDATE, {"queue_id": queue_id, "calls": calls})
+
+
+def _alert(n: int) -> WebSocketMessage:
+    return create_event_message(WebSocketEventType.SCHEDULE_CHANGED, {"schedule_id": n})
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+        self.frames = []
+        self.closed_with = None
+
+    async def send_bytes(self, data):
+        self.frames.append(orjson.loads(data))
+
+    async def close(self, code=1000, reason=""):
+        self.client_state.name = "DISCONNECTED"
+        self.closed_with = code
+
+
+def test_alerts_are_sent_before_bulk_updates():
+    queue = OutboundQueue(max_size=100)
+    for i in range(5):
+        queue.put(_metrics(f"q{i}", i))
+    queue.put(_alert(1))
+    queue.put(create_event_message(WebSocketEventType.FORECAST_CALCULATED, {"forecast_id": 1}))
+
+    types = [message.type for message in queue.get_nowait(3)]
+
+    assert types == ["schedule.changed", "forecast.calculated", "queue.metrics.update"]
+    assert len(queue) == 4
+
+
+def test_superseded_updates_are_coalesced():
+    queue = OutboundQueue(max_size=100)
+    for calls in range(10):
+        queue.put(_metrics("q1", calls))
+    queue.put(_metrics("q2", 0))
+
+    messages = queue.get_nowait(10)
+
+    assert [(m.payload["queue_id"], m.payload["calls"]) for m in messages] == [("q1", 9), ("q2", 0)]
+    assert queue.stats["coalesced"] == 9
+    # Once sent, the next update queues again
+    queue.put(_metrics("q1", 10))
+    assert len(queue) == 1
+
+
+def test_full_queue_sheds_bulk_before_alerts():
+    queue = OutboundQueue(max_size=4, policy=SlowConsumerPolicy.DROP)
+    for i in range(3):
+        queue.put(_metrics(f"q{i}", i))
+    queue.put(_alert(0))
+
+    assert queue.put(_alert(1))
+    assert queue.put(_alert(2))
+    # Oldest bulk update makes way for the newest one
+    assert queue.put(_metrics("q9", 9))
+    assert queue.put(_alert(3))
+    # Nothing queued ranks below a bulk update, so the new one is dropped
+    assert not queue.put(_metrics("q10", 10))
+
+    messages = queue.get_nowait(10)
+    assert [m.payload.get("schedule_id") for m in messages] == [0, 1, 2, 3]
+    assert queue.stats["dropped"] == 5
+
+
+def test_full_queue_disconnect_policy_raises():
+    queue = OutboundQueue(max_size=2, policy=SlowConsumerPolicy.DISCONNECT)
+    queue.put(_alert(0))
+    queue.put(_alert(1))
+
+    with pytest.raises(SlowConsumerException):
+        queue.put(_alert(2))
+
+
+def test_batch_frame_embeds_cached_message_bytes():
+    messages = [_alert(1), _metrics("q1", 3)]
+    encoded = [message.encoded() for message in messages]
+
+    frame = orjson.loads(encode_batch(messages))
+
+    assert frame["type"] == "batch"
+    assert frame["payload"]["batch_size"] == 2
+    assert frame["payload"]["messages"] == [orjson.loads(data) for data in encoded]
+    assert messages[0].encoded() is encoded[0]
+
+
+async def test_slow_consumer_is_disconnected_without_blocking_sender():
+    websocket = FakeWebSocket()
+    connection = WebSocketConnection(
+        websocket=websocket,
+        connection_id="conn-1",
+        rate_limit=RateLimiter(max_tokens=1000),
+        outbound_queue_size=5,
+        slow_consumer_policy=SlowConsumerPolicy.DISCONNECT
+    )
+
+    # The batch loop never gets to run while this coroutine keeps queueing
+    results = [await connection.send_message(_alert(i), batch=True) for i in range(6)]
+    await asyncio.sleep(0)
+
+    assert results == [True] * 5 + [False]
+    assert not connection.is_connected
+    assert websocket.closed_with == 1013
+
+
+async def test_batched_sends_arrive_in_priority_order():
+    websocket = FakeWebSocket()
+    connection = WebSocketConnection(websocket=websocket, connection_id="conn-1",
+                                     rate_limit=RateLimiter(max_tokens=1000))
+
+    for calls in range(20):
+        await connection.send_message(_metrics("q1", calls), batch=True)
+    await connection.send_message(_alert(1), batch=True)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert len(websocket.frames) == 1
+    batch = websocket.frames[0]["payload"]["messages"]
+    assert [m["type"] for m in batch] == ["schedule.changed", "queue.metrics.update"]
+    assert batch[1]["payload"]["calls"] == 19
+    assert connection.get_stats()["metrics"]["messages_sent"] == 2
+    await connection.close()